@@ -0,0 +1,497 @@
+"""
+📊 BENCHMARKS HEADLESS DU KIOSQUE TRÈFLE
+Mesure chargeur, index, interface et chemins de génération sans FreeCAD ni Qt :
+`bench/substituts` fournit des stand-ins de `FreeCAD`, `FreeCADGui` et `PySide`,
+`bench/kiosque_synthetique.py` un script `KiosqueTrefleFonctionnel` au coût réglable.
+
+Usage :
+    python bench/bench_kiosque.py                  # compare à bench/baseline.json
+    python bench/bench_kiosque.py --enregistrer    # (ré)écrit la référence
+    python bench/bench_kiosque.py -k cache -r 20 --tolerance 1.3
+
+Le meilleur temps (min) de chaque benchmark est comparé à la référence ; au-delà de
+`tolerance` × référence, le benchmark est signalé en régression (code de sortie 1).
+Les temps sont comparés en unités de calibration (`calibrer` : meilleur temps d'une
+charge Python fixe, mesurée à chaque exécution et enregistrée avec la référence) :
+une machine deux fois plus lente n'est pas une régression. Pour les benchmarks
+dominés par NumPy ou les processus, la normalisation reste approximative.
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ICI = os.path.dirname(os.path.abspath(__file__))
+RACINE = os.path.dirname(ICI)
+SUBSTITUTS = os.path.join(ICI, 'substituts')
+SCRIPT = os.path.join(ICI, 'kiosque_synthetique.py')
+REFERENCE = os.path.join(ICI, 'baseline.json')
+TOLERANCE_DEFAUT = 1.5
+REPETITIONS_DEFAUT = 7
+REPETITIONS_CALIBRATION = 5
+
+# Fonctions ajoutées au script synthétique pour mesurer l'indexation/découverte à l'échelle
+FONCTIONS_REMPLISSAGE = 400
+
+PARAMETRES = {
+    'rayon_petale': 2200, 'rayon_rosaire': 1000, 'hauteur_petale': 2200, 'hauteur_dome': 3500,
+    'material': 'Acier galvanisé (permanent)', 'wind_speed': 100, 'safety_factor': 1.3,
+}
+
+MODULES_KIOSQUE = ('interface_ultrasimple', 'interface_dialogue', 'kiosque_generation', 'kiosque_cache', 'kiosque_index',
+                   'kiosque_incremental', 'kiosque_instances', 'kiosque_documents', 'kiosque_aiguillage',
+                   'kiosque_historique', 'kiosque_profil', 'kiosque_ancrage', 'kiosque_metre', 'kiosque_optimisation',
+                   'kiosque_service', 'kiosque_bac_a_sable', 'kiosque_journal', 'kiosque_surveillance',
+                   'kiosque_export', 'kiosque_comparaison', 'kiosque_fiabilite', 'kiosque_parallele',
+                   'kiosque_module')
+
+
+def preparer_environnement(dossier):
+    """Substituts en tête de `sys.path` et HOME isolé (index, cache) : avant tout import kiosque_*."""
+    os.environ['HOME'] = os.environ['USERPROFILE'] = dossier
+    for chemin in (RACINE, SUBSTITUTS):
+        if chemin not in sys.path:
+            sys.path.insert(0, chemin)
+
+
+def script_large(dossier, n=FONCTIONS_REMPLISSAGE):
+    """Copie du script synthétique complétée de `n` fonctions de module."""
+    with open(SCRIPT, encoding='utf-8') as f:
+        source = f.read()
+    source += "".join(f"\n\ndef outil_{i:04d}(a, b=1, *args, cle=None):\n"
+                      f"    return a + b if cle is None else cle\n" for i in range(n))
+    chemin = os.path.join(dossier, 'kiosque_synthetique_large.py')
+    with open(chemin, 'w', encoding='utf-8') as f:
+        f.write(source)
+    return chemin
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+# Chaque benchmark reçoit le contexte et retourne la fonction mesurée (sans argument).
+
+BENCHMARKS = {}
+
+
+def benchmark(nom):
+    def enregistrer(fonction):
+        BENCHMARKS[nom] = fonction
+        return fonction
+    return enregistrer
+
+
+def _fermer_documents():
+    import FreeCAD
+    FreeCAD.fermer_tout()
+
+
+@benchmark('import_interface')
+def _import_interface(ctx):
+    import importlib
+
+    def mesure():
+        for nom in MODULES_KIOSQUE:
+            sys.modules.pop(nom, None)
+        importlib.import_module('interface_ultrasimple')
+    return mesure
+
+
+@benchmark('import_dialogue')
+def _import_dialogue(ctx):
+    import importlib
+
+    def mesure():
+        for nom in MODULES_KIOSQUE:
+            sys.modules.pop(nom, None)
+        importlib.import_module('interface_dialogue')
+    return mesure
+
+
+@benchmark('charger_module')
+def _charger_module(ctx):
+    from kiosque_generation import charger_module
+    return lambda: charger_module(SCRIPT)
+
+
+@benchmark('indexation_ast')
+def _indexation_ast(ctx):
+    from kiosque_index import indexer_source
+    with open(ctx['script_large'], encoding='utf-8') as f:
+        source = f.read()
+    return lambda: indexer_source(source)
+
+
+@benchmark('index_en_cache')
+def _index_en_cache(ctx):
+    from kiosque_index import charger_index
+    charger_index(ctx['script_large'])  # remplit le cache disque
+    return lambda: charger_index(ctx['script_large'])
+
+
+@benchmark('decouverte_interface')
+def _decouverte_interface(ctx):
+    from interface_ultrasimple import InterfaceUltraSimple
+    return lambda: InterfaceUltraSimple(ctx['script_large'])
+
+
+@benchmark('generer_magique')
+def _generer_magique(ctx):
+    from interface_ultrasimple import InterfaceUltraSimple
+    interface = InterfaceUltraSimple(SCRIPT)
+
+    def mesure():
+        _fermer_documents()
+        interface.generer_magique()
+    return mesure
+
+
+@benchmark('appliquer_parametres')
+def _appliquer_parametres(ctx):
+    from kiosque_generation import appliquer_parametres
+    config = {'rayon_petale': 0, 'hauteur_dome': 0}
+
+    def mesure():
+        for _ in range(1000):
+            appliquer_parametres(config, PARAMETRES)
+    return mesure
+
+
+@benchmark('construire_kiosque')
+def _construire_kiosque(ctx):
+    from kiosque_generation import charger_module, construire_kiosque
+    module = charger_module(SCRIPT)
+
+    def mesure():
+        _fermer_documents()
+        construire_kiosque(module, PARAMETRES)
+    return mesure
+
+
+@benchmark('construire_parallele')
+def _construire_parallele(ctx):
+    from kiosque_generation import charger_module
+    from kiosque_index import indexer_source
+    from kiosque_parallele import ConstructionParallele
+    with open(SCRIPT, encoding='utf-8') as f:
+        construction = ConstructionParallele(SCRIPT, indexer_source(f.read()), chemins_supplementaires=(SUBSTITUTS,))
+    construction.prechauffer()
+    ctx['nettoyages'].append(construction.arreter)
+    module = charger_module(SCRIPT)
+
+    # Workers déjà démarrés (comme dans l'interface) : à comparer à construire_kiosque
+    def mesure():
+        _fermer_documents()
+        construction.construire(module, PARAMETRES)
+    return mesure
+
+
+@benchmark('construire_instances')
+def _construire_instances(ctx):
+    from kiosque_generation import charger_module, construire_kiosque
+    module = charger_module(SCRIPT)
+
+    def mesure():
+        _fermer_documents()
+        construire_kiosque(module, PARAMETRES, instances=True)
+    return mesure
+
+
+@benchmark('cache_miss')
+def _cache_miss(ctx):
+    from kiosque_cache import CacheGeometrie
+    from kiosque_generation import charger_module, construire_kiosque
+    module = charger_module(SCRIPT)
+    cache = CacheGeometrie(os.path.join(ctx['dossier'], 'cache_miss'))
+
+    def mesure():
+        _fermer_documents()
+        cache.vider()
+        construire_kiosque(module, PARAMETRES, cache=cache)
+    return mesure
+
+
+@benchmark('cache_hit')
+def _cache_hit(ctx):
+    from kiosque_cache import CacheGeometrie
+    from kiosque_generation import charger_module, construire_kiosque
+    module = charger_module(SCRIPT)
+    cache = CacheGeometrie(os.path.join(ctx['dossier'], 'cache_hit'))
+    construire_kiosque(module, PARAMETRES, cache=cache)
+
+    def mesure():
+        _fermer_documents()
+        construire_kiosque(module, PARAMETRES, cache=cache)
+    return mesure
+
+
+@benchmark('incremental_dome')
+def _incremental_dome(ctx):
+    from kiosque_generation import charger_module
+    from kiosque_incremental import SessionIncrementale
+    from kiosque_index import charger_index
+    _fermer_documents()
+    index, _ = charger_index(SCRIPT)
+    session = SessionIncrementale(charger_module(SCRIPT), index)
+    session.construire(PARAMETRES)
+    hauteurs = itertools.cycle([3000, PARAMETRES['hauteur_dome']])  # change à chaque appel
+
+    def mesure():
+        session.construire(dict(PARAMETRES, hauteur_dome=next(hauteurs)))
+    return mesure
+
+
+@benchmark('comparaison_5_variantes')
+def _comparaison(ctx):
+    from kiosque_comparaison import ComparaisonVariantes
+    from kiosque_generation import charger_module
+    from kiosque_index import indexer_source
+    with open(SCRIPT, encoding='utf-8') as f:
+        comparaison = ComparaisonVariantes(charger_module(SCRIPT), indexer_source(f.read()))
+    # Dôme seul différent : pétales et plots modélisés une fois (à comparer à 5 × construire_kiosque)
+    variantes = [dict(PARAMETRES, hauteur_dome=h) for h in range(3000, 4001, 250)]
+
+    def mesure():
+        _fermer_documents()
+        comparaison.construire(variantes)
+    return mesure
+
+
+@benchmark('journal_10k')
+def _journal(ctx):
+    from kiosque_journal import Journal
+    journal = Journal()
+    journal.ouvrir_fichier(os.path.join(ctx['dossier'], 'journal.jsonl'))
+    ctx['nettoyages'].append(journal.fermer_fichier)
+
+    def mesure():
+        for i in range(10000):
+            journal.info("✅ variante", index=i, duree_s=0.5)
+    return mesure
+
+
+@benchmark('dimensionnement_100k')
+def _dimensionnement(ctx):
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    from kiosque_ancrage import dimensionner
+    vitesses = np.linspace(50, 200, 100)[:, None]
+    rayons = np.linspace(1500, 3000, 1000)[None, :]
+    return lambda: dimensionner(vitesses, rayons, material='Bambou (temporaire)')
+
+
+@benchmark('metre_100k')
+def _metre(ctx):
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    from kiosque_metre import estimer
+    rayons = np.linspace(1500, 3000, 100)[:, None]
+    hauteurs = np.linspace(2500, 4500, 1000)[None, :]
+    return lambda: estimer(rayons, hauteur_dome=hauteurs, material='Bambou (temporaire)')
+
+
+@benchmark('optimisation')
+def _optimisation(ctx):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return None
+    from kiosque_optimisation import optimiser
+    return lambda: optimiser(130, 'Bambou (temporaire)', 1.5, emprise_max=7000,
+                             hauteur_libre_min=2100, lest_max=1500)
+
+
+@benchmark('fiabilite_1m')
+def _fiabilite(ctx):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return None
+    from kiosque_fiabilite import analyser_parametres
+    return lambda: analyser_parametres(PARAMETRES, echantillons=1_000_000, graine=0)
+
+
+@benchmark('batch_froid_1_variante')
+def _batch_froid(ctx):
+    from kiosque_batch import executer_batch
+    sortie = os.path.join(ctx['dossier'], 'batch_froid')
+    # Pool neuf à chaque appel : démarrage de l'interpréteur, import FreeCAD, exécution du script
+    return lambda: executer_batch(SCRIPT, [{}], sortie, ('fcstd',), 1, (SUBSTITUTS,))
+
+
+@benchmark('service_1_variante')
+def _service(ctx):
+    import threading
+
+    from kiosque_service import ClientService, ServiceGeneration
+    fichier = os.path.join(ctx['dossier'], 'service.json')
+    service = ServiceGeneration(SCRIPT, 1, (SUBSTITUTS,), os.path.join(ctx['dossier'], 'service'),
+                                fichier_service=fichier)
+    pret = threading.Event()
+    threading.Thread(target=service.servir, kwargs={'pret': pret}, daemon=True).start()
+    pret.wait(60)
+    client = ClientService(fichier)
+    ctx['nettoyages'] += [client.fermer, service.arreter]
+    return lambda: client.generer({}, ('fcstd',))
+
+
+@benchmark('bac_a_sable_1_variante')
+def _bac_a_sable(ctx):
+    from kiosque_bac_a_sable import BacASable
+    bac_a_sable = BacASable(SCRIPT, (SUBSTITUTS,))
+    bac_a_sable.demarrer()
+    ctx['nettoyages'].append(bac_a_sable.arreter)
+    # Enfant forké du serveur pré-chargé, formes BREP renvoyées par le pipe
+    return lambda: bac_a_sable.generer({})
+
+
+@benchmark('export_step_stl_glb')
+def _export(ctx):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return None
+    from kiosque_export import creer_pool, exporter, formes_brep
+    from kiosque_generation import charger_module, construire_kiosque
+    _fermer_documents()
+    formes = formes_brep(construire_kiosque(charger_module(SCRIPT), PARAMETRES))
+    pool = creer_pool(2, (SUBSTITUTS,))
+    ctx['nettoyages'].append(pool.shutdown)
+    base = os.path.join(ctx['dossier'], 'export', 'kiosque')
+    # Pool déjà démarré (comme dans l'interface) : STEP et pièces maillées en parallèle, écrites au fil de l'eau
+    return lambda: exporter(formes, base, pool=pool)
+
+
+# ============================================================================
+# EXÉCUTION ET COMPARAISON
+# ============================================================================
+
+def calibrer(repetitions=REPETITIONS_CALIBRATION):
+    """Meilleur temps (s) d'une charge Python fixe (flottants, dict, chaînes) : unité de mesure."""
+    def charge():
+        total, table = 0.0, {}
+        for i in range(100_000):
+            table[i & 1023] = f"{i:x}"
+            total += math.sin(i) * len(table[i & 1023])
+        return total
+
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        charge()
+        durees.append(time.perf_counter() - debut)
+    return min(durees)
+
+
+def executer(noms, repetitions, dossier):
+    """Exécute les benchmarks ; retourne {nom: {'min', 'mediane', 'repetitions'}} (secondes)."""
+    ctx = {'dossier': dossier, 'script_large': script_large(dossier), 'nettoyages': []}
+    resultats = {}
+    for nom in noms:
+        with contextlib.redirect_stdout(io.StringIO()):
+            mesure = BENCHMARKS[nom](ctx)
+        if mesure is None:
+            print(f"⏭️  {nom}: ignoré (dépendance absente)")
+            continue
+        durees = []
+        for _ in range(repetitions):
+            with contextlib.redirect_stdout(io.StringIO()):
+                debut = time.perf_counter()
+                mesure()
+                durees.append(time.perf_counter() - debut)
+        resultats[nom] = {'min': min(durees), 'mediane': statistics.median(durees),
+                          'repetitions': repetitions}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for nettoyer in ctx['nettoyages']:  # services, pools lancés par les benchmarks
+            nettoyer()
+    return resultats
+
+
+def comparer(resultats, reference, tolerance, facteur=1.0):
+    """Affiche le tableau et retourne la liste des benchmarks en régression.
+
+    `facteur` : calibration de cette exécution / celle de la référence ; les références
+    sont ramenées à la vitesse de cette machine avant le calcul du ratio.
+    """
+    regressions = []
+    print(f"{'Benchmark':<24} {'min (ms)':>10} {'médiane':>10} {'référence':>10} {'ratio':>7}")
+    for nom, r in resultats.items():
+        ref = reference.get(nom, {}).get('min')
+        ref = ref * facteur if ref else None
+        ratio = r['min'] / ref if ref else None
+        statut = ''
+        if ratio is not None and ratio > tolerance:
+            regressions.append(nom)
+            statut = '  ❌ régression'
+        print(f"{nom:<24} {r['min'] * 1000:>10.2f} {r['mediane'] * 1000:>10.2f} "
+              f"{ref * 1000 if ref else float('nan'):>10.2f} "
+              f"{ratio if ratio is not None else float('nan'):>7.2f}{statut}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks headless du kiosque trèfle")
+    parser.add_argument('-k', '--filtre', default='', help="Sous-chaîne des benchmarks à exécuter")
+    parser.add_argument('-r', '--repetitions', type=int, default=REPETITIONS_DEFAUT)
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE_DEFAUT,
+                        help="Ratio min/référence au-delà duquel on signale une régression")
+    parser.add_argument('--reference', default=REFERENCE, help="Fichier JSON de référence")
+    parser.add_argument('--enregistrer', action='store_true',
+                        help="Écrire les résultats comme nouvelle référence")
+    args = parser.parse_args(argv)
+
+    noms = [nom for nom in BENCHMARKS if args.filtre in nom]
+    if not noms:
+        parser.error(f"Aucun benchmark ne correspond à '{args.filtre}'")
+
+    calibration = calibrer()
+    with tempfile.TemporaryDirectory(prefix='kiosque_bench_') as dossier:
+        preparer_environnement(dossier)
+        resultats = executer(noms, args.repetitions, dossier)
+    calibration = min(calibration, calibrer())  # avant/après : écarte une mesure perturbée
+
+    reference, calibration_reference = {}, None
+    if os.path.exists(args.reference):
+        with open(args.reference, encoding='utf-8') as f:
+            donnees = json.load(f)
+        reference = donnees.get('benchmarks', {})
+        calibration_reference = donnees.get('calibration_s')
+    facteur = calibration / calibration_reference if calibration_reference else 1.0
+    print(f"⚖️  Calibration : {calibration * 1000:.2f} ms"
+          + (f" (référence {calibration_reference * 1000:.2f} ms, facteur {facteur:.2f})"
+             if calibration_reference else " (référence non calibrée : temps absolus)"))
+    regressions = comparer(resultats, reference, args.tolerance, facteur)
+
+    if args.enregistrer:
+        # Références d'autres benchmarks conservées : ramenées à la calibration de cette machine
+        reference = {nom: dict(r, min=r['min'] * facteur, mediane=r['mediane'] * facteur)
+                     for nom, r in reference.items()}
+        reference.update(resultats)
+        with open(args.reference, 'w', encoding='utf-8') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'calibration_s': calibration,
+                       'benchmarks': reference},
+                      f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"💾 Référence écrite: {args.reference}")
+        return 0
+    if regressions:
+        print(f"❌ {len(regressions)} régression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
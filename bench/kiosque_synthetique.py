@@ -0,0 +1,82 @@
+"""
+Script kiosque synthétique pour les benchmarks (même interface que
+`kiosque_trefle_4petales_dome22.py`, géométrie factice).
+
+Coût réglable par variables d'environnement, lues à chaque construction :
+  - KIOSQUE_BENCH_OBJETS : objets créés par pétale / plot / dôme (défaut 20) ;
+  - KIOSQUE_BENCH_COUT   : itérations de calcul par objet (défaut 2000).
+"""
+
+import math
+import os
+
+import FreeCAD as App
+
+
+def _reglage(nom, defaut):
+    return int(os.environ.get(nom, defaut))
+
+
+def _calcul(iterations):
+    total = 0.0
+    for i in range(iterations):
+        total += math.sin(i) * math.cos(i)
+    return total
+
+
+class KiosqueTrefleFonctionnel:
+
+    def __init__(self):
+        self.config = {
+            'rayon_petale': 2200,
+            'rayon_rosaire': 1000,
+            'hauteur_petale': 2200,
+            'hauteur_dome': 3500,
+            'nb_petales': 4,
+            'nb_plots_par_petale': 2,
+        }
+
+    def _objets(self, prefixe, nombre):
+        doc = App.ActiveDocument
+        cout = _reglage('KIOSQUE_BENCH_COUT', 2000)
+        for i in range(nombre):
+            _calcul(cout)
+            doc.addObject('Part::Feature', f"{prefixe}_{i}")
+
+    def creer_petale(self, angle):
+        rayon = self.config['rayon_petale']
+        hauteur = self.config['hauteur_petale']
+        self._objets(f"Petale_{int(angle)}_{rayon}_{hauteur}", _reglage('KIOSQUE_BENCH_OBJETS', 20))
+
+    def assembler_4_petales(self):
+        for k in range(self.config['nb_petales']):
+            self.creer_petale(k * 90 + 45)
+
+    def creer_plot(self, angle):
+        self._objets(f"Plot_{int(angle)}_{self.config['rayon_rosaire']}",
+                     _reglage('KIOSQUE_BENCH_OBJETS', 20) // 4)
+
+    def creer_plots_fondation(self):
+        c = self.config
+        n = c['nb_petales'] * c.get('nb_plots_par_petale', 2)
+        for k in range(n):
+            self.creer_plot(k * 360 / n)
+
+    def creer_dome(self):
+        self._objets(f"Dome_{self.config['hauteur_dome']}", _reglage('KIOSQUE_BENCH_OBJETS', 20))
+
+    def generer_kiosque_complet_avec_plots(self):
+        doc = App.newDocument("Kiosque_Trefle")
+        self.assembler_4_petales()
+        self.creer_plots_fondation()
+        self.creer_dome()
+        return doc
+
+
+def creer_kiosque_fonctionnel():
+    return KiosqueTrefleFonctionnel().assembler_4_petales()
+
+
+def creer_kiosque_avec_plots():
+    return KiosqueTrefleFonctionnel().generer_kiosque_complet_avec_plots()
+
@@ -0,0 +1,144 @@
+"""
+Substitut minimal de `FreeCAD` (App) pour les benchmarks hors FreeCAD.
+
+Documents en mémoire : objets nommés (forme substitut pour les `Part::Feature`), recompute
+compté (ignoré si `RecomputesFrozen`), `saveCopy`/`mergeProject`/`openDocument`
+sérialisent la liste des objets en JSON (suffisant pour le cache de géométrie et le service).
+"""
+
+import json
+
+ActiveDocument = None
+_documents = {}
+
+
+class Vector:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x, self.y, self.z = x, y, z
+
+
+class Rotation:
+    def __init__(self, axe=None, angle=0.0):
+        self.Axis, self.Angle = axe or Vector(0, 0, 1), angle
+
+
+class Placement:
+    def __init__(self, base=None, rotation=None):
+        self.Base = base or Vector()
+        self.Rotation = rotation or Rotation()
+
+    def multiply(self, autre):
+        return Placement(self.Base, Rotation(self.Rotation.Axis,
+                                             self.Rotation.Angle + autre.Rotation.Angle))
+
+
+class Objet:
+    def __init__(self, document, type_objet, nom):
+        self.Document = document
+        self.TypeId = type_objet
+        self.Name = nom
+        self.Label = nom
+        self.InList = []
+        self.InListRecursive = []
+        self.ViewObject = None
+        self.Placement = Placement()
+        self.LinkedObject = None
+
+
+class Document:
+    def __init__(self, nom):
+        self.Name = nom
+        self.Label = nom
+        self.Objects = []
+        self.recomputes = 0
+        self.RecomputesFrozen = False
+        self.UndoMode = 1
+
+    def _nom_unique(self, nom):
+        existants = {o.Name for o in self.Objects}
+        if nom not in existants:
+            return nom
+        i = 1
+        while f"{nom}{i:03d}" in existants:
+            i += 1
+        return f"{nom}{i:03d}"
+
+    def addObject(self, type_objet, nom='Objet'):
+        objet = Objet(self, type_objet, self._nom_unique(nom))
+        if type_objet == 'Part::Feature':
+            import Part
+            objet.Shape = Part.Forme([objet.Name])
+        self.Objects.append(objet)
+        return objet
+
+    def getObject(self, nom):
+        for objet in self.Objects:
+            if objet.Name == nom:
+                return objet
+        return None
+
+    def removeObject(self, nom):
+        self.Objects = [o for o in self.Objects if o.Name != nom]
+
+    def recompute(self):
+        if self.RecomputesFrozen:
+            return 0
+        self.recomputes += 1
+        return len(self.Objects)
+
+    def saveCopy(self, chemin):
+        with open(chemin, 'w', encoding='utf-8') as f:
+            json.dump([[o.TypeId, o.Name] for o in self.Objects], f)
+
+    saveAs = saveCopy
+
+    def mergeProject(self, chemin):
+        with open(chemin, encoding='utf-8') as f:
+            for type_objet, nom in json.load(f):
+                self.addObject(type_objet, nom)
+
+
+def newDocument(nom='Sans_nom'):
+    global ActiveDocument
+    unique, i = nom, 1
+    while unique in _documents:
+        unique, i = f"{nom}{i}", i + 1
+    document = Document(unique)
+    _documents[unique] = document
+    ActiveDocument = document
+    return document
+
+
+def openDocument(chemin):
+    import os
+    document = newDocument(os.path.splitext(os.path.basename(chemin))[0])
+    document.mergeProject(chemin)
+    document.FileName = chemin
+    return document
+
+
+def listDocuments():
+    return dict(_documents)
+
+
+def getDocument(nom):
+    return _documents[nom]
+
+
+def setActiveDocument(nom):
+    global ActiveDocument
+    ActiveDocument = _documents[nom]
+
+
+def closeDocument(nom):
+    global ActiveDocument
+    document = _documents.pop(nom)
+    if ActiveDocument is document:
+        ActiveDocument = next(iter(_documents.values()), None)
+
+
+def fermer_tout():
+    """Réinitialise l'état entre deux mesures (spécifique au substitut)."""
+    global ActiveDocument
+    _documents.clear()
+    ActiveDocument = None
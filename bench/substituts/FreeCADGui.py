@@ -0,0 +1,7 @@
+"""Substitut minimal de `FreeCADGui` : pas de vue 3D."""
+
+ActiveDocument = None
+
+
+def setActiveDocument(nom):
+    pass
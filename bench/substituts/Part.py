@@ -0,0 +1,49 @@
+"""
+Substitut minimal de `Part` pour les benchmarks hors FreeCAD : `getShape`,
+`makeCompound`, `exportBrep`/`exportStep` et `exportBrepToString`/`importBrepFromString`
+(liste des objets sérialisée en texte), `tessellate` (un tétraèdre par objet, décalé
+selon son rang).
+"""
+
+
+class Forme:
+    def __init__(self, noms=()):
+        self.noms = list(noms)
+
+    def isNull(self):
+        return not self.noms
+
+    def exportBrep(self, chemin):
+        with open(chemin, 'w', encoding='utf-8') as f:
+            f.write(self.exportBrepToString())
+
+    def exportBrepToString(self):
+        return 'DBRep_DrawableShape\n' + '\n'.join(self.noms) + '\n'
+
+    def importBrepFromString(self, texte):
+        self.noms = texte.splitlines()[1:]
+
+    def exportStep(self, chemin):
+        with open(chemin, 'w', encoding='utf-8') as f:
+            f.write('ISO-10303-21;\n' + '\n'.join(self.noms) + '\nEND-ISO-10303-21;\n')
+
+    def tessellate(self, deviation):
+        from FreeCAD import Vector
+        points, triangles = [], []
+        for k, _ in enumerate(self.noms):
+            x = 1000.0 * k
+            n = len(points)
+            points += [Vector(x, 0, 0), Vector(x + 100, 0, 0), Vector(x, 100, 0), Vector(x, 0, 100)]
+            triangles += [(n, n + 2, n + 1), (n, n + 1, n + 3), (n, n + 3, n + 2), (n + 1, n + 2, n + 3)]
+        return points, triangles
+
+
+Shape = Forme
+
+
+def getShape(objet):
+    return Forme([objet.Name])
+
+
+def makeCompound(formes):
+    return Forme(nom for forme in formes for nom in forme.noms)
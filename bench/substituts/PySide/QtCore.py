@@ -0,0 +1,95 @@
+"""
+Substitut de `PySide.QtCore` : signaux synchrones, QThread exécuté sur place.
+
+`QThread.start()` émet `started` puis `finished` dans le thread appelant : une
+génération lancée par l'interface se termine donc avant le retour de l'appel.
+"""
+
+import inspect
+
+
+def _arite(cible):
+    """Nombre d'arguments acceptés (None = illimité) : Qt ignore les arguments en trop."""
+    try:
+        parametres = inspect.signature(cible).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind == p.VAR_POSITIONAL for p in parametres):
+        return None
+    return sum(1 for p in parametres if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+
+
+class _SignalLie:
+    def __init__(self):
+        self._cibles = []
+
+    def connect(self, cible):
+        self._cibles.append((cible, _arite(cible)))
+
+    def disconnect(self, cible=None):
+        self._cibles = [] if cible is None else [c for c in self._cibles if c[0] is not cible]
+
+    def emit(self, *args):
+        for cible, arite in list(self._cibles):
+            cible(*(args if arite is None else args[:arite]))
+
+
+class Signal:
+    """Descripteur : un `_SignalLie` par instance."""
+
+    def __init__(self, *types):
+        self.types = types
+
+    def __set_name__(self, proprietaire, nom):
+        self.nom = '_signal_' + nom
+
+    def __get__(self, instance, proprietaire=None):
+        if instance is None:
+            return self
+        signal = instance.__dict__.get(self.nom)
+        if signal is None:
+            signal = instance.__dict__[self.nom] = _SignalLie()
+        return signal
+
+
+class QObject:
+    def __init__(self, parent=None):
+        self._parent = parent
+
+    def moveToThread(self, thread):
+        pass
+
+
+class QThread(QObject):
+    started = Signal()
+    finished = Signal()
+
+    def start(self):
+        self.started.emit()
+        self.finished.emit()
+
+    def quit(self):
+        pass
+
+    def wait(self, delai=None):
+        return True
+
+
+class QTimer(QObject):
+    timeout = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.actif = False
+
+    def setSingleShot(self, unique):
+        pass
+
+    def setInterval(self, delai):
+        pass
+
+    def start(self, delai=None):
+        self.actif = True
+
+    def stop(self):
+        self.actif = False
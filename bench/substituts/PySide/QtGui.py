@@ -0,0 +1,153 @@
+"""
+Substitut de `PySide.QtGui` : widgets inertes.
+
+Toute méthode inconnue est un appel sans effet qui sert aussi de signal
+(`connect`/`emit`) ; seuls les widgets dont l'interface lit l'état (spin boxes,
+combos, cases à cocher, textes) mémorisent leur valeur. Les boîtes de dialogue
+modales retournent immédiatement.
+"""
+
+from PySide.QtCore import Signal, _SignalLie
+
+
+class _Methode(_SignalLie):
+    """Méthode sans effet, utilisable aussi comme signal."""
+
+    def __call__(self, *args, **kwargs):
+        return None
+
+
+class _MetaWidget(type):
+    def __getattr__(cls, nom):
+        if nom.startswith('__'):
+            raise AttributeError(nom)
+        return 0  # énumérations (QAbstractItemView.NoEditTriggers, ...)
+
+
+class QWidget(metaclass=_MetaWidget):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, nom):
+        # Les attributs Python de l'interface (`_thread_generation`...) restent de vrais AttributeError
+        if nom.startswith('_'):
+            raise AttributeError(nom)
+        methode = self.__dict__[nom] = _Methode()
+        return methode
+
+
+class QDialog(QWidget):
+    def exec_(self):
+        return 0
+
+    def closeEvent(self, evenement):
+        pass
+
+
+class QLabel(QWidget):
+    def __init__(self, texte='', *args):
+        self._texte = texte
+
+    def setText(self, texte):
+        self._texte = texte
+
+    def text(self):
+        return self._texte
+
+
+class QTextEdit(QWidget):
+    def __init__(self, *args):
+        self._lignes = []
+        self._lignes_max = 0
+
+    def document(self):
+        return self
+
+    def setMaximumBlockCount(self, nombre):
+        self._lignes_max = nombre
+
+    def append(self, texte):
+        self._lignes.extend(texte.split("\n"))
+        if self._lignes_max:
+            del self._lignes[:-self._lignes_max]
+
+    def setPlainText(self, texte):
+        self._lignes = [texte]
+
+    def toPlainText(self):
+        return "\n".join(self._lignes)
+
+
+class QSpinBox(QWidget):
+    valueChanged = Signal(int)
+
+    def __init__(self, *args):
+        self._valeur = 0
+
+    def setValue(self, valeur):
+        if valeur != self._valeur:
+            self._valeur = valeur
+            self.valueChanged.emit(valeur)
+
+    def value(self):
+        return self._valeur
+
+
+QDoubleSpinBox = QSpinBox
+
+
+class QComboBox(QWidget):
+    def __init__(self, *args):
+        self._elements = []
+        self._courant = 0
+
+    def addItems(self, elements):
+        self._elements.extend(elements)
+
+    def setCurrentIndex(self, index):
+        self._courant = index
+
+    def currentText(self):
+        return self._elements[self._courant] if self._elements else ''
+
+
+class QCheckBox(QWidget):
+    toggled = Signal(bool)
+
+    def __init__(self, *args):
+        self._coche = False
+
+    def setChecked(self, coche):
+        if coche != self._coche:
+            self._coche = coche
+            self.toggled.emit(coche)
+
+    def isChecked(self):
+        return self._coche
+
+
+class QPushButton(QWidget):
+    clicked = Signal()
+
+
+class QMessageBox(QWidget):
+    @staticmethod
+    def information(*args):
+        return 0
+
+    warning = critical = question = information
+
+
+class QFileDialog(QWidget):
+    @staticmethod
+    def getOpenFileName(*args):
+        return '', ''
+
+    getSaveFileName = getOpenFileName
+
+
+def __getattr__(nom):
+    # Layouts, QGroupBox, QScrollArea, QTableWidget, QColor... : widgets inertes
+    if nom.startswith('__'):
+        raise AttributeError(nom)
+    return QWidget
@@ -0,0 +1 @@
+"""Substitut minimal de PySide (QtCore/QtGui) pour les benchmarks sans affichage."""
@@ -0,0 +1,1979 @@
+"""
+🏗️ DIALOGUE QT DU GÉNÉRATEUR KIOSQUE TRÈFLE
+`InterfaceUltraSimple` et son worker de génération. Importe FreeCAD, FreeCADGui et
+PySide : n'est chargé qu'à la construction du dialogue (voir `interface_ultrasimple`).
+"""
+
+import FreeCAD as App
+import FreeCADGui as Gui
+from PySide import QtCore, QtGui
+import os
+import threading
+import time
+
+from kiosque_aiguillage import IndexAiguillage, appelables_sans_argument
+from kiosque_cache import CacheGeometrie
+from kiosque_documents import GestionnaireDocuments
+from kiosque_export import DEVIATION_DEFAUT_MM
+from kiosque_historique import HistoriqueGenerations, resume_geometrie
+from kiosque_incremental import SessionIncrementale
+from kiosque_index import NOM_CLASSE, FonctionDifferee, charger_index
+from kiosque_journal import JOURNAL, NIVEAUX
+from kiosque_profil import PROFILEUR, formater_resume
+from kiosque_surveillance import INTERVALLE_SURVEILLANCE_MS, SurveillanceFichier
+from kiosque_generation import (
+    CORRESPONDANCE_CONTROLES,
+    FS_DEFAUT,
+    PARAMETRES_GEOMETRIE,
+    REPERTOIRE_DONNEES,
+    VENT_DEFAUT,
+    GenerationAnnulee,
+    charger_module,
+    construction_groupee,
+    construire_kiosque,
+    instrumenter_etapes,
+    meta_parametre,
+    verifier_annulation,
+)
+
+# Aperçu en direct : délai d'anti-rebond et tessellation grossière de la vue
+DELAI_APERCU_MS = 300
+DEVIATION_APERCU = 2.0  # % (FreeCAD : 0.5 par défaut)
+ANGLE_APERCU = 45.0  # degrés (FreeCAD : 28.5 par défaut)
+
+# Zone de logs : nouveaux évènements du journal ajoutés d'un bloc, nombre de lignes borné
+INTERVALLE_LOG_MS = 200
+LIGNES_LOG_MAX = 1000
+
+# Comparaison : variantes proposées autour des réglages courants, au plus ce nombre par défaut
+PAS_COMPARAISON_MM = 200
+COMPARAISON_MAX = 5
+
+
+class GenerationWorker(QtCore.QObject):
+    """Exécute une tâche de génération hors du thread de l'interface.
+
+    `tache(rappel, annulation)` reçoit une fonction `rappel(message)` pour publier
+    la progression et un `threading.Event` d'annulation coopérative. Sa valeur de
+    retour est renvoyée au thread Qt via le signal `termine`.
+
+    Remarque : FreeCAD n'est pas entièrement thread-safe ; la tâche ne doit toucher
+    qu'au document App (jamais à Gui) — la vue est ajustée au retour dans le thread Qt.
+    """
+    progression = QtCore.Signal(str)
+    termine = QtCore.Signal(object)
+    echec = QtCore.Signal(str)
+    annule = QtCore.Signal()
+
+    def __init__(self, tache):
+        super(GenerationWorker, self).__init__()
+        self.tache = tache
+        self.annulation = threading.Event()
+
+    def annuler(self):
+        self.annulation.set()
+
+    def run(self):
+        try:
+            resultat = self.tache(self.progression.emit, self.annulation)
+        except GenerationAnnulee:
+            self.annule.emit()
+        except Exception as e:
+            JOURNAL.exception(f"❌ Génération: {e}")
+            self.echec.emit(str(e))
+        else:
+            self.termine.emit(resultat)
+
+
+class InterfaceUltraSimple(QtGui.QDialog):
+    def __init__(self, chemin_script=None):
+        super(InterfaceUltraSimple, self).__init__()
+        
+        # CHEMIN EXPLICITE - MODIFIEZ ICI !!!
+        if chemin_script is None:
+            # ⚡⚡⚡ METTEZ VOTRE VRAI CHEMIN ICI ! ⚡⚡⚡
+            self.chemin_script = r"C:\Users\VotreNom\Documents\FreeCAD\SCRIPTS_PARAMETRIQUES\kiosque_trefle_4petales_dome22.py"
+            # OU: r"C:\Users\John\Desktop\SCRIPTS_PARAMETRIQUES\kiosque_trefle_4petales_dome22.py"
+        else:
+            self.chemin_script = chemin_script
+        
+        JOURNAL.info(f"🔍 Chemin du script: {self.chemin_script}")
+
+        # Cache disque des kiosques déjà générés (clé: script + config)
+        self.cache = CacheGeometrie()
+
+        # Documents créés par l'interface : brouillon d'essai réutilisé, générés bornés (LRU)
+        self.documents = GestionnaireDocuments()
+
+        # Historique SQLite des générations (rechargement, variante la plus proche)
+        try:
+            self.historique = HistoriqueGenerations()
+        except Exception as e:
+            JOURNAL.avertissement(f"⚠️  Historique indisponible: {e}")
+            self.historique = None
+
+        # Module réel exécuté à la demande (voir `module_loaded`)
+        self._module = None
+        self._verrou_module = threading.RLock()
+
+        # Dernière construction réutilisable par la régénération incrémentale
+        self._session_incrementale = None
+        self._session_apercu = None
+        self._doc_apercu = None
+        self._apercu_en_attente = False
+
+        # Serveur d'exécution isolée du script (`kiosque_bac_a_sable`), démarré au premier usage
+        self._bac_a_sable = None
+
+        # Workers des sous-assemblages (`kiosque_parallele`), démarrés au premier usage
+        self._parallele = None
+
+        # Suivi des enregistrements du script (rechargement à chaud, `kiosque_surveillance`)
+        self._surveillance = None
+
+        # Export STEP/STL/glTF en arrière-plan (`kiosque_export`) : pool créé au premier export
+        self._pool_export = None
+        self._thread_export = None
+        self._annulation_export = None
+        
+        # Indexer IMMÉDIATEMENT le script
+        self.fonctions_chargees = self.charger_script_explicitement()
+        
+        # Interface simple
+        self.setup_ui()
+    
+    @PROFILEUR.mesurer('charger_script_explicitement', 'interface')
+    def charger_script_explicitement(self):
+        """Indexe le script (AST) de manière EXPLICITE, sans l'exécuter.
+
+        Le module réel n'est exécuté qu'à la première génération (`module_loaded`).
+        """
+        try:
+            # Vérifier si le fichier existe
+            if not os.path.exists(self.chemin_script):
+                JOURNAL.erreur(f"❌ Fichier non trouvé: {self.chemin_script}")
+                
+                # Demander à l'utilisateur
+                fichier, _ = QtGui.QFileDialog.getOpenFileName(
+                    None,
+                    "Où est votre script kiosque_trefle_4petales_dome22.py ?",
+                    os.path.expanduser("~"),
+                    "Python Files (*.py)"
+                )
+                
+                if fichier:
+                    self.chemin_script = fichier
+                else:
+                    return []
+            
+            JOURNAL.info(f"✅ Fichier trouvé: {self.chemin_script}")
+
+            # Oublier le module d'un éventuel script précédent
+            with self._verrou_module:
+                self._module = None
+            self._arreter_bac_a_sable()
+            self._arreter_parallele()
+            self._session_incrementale = None
+            self._session_apercu = None
+
+            # ANALYSER le script (AST, index mis en cache par empreinte)
+            JOURNAL.info("⚡ Indexation statique du script...")
+            try:
+                with PROFILEUR.span('index AST', 'chargement'):
+                    self.index_script, self.hash_script = charger_index(self.chemin_script)
+            except SyntaxError as e:
+                JOURNAL.erreur(f"❌ Erreur de syntaxe dans le script: {e}")
+                return []
+            # Cibles de génération déjà essayées avec ce même script
+            self.aiguillage = IndexAiguillage(self.hash_script)
+            # Rechargement à chaud : suivi des enregistrements de ce fichier
+            if self._surveillance is None or self._surveillance.chemin != self.chemin_script:
+                self._surveillance = SurveillanceFichier(self.chemin_script, self.hash_script)
+
+            # Fonctions définies DANS le module
+            fonctions_trouvees = sorted(self.index_script['fonctions'])
+            JOURNAL.info(f"📋 Fonctions trouvées dans le module: {len(fonctions_trouvees)}")
+            if self.index_script.get('classe'):
+                JOURNAL.info(f"📋 {NOM_CLASSE}: {len(self.index_script['classe']['methodes'])} méthodes")
+
+            # Chercher les fonctions principales par mot-clé
+            fonctions_importantes = []
+            for f in fonctions_trouvees:
+                if any(mot in f.lower() for mot in ['kiosque', 'creer', 'generer', 'plot']):
+                    fonctions_importantes.append(f)
+                    JOURNAL.debug(f"   • {f}")
+
+            # Construire la map nom->callable (différé) pour l'interface
+            fonctions_disponibles = []
+            self.functions_map = {}
+            for name in fonctions_trouvees:
+                self.functions_map[name] = FonctionDifferee(lambda: self.module_loaded, name)
+                if name in fonctions_importantes:
+                    fonctions_disponibles.append(name)
+                    JOURNAL.debug(f"✅ Fonction disponible: {name}")
+
+            # Si aucune fonction importante trouvée, retourner toutes les fonctions
+            if not fonctions_disponibles:
+                fonctions_disponibles = list(self.functions_map.keys())
+
+            return fonctions_disponibles
+            
+        except Exception as e:
+            JOURNAL.erreur(f"❌ Erreur chargement: {str(e)}")
+            return []
+
+    @property
+    def module_loaded(self):
+        """Module du script, exécuté à la première demande (une seule fois, thread-safe)."""
+        with self._verrou_module:
+            if self._module is None and os.path.exists(self.chemin_script):
+                JOURNAL.info("⚡ Chargement sûr du module...")
+                try:
+                    self._module = charger_module(self.chemin_script)
+                    JOURNAL.info(f"✅ Module chargé: {getattr(self._module, '__name__', '<module>')}")
+                except Exception as e:
+                    JOURNAL.erreur(f"❌ Erreur import module: {e}")
+            return self._module
+
+    def _classe_disponible(self):
+        """Vrai si le script définit `KiosqueTrefleFonctionnel` (d'après l'index, sans import)."""
+        return bool(getattr(self, 'index_script', None) and self.index_script.get('classe'))
+    
+    def setup_ui(self):
+        """Interface TRÈS SIMPLE"""
+        self.setWindowTitle("🏗️ Générateur Kiosque - Ultra Simple")
+        self.resize(800, 700)
+        self.setMinimumSize(600, 400)
+
+        # Utiliser un scroll area pour éviter le chevauchement des contrôles
+        main_layout = QtGui.QVBoxLayout()
+        scroll = QtGui.QScrollArea()
+        scroll.setWidgetResizable(True)
+        content = QtGui.QWidget()
+        layout = QtGui.QVBoxLayout(content)
+
+        # ============================================
+        # 1. STATUT
+        # ============================================
+        if self.fonctions_chargees:
+            label_statut = QtGui.QLabel(f"✅ Script chargé: {len(self.fonctions_chargees)} fonctions disponibles")
+            label_statut.setStyleSheet("""
+                background-color: #27ae60;
+                color: white;
+                padding: 10px;
+                font-weight: bold;
+                border-radius: 5px;
+            """)
+        else:
+            label_statut = QtGui.QLabel("❌ Aucune fonction chargée - Vérifiez le chemin")
+            label_statut.setStyleSheet("""
+                background-color: #e74c3c;
+                color: white;
+                padding: 10px;
+                font-weight: bold;
+                border-radius: 5px;
+            """)
+        
+        layout.addWidget(label_statut)
+
+        # Bouton pour choisir le script
+        btn_choose = QtGui.QPushButton("📂 Choisir un script .py")
+        btn_choose.clicked.connect(self.choisir_script)
+        layout.addWidget(btn_choose)
+        
+        # ============================================
+        # 2. PARAMÈTRES SIMPLES
+        # ============================================
+        group_params = QtGui.QGroupBox("📏 Paramètres Rapides")
+        layout_params = QtGui.QGridLayout()
+        
+        # Quelques paramètres essentiels
+        params = [
+            ('Rayon pétales (mm):', 2200, 'rayon'),
+            ('Espacement (mm):', 1000, 'espace'),
+            ('Hauteur (mm):', 2200, 'haut'),
+            ('Hauteur Dôme (mm):', 3500, 'hauteur_dome'),
+            ('Mistral:', '100 km/h', 'mistral')
+        ]
+        
+        self.controles = {}
+        
+        for i, (label, valeur, nom) in enumerate(params):
+            lbl = QtGui.QLabel(label)
+            layout_params.addWidget(lbl, i, 0)
+            
+            if nom == 'mistral':
+                combo = QtGui.QComboBox()
+                combo.addItems(['100 km/h', '130 km/h'])
+                self.controles[nom] = combo
+                layout_params.addWidget(combo, i, 1)
+            else:
+                spin = QtGui.QSpinBox()
+                # Set a larger default range and allow the dome height control
+                if nom == 'hauteur_dome':
+                    spin.setRange(500, 10000)
+                    spin.setValue(valeur)
+                else:
+                    spin.setRange(500, 5000)
+                    spin.setValue(valeur)
+                self.controles[nom] = spin
+                layout_params.addWidget(spin, i, 1)
+        
+        # Aperçu en direct : chaque modification relance le minuteur (anti-rebond)
+        self.chk_apercu = QtGui.QCheckBox("👁️ Aperçu en direct (détail réduit, sans plots)")
+        layout_params.addWidget(self.chk_apercu, len(params), 0, 1, 2)
+        self._timer_apercu = QtCore.QTimer(self)
+        self._timer_apercu.setSingleShot(True)
+        self._timer_apercu.setInterval(DELAI_APERCU_MS)
+        self._timer_apercu.timeout.connect(self._lancer_apercu)
+        self.chk_apercu.toggled.connect(self._planifier_apercu)
+        for nom in ('rayon', 'espace', 'haut', 'hauteur_dome'):
+            self.controles[nom].valueChanged.connect(self._planifier_apercu)
+
+        group_params.setLayout(layout_params)
+        layout.addWidget(group_params)
+        
+        # ============================================
+        # 3. BOUTONS DE GÉNÉRATION
+        # ============================================
+        group_actions = QtGui.QGroupBox("🚀 Génération")
+        layout_actions = QtGui.QVBoxLayout()
+        
+        # Bouton 1: Chercher et exécuter n'importe quelle fonction
+        self.btn_magique = QtGui.QPushButton("✨ GÉNÉRER AUTOMATIQUEMENT (Recommandé)")
+        self.btn_magique.setStyleSheet("""
+            QPushButton {
+                background-color: #9b59b6;
+                color: white;
+                font-size: 14px;
+                font-weight: bold;
+                padding: 12px;
+                border-radius: 6px;
+            }
+            QPushButton:hover {
+                background-color: #8e44ad;
+            }
+        """)
+        self.btn_magique.clicked.connect(self.generer_magique)
+        layout_actions.addWidget(self.btn_magique)
+        
+        # Boutons spécifiques
+        frame_boutons = QtGui.QFrame()
+        layout_boutons_spec = QtGui.QHBoxLayout()
+        
+        self.btn_standard = QtGui.QPushButton("🏗️ Standard")
+        self.btn_standard.clicked.connect(self.generer_standard)
+        self.btn_standard.setEnabled(bool(self.fonctions_chargees))
+        layout_boutons_spec.addWidget(self.btn_standard)
+        
+        self.btn_plots = QtGui.QPushButton("🏗️ Avec Plots")
+        self.btn_plots.clicked.connect(self.generer_plots)
+        self.btn_plots.setEnabled(bool(self.fonctions_chargees))
+        layout_boutons_spec.addWidget(self.btn_plots)
+        
+        frame_boutons.setLayout(layout_boutons_spec)
+        layout_actions.addWidget(frame_boutons)
+        
+        # Bouton tester
+        self.btn_tester = QtGui.QPushButton("🔍 Montrer les fonctions")
+        self.btn_tester.clicked.connect(self.montrer_fonctions)
+        layout_actions.addWidget(self.btn_tester)
+        
+        group_actions.setLayout(layout_actions)
+        layout.addWidget(group_actions)
+        
+        # ============================================
+        # 4. MESSAGE
+        # ============================================
+        self.label_message = QtGui.QLabel("Cliquez sur 'GÉNÉRER AUTOMATIQUEMENT' pour commencer")
+        self.label_message.setStyleSheet("""
+            background-color: #f1c40f;
+            padding: 10px;
+            border-radius: 5px;
+            font-weight: bold;
+        """)
+        layout.addWidget(self.label_message)
+        
+        # Zone de logs
+        self.log_area = QtGui.QTextEdit()
+        self.log_area.setReadOnly(True)
+        self.log_area.setFixedHeight(100)
+        self.log_area.document().setMaximumBlockCount(LIGNES_LOG_MAX)
+        layout.addWidget(self.log_area)
+        self._curseur_log = 0
+        self._timer_log = QtCore.QTimer(self)
+        self._timer_log.setInterval(INTERVALLE_LOG_MS)
+        self._timer_log.timeout.connect(self._vider_log)
+        self._timer_log.start()
+
+        # Annulation de la génération en cours (exécutée en arrière-plan)
+        self.btn_annuler = QtGui.QPushButton("⏹️ Annuler la génération")
+        self.btn_annuler.setEnabled(False)
+        self.btn_annuler.clicked.connect(self.annuler_generation)
+        layout.addWidget(self.btn_annuler)
+
+        # ============================================
+        # 5. PARAMÈTRES STRUCTURELS + ACTIONS
+        # ============================================
+        group_struct = QtGui.QGroupBox("⚙️ Paramètres Structurels & Matériaux")
+        layout_struct = QtGui.QGridLayout()
+
+        # Matériau
+        layout_struct.addWidget(QtGui.QLabel("Matériau principal:"), 0, 0)
+        combo_mat = QtGui.QComboBox()
+        combo_mat.addItems(['Acier galvanisé (permanent)', 'Bambou (temporaire)'])
+        self.controles['material'] = combo_mat
+        layout_struct.addWidget(combo_mat, 0, 1)
+
+        # Vitesse vent (km/h)
+        layout_struct.addWidget(QtGui.QLabel("Vitesse vent (km/h):"), 1, 0)
+        spin_wind = QtGui.QSpinBox()
+        spin_wind.setRange(0, 300)
+        spin_wind.setValue(VENT_DEFAUT)
+        self.controles['wind_speed'] = spin_wind
+        layout_struct.addWidget(spin_wind, 1, 1)
+
+        # Facteur de sécurité
+        layout_struct.addWidget(QtGui.QLabel("Facteur de sécurité:"), 2, 0)
+        spin_sf = QtGui.QDoubleSpinBox()
+        spin_sf.setRange(1.0, 3.0)
+        spin_sf.setSingleStep(0.1)
+        spin_sf.setValue(FS_DEFAUT)
+        self.controles['safety_factor'] = spin_sf
+        layout_struct.addWidget(spin_sf, 2, 1)
+
+        group_struct.setLayout(layout_struct)
+        layout.addWidget(group_struct)
+
+        # ============================================
+        # 6. BOUTONS SUPPLÉMENTAIRES
+        # ============================================
+        frame_actions2 = QtGui.QFrame()
+        layout_actions2 = QtGui.QHBoxLayout()
+
+        self.btn_generate_params = QtGui.QPushButton("🔧 Générer avec paramètres")
+        self.btn_generate_params.setStyleSheet("background-color: #2980b9; color: white; padding:8px;")
+        self.btn_generate_params.clicked.connect(self.generer_avec_parametres)
+        layout_actions2.addWidget(self.btn_generate_params)
+
+        self.btn_advice = QtGui.QPushButton("💡 Conseil dimensionnement")
+        self.btn_advice.clicked.connect(self.montrer_conseil)
+        layout_actions2.addWidget(self.btn_advice)
+
+        self.btn_fiabilite = QtGui.QPushButton("🎲 Fiabilité ancrage")
+        self.btn_fiabilite.clicked.connect(self.montrer_fiabilite)
+        layout_actions2.addWidget(self.btn_fiabilite)
+
+        self.btn_metre = QtGui.QPushButton("📐 Métré (sans CAO)")
+        self.btn_metre.clicked.connect(self.montrer_metre)
+        layout_actions2.addWidget(self.btn_metre)
+
+        self.btn_optimiser = QtGui.QPushButton("🎯 Optimiser")
+        self.btn_optimiser.clicked.connect(self.montrer_optimisation)
+        layout_actions2.addWidget(self.btn_optimiser)
+
+        self.btn_comparer = QtGui.QPushButton("⚖️ Comparer")
+        self.btn_comparer.clicked.connect(lambda: self.montrer_comparaison())
+        layout_actions2.addWidget(self.btn_comparer)
+
+        self.btn_historique = QtGui.QPushButton("🕘 Historique")
+        self.btn_historique.clicked.connect(self.montrer_historique)
+        layout_actions2.addWidget(self.btn_historique)
+
+        frame_actions2.setLayout(layout_actions2)
+        layout.addWidget(frame_actions2)
+
+        # Ne reconstruire que les sous-assemblages touchés par les paramètres modifiés
+        self.chk_incremental = QtGui.QCheckBox("♻️ Régénération incrémentale (garde le document précédent)")
+        self.chk_incremental.setChecked(True)
+        layout.addWidget(self.chk_incremental)
+
+        # Un pétale/plot maître, les autres en App::Link tournés (symétrie du trèfle)
+        self.chk_instances = QtGui.QCheckBox("🔗 Pétales et plots symétriques en App::Link")
+        self.chk_instances.setChecked(True)
+        layout.addWidget(self.chk_instances)
+
+        # Job soumis à `kiosque_service` : workers FreeCAD déjà démarrés, script déjà chargé
+        self.chk_service = QtGui.QCheckBox("🔥 Générer via le service (workers préchauffés)")
+        layout.addWidget(self.chk_service)
+
+        # Script exécuté dans un processus forké (délai, mémoire bornés) : un plantage épargne FreeCAD
+        self.chk_bac_a_sable = QtGui.QCheckBox("🧪 Exécuter le script dans un bac à sable (processus isolé)")
+        layout.addWidget(self.chk_bac_a_sable)
+
+        # Pétales, plots et dôme construits en même temps dans des processus, fusionnés ici en BREP
+        self.chk_parallele = QtGui.QCheckBox("⚡ Construire les sous-assemblages en parallèle (processus)")
+        layout.addWidget(self.chk_parallele)
+
+        # Après chaque génération : STEP (fabricant), STL et glTF (visionneuse web), pièces maillées en parallèle
+        layout_export = QtGui.QHBoxLayout()
+        self.chk_export = QtGui.QCheckBox("📦 Exporter STEP/STL/glTF en arrière-plan")
+        layout_export.addWidget(self.chk_export)
+        layout_export.addWidget(QtGui.QLabel("Déviation (mm):"))
+        self.spin_deviation = QtGui.QDoubleSpinBox()
+        self.spin_deviation.setRange(0.05, 20.0)
+        self.spin_deviation.setSingleStep(0.25)
+        self.spin_deviation.setValue(DEVIATION_DEFAUT_MM)
+        layout_export.addWidget(self.spin_deviation)
+        layout.addLayout(layout_export)
+
+        # Rechargement à chaud : le script est relu dès qu'il est enregistré avec un nouveau contenu
+        self.chk_rechargement = QtGui.QCheckBox("🔄 Recharger le script à chaque enregistrement")
+        layout.addWidget(self.chk_rechargement)
+        self._timer_surveillance = QtCore.QTimer(self)
+        self._timer_surveillance.setInterval(INTERVALLE_SURVEILLANCE_MS)
+        self._timer_surveillance.timeout.connect(self._surveiller_script)
+        self.chk_rechargement.toggled.connect(self._basculer_rechargement)
+        self.chk_rechargement.setChecked(True)
+
+        # Au-delà, les documents générés les moins récents sont fermés
+        layout_documents = QtGui.QHBoxLayout()
+        layout_documents.addWidget(QtGui.QLabel("🗂️ Documents générés gardés ouverts:"))
+        self.spin_documents = QtGui.QSpinBox()
+        self.spin_documents.setRange(1, 20)
+        self.spin_documents.setValue(self.documents.max_documents)
+        self.spin_documents.valueChanged.connect(self._changer_max_documents)
+        layout_documents.addWidget(self.spin_documents)
+        layout.addLayout(layout_documents)
+
+        # ============================================
+        # 7. PROFILAGE
+        # ============================================
+        group_profil = QtGui.QGroupBox("⏱️ Profilage")
+        layout_profil = QtGui.QVBoxLayout()
+        self.texte_profil = QtGui.QTextEdit()
+        self.texte_profil.setReadOnly(True)
+        self.texte_profil.setFixedHeight(120)
+        self.texte_profil.setStyleSheet("font-family: monospace;")
+        layout_profil.addWidget(self.texte_profil)
+
+        layout_options = QtGui.QHBoxLayout()
+        self.chk_memoire = QtGui.QCheckBox("Pic mémoire (tracemalloc, plus lent)")
+        self.chk_memoire.toggled.connect(PROFILEUR.suivre_memoire)
+        layout_options.addWidget(self.chk_memoire)
+        self.chk_cprofile = QtGui.QCheckBox("cProfile de la prochaine génération")
+        layout_options.addWidget(self.chk_cprofile)
+        layout_profil.addLayout(layout_options)
+
+        layout_export = QtGui.QHBoxLayout()
+        btn_trace = QtGui.QPushButton("📤 Exporter trace (Chrome/Perfetto)")
+        btn_trace.clicked.connect(self.exporter_trace)
+        layout_export.addWidget(btn_trace)
+        btn_reinit = QtGui.QPushButton("🧹 Réinitialiser")
+        btn_reinit.clicked.connect(self._reinitialiser_profil)
+        layout_export.addWidget(btn_reinit)
+        layout_profil.addLayout(layout_export)
+
+        group_profil.setLayout(layout_profil)
+        layout.addWidget(group_profil)
+        self._rafraichir_profil()
+
+        # Bouton fermer
+        btn_fermer = QtGui.QPushButton("❌ Fermer")
+        btn_fermer.clicked.connect(self.close)
+        layout.addWidget(btn_fermer)
+
+        # Placer le content dans le scroll area
+        scroll.setWidget(content)
+        main_layout.addWidget(scroll)
+        self.setLayout(main_layout)
+    
+    def montrer_fonctions(self):
+        """Montre toutes les fonctions disponibles"""
+        # Utiliser la map de fonctions du module si présente
+        if hasattr(self, 'functions_map') and self.functions_map:
+            toutes_fonctions = sorted(self.functions_map.keys())
+        else:
+            toutes_fonctions = []
+        index = getattr(self, 'index_script', None) or {}
+        msg = f"Fonctions disponibles ({len(toutes_fonctions)}):\n\n"
+        msg += "\n".join(
+            f"{nom}({', '.join(index.get('fonctions', {}).get(nom, {}).get('params', []))})"
+            for nom in toutes_fonctions[:100])
+        # Méthodes de la classe, avec les clés de config lues (index statique)
+        classe = index.get('classe')
+        if classe:
+            msg += f"\n\n{classe['nom']} ({len(classe['methodes'])} méthodes):\n\n"
+            for nom, info in sorted(classe['methodes'].items()):
+                if nom.startswith('_'):
+                    continue
+                ligne = f"{nom}({', '.join(info['params'])})"
+                if info['config']:
+                    ligne += f"  — config: {', '.join(info['config'])}"
+                msg += ligne + "\n"
+        QtGui.QMessageBox.information(self, "Toutes les fonctions", msg)
+    
+    # ------------------------------------------------------------------
+    # Génération en arrière-plan
+    # ------------------------------------------------------------------
+    def _lancer_generation(self, titre, tache):
+        """Lance `tache(rappel, annulation)` dans un QThread dédié.
+
+        La progression est affichée dans `log_area`/`label_message` ; le résultat
+        (dict avec au moins 'message', éventuellement 'doc') revient dans le thread Qt.
+        """
+        if getattr(self, '_thread_generation', None) is not None:
+            QtGui.QMessageBox.warning(self, "Génération en cours",
+                "Une génération est déjà en cours. Annulez-la ou attendez la fin.")
+            return False
+        # FreeCAD n'est pas thread-safe : pas d'aperçu concurrent de la génération finale
+        self._arreter_apercu()
+
+        self.label_message.setText(f"🔄 {titre}...")
+        self._append_log(f"▶️ {titre}")
+
+        chemin_prof = None
+        if self.chk_cprofile.isChecked():
+            self.chk_cprofile.setChecked(False)  # une seule génération capturée
+            chemin_prof = os.path.join(REPERTOIRE_DONNEES, 'profils',
+                                       f"generation_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+
+        def tache_mesuree(rappel, annulation):
+            with PROFILEUR.span(titre, 'generation'):
+                if chemin_prof is None:
+                    return tache(rappel, annulation)
+                with PROFILEUR.cprofile(chemin_prof):
+                    resultat = tache(rappel, annulation)
+                rappel(f"⏱️ cProfile enregistré: {chemin_prof}")
+                return resultat
+
+        thread = QtCore.QThread(self)
+        worker = GenerationWorker(tache_mesuree)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progression.connect(self._generation_progression)
+        worker.termine.connect(self._generation_terminee)
+        worker.echec.connect(self._generation_echouee)
+        worker.annule.connect(self._generation_annulee)
+        for signal in (worker.termine, worker.echec, worker.annule):
+            signal.connect(thread.quit)
+        thread.finished.connect(self._generation_nettoyer)
+
+        self._thread_generation = thread
+        self._worker_generation = worker
+        self._activer_boutons_generation(False)
+        self._suspendre_vue(True)
+        thread.start()
+        return True
+
+    def annuler_generation(self):
+        """Demande l'arrêt coopératif de la génération en cours."""
+        worker = getattr(self, '_worker_generation', None)
+        if worker is not None:
+            worker.annuler()
+            self.btn_annuler.setEnabled(False)
+            self.label_message.setText("⏹️ Annulation demandée (à la prochaine étape)...")
+            self._append_log("⏹️ Annulation demandée")
+
+    def closeEvent(self, event):
+        """Arrête proprement le worker avant de fermer le dialogue."""
+        thread = getattr(self, '_thread_generation', None)
+        if thread is not None:
+            self.annuler_generation()
+            thread.quit()
+            thread.wait(5000)
+        self._arreter_apercu()
+        self._arreter_bac_a_sable(attendre=True)
+        self._arreter_parallele(attendre=True)
+        self._arreter_export()
+        for nom in ('_timer_log', '_timer_surveillance'):
+            if hasattr(self, nom):
+                getattr(self, nom).stop()
+        JOURNAL.vider()
+        super(InterfaceUltraSimple, self).closeEvent(event)
+
+    def _arreter_bac_a_sable(self, attendre=False):
+        bac_a_sable, self._bac_a_sable = getattr(self, '_bac_a_sable', None), None
+        if bac_a_sable is not None:
+            self._arreter_en_arriere_plan(bac_a_sable, 'bac à sable', attendre)
+
+    def _arreter_parallele(self, attendre=False):
+        parallele, self._parallele = getattr(self, '_parallele', None), None
+        if parallele is not None:
+            self._arreter_en_arriere_plan(parallele, 'workers parallèles', attendre)
+
+    @staticmethod
+    def _arreter_en_arriere_plan(serveur, libelle, attendre):
+        """`serveur.arreter()` hors du thread Qt, sauf si `attendre` (fermeture du dialogue).
+
+        L'arrêt attend le verrou du serveur (job ou préchauffage en cours) puis la fin de
+        ses processus ; l'objet est déjà détaché du dialogue, son remplaçant démarre à côté.
+        """
+        def arreter():
+            try:
+                serveur.arreter()
+            except Exception as e:
+                JOURNAL.avertissement(f"⚠️  Arrêt {libelle} incomplet: {e}")
+
+        if attendre:
+            arreter()
+        else:
+            threading.Thread(target=arreter, name='kiosque-arret', daemon=True).start()
+
+    def _arreter_export(self):
+        """Annule l'export en cours (fichiers partiels supprimés) et arrête le pool de maillage."""
+        if self._annulation_export is not None:
+            self._annulation_export.set()
+        if self._thread_export is not None:
+            self._thread_export.join(10)
+        pool, self._pool_export = self._pool_export, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _activer_boutons_generation(self, actif):
+        for nom in ('btn_magique', 'btn_generate_params'):
+            if hasattr(self, nom):
+                getattr(self, nom).setEnabled(actif)
+        for nom in ('btn_standard', 'btn_plots'):
+            if hasattr(self, nom):
+                getattr(self, nom).setEnabled(actif and bool(self.fonctions_chargees))
+        if hasattr(self, 'btn_annuler'):
+            self.btn_annuler.setEnabled(not actif)
+
+    def _suspendre_vue(self, suspendre):
+        """Gèle les rafraîchissements de la fenêtre principale pendant une génération."""
+        fenetre = Gui.getMainWindow() if hasattr(Gui, 'getMainWindow') else None
+        if fenetre is not None:
+            fenetre.setUpdatesEnabled(not suspendre)
+
+    def _evincer_documents(self):
+        """Ferme les documents générés au-delà de la limite (jamais l'actif ni l'aperçu)."""
+        actif = getattr(App.ActiveDocument, 'Name', None)
+        for nom in self.documents.evincer(proteges={actif, self._doc_apercu}):
+            self._append_log(f"🗂️ Document fermé (le moins récent): {nom}")
+
+    def _changer_max_documents(self, valeur):
+        self.documents.max_documents = int(valeur)
+        self._evincer_documents()
+
+    def _generation_progression(self, message):
+        self.label_message.setText(message)
+        self._append_log(message)
+
+    def _generation_terminee(self, resultat):
+        self._suspendre_vue(False)  # avant l'unique fitAll
+        resultat = resultat or {}
+        doc_name = resultat.get('doc')
+        if doc_name and doc_name in App.listDocuments():
+            self.documents.conserver(doc_name)
+            self._evincer_documents()
+            App.setActiveDocument(doc_name)
+            if hasattr(Gui, 'setActiveDocument'):
+                Gui.setActiveDocument(doc_name)
+        # Zoom (uniquement dans le thread Qt)
+        if hasattr(Gui, 'ActiveDocument') and Gui.ActiveDocument:
+            with PROFILEUR.span('viewIsometric + fitAll', 'gui'):
+                Gui.ActiveDocument.ActiveView.viewIsometric()
+                Gui.ActiveDocument.ActiveView.fitAll()
+
+        message = resultat.get('message', "✅ Génération terminée")
+        self.label_message.setText(message)
+        self._append_log(message)
+        if doc_name and doc_name in App.listDocuments() and self.chk_export.isChecked():
+            self._exporter_en_arriere_plan(doc_name)
+        if resultat.get('popup'):
+            QtGui.QMessageBox.information(self, "Succès !", resultat['popup'])
+        if resultat.get('comparaison'):
+            self._montrer_tableau_comparaison(resultat['comparaison'])
+        if resultat.get('fiabilite'):
+            self._montrer_tableau_fiabilite(resultat['fiabilite'])
+
+    def _exporter_en_arriere_plan(self, doc_name):
+        """Exporte `doc_name` dans REPERTOIRE_DONNEES/exports sans bloquer l'interface.
+
+        Les formes sont lues (BREP) dans le thread Qt ; STEP et maillages sont produits
+        par le pool de processus, écrits au fil de l'eau par un thread d'export.
+        """
+        from kiosque_export import creer_pool, exporter, formes_brep
+
+        if self._thread_export is not None and self._thread_export.is_alive():
+            JOURNAL.avertissement("⚠️  Export précédent encore en cours : celui-ci est ignoré")
+            return
+        try:
+            with PROFILEUR.span('lecture des formes', 'export'):
+                formes = formes_brep(App.getDocument(doc_name))
+            if self._pool_export is None:
+                self._pool_export = creer_pool()
+        except Exception as e:
+            JOURNAL.erreur(f"❌ Export impossible: {e}")
+            return
+        base = os.path.join(REPERTOIRE_DONNEES, 'exports', f"{doc_name}_{time.strftime('%Y%m%d-%H%M%S')}")
+        deviation = self.spin_deviation.value()
+        pool, annulation = self._pool_export, threading.Event()
+        self._annulation_export = annulation
+
+        def executer():
+            try:
+                exporter(formes, base, deviation=deviation, pool=pool, annulation=annulation,
+                         rappel=lambda texte: JOURNAL.debug(texte, source='export'))
+            except Exception as e:
+                JOURNAL.exception(f"❌ Export échoué: {e}")
+
+        self._append_log(f"📦 Export de {len(formes)} pièce(s) en arrière-plan (déviation {deviation} mm)")
+        self._thread_export = threading.Thread(target=executer, name='kiosque-export', daemon=True)
+        self._thread_export.start()
+
+    def _generation_echouee(self, erreur):
+        self.label_message.setText(f"❌ Erreur: {erreur}")
+        self._append_log(f"❌ {erreur}")
+        QtGui.QMessageBox.critical(self, "Erreur génération", erreur)
+
+    def _generation_annulee(self):
+        self.label_message.setText("⏹️ Génération annulée")
+        self._append_log("⏹️ Génération annulée")
+
+    def _generation_nettoyer(self):
+        self._thread_generation = None
+        self._worker_generation = None
+        self._activer_boutons_generation(True)
+        self._suspendre_vue(False)
+        self._append_log(self.documents.rapport())
+        self._vider_log()
+        self._rafraichir_profil()
+
+    # ------------------------------------------------------------------
+    # Profilage
+    # ------------------------------------------------------------------
+    def _rafraichir_profil(self):
+        if hasattr(self, 'texte_profil'):
+            self.texte_profil.setPlainText(formater_resume(PROFILEUR.resume()))
+
+    def _reinitialiser_profil(self):
+        PROFILEUR.reinitialiser()
+        self._rafraichir_profil()
+
+    def exporter_trace(self):
+        """Exporte les spans au format Trace Event (chrome://tracing, ui.perfetto.dev)."""
+        fichier, _ = QtGui.QFileDialog.getSaveFileName(
+            self, "Exporter la trace", os.path.join(os.path.expanduser("~"), "kiosque_trace.json"),
+            "Trace JSON (*.json)")
+        if fichier:
+            PROFILEUR.exporter_chrome(fichier)
+            self._append_log(f"⏱️ Trace exportée: {fichier}")
+
+    # ------------------------------------------------------------------
+    # Aperçu en direct (détail réduit, anti-rebond)
+    # ------------------------------------------------------------------
+    def _planifier_apercu(self, *_):
+        """Relance le minuteur d'anti-rebond ; un aperçu en cours devient périmé."""
+        if not self.chk_apercu.isChecked():
+            self._timer_apercu.stop()
+            return
+        worker = getattr(self, '_worker_apercu', None)
+        if worker is not None:
+            worker.annuler()  # arrêt à la prochaine étape, relancé à la fin (`_apercu_nettoyer`)
+            self._apercu_en_attente = True
+        self._timer_apercu.start()
+
+    def _lancer_apercu(self):
+        """Construit l'aperçu dans un QThread dédié (au plus un à la fois)."""
+        if not self.chk_apercu.isChecked() or not self._classe_disponible():
+            return
+        if getattr(self, '_thread_generation', None) is not None:
+            return  # la génération finale est prioritaire
+        if getattr(self, '_thread_apercu', None) is not None:
+            self._apercu_en_attente = True
+            return
+        self._apercu_en_attente = False
+        parametres = self._lire_parametres()
+
+        def tache(rappel, annulation):
+            module = self.module_loaded
+            if module is None:
+                raise RuntimeError("Le module du script n'a pas pu être chargé")
+            session = self._session_apercu
+            if session is None or session.module is not module:
+                # Aperçu toujours instancié : un seul pétale modélisé
+                session = SessionIncrementale(module, self.index_script, apercu=True, instances=True)
+                self._session_apercu = session
+            debut = time.perf_counter()
+            with PROFILEUR.span('aperçu', 'generation'):
+                doc = session.construire(parametres, None, annulation)
+            return {'doc': getattr(doc, 'Name', None), 'duree': time.perf_counter() - debut}
+
+        thread = QtCore.QThread(self)
+        worker = GenerationWorker(tache)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.termine.connect(self._apercu_termine)
+        worker.echec.connect(self._apercu_echoue)
+        for signal in (worker.termine, worker.echec, worker.annule):
+            signal.connect(thread.quit)
+        thread.finished.connect(self._apercu_nettoyer)
+
+        self._thread_apercu = thread
+        self._worker_apercu = worker
+        thread.start()
+
+    def _arreter_apercu(self):
+        """Annule l'aperçu en cours et attend la fin de son thread."""
+        self._timer_apercu.stop()
+        self._apercu_en_attente = False
+        thread = getattr(self, '_thread_apercu', None)
+        if thread is not None:
+            self._worker_apercu.annuler()
+            thread.quit()
+            thread.wait(5000)
+
+    def _apercu_termine(self, resultat):
+        doc_name = resultat.get('doc')
+        if not doc_name or doc_name not in App.listDocuments():
+            return
+        nouveau = doc_name != self._doc_apercu
+        if nouveau and self._doc_apercu:
+            self._fermer_document(self._doc_apercu)
+        self._doc_apercu = doc_name
+        doc = App.getDocument(doc_name)
+        doc.Label = "Apercu_Kiosque"
+        # Tessellation grossière : l'affichage suit plus vite pendant les réglages
+        for obj in doc.Objects:
+            vue = getattr(obj, 'ViewObject', None)
+            if vue is not None and hasattr(vue, 'Deviation'):
+                vue.Deviation = DEVIATION_APERCU
+                vue.AngularDeflection = ANGLE_APERCU
+        App.setActiveDocument(doc_name)
+        if hasattr(Gui, 'setActiveDocument'):
+            Gui.setActiveDocument(doc_name)
+        if nouveau and hasattr(Gui, 'ActiveDocument') and Gui.ActiveDocument:
+            Gui.ActiveDocument.ActiveView.viewIsometric()
+            Gui.ActiveDocument.ActiveView.fitAll()
+        self.label_message.setText(f"👁️ Aperçu mis à jour en {resultat['duree'] * 1000:.0f} ms")
+
+    def _apercu_echoue(self, erreur):
+        self._append_log(f"👁️ Aperçu impossible: {erreur}")
+
+    def _apercu_nettoyer(self):
+        self._thread_apercu = None
+        self._worker_apercu = None
+        self._rafraichir_profil()
+        if self._apercu_en_attente:
+            self._timer_apercu.start()
+
+    def _fermer_document(self, doc_name):
+        try:
+            if doc_name in App.listDocuments():
+                App.closeDocument(doc_name)
+        except Exception as e:
+            JOURNAL.avertissement(f"⚠️  Impossible de fermer {doc_name}: {e}")
+
+    def generer_magique(self):
+        """Essaie TOUTES les fonctions jusqu'à ce qu'une marche"""
+        # Chercher toutes les fonctions qui pourraient créer un kiosque
+        fonctions_a_tester = []
+        if hasattr(self, 'functions_map') and self.functions_map:
+            for nom in self.functions_map.keys():
+                if any(mot in nom.lower() for mot in ['kiosque', 'creer', 'generer']):
+                    fonctions_a_tester.append(nom)
+
+        fonctions_a_tester = self._ordonner_candidats(fonctions_a_tester)
+        JOURNAL.info(f"🔧 {len(fonctions_a_tester)} fonctions à tester")
+
+        if not fonctions_a_tester:
+            QtGui.QMessageBox.warning(self, "Aucune fonction",
+                "Je n'ai trouvé aucune fonction à tester.")
+            return
+
+        hauteur = self._hauteur_dome_ui()
+
+        def tache(rappel, annulation):
+            # Tester chaque fonction
+            for nom_fonction in fonctions_a_tester:
+                verifier_annulation(annulation)
+
+                def essai(rappel, annulation, config, nom_fonction=nom_fonction):
+                    # Brouillon réutilisé ; en cas d'échec, les documents de l'essai sont fermés
+                    with self.documents.essai(f"Test_{nom_fonction}"):
+                        # Appel de la fonction en tenant compte de la hauteur du dôme
+                        func = self.functions_map.get(nom_fonction)
+                        if func is None:
+                            raise RuntimeError("Fonction introuvable dans le module chargé")
+                        self._call_with_dome_height(func, nom_fonction, hauteur=hauteur,
+                                                    rappel=rappel, annulation=annulation)
+                        verifier_annulation(annulation)
+                    return App.ActiveDocument
+
+                try:
+                    rappel(f"🧪 Test de: {nom_fonction}")
+                    debut = time.perf_counter()
+                    self._historiser({'hauteur_dome': hauteur}, nom_fonction, essai, rappel, annulation)
+                    self.aiguillage.succes(nom_fonction, time.perf_counter() - debut)
+                    JOURNAL.info(f"✅ SUCCÈS avec: {nom_fonction}", fonction=nom_fonction)
+                    return {
+                        # Le script a pu ouvrir son propre document : c'est lui qui est actif
+                        'doc': getattr(App.ActiveDocument, 'Name', None),
+                        'message': f"✅ Réussi avec: {nom_fonction}",
+                        'popup': (f"Kiosque généré avec la fonction:\n'{nom_fonction}'\n\n"
+                                  f"Regardez dans la vue 3D !"),
+                    }
+                except GenerationAnnulee:
+                    raise
+                except Exception as e:
+                    rappel(f"   ❌ {nom_fonction} a échoué: {e}")
+                    self.aiguillage.echec(nom_fonction, e)
+                    continue
+
+            # Si aucune fonction n'a marché
+            raise RuntimeError("J'ai testé toutes les fonctions mais aucune n'a réussi.\n"
+                               "Votre script a peut-être une erreur.")
+
+        self._lancer_generation("Recherche d'une fonction qui marche", tache)
+    
+    def _ordonner_candidats(self, noms):
+        """Candidats sans argument obligatoire, cibles connues comme bonnes d'abord (`aiguillage`)."""
+        noms, exigent_arguments = appelables_sans_argument(getattr(self, 'index_script', None), noms)
+        for nom in exigent_arguments:
+            JOURNAL.info(f"   ⏭️ {nom} ignorée (arguments obligatoires)", fonction=nom)
+        aiguillage = getattr(self, 'aiguillage', None)
+        if aiguillage is None:
+            return noms
+        noms, echecs_connus = aiguillage.ordonner(noms)
+        for nom in echecs_connus:
+            JOURNAL.info(f"   ⏭️ {nom} ignorée (échec mémorisé: {aiguillage.cibles[nom]['erreur']})", fonction=nom)
+        if noms and aiguillage.connue_bonne(noms[0]):
+            JOURNAL.info(f"🧭 Cible connue: {noms[0]} ({aiguillage.cibles[noms[0]]['duree_s']:.2f} s)")
+        return noms
+
+    def generer_standard(self):
+        """Essaie les fonctions standard"""
+        self.essayer_fonctions(['creer_kiosque_fonctionnel', 'creer_kiosque', 'generer_kiosque'])
+    
+    def generer_plots(self):
+        """Essaie les fonctions avec plots"""
+        self.essayer_fonctions(['creer_kiosque_avec_plots', 'creer_kiosque_complet', 'generer_kiosque_complet'])
+
+    def _historiser(self, parametres, cible, construire, rappel, annulation):
+        """Exécute `construire(rappel, annulation, config)` et l'enregistre dans l'historique.
+
+        `config` est un dict à compléter avec la configuration effective. Les échecs sont
+        enregistrés puis propagés ; une annulation n'est pas enregistrée.
+        """
+        debut = time.perf_counter()
+        config = {}
+        try:
+            doc = construire(rappel, annulation, config)
+        except GenerationAnnulee:
+            raise
+        except Exception as e:
+            self._enregistrer_historique(parametres, config, cible, debut, None, e)
+            raise
+        self._enregistrer_historique(parametres, config, cible, debut, doc)
+        return doc
+
+    def _enregistrer_historique(self, parametres, config, cible, debut, doc, erreur=None):
+        if self.historique is None:
+            return
+        duree = time.perf_counter() - debut
+        try:
+            geometrie = resume_geometrie(doc) if doc is not None else None
+            self.historique.enregistrer(
+                parametres, config or parametres, getattr(self, 'hash_script', None), cible, duree,
+                phases=PROFILEUR.resume(depuis=debut), fichier=getattr(doc, 'FileName', None) or None,
+                geometrie=geometrie, statut='ok' if erreur is None else 'erreur', erreur=erreur)
+        except Exception as e:
+            JOURNAL.avertissement(f"⚠️  Historique non enregistré: {e}")
+
+    def _appliquer_parametres_ui(self, parametres):
+        """Replace les valeurs de `parametres` (clés `config`) dans les contrôles (thread Qt)."""
+        for nom, cle in CORRESPONDANCE_CONTROLES.items():
+            controle = self.controles.get(nom)
+            valeur = parametres.get(cle)
+            if controle is None or valeur is None:
+                continue
+            if nom == 'material':
+                index = controle.findText(str(valeur))
+                if index >= 0:
+                    controle.setCurrentIndex(index)
+            elif nom == 'safety_factor':
+                controle.setValue(float(valeur))
+            else:
+                controle.setValue(int(valeur))
+
+    def _lire_parametres(self):
+        """Lit les contrôles de l'UI et retourne un dict de clés `config` (thread Qt)."""
+        parametres = {}
+        for nom, cle in CORRESPONDANCE_CONTROLES.items():
+            controle = self.controles.get(nom)
+            if controle is None:
+                parametres[cle] = None
+            elif nom == 'material':
+                parametres[cle] = controle.currentText()
+            elif nom == 'safety_factor':
+                parametres[cle] = float(controle.value())
+            else:
+                parametres[cle] = int(controle.value())
+        return parametres
+
+    def _hauteur_dome_ui(self):
+        """Lit la hauteur du dôme dans l'UI (à appeler depuis le thread Qt)."""
+        if 'hauteur_dome' in getattr(self, 'controles', {}):
+            try:
+                return int(self.controles['hauteur_dome'].value())
+            except Exception:
+                return None
+        return None
+
+    @PROFILEUR.mesurer('_call_with_dome_height', 'interface')
+    def _call_with_dome_height(self, func, nom_fonction, hauteur=None, rappel=None, annulation=None):
+        """Appelle `func` en appliquant la valeur de `hauteur_dome` via la classe si possible.
+
+        Logique : si le module chargé contient `KiosqueTrefleFonctionnel`, on crée une instance,
+        on fixe `config['hauteur_dome']` avec la valeur UI, puis on appelle la méthode la plus
+        appropriée (généralement `generer_kiosque_complet_avec_plots` pour les variantes avec plots,
+        ou `assembler_4_petales` / `generer_*` sinon). Sinon on appelle la fonction directe.
+
+        `hauteur` doit être lue dans le thread Qt par l'appelant (`_hauteur_dome_ui`) ;
+        `rappel`/`annulation` permettent le suivi des étapes depuis un worker. L'appel se fait
+        en construction groupée : un seul recompute du document à la fin. L'échec de l'appel
+        direct est propagé.
+        """
+        with construction_groupee(rappel, self.module_loaded):
+            try:
+                # Si la classe est disponible dans le module chargé, privilégier son usage
+                module = self.module_loaded if self._classe_disponible() else None
+                if module is not None and hasattr(module, 'KiosqueTrefleFonctionnel'):
+                    Kclass = getattr(module, 'KiosqueTrefleFonctionnel')
+                    try:
+                        with PROFILEUR.span('KiosqueTrefleFonctionnel()', 'script'):
+                            instance = Kclass()
+                        if hauteur is not None:
+                            try:
+                                instance.config['hauteur_dome'] = hauteur
+                                _ = instance.config['hauteur_dome']
+                                if rappel is not None:
+                                    rappel(f"Hauteur dôme appliquée: {hauteur} mm")
+                            except Exception:
+                                pass
+                        instrumenter_etapes(instance, rappel, annulation)
+
+                        # Choisir la méthode la plus adaptée
+                        name = nom_fonction.lower() if nom_fonction else ''
+                        if 'plot' in name or 'plots' in name or 'complet' in name:
+                            if hasattr(instance, 'generer_kiosque_complet_avec_plots'):
+                                instance.generer_kiosque_complet_avec_plots()
+                                return
+                        if 'fonctionnel' in name or 'original' in name:
+                            if hasattr(instance, 'assembler_4_petales'):
+                                instance.assembler_4_petales()
+                                return
+
+                        # Fallback: essayer d'appeler une méthode générique si existante
+                        if hasattr(instance, 'generer_kiosque_complet_avec_plots'):
+                            instance.generer_kiosque_complet_avec_plots()
+                            return
+                    except GenerationAnnulee:
+                        raise
+                    except Exception as e:
+                        JOURNAL.avertissement(f"⚠️  Échec appel via classe: {e}")
+                        # si échec, on continue et tente l'appel direct
+
+                # Appel direct si rien d'autre
+                verifier_annulation(annulation)
+                func()
+            except GenerationAnnulee:
+                raise
+            except Exception as e:
+                JOURNAL.avertissement(f"❌ Erreur lors de l'appel de {nom_fonction}: {e}", trace=True,
+                                      fonction=nom_fonction)
+                raise  # l'appelant ferme le document d'essai et passe au candidat suivant
+    
+    def essayer_fonctions(self, noms_fonctions):
+        """Essaie une liste de fonctions"""
+        candidats = []
+        for nom in self._ordonner_candidats(noms_fonctions):
+            func = None
+            if hasattr(self, 'functions_map') and nom in self.functions_map:
+                func = self.functions_map[nom]
+            if func and callable(func):
+                candidats.append((nom, func))
+
+        if not candidats:
+            QtGui.QMessageBox.warning(self, "Fonctions non trouvées",
+                f"Aucune de ces fonctions n'a marché: {', '.join(noms_fonctions)}\n"
+                f"Essayez 'GÉNÉRER AUTOMATIQUEMENT'.")
+            return
+
+        hauteur = self._hauteur_dome_ui()
+
+        def tache(rappel, annulation):
+            for nom, func in candidats:
+                verifier_annulation(annulation)
+                def essai(rappel, annulation, config, nom=nom, func=func):
+                    with self.documents.essai(f"Kiosque_{nom}"):
+                        # Call function while applying dome height if possible
+                        self._call_with_dome_height(func, nom, hauteur=hauteur,
+                                                    rappel=rappel, annulation=annulation)
+                        verifier_annulation(annulation)
+                    return App.ActiveDocument
+
+                try:
+                    rappel(f"🔄 Appel de {nom}...")
+                    debut = time.perf_counter()
+                    self._historiser({'hauteur_dome': hauteur}, nom, essai, rappel, annulation)
+                    self.aiguillage.succes(nom, time.perf_counter() - debut)
+                    return {
+                        'doc': getattr(App.ActiveDocument, 'Name', None),
+                        'message': f"✅ Réussi avec {nom}",
+                        'popup': f"Fonction {nom} a réussi!",
+                    }
+                except GenerationAnnulee:
+                    raise
+                except Exception as e:
+                    rappel(f"❌ {nom} échoué: {e}")
+                    self.aiguillage.echec(nom, e)
+                    continue
+
+            raise RuntimeError(f"Aucune de ces fonctions n'a marché: {', '.join(noms_fonctions)}\n"
+                               f"Essayez 'GÉNÉRER AUTOMATIQUEMENT'.")
+
+        self._lancer_generation(f"Génération ({', '.join(n for n, _ in candidats)})", tache)
+
+    # ------------------------------------------------------------------
+    # Sélection du script, logs, génération paramétrée, conseil
+    # ------------------------------------------------------------------
+    def _append_log(self, texte):
+        """Journalise une ligne pour la zone de logs (affichée au prochain `_vider_log`, pas en console)."""
+        JOURNAL.info(texte, console=False, source='interface')
+
+    def _vider_log(self):
+        """Ajoute d'un bloc à la zone de logs les évènements `info`+ arrivés depuis le dernier appel."""
+        nouveaux = JOURNAL.depuis(self._curseur_log)
+        if not nouveaux:
+            return
+        self._curseur_log = nouveaux[-1]['seq']
+        lignes = [e['message'] for e in nouveaux if NIVEAUX[e['niveau']] >= NIVEAUX['info']]
+        if lignes:
+            try:
+                self.log_area.append("\n".join(lignes[-LIGNES_LOG_MAX:]))
+            except Exception:
+                pass
+
+    def choisir_script(self):
+        """Demande un autre script, le réindexe et met à jour les boutons."""
+        fichier, _ = QtGui.QFileDialog.getOpenFileName(
+            None,
+            "Sélectionnez votre script kiosque .py",
+            os.path.expanduser("~"),
+            "Python Files (*.py)"
+        )
+        if fichier:
+            self.chemin_script = fichier
+            self.label_message.setText(f"🔁 Chargement: {os.path.basename(fichier)}")
+            # Réindexer le script (le module sera exécuté à la prochaine génération)
+            self._appliquer_script(self.charger_script_explicitement())
+            self._append_log(f"Chargé: {fichier}")
+
+    def _appliquer_script(self, fonctions):
+        """Fonctions du script (ré)indexé et boutons qui en dépendent."""
+        self.fonctions_chargees = fonctions
+        try:
+            self.btn_standard.setEnabled(bool(self.fonctions_chargees))
+            self.btn_plots.setEnabled(bool(self.fonctions_chargees))
+        except Exception:
+            pass
+
+    def _basculer_rechargement(self, actif):
+        if actif:
+            self._timer_surveillance.start()
+        else:
+            self._timer_surveillance.stop()
+
+    def _surveiller_script(self):
+        """Minuterie : recharge le script si son contenu a changé (jamais pendant une génération)."""
+        if self._surveillance is None or getattr(self, '_thread_generation', None) is not None:
+            return  # vérifié de nouveau au tick suivant la génération
+        empreinte = self._surveillance.verifier()
+        if empreinte is not None:
+            self._recharger_a_chaud(empreinte)
+
+    def _recharger_a_chaud(self, empreinte):
+        """Script modifié sur disque : réindexé, état lié à l'ancienne empreinte oublié, réglages gardés.
+
+        Module, sessions incrémentales et bac à sable sont remplacés ; le cache de géométrie,
+        l'index et l'aiguillage sont adressés par empreinte, les entrées de l'ancien script ne
+        sont donc plus jamais consultées. Le nouveau module est chargé en arrière-plan.
+        """
+        ancienne = getattr(self, 'hash_script', None)
+        JOURNAL.info(f"🔄 Script modifié ({(ancienne or '?')[:8]} -> {empreinte[:8]}) : rechargement",
+                     ancienne=ancienne, nouvelle=empreinte)
+        apercu = self.chk_apercu.isChecked()
+        self._arreter_apercu()
+        debut = time.perf_counter()
+        self._appliquer_script(self.charger_script_explicitement())
+        if getattr(self, 'hash_script', None) != empreinte:
+            self.label_message.setText("❌ Script modifié mais non rechargé (voir les logs)")
+            return
+        self.label_message.setText(f"🔄 Script rechargé en {(time.perf_counter() - debut) * 1000:.0f} ms "
+                                   f"(réglages conservés)")
+        # Préchargement : la génération suivante ne paie que la construction du modèle
+        if apercu:
+            self._planifier_apercu()  # l'aperçu charge le module en le reconstruisant
+        else:
+            threading.Thread(target=lambda: self.module_loaded, name='kiosque-prechargement',
+                             daemon=True).start()
+        if self.chk_bac_a_sable.isChecked():
+            from kiosque_bac_a_sable import BacASable
+            bac_a_sable = self._bac_a_sable = BacASable(self.chemin_script)
+
+            def prechauffer():
+                try:
+                    bac_a_sable.prechauffer()
+                except Exception as e:
+                    JOURNAL.avertissement(f"⚠️  Bac à sable non préchauffé: {e}")
+
+            threading.Thread(target=prechauffer, name='kiosque-bac-a-sable', daemon=True).start()
+
+    @PROFILEUR.mesurer('generer_avec_parametres', 'interface')
+    def generer_avec_parametres(self):
+        """Collecte paramètres clés et génère le kiosque via la classe si disponible."""
+        try:
+            # Récupérer paramètres clefs
+            parametres = self._lire_parametres()
+            self._append_log("Paramètres: " + ", ".join(f"{cle}={valeur}" for cle, valeur in parametres.items()))
+
+            if self.chk_service.isChecked():
+                self._generer_via_service(parametres)
+            elif self.chk_bac_a_sable.isChecked():
+                self._generer_bac_a_sable(parametres)
+            elif self.chk_parallele.isChecked() and self._classe_disponible():
+                self._generer_parallele(parametres)
+            # Si la classe est disponible, l'utiliser
+            elif self._classe_disponible():
+                incremental = self.chk_incremental.isChecked()
+                instances = self.chk_instances.isChecked()
+
+                def construire(rappel, annulation, config):
+                    # Première génération : le module réel est exécuté ici, hors du thread Qt
+                    module = self.module_loaded
+                    if module is None:
+                        raise RuntimeError("Le module du script n'a pas pu être chargé")
+                    if incremental:
+                        session = self._session_incrementale
+                        if session is None or session.module is not module or session.instances != instances:
+                            session = SessionIncrementale(module, self.index_script, instances=instances,
+                                                          cache=self.cache)
+                            self._session_incrementale = session
+                        doc = session.construire(parametres, rappel, annulation)
+                        config.update(session.config_construite or {})
+                        return doc
+                    return construire_kiosque(module, parametres, rappel, annulation, cache=self.cache,
+                                              instances=instances, config_effective=config)
+
+                def tache(rappel, annulation):
+                    cible = 'incremental' if incremental else 'generer_kiosque_complet_avec_plots'
+                    doc = self._historiser(parametres, cible, construire, rappel, annulation)
+                    return {
+                        'doc': getattr(doc, 'Name', None),
+                        'message': 'Génération terminée via KiosqueTrefleFonctionnel',
+                    }
+
+                self._lancer_generation("Génération avec paramètres", tache)
+            else:
+                # Si pas de classe, essayer d'appeler une fonction nommée
+                if 'creer_kiosque_avec_plots' in getattr(self, 'functions_map', {}):
+                    func = self.functions_map['creer_kiosque_avec_plots']
+                    hauteur = self._hauteur_dome_ui()
+
+                    def tache(rappel, annulation):
+                        self._call_with_dome_height(func, 'creer_kiosque_avec_plots', hauteur=hauteur,
+                                                    rappel=rappel, annulation=annulation)
+                        doc = App.ActiveDocument
+                        return {
+                            'doc': getattr(doc, 'Name', None),
+                            'message': "✅ Génération terminée via creer_kiosque_avec_plots",
+                        }
+
+                    self._lancer_generation("Génération avec paramètres", tache)
+                else:
+                    QtGui.QMessageBox.warning(self, "Pas de cible", "Aucune classe ou fonction compatible trouvée dans le script chargé.")
+
+        except Exception as e:
+            JOURNAL.exception(f"❌ Erreur generer_avec_parametres: {e}")
+
+    def _generer_via_service(self, parametres):
+        """Soumet la variante au service de génération puis ouvre le FCStd produit."""
+        from kiosque_service import ClientService
+
+        chemin_script = self.chemin_script
+        instances = self.chk_instances.isChecked()
+
+        def tache(rappel, annulation):
+            with ClientService() as client:
+                rappel("🔥 Job soumis au service de génération")
+                entree = client.generer(parametres, ('fcstd',), script=chemin_script, instances=instances)
+            if entree['statut'] != 'ok':
+                raise RuntimeError(entree.get('erreur') or "Échec du service de génération")
+            verifier_annulation(annulation)  # le job n'est pas interruptible : seulement pas ouvert
+            doc = App.openDocument(entree['fichiers']['fcstd'])
+            return {
+                'doc': doc.Name,
+                'message': f"✅ Générée par le service en {entree['latence_s']:.2f} s "
+                           f"(modélisation {entree['duree_s']:.2f} s)",
+            }
+
+        self._lancer_generation("Génération via le service", tache)
+
+    def _generer_bac_a_sable(self, parametres):
+        """Génère dans le bac à sable puis reconstruit les formes BREP dans un nouveau document."""
+        from kiosque_bac_a_sable import BacASable, reconstruire_document
+
+        if self._bac_a_sable is None:
+            self._bac_a_sable = BacASable(self.chemin_script)
+        bac_a_sable = self._bac_a_sable
+        instances = self.chk_instances.isChecked()
+        resultats = {}
+
+        def construire(rappel, annulation, config):
+            if not bac_a_sable.actif():
+                rappel("🧪 Démarrage du bac à sable (FreeCAD + script)...")
+            resultat = bac_a_sable.generer(parametres, rappel, annulation, instances=instances)
+            config.update(resultat['config'])
+            resultats.update(resultat)
+            return reconstruire_document(resultat)
+
+        def tache(rappel, annulation):
+            doc = self._historiser(parametres, 'bac_a_sable', construire, rappel, annulation)
+            return {
+                'doc': doc.Name,
+                'message': f"✅ Générée en bac à sable en {resultats['duree_s']:.2f} s "
+                           f"({len(resultats['formes'])} formes, {resultats.get('memoire_max_mo', '?')} Mo max)",
+            }
+
+        self._lancer_generation("Génération en bac à sable", tache)
+
+    def _generer_parallele(self, parametres):
+        """Sous-assemblages construits dans les workers, fusionnés dans le document de l'orchestrateur."""
+        from kiosque_parallele import ConstructionParallele
+
+        if self._parallele is None:
+            self._parallele = ConstructionParallele(self.chemin_script, self.index_script)
+        parallele = self._parallele
+
+        def construire(rappel, annulation, config):
+            module = self.module_loaded
+            if module is None:
+                raise RuntimeError("Le module du script n'a pas pu être chargé")
+            if not parallele.actif():
+                rappel(f"⚡ Démarrage de {parallele.processus} worker(s) (FreeCAD + script)...")
+            return parallele.construire(module, parametres, rappel, annulation, config_effective=config)
+
+        def tache(rappel, annulation):
+            doc = self._historiser(parametres, 'parallele', construire, rappel, annulation)
+            bilan = parallele.bilan
+            return {
+                'doc': doc.Name,
+                'message': f"✅ Générée en {bilan['duree_s']:.2f} s ({len(bilan['paralleles'])} sous-assemblage(s) "
+                           f"en parallèle, {len(bilan['sur_place'])} sur place)",
+            }
+
+        self._lancer_generation("Génération parallèle", tache)
+
+    def montrer_historique(self):
+        """Générations passées de ce script : recharger des réglages, variante la plus proche, durées."""
+        if self.historique is None:
+            QtGui.QMessageBox.warning(self, "Historique", "Historique indisponible (voir la console).")
+            return
+        try:
+            entrees = self.historique.dernieres(200, getattr(self, 'hash_script', None))
+            colonnes = [("#", 'id'), ("Date", 'date'), ("Cible", 'cible'), ("Statut", 'statut'),
+                        ("Durée (s)", 'duree_s'), ("Rayon", 'rayon_petale'), ("Espace", 'rayon_rosaire'),
+                        ("Hauteur", 'hauteur_petale'), ("Dôme", 'hauteur_dome'),
+                        ("Matériau", 'material'), ("Objets", 'nb_objets')]
+            dialogue = QtGui.QDialog(self)
+            dialogue.setWindowTitle(f"Historique des générations ({len(entrees)})")
+            dialogue.resize(900, 460)
+            vbox = QtGui.QVBoxLayout(dialogue)
+            table = QtGui.QTableWidget(len(entrees), len(colonnes))
+            table.setHorizontalHeaderLabels([titre for titre, _ in colonnes])
+            table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+            table.setSelectionBehavior(QtGui.QAbstractItemView.SelectRows)
+            for i, entree in enumerate(entrees):
+                for j, (_, cle) in enumerate(colonnes):
+                    valeur = entree.get(cle)
+                    texte = "" if valeur is None else (f"{valeur:g}" if isinstance(valeur, float) else str(valeur))
+                    table.setItem(i, j, QtGui.QTableWidgetItem(texte))
+            table.resizeColumnsToContents()
+            vbox.addWidget(table)
+            info = QtGui.QLabel(f"Base : {self.historique.chemin}")
+            info.setWordWrap(True)
+            vbox.addWidget(info)
+
+            def selection():
+                ligne = table.currentRow()
+                return entrees[ligne] if 0 <= ligne < len(entrees) else None
+
+            def recharger():
+                entree = selection()
+                if entree is not None:
+                    self._appliquer_parametres_ui(entree['parametres'])
+                    self._append_log(f"🕘 Réglages de la génération #{entree['id']} rechargés")
+                    dialogue.accept()
+
+            def plus_proche():
+                proches = self.historique.plus_proche(self._lire_parametres(),
+                                                      getattr(self, 'hash_script', None))
+                if not proches:
+                    info.setText("Aucune génération réussie comparable.")
+                    return
+                proche = proches[0]
+                for i, entree in enumerate(entrees):
+                    if entree['id'] == proche['id']:
+                        table.selectRow(i)
+                info.setText(f"Plus proche des réglages : #{proche['id']} (distance {proche['distance']:.2f}, "
+                             f"{proche['duree_s'] or 0:.2f} s) {proche['fichier'] or ''}")
+
+            def tracer():
+                self._tracer_durees(getattr(self, 'hash_script', None))
+
+            boutons = QtGui.QHBoxLayout()
+            for libelle, action in (("↩️ Recharger les réglages", recharger),
+                                    ("🔎 Plus proche des réglages actuels", plus_proche),
+                                    ("📈 Durée selon les paramètres", tracer)):
+                bouton = QtGui.QPushButton(libelle)
+                bouton.clicked.connect(action)
+                boutons.addWidget(bouton)
+            vbox.addLayout(boutons)
+            table.itemDoubleClicked.connect(lambda *_: recharger())
+            dialogue.exec_()
+        except Exception as e:
+            JOURNAL.exception(f"❌ Erreur montrer_historique: {e}")
+
+    def _tracer_durees(self, hash_script):
+        """Nuage durée / paramètre géométrique (matplotlib, fourni avec FreeCAD)."""
+        try:
+            import matplotlib.pyplot as plt
+        except ImportError:
+            QtGui.QMessageBox.information(self, "Graphique",
+                "matplotlib n'est pas disponible : exportez l'historique en CSV\n"
+                "(python kiosque_historique.py --csv historique.csv).")
+            return
+        figure, axes = plt.subplots(1, len(PARAMETRES_GEOMETRIE), figsize=(14, 3.5), sharey=True)
+        for ax, cle in zip(axes, PARAMETRES_GEOMETRIE):
+            points = self.historique.series(cle, hash_script)
+            ax.scatter([p[0] for p in points], [p[1] for p in points], s=12)
+            ax.set_xlabel(f"{cle} (mm)")
+        axes[0].set_ylabel("Durée de génération (s)")
+        figure.tight_layout()
+        plt.show()
+
+    def montrer_metre(self):
+        """Affiche le métré analytique (`kiosque_metre`) des paramètres courants, sans générer."""
+        try:
+            from kiosque_metre import estimer_parametres
+
+            parametres = self._lire_parametres()
+            debut = time.perf_counter()
+            r = {cle: float(valeur) for cle, valeur in estimer_parametres(parametres).items()}
+            duree = time.perf_counter() - debut
+
+            lignes = [
+                ("Lisses des pétales", r['longueur_lisses'], "m", "{:.1f}"),
+                ("Montants", r['nb_montants'], "u", "{:.0f}"),
+                ("Montants (longueur)", r['longueur_montants'], "m", "{:.1f}"),
+                ("Nervures du dôme", r['longueur_nervures'], "m", "{:.1f}"),
+                ("Tubes (total)", r['longueur_tubes'], "m", "{:.1f}"),
+                ("Surface du dôme", r['surface_dome'], "m²", "{:.1f}"),
+                ("Plots", r['nb_plots'], "u", "{:.0f}"),
+                ("Béton des plots", r['volume_beton'], "m³", "{:.2f}"),
+                ("Masse béton", r['masse_beton'], "kg", "{:.0f}"),
+                ("Masse tubes", r['masse_tubes'], "kg", "{:.0f}"),
+                ("Masse couverture", r['masse_couverture'], "kg", "{:.0f}"),
+                ("Masse structure", r['masse_structure'], "kg", "{:.0f}"),
+            ]
+            dialogue = QtGui.QDialog(self)
+            dialogue.setWindowTitle("Métré analytique")
+            dialogue.resize(420, 460)
+            vbox = QtGui.QVBoxLayout(dialogue)
+            table = QtGui.QTableWidget(len(lignes), 3)
+            table.setHorizontalHeaderLabels(["Poste", "Quantité", "Unité"])
+            table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+            for i, (poste, valeur, unite, fmt) in enumerate(lignes):
+                table.setItem(i, 0, QtGui.QTableWidgetItem(poste))
+                table.setItem(i, 1, QtGui.QTableWidgetItem(fmt.format(valeur)))
+                table.setItem(i, 2, QtGui.QTableWidgetItem(unite))
+            table.resizeColumnsToContents()
+            vbox.addWidget(table)
+
+            note = QtGui.QLabel(
+                f"{parametres['material']} — calculé en {duree * 1e6:.0f} µs, sans modèle CAO.\n"
+                "Estimation pour devis : quantités indicatives, à confirmer sur plans.")
+            note.setWordWrap(True)
+            vbox.addWidget(note)
+            boutons = QtGui.QDialogButtonBox(QtGui.QDialogButtonBox.Ok)
+            boutons.accepted.connect(dialogue.accept)
+            vbox.addWidget(boutons)
+            dialogue.exec_()
+            self._append_log(f"Métré : {r['longueur_tubes']:.0f} m de tubes, {r['surface_dome']:.0f} m² de dôme, "
+                             f"{r['volume_beton']:.2f} m³ de béton, {r['masse_structure']:.0f} kg de structure")
+        except Exception as e:
+            JOURNAL.exception(f"❌ Erreur montrer_metre: {e}")
+
+    def montrer_optimisation(self):
+        """Front de Pareto (`kiosque_optimisation`) sous les contraintes saisies, sans CAO.
+
+        Vent, matériau et FS sont ceux de l'interface ; seule la variante choisie est générée.
+        """
+        try:
+            from kiosque_optimisation import optimiser
+
+            parametres = self._lire_parametres()
+            dialogue = QtGui.QDialog(self)
+            dialogue.setWindowTitle("Optimisation sous contraintes")
+            dialogue.resize(900, 520)
+            vbox = QtGui.QVBoxLayout(dialogue)
+            vent, fs = meta_parametre(parametres, 'wind_speed'), meta_parametre(parametres, 'safety_factor')
+            vbox.addWidget(QtGui.QLabel(
+                f"{parametres['material']} — vent {vent} km/h, "
+                f"FS {fs:.2f} (réglages de l'interface). 0 = sans contrainte."))
+
+            grille = QtGui.QGridLayout()
+            contraintes = {}
+            for i, (libelle, cle, valeur, maximum) in enumerate((
+                    ("Emprise max (diamètre, mm):", 'emprise_max', 7000, 20000),
+                    ("Hauteur libre min (mm):", 'hauteur_libre_min', 2100, 5000),
+                    ("Lest max par plot (kg):", 'lest_max', 0, 10000))):
+                grille.addWidget(QtGui.QLabel(libelle), i, 0)
+                spin = QtGui.QSpinBox()
+                spin.setRange(0, maximum)
+                spin.setValue(valeur)
+                grille.addWidget(spin, i, 1)
+                contraintes[cle] = spin
+            vbox.addLayout(grille)
+
+            colonnes = [("Rayon", 'rayon_petale', 1, "{:.0f}"), ("Espace", 'rayon_rosaire', 1, "{:.0f}"),
+                        ("Hauteur", 'hauteur_petale', 1, "{:.0f}"), ("Dôme", 'hauteur_dome', 1, "{:.0f}"),
+                        ("Emprise (m)", 'emprise', 1e-3, "{:.2f}"), ("Abri (m²)", 'surface_abritee', 1, "{:.1f}"),
+                        ("Structure (kg)", 'masse_structure', 1, "{:.0f}"),
+                        ("Béton (m³)", 'volume_beton', 1, "{:.2f}"), ("Lest/plot (kg)", 'masse_plot', 1, "{:.0f}")]
+            table = QtGui.QTableWidget(0, len(colonnes))
+            table.setHorizontalHeaderLabels([titre for titre, _, _, _ in colonnes])
+            table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+            table.setSelectionBehavior(QtGui.QAbstractItemView.SelectRows)
+            vbox.addWidget(table)
+            info = QtGui.QLabel("")
+            info.setWordWrap(True)
+            vbox.addWidget(info)
+            front = []
+
+            def chercher():
+                valeurs = {cle: (spin.value() or None) for cle, spin in contraintes.items()}
+                resultat = optimiser(vent, parametres['material'], fs, **valeurs)
+                front[:] = resultat['front']
+                table.setRowCount(len(front))
+                for i, entree in enumerate(front):
+                    for j, (_, cle, echelle, fmt) in enumerate(colonnes):
+                        valeur = entree['parametres'][cle] if cle in entree['parametres'] else entree[cle]
+                        table.setItem(i, j, QtGui.QTableWidgetItem(fmt.format(valeur * echelle)))
+                table.resizeColumnsToContents()
+                info.setText(f"{resultat['evalues']} candidat(s) évalué(s), {resultat['elagues']} élagué(s) "
+                             f"par les contraintes, front de Pareto de {len(front)} en "
+                             f"{resultat['duree_s'] * 1000:.0f} ms (masse, béton, surface abritée).")
+                self._append_log(f"🎯 Optimisation : front de {len(front)} variante(s) en "
+                                 f"{resultat['duree_s'] * 1000:.0f} ms")
+
+            def comparer():
+                # Lignes sélectionnées, à défaut les premières du front
+                lignes = sorted({index.row() for index in table.selectionModel().selectedRows()})
+                if len(lignes) < 2:
+                    lignes = list(range(min(len(front), COMPARAISON_MAX)))
+                if len(lignes) < 2:
+                    return
+                dialogue.accept()
+                self._generer_comparaison([dict(parametres, **front[i]['parametres']) for i in lignes])
+
+            def appliquer(generer=False):
+                ligne = table.currentRow()
+                if not 0 <= ligne < len(front):
+                    return
+                self._appliquer_parametres_ui(front[ligne]['parametres'])
+                self._append_log(f"🎯 Variante du front appliquée : {front[ligne]['parametres']}")
+                dialogue.accept()
+                if generer:
+                    self.generer_avec_parametres()
+
+            boutons = QtGui.QHBoxLayout()
+            for libelle, action in (("🔎 Chercher", chercher),
+                                    ("↩️ Appliquer les réglages", lambda: appliquer(False)),
+                                    ("🔧 Générer cette variante", lambda: appliquer(True)),
+                                    ("⚖️ Comparer la sélection", comparer)):
+                bouton = QtGui.QPushButton(libelle)
+                bouton.clicked.connect(action)
+                boutons.addWidget(bouton)
+            vbox.addLayout(boutons)
+            table.itemDoubleClicked.connect(lambda *_: appliquer(False))
+            chercher()
+            dialogue.exec_()
+        except Exception as e:
+            JOURNAL.exception(f"❌ Erreur montrer_optimisation: {e}")
+
+    def montrer_comparaison(self, variantes=None):
+        """Saisie des variantes à comparer (une ligne par variante), puis construction côte à côte.
+
+        Par défaut : les réglages courants encadrés de ±`PAS_COMPARAISON_MM` sur le rayon des pétales.
+        """
+        try:
+            parametres = self._lire_parametres()
+            if variantes is None:
+                variantes = [dict(parametres, rayon_petale=(parametres['rayon_petale'] or 0) + delta)
+                             for delta in (-PAS_COMPARAISON_MM, 0, PAS_COMPARAISON_MM)]
+            dialogue = QtGui.QDialog(self)
+            dialogue.setWindowTitle("Comparer des variantes")
+            dialogue.resize(620, 360)
+            vbox = QtGui.QVBoxLayout(dialogue)
+            vent, fs = meta_parametre(parametres, 'wind_speed'), meta_parametre(parametres, 'safety_factor')
+            vbox.addWidget(QtGui.QLabel(
+                f"Une ligne par variante (mm). {parametres['material']}, vent {vent} km/h, "
+                f"FS {fs:.2f} : réglages de l'interface pour toutes."))
+            table = QtGui.QTableWidget(len(variantes), len(PARAMETRES_GEOMETRIE))
+            table.setHorizontalHeaderLabels(PARAMETRES_GEOMETRIE)
+            for i, variante in enumerate(variantes):
+                for j, cle in enumerate(PARAMETRES_GEOMETRIE):
+                    table.setItem(i, j, QtGui.QTableWidgetItem(str(variante.get(cle) or '')))
+            vbox.addWidget(table)
+
+            def dupliquer():
+                ligne = max(table.currentRow(), 0)
+                table.insertRow(ligne + 1)
+                for j in range(len(PARAMETRES_GEOMETRIE)):
+                    item = table.item(ligne, j)
+                    table.setItem(ligne + 1, j, QtGui.QTableWidgetItem(item.text() if item else ''))
+
+            def retirer():
+                if table.rowCount() > 2:
+                    table.removeRow(max(table.currentRow(), 0))
+
+            def construire():
+                lues = []
+                for i in range(table.rowCount()):
+                    variante = dict(parametres)
+                    for j, cle in enumerate(PARAMETRES_GEOMETRIE):
+                        texte = table.item(i, j).text().strip() if table.item(i, j) else ''
+                        variante[cle] = int(float(texte)) if texte else None
+                    lues.append(variante)
+                dialogue.accept()
+                self._generer_comparaison(lues)
+
+            boutons = QtGui.QHBoxLayout()
+            for libelle, action in (("➕ Dupliquer la ligne", dupliquer), ("➖ Retirer la ligne", retirer),
+                                    ("⚖️ Construire la comparaison", construire)):
+                bouton = QtGui.QPushButton(libelle)
+                bouton.clicked.connect(action)
+                boutons.addWidget(bouton)
+            vbox.addLayout(boutons)
+            dialogue.exec_()
+        except Exception as e:
+            JOURNAL.exception(f"❌ Erreur montrer_comparaison: {e}")
+
+    def _generer_comparaison(self, variantes):
+        """Construit `variantes` côte à côte dans un seul document (`kiosque_comparaison`)."""
+        if not self._classe_disponible():
+            QtGui.QMessageBox.warning(self, "Comparaison impossible",
+                "La comparaison nécessite la classe KiosqueTrefleFonctionnel du script.")
+            return
+        from kiosque_comparaison import ComparaisonVariantes
+
+        instances = self.chk_instances.isChecked()
+
+        def tache(rappel, annulation):
+            module = self.module_loaded
+            if module is None:
+                raise RuntimeError("Le module du script n'a pas pu être chargé")
+            resultat = ComparaisonVariantes(module, self.index_script, instances=instances).construire(
+                variantes, rappel, annulation)
+            doc = resultat.pop('doc')
+            return {
+                'doc': doc.Name,
+                'message': (f"⚖️ {len(variantes)} variantes comparées en {resultat['duree_s']:.2f} s "
+                            f"({resultat['partages']} sous-assemblage(s) partagé(s))"),
+                'comparaison': resultat,
+            }
+
+        self._lancer_generation(f"Comparaison de {len(variantes)} variantes", tache)
+
+    def _montrer_tableau_comparaison(self, comparaison):
+        """Tableau comparatif : une colonne par variante, paramètres qui diffèrent puis indicateurs."""
+        from kiosque_comparaison import COLONNES_COMPARAISON, cles_differentes
+
+        entrees = comparaison['variantes']
+        differentes = cles_differentes([e['parametres'] for e in entrees])
+        lignes = [(cle, cle, 1, "{}") for cle in differentes]
+        lignes += [(libelle, cle, echelle, fmt) for cle, (libelle, echelle, fmt) in COLONNES_COMPARAISON.items()]
+        dialogue = QtGui.QDialog(self)
+        dialogue.setWindowTitle("Comparaison des variantes")
+        dialogue.resize(160 + 110 * len(entrees), 420)
+        vbox = QtGui.QVBoxLayout(dialogue)
+        table = QtGui.QTableWidget(len(lignes), len(entrees))
+        table.setHorizontalHeaderLabels([f"Variante {e['index']}" for e in entrees])
+        table.setVerticalHeaderLabels([libelle for libelle, _, _, _ in lignes])
+        table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        for j, entree in enumerate(entrees):
+            for i, (_, cle, echelle, fmt) in enumerate(lignes):
+                valeur = entree['parametres'].get(cle) if cle in differentes else entree[cle] * echelle
+                table.setItem(i, j, QtGui.QTableWidgetItem(fmt.format(valeur)))
+        table.resizeColumnsToContents()
+        vbox.addWidget(table)
+        vbox.addWidget(QtGui.QLabel(
+            f"{comparaison['construits']} sous-assemblage(s) modélisé(s), {comparaison['partages']} partagé(s) "
+            f"entre variantes ; variantes espacées de {comparaison['espacement_mm'] / 1000:.1f} m le long de X."))
+        boutons = QtGui.QDialogButtonBox(QtGui.QDialogButtonBox.Ok)
+        boutons.accepted.connect(dialogue.accept)
+        vbox.addWidget(boutons)
+        dialogue.exec_()
+
+    def montrer_conseil(self):
+        """Affiche le dimensionnement vent/ancrage (`kiosque_ancrage`) pour la géométrie courante.
+
+        Tableau sur une plage de vitesses de vent, la vitesse saisie étant surlignée.
+        """
+        try:
+            import numpy as np
+            from kiosque_ancrage import NB_PLOTS_DEFAUT, dimensionner_parametres
+
+            parametres = self._lire_parametres()
+            wind = meta_parametre(parametres, 'wind_speed')
+            vitesses = np.union1d(np.arange(60, 181, 20), [wind])
+            r = dimensionner_parametres(parametres, wind_speed=vitesses)
+
+            colonnes = [
+                ("Vent (km/h)", vitesses, 1, "{:.0f}"),
+                ("q (Pa)", r['pression'], 1, "{:.0f}"),
+                ("Effort H (kN)", r['effort_horizontal'], 1e-3, "{:.1f}"),
+                ("Moment (kN·m)", r['moment'], 1e-3, "{:.1f}"),
+                ("Soulèvement (kN)", r['soulevement'], 1e-3, "{:.1f}"),
+                ("Traction/plot (kN)", r['traction_plot'], 1e-3, "{:.1f}"),
+                ("Lest/plot (kg)", r['masse_plot'], 1, "{:.0f}"),
+                ("Côté plot (cm)", r['cote_plot'], 100, "{:.0f}"),
+            ]
+            dialogue = QtGui.QDialog(self)
+            dialogue.setWindowTitle("Conseil dimensionnement")
+            dialogue.resize(760, 420)
+            vbox = QtGui.QVBoxLayout(dialogue)
+            table = QtGui.QTableWidget(len(vitesses), len(colonnes))
+            table.setHorizontalHeaderLabels([titre for titre, _, _, _ in colonnes])
+            table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+            for i, vitesse in enumerate(vitesses):
+                for j, (_, valeurs, echelle, fmt) in enumerate(colonnes):
+                    item = QtGui.QTableWidgetItem(fmt.format(float(valeurs[i]) * echelle))
+                    if vitesse == wind:
+                        item.setBackground(QtGui.QColor('#f1c40f'))
+                    table.setItem(i, j, item)
+            table.resizeColumnsToContents()
+            vbox.addWidget(table)
+
+            ligne = int(np.searchsorted(vitesses, wind))
+            note = QtGui.QLabel(
+                f"{parametres['material']} — FS retenu {float(r['fs'][ligne]):.2f}, {NB_PLOTS_DEFAUT} plots.\n"
+                f"À {wind} km/h : lest béton ≈ {float(r['masse_plot'][ligne]):.0f} kg par plot "
+                f"(cube de {float(r['cote_plot'][ligne]) * 100:.0f} cm).\n"
+                "Pré-dimensionnement simplifié : vérifier par calculs normatifs pour votre site.")
+            note.setWordWrap(True)
+            vbox.addWidget(note)
+            boutons = QtGui.QDialogButtonBox(QtGui.QDialogButtonBox.Ok)
+            boutons.accepted.connect(dialogue.accept)
+            vbox.addWidget(boutons)
+            dialogue.exec_()
+            self._append_log(f"Conseil affiché : lest {float(r['masse_plot'][ligne]):.0f} kg/plot à {wind} km/h")
+        except Exception as e:
+            JOURNAL.exception(f"❌ Erreur montrer_conseil: {e}")
+
+    def montrer_fiabilite(self):
+        """Monte-Carlo de l'ancrage (`kiosque_fiabilite`) pour la géométrie courante, sans CAO.
+
+        Probabilité de défaillance par mode pour le lest déterministe de `montrer_conseil`,
+        et lest requis pour la probabilité visée. Les tirages sont faits hors du thread Qt
+        (`_lancer_generation`), annulables entre deux blocs.
+        """
+        try:
+            from kiosque_fiabilite import CIBLE_DEFAUT, ECHANTILLONS_DEFAUT
+
+            parametres = self._lire_parametres()
+            dialogue = QtGui.QDialog(self)
+            dialogue.setWindowTitle("Fiabilité de l'ancrage (Monte-Carlo)")
+            vbox = QtGui.QVBoxLayout(dialogue)
+            vbox.addWidget(QtGui.QLabel(
+                f"{parametres['material']} — vent de calcul {meta_parametre(parametres, 'wind_speed')} km/h "
+                f"(période de retour 50 ans), FS {meta_parametre(parametres, 'safety_factor'):.2f}."))
+
+            grille = QtGui.QGridLayout()
+            grille.addWidget(QtGui.QLabel("Tirages (milliers):"), 0, 0)
+            spin_tirages = QtGui.QSpinBox()
+            spin_tirages.setRange(10, 20000)
+            spin_tirages.setSingleStep(500)
+            spin_tirages.setValue(ECHANTILLONS_DEFAUT // 1000)
+            grille.addWidget(spin_tirages, 0, 1)
+            grille.addWidget(QtGui.QLabel("Probabilité annuelle visée:"), 1, 0)
+            combo_cible = QtGui.QComboBox()
+            cibles = (1e-3, 1e-4, 1e-5)
+            combo_cible.addItems([f"{c:.0e}" for c in cibles])
+            combo_cible.setCurrentIndex(cibles.index(CIBLE_DEFAUT))
+            grille.addWidget(combo_cible, 1, 1)
+            vbox.addLayout(grille)
+
+            def lancer():
+                echantillons, cible = spin_tirages.value() * 1000, float(combo_cible.currentText())
+                dialogue.accept()
+                self._generer_fiabilite(parametres, echantillons, cible)
+
+            boutons = QtGui.QHBoxLayout()
+            for libelle, action in (("🎲 Calculer", lancer), ("Fermer", dialogue.reject)):
+                bouton = QtGui.QPushButton(libelle)
+                bouton.clicked.connect(action)
+                boutons.addWidget(bouton)
+            vbox.addLayout(boutons)
+            dialogue.exec_()
+        except Exception as e:
+            JOURNAL.exception(f"❌ Erreur montrer_fiabilite: {e}")
+
+    def _generer_fiabilite(self, parametres, echantillons, cible):
+        """Tirages de `montrer_fiabilite` dans le worker de génération (bouton Annuler actif)."""
+        from kiosque_fiabilite import analyser_parametres
+
+        def tache(rappel, annulation):
+            r = analyser_parametres(parametres, echantillons=echantillons, cible=cible, annulation=annulation)
+            return {
+                'message': (f"🎲 Fiabilité : défaillance {r['pf']:.1e}/an (β {r['beta']:.2f}) avec "
+                            f"{r['masse_plot']:.0f} kg/plot ; {r['masse_requise']:.0f} kg requis "
+                            f"pour {cible:.0e}"),
+                'fiabilite': r,
+            }
+
+        tirages = f"{echantillons:,}".replace(',', ' ')
+        self._lancer_generation(f"Fiabilité de l'ancrage ({tirages} tirages)", tache)
+
+    def _montrer_tableau_fiabilite(self, r):
+        """Résultats de `kiosque_fiabilite.analyser` : probabilités par mode et lest requis."""
+        lignes = [
+            ("Défaillance (tous modes)", 'pf', "{:.2e}"),
+            ("  soulèvement d'un plot", 'pf_soulevement', "{:.2e}"),
+            ("  renversement", 'pf_renversement', "{:.2e}"),
+            ("  rupture de la liaison", 'pf_rupture', "{:.2e}"),
+            ("Indice de fiabilité β", 'beta', "{:.2f}"),
+            ("Lest/plot dimensionné (kg)", 'masse_plot', "{:.0f}"),
+            ("Lest/plot requis (kg)", 'masse_requise', "{:.0f}"),
+            ("Côté plot dimensionné (cm)", 'cote_plot', "{:.0f}"),
+            ("Côté plot requis (cm)", 'cote_requise', "{:.0f}"),
+        ]
+        dialogue = QtGui.QDialog(self)
+        dialogue.setWindowTitle("Fiabilité de l'ancrage (Monte-Carlo)")
+        dialogue.resize(520, 420)
+        vbox = QtGui.QVBoxLayout(dialogue)
+        table = QtGui.QTableWidget(len(lignes), 2)
+        table.setHorizontalHeaderLabels(["Indicateur", "Valeur"])
+        table.setEditTriggers(QtGui.QAbstractItemView.NoEditTriggers)
+        for i, (libelle, cle, fmt) in enumerate(lignes):
+            echelle = 100 if cle.startswith('cote') else 1
+            table.setItem(i, 0, QtGui.QTableWidgetItem(libelle))
+            table.setItem(i, 1, QtGui.QTableWidgetItem(fmt.format(r[cle] * echelle)))
+        table.resizeColumnsToContents()
+        vbox.addWidget(table)
+        tirages = f"{r['echantillons']:,}".replace(',', ' ')
+        texte = (f"{tirages} tirages en {r['duree_s']:.2f} s ; "
+                 f"IC 95 % de la défaillance : ± {r['intervalle_pf']:.1e}.")
+        if not r['estimation_fiable']:
+            texte += "\n⚠️ Trop peu de tirages pour cette cible : lest requis peu fiable."
+        info = QtGui.QLabel(texte + "\nModèle probabiliste simplifié : ne remplace pas une étude normative.")
+        info.setWordWrap(True)
+        vbox.addWidget(info)
+        boutons = QtGui.QDialogButtonBox(QtGui.QDialogButtonBox.Ok)
+        boutons.accepted.connect(dialogue.accept)
+        vbox.addWidget(boutons)
+        dialogue.exec_()
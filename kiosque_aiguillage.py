@@ -0,0 +1,106 @@
+"""
+🧭 AIGUILLAGE DES FONCTIONS DE GÉNÉRATION
+Mémorise, par empreinte SHA-256 du script, quelles fonctions candidates ont
+produit un kiosque (nombre de succès, dernière durée) et lesquelles ont échoué.
+
+Au clic suivant, `ordonner()` place d'abord les cibles connues comme bonnes (les
+plus fiables puis les plus rapides), puis les inconnues dans l'ordre d'origine ;
+les échecs connus sont écartés tant qu'il reste une autre candidate.
+`appelables_sans_argument()` écarte, d'après l'index statique, les fonctions qui
+exigent des arguments, avant toute création de document.
+"""
+
+import json
+import os
+import threading
+import time
+
+from kiosque_generation import REPERTOIRE_DONNEES
+from kiosque_journal import JOURNAL
+
+DOSSIER_AIGUILLAGE = os.path.join(REPERTOIRE_DONNEES, 'aiguillage')
+VERSION_AIGUILLAGE = 1
+
+
+def appelables_sans_argument(index, noms):
+    """Sépare `noms` en (appelables sans argument, exigeant des arguments) d'après `index`.
+
+    Les noms absents de l'index sont gardés (rien ne permet de les écarter).
+    """
+    fonctions = (index or {}).get('fonctions', {})
+    appelables, ecartees = [], []
+    for nom in noms:
+        if fonctions.get(nom, {}).get('requis', 0) > 0:
+            ecartees.append(nom)
+        else:
+            appelables.append(nom)
+    return appelables, ecartees
+
+
+class IndexAiguillage:
+    """Résultats des essais de génération d'un script, persistés sous `<hash>.json`."""
+
+    def __init__(self, hash_script, dossier=DOSSIER_AIGUILLAGE):
+        self.hash_script = hash_script
+        self.chemin = os.path.join(dossier, hash_script + '.json')
+        self.cibles = {}  # nom -> {'succes', 'echecs', 'duree_s', 'erreur', 'date'}
+        self._verrou = threading.Lock()
+        try:
+            with open(self.chemin, 'r', encoding='utf-8') as f:
+                donnees = json.load(f)
+            if donnees.get('version') == VERSION_AIGUILLAGE:
+                self.cibles = donnees.get('cibles', {})
+        except (OSError, ValueError):
+            pass
+
+    def _cible(self, nom):
+        return self.cibles.setdefault(nom, {'succes': 0, 'echecs': 0, 'duree_s': None,
+                                            'erreur': None, 'date': None})
+
+    def connue_bonne(self, nom):
+        return self.cibles.get(nom, {}).get('succes', 0) > 0
+
+    def connue_en_echec(self, nom):
+        cible = self.cibles.get(nom, {})
+        return cible.get('echecs', 0) > 0 and cible.get('succes', 0) == 0
+
+    def ordonner(self, candidats):
+        """Retourne (ordre d'essai, échecs connus écartés)."""
+        with self._verrou:
+            bonnes = sorted((n for n in candidats if self.connue_bonne(n)),
+                            key=lambda n: (-self.cibles[n]['succes'],
+                                           self.cibles[n]['duree_s'] or float('inf')))
+            echecs = [n for n in candidats if self.connue_en_echec(n)]
+            inconnues = [n for n in candidats if n not in bonnes and n not in echecs]
+        if not bonnes and not inconnues:
+            return echecs, []  # tout a déjà échoué : on réessaie plutôt que de ne rien faire
+        return bonnes + inconnues, echecs
+
+    def succes(self, nom, duree_s):
+        with self._verrou:
+            cible = self._cible(nom)
+            cible['succes'] += 1
+            cible['duree_s'] = round(duree_s, 3)
+            cible['erreur'] = None
+            cible['date'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.enregistrer()
+
+    def echec(self, nom, erreur):
+        with self._verrou:
+            cible = self._cible(nom)
+            cible['echecs'] += 1
+            cible['erreur'] = str(erreur)[:500]
+            cible['date'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.enregistrer()
+
+    def enregistrer(self):
+        with self._verrou:
+            donnees = {'version': VERSION_AIGUILLAGE, 'cibles': dict(self.cibles)}
+        try:
+            os.makedirs(os.path.dirname(self.chemin), exist_ok=True)
+            temporaire = f"{self.chemin}.{os.getpid()}.tmp"
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump(donnees, f, indent=2, ensure_ascii=False)
+            os.replace(temporaire, self.chemin)
+        except OSError as e:
+            JOURNAL.avertissement(f"⚠️  Aiguillage non persisté: {e}")
@@ -0,0 +1,140 @@
+"""
+🌬️ DIMENSIONNEMENT VENT / ANCRAGE DU KIOSQUE TRÈFLE
+Calcul vectorisé (NumPy, sans FreeCAD) : pression dynamique du vent, efforts sur
+les pétales et le dôme, moment de renversement, soulèvement et lest béton requis
+par plot. Toutes les entrées sont diffusées (broadcasting) : un seul appel évalue
+des tableaux entiers de vitesses × géométries × matériaux.
+
+Modèle simplifié de pré-dimensionnement (pas un calcul normatif) :
+  - q = ½·ρ·v² ;
+  - pétales : bande verticale `largeur × hauteur_petale` pondérée par la solidité
+    (montants + panneaux), bras de levier à mi-hauteur ;
+  - dôme : silhouette parabolique ⅔·largeur·hauteur_dome posée sur les pétales,
+    centre de poussée à 2/5 de sa hauteur, succion verticale sur l'emprise ;
+  - plots répartis sur le cercle extérieur (rayon_rosaire + rayon_petale) : traction
+    max = 2·M/(n·r) + U/n, diminuée du poids propre ; glissement par frottement.
+Dimensions en mm (comme `config`), vitesses en km/h, résultats en SI.
+"""
+
+import numpy as np
+
+from kiosque_generation import FS_DEFAUT, meta_parametre
+
+RHO_AIR = 1.225  # kg/m³
+GRAVITE = 9.81  # m/s²
+RHO_BETON = 2400.0  # kg/m³
+FROTTEMENT_SOL = 0.5  # coefficient béton / sol
+NB_PLOTS_DEFAUT = 8
+
+CF_PETALES = 1.2  # coefficient de force, bande verticale
+SOLIDITE_PETALES = 0.35  # part pleine de la bande (montants, panneaux)
+CF_DOME = 0.6  # traînée d'une coque arrondie
+CP_SOULEVEMENT = 0.8  # succion verticale sur le dôme
+
+# Dimensions de l'interface quand le script ne les fixe pas (mm)
+GEOMETRIE_DEFAUT = {
+    'rayon_petale': 2200,
+    'rayon_rosaire': 1000,
+    'hauteur_petale': 2200,
+    'hauteur_dome': 3500,
+}
+
+# Matériau -> (masse surfacique de la structure en kg/m² d'emprise, FS minimal)
+MATERIAUX = {
+    'acier': (25.0, 1.25),
+    'bambou': (12.0, 1.5),
+}
+MATERIAU_DEFAUT = 'acier'
+
+
+def proprietes_materiau(material, table=MATERIAUX):
+    """Valeurs de `table` d'après le début du libellé ('Bambou (temporaire)'...)."""
+    nom = str(material or '').strip().lower()
+    for cle, valeurs in table.items():
+        if nom.startswith(cle):
+            return valeurs
+    return table[MATERIAU_DEFAUT]
+
+
+def diffuser_materiau(material, forme, table=MATERIAUX):
+    """Colonnes de `table` en tableaux diffusés à `forme` ; un libellé par valeur unique."""
+    if isinstance(material, str):  # cas courant (interface) : pas de np.unique
+        return tuple(np.full(forme, valeur, dtype=float) for valeur in proprietes_materiau(material, table))
+    libelles = np.asarray(material, dtype=object)
+    uniques, inverse = np.unique(libelles.astype(str), return_inverse=True)
+    valeurs = np.array([proprietes_materiau(u, table) for u in uniques], dtype=float)
+    return tuple(np.broadcast_to(valeurs[inverse, i].reshape(libelles.shape), forme)
+                 for i in range(valeurs.shape[1]))
+
+
+def dimensionner(wind_speed, rayon_petale=None, rayon_rosaire=None, hauteur_petale=None,
+                 hauteur_dome=None, material=MATERIAU_DEFAUT, safety_factor=FS_DEFAUT,
+                 nb_plots=NB_PLOTS_DEFAUT):
+    """Efforts et lest par plot pour toutes les combinaisons diffusées des entrées.
+
+    Les dimensions à None prennent `GEOMETRIE_DEFAUT`. Retourne un dict de tableaux
+    de même forme : pression (Pa), effort_horizontal (N), moment (N·m),
+    soulevement (N), fs (FS retenu), traction_plot (N), cisaillement_plot (N),
+    masse_plot (kg), volume_plot (m³), cote_plot (m, plot cubique).
+    """
+    geometrie = {cle: GEOMETRIE_DEFAUT[cle] if valeur is None else valeur
+                 for cle, valeur in (('rayon_petale', rayon_petale), ('rayon_rosaire', rayon_rosaire),
+                                     ('hauteur_petale', hauteur_petale), ('hauteur_dome', hauteur_dome))}
+    v, r_p, r_r, h_p, h_d, sf, n = np.broadcast_arrays(
+        np.asarray(wind_speed, dtype=float) / 3.6,
+        np.asarray(geometrie['rayon_petale'], dtype=float) / 1000.0,
+        np.asarray(geometrie['rayon_rosaire'], dtype=float) / 1000.0,
+        np.asarray(geometrie['hauteur_petale'], dtype=float) / 1000.0,
+        np.asarray(geometrie['hauteur_dome'], dtype=float) / 1000.0,
+        np.asarray(safety_factor, dtype=float),
+        np.asarray(nb_plots, dtype=float),
+    )
+    # Le matériau participe aussi à la diffusion
+    forme = np.broadcast_shapes(v.shape, np.shape(np.asarray(material, dtype=object)))
+    v, r_p, r_r, h_p, h_d, sf, n = (np.broadcast_to(a, forme) for a in (v, r_p, r_r, h_p, h_d, sf, n))
+    masse_surfacique, fs_min = diffuser_materiau(material, forme)
+
+    q = 0.5 * RHO_AIR * v ** 2
+    r_ext = r_r + r_p
+    largeur = 2.0 * r_ext
+    emprise = np.pi * r_ext ** 2
+
+    f_petales = q * CF_PETALES * SOLIDITE_PETALES * largeur * h_p
+    f_dome = q * CF_DOME * (2.0 / 3.0) * largeur * h_d
+    moment = f_petales * h_p / 2.0 + f_dome * (h_p + 0.4 * h_d)
+    soulevement = q * CP_SOULEVEMENT * emprise
+    poids = masse_surfacique * emprise * GRAVITE
+
+    fs = np.maximum(sf, fs_min)
+    traction = fs * (2.0 * moment / (n * r_ext) + soulevement / n) - poids / n
+    cisaillement = fs * (f_petales + f_dome) / n
+    masse = np.maximum(np.maximum(traction, 0.0), cisaillement / FROTTEMENT_SOL) / GRAVITE
+    volume = masse / RHO_BETON
+
+    return {
+        'pression': q,
+        'effort_horizontal': f_petales + f_dome,
+        'moment': moment,
+        'soulevement': soulevement,
+        'fs': fs,
+        'traction_plot': traction,
+        'cisaillement_plot': cisaillement,
+        'masse_plot': masse,
+        'volume_plot': volume,
+        'cote_plot': np.cbrt(volume),
+    }
+
+
+def dimensionner_parametres(parametres, wind_speed=None, nb_plots=NB_PLOTS_DEFAUT):
+    """`dimensionner` appliqué à un dict de `PARAMETRES` (interface, batch).
+
+    `wind_speed` permet de remplacer la vitesse des paramètres par un tableau (courbe).
+    """
+    return dimensionner(
+        meta_parametre(parametres, 'wind_speed') if wind_speed is None else wind_speed,
+        parametres.get('rayon_petale'), parametres.get('rayon_rosaire'),
+        parametres.get('hauteur_petale'), parametres.get('hauteur_dome'),
+        parametres.get('material') or MATERIAU_DEFAUT,
+        meta_parametre(parametres, 'safety_factor'),
+        nb_plots,
+    )
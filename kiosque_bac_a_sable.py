@@ -0,0 +1,321 @@
+"""
+🧪 BAC À SABLE D'EXÉCUTION DU SCRIPT
+Le script du kiosque est exécuté hors du processus FreeCAD de l'interface : un
+serveur (processus séparé) importe FreeCAD et charge le module UNE fois, puis
+chaque génération tourne dans un enfant `fork()` de ce serveur (copie sur
+écriture : démarrage quasi nul), avec délai maximal et limite mémoire.
+
+Un script lent, qui plante ou qui épuise la mémoire ne coûte que l'enfant ; le
+résultat revient sous forme de formes BREP sérialisées, reconstruites en
+`Part::Feature` dans un document de l'interface (`reconstruire_document`).
+Recharger le script relance le serveur : il n'est jamais exécuté dans l'interface.
+
+Sans `os.fork` (Windows), le serveur exécute lui-même les jobs : l'interface reste
+protégée (serveur relancé après un plantage, un dépassement de délai ou une
+annulation) mais la limite mémoire n'est pas appliquée.
+"""
+
+import os
+import sys
+import threading
+import time
+
+DELAI_DEFAUT_S = 300
+MEMOIRE_DEFAUT_MO = 4096
+DELAI_DEMARRAGE_S = 120  # import de FreeCAD + exécution du script dans le serveur
+MARGE_S = 5  # au-delà du délai du job, le client considère le serveur bloqué
+FORK_DISPONIBLE = hasattr(os, 'fork')
+
+
+class ErreurBacASable(Exception):
+    """Levée quand un job du bac à sable échoue : délai, mémoire, plantage ou erreur du script."""
+
+
+# ============================================================================
+# CÔTÉ SERVEUR (processus séparé, enfants forkés)
+# ============================================================================
+
+def _executer_job(module, job, envoyer):
+    """Construit la variante `job` puis envoie ('resultat', dict) ; progression : ('rappel', texte)."""
+    import traceback
+
+    from kiosque_export import formes_brep
+    from kiosque_generation import construire_kiosque
+
+    debut = time.perf_counter()
+    config = {}
+    try:
+        doc = construire_kiosque(module, job['parametres'], lambda message: envoyer(('rappel', message)),
+                                 instances=job.get('instances', False), config_effective=config)
+        if doc is None:
+            raise RuntimeError("Aucun document produit")
+        resultat = {'statut': 'ok', 'formes': formes_brep(doc), 'objets': len(doc.Objects),
+                    'config': {cle: valeur for cle, valeur in config.items()
+                               if isinstance(valeur, (bool, int, float, str, type(None)))}}
+    except MemoryError:
+        resultat = {'statut': 'erreur', 'erreur': f"Limite mémoire atteinte ({job.get('memoire_mo')} Mo)"}
+    except Exception as e:
+        resultat = {'statut': 'erreur', 'erreur': f"{type(e).__name__}: {e}",
+                    'trace': traceback.format_exc()}
+    resultat['duree_s'] = round(time.perf_counter() - debut, 4)
+    envoyer(('resultat', resultat))
+
+
+def _enfant(module, job, emetteur):
+    """Corps de l'enfant forké : limite mémoire, construction, envoi ; ne retourne jamais."""
+    code = 0
+    try:
+        if job.get('memoire_mo'):
+            import resource
+            octets = int(job['memoire_mo']) * 1048576
+            resource.setrlimit(resource.RLIMIT_AS, (octets, octets))
+        _executer_job(module, job, emetteur.send)
+    except BaseException:
+        code = 1
+    finally:
+        os._exit(code)  # pas de nettoyage hérité du serveur (atexit, FreeCAD)
+
+
+def _executer_forke(module, job, connexion):
+    """Exécute `job` dans un enfant forké ; relaie sa progression et tue l'enfant au besoin."""
+    import signal
+    from multiprocessing.connection import Pipe, wait
+
+    recepteur, emetteur = Pipe(duplex=False)
+    pid = os.fork()
+    if pid == 0:
+        recepteur.close()
+        _enfant(module, job, emetteur)
+    emetteur.close()
+
+    echeance = time.monotonic() + job['delai_s']
+    resultat = None
+    termine = False  # l'enfant a envoyé son résultat et sort de lui-même
+    try:
+        while resultat is None:
+            reste = echeance - time.monotonic()
+            if reste <= 0:
+                resultat = {'statut': 'erreur', 'erreur': f"Délai dépassé ({job['delai_s']} s)"}
+                break
+            prets = wait([recepteur, connexion], timeout=reste)
+            if connexion in prets and connexion.recv().get('action') == 'annuler':
+                resultat = {'statut': 'annule'}
+                break
+            if recepteur in prets:
+                try:
+                    genre, contenu = recepteur.recv()
+                except EOFError:
+                    break  # enfant mort sans résultat
+                if genre == 'rappel':
+                    connexion.send(('rappel', contenu))
+                else:
+                    resultat, termine = contenu, True
+    finally:
+        if not termine:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        _, statut, usage = os.wait4(pid, 0)
+        recepteur.close()
+
+    if resultat is None:
+        if os.WIFSIGNALED(statut):
+            cause = f"signal {signal.Signals(os.WTERMSIG(statut)).name}"
+        else:
+            cause = f"code {os.WEXITSTATUS(statut)}"
+        resultat = {'statut': 'erreur', 'erreur': f"Le script a planté ({cause})"}
+    # ru_maxrss : Ko sous Linux, octets sous macOS
+    resultat['memoire_max_mo'] = round(usage.ru_maxrss / (1048576 if sys.platform == 'darwin' else 1024), 1)
+    connexion.send(('resultat', resultat))
+
+
+def _executer_sur_place(module, job, connexion):
+    """Sans fork : job exécuté dans le serveur, documents créés refermés ensuite."""
+    import FreeCAD as App
+
+    avant = set(App.listDocuments())
+    try:
+        _executer_job(module, job, connexion.send)
+    finally:
+        for nom in set(App.listDocuments()) - avant:
+            try:
+                App.closeDocument(nom)
+            except Exception:
+                pass
+
+
+def _serveur(connexion, chemin_script, chemins):
+    """Point d'entrée du serveur : FreeCAD et le script chargés une fois, puis boucle de jobs."""
+    for chemin in chemins:
+        if chemin not in sys.path:
+            sys.path.append(chemin)
+    debut = time.perf_counter()
+    try:
+        import FreeCAD  # noqa: F401
+
+        from kiosque_generation import charger_module
+        module = charger_module(chemin_script)
+    except BaseException as e:
+        connexion.send(('erreur', f"{type(e).__name__}: {e}"))
+        return
+    connexion.send(('pret', {'pid': os.getpid(), 'fork': FORK_DISPONIBLE,
+                             'duree_s': round(time.perf_counter() - debut, 3)}))
+    while True:
+        try:
+            job = connexion.recv()
+        except (EOFError, OSError):
+            return
+        action = job.get('action')
+        if action == 'arreter':
+            return
+        if action != 'generer':
+            continue  # annulation arrivée après la fin du job
+        if FORK_DISPONIBLE:
+            _executer_forke(module, job, connexion)
+        else:
+            _executer_sur_place(module, job, connexion)
+
+
+# ============================================================================
+# CÔTÉ INTERFACE
+# ============================================================================
+
+class BacASable:
+    """Serveur d'exécution isolée du script (voir le module), piloté depuis l'interface."""
+
+    def __init__(self, chemin_script, chemins_supplementaires=(), delai_s=DELAI_DEFAUT_S,
+                 memoire_mo=MEMOIRE_DEFAUT_MO):
+        self.chemin_script = os.path.abspath(chemin_script)
+        self.chemins_supplementaires = tuple(chemins_supplementaires)
+        self.delai_s = delai_s
+        self.memoire_mo = memoire_mo
+        self.infos = None
+        self._processus = None
+        self._connexion = None
+        self._verrou = threading.Lock()
+
+    def actif(self):
+        return self._processus is not None and self._processus.is_alive()
+
+    def demarrer(self):
+        """Lance le serveur et attend qu'il ait chargé FreeCAD et le script."""
+        from kiosque_batch import chemins_freecad, contexte_processus
+
+        ctx = contexte_processus()
+        self._connexion, cote_serveur = ctx.Pipe()
+        self._processus = ctx.Process(target=_serveur, name='kiosque-bac-a-sable', daemon=True,
+                                      args=(cote_serveur, self.chemin_script,
+                                            chemins_freecad(self.chemins_supplementaires)))
+        self._processus.start()
+        cote_serveur.close()
+        if not self._connexion.poll(DELAI_DEMARRAGE_S):
+            self._tuer()
+            raise ErreurBacASable(f"Le serveur n'a pas démarré en {DELAI_DEMARRAGE_S} s")
+        try:
+            genre, contenu = self._connexion.recv()
+        except EOFError:
+            code = self._tuer()
+            raise ErreurBacASable(f"Le serveur s'est arrêté au démarrage (code {code})")
+        if genre != 'pret':
+            self._tuer()
+            raise ErreurBacASable(f"Chargement du script impossible: {contenu}")
+        self.infos = contenu
+        return contenu
+
+    def _tuer(self):
+        """Termine le serveur sans attendre sa coopération ; retourne son code de sortie."""
+        processus, self._processus = self._processus, None
+        if self._connexion is not None:
+            self._connexion.close()
+            self._connexion = None
+        if processus is None:
+            return None
+        if processus.is_alive():
+            processus.kill()
+        processus.join(5)
+        return processus.exitcode
+
+    def arreter(self):
+        with self._verrou:
+            if self.actif():
+                try:
+                    self._connexion.send({'action': 'arreter'})
+                    self._processus.join(5)
+                except OSError:
+                    pass
+            self._tuer()
+
+    def _demarrer_si_besoin(self):
+        if not self.actif():
+            self._tuer()
+            self.demarrer()
+
+    def prechauffer(self):
+        """Démarre le serveur s'il ne tourne pas (depuis un thread : le job suivant n'attend pas)."""
+        with self._verrou:
+            self._demarrer_si_besoin()
+
+    def recharger(self, chemin_script=None):
+        """Relance le serveur (script modifié ou autre script) : le script n'est exécuté que là."""
+        self.arreter()
+        if chemin_script:
+            self.chemin_script = os.path.abspath(chemin_script)
+        with self._verrou:
+            return self.demarrer()
+
+    def generer(self, parametres, rappel=None, annulation=None, instances=False):
+        """Génère `parametres` dans le bac à sable ; retourne le résultat (`formes` BREP...).
+
+        Lève `GenerationAnnulee` si `annulation` est positionné, `ErreurBacASable` sinon.
+        """
+        from kiosque_generation import GenerationAnnulee
+
+        with self._verrou:
+            self._demarrer_si_besoin()
+            fork = self.infos['fork']
+            self._connexion.send({'action': 'generer', 'parametres': parametres, 'instances': instances,
+                                  'delai_s': self.delai_s, 'memoire_mo': self.memoire_mo})
+            echeance = time.monotonic() + self.delai_s + MARGE_S
+            annulation_envoyee = False
+            while True:
+                if annulation is not None and annulation.is_set() and not annulation_envoyee:
+                    if not fork:  # le serveur exécute le job lui-même : seul l'arrêt l'interrompt
+                        self._tuer()
+                        raise GenerationAnnulee("Génération annulée par l'utilisateur")
+                    self._connexion.send({'action': 'annuler'})
+                    annulation_envoyee = True
+                if not self._connexion.poll(0.1):
+                    if time.monotonic() > echeance:
+                        self._tuer()
+                        raise ErreurBacASable(f"Délai dépassé ({self.delai_s} s) : serveur relancé au prochain job")
+                    if not self._processus.is_alive():
+                        code = self._tuer()
+                        raise ErreurBacASable(f"Le serveur du bac à sable s'est arrêté (code {code})")
+                    continue
+                try:
+                    genre, contenu = self._connexion.recv()
+                except (EOFError, OSError):
+                    code = self._tuer()
+                    raise ErreurBacASable(f"Le serveur du bac à sable s'est arrêté (code {code})")
+                if genre == 'rappel':
+                    if rappel is not None:
+                        rappel(contenu)
+                    continue
+                if contenu['statut'] == 'annule':
+                    raise GenerationAnnulee("Génération annulée par l'utilisateur")
+                if contenu['statut'] != 'ok':
+                    raise ErreurBacASable(contenu['erreur'])
+                return contenu
+
+
+def reconstruire_document(resultat, nom="Kiosque_BacASable"):
+    """Nouveau document : un `Part::Feature` par forme BREP du résultat d'un job."""
+    import FreeCAD as App
+
+    from kiosque_export import ajouter_formes
+
+    doc = App.newDocument(nom)
+    ajouter_formes(doc, resultat['formes'])
+    doc.recompute()
+    return doc
@@ -0,0 +1,578 @@
+"""
+🏭 GÉNÉRATION BATCH DU KIOSQUE TRÈFLE (sans interface graphique)
+Balayage de paramètres réparti sur un pool de processus FreeCAD headless.
+
+Exemples :
+    python kiosque_batch.py kiosque_trefle_4petales_dome22.py \
+        --grille rayon_petale=2000:2400:200 hauteur_dome=3000,3500 material="Bambou (temporaire)" \
+        --sortie variantes --formats fcstd,step
+
+    python kiosque_batch.py kiosque_trefle_4petales_dome22.py --csv variantes.csv -j 8
+
+    python kiosque_batch.py --dimensionner --grille wind_speed=60:200:5 rayon_petale=1500:3000:50
+    python kiosque_batch.py --metre --grille rayon_petale=1500:3000:100 material="Bambou (temporaire)"
+    python kiosque_batch.py --fiabilite --grille wind_speed=100,130 material="Bambou (temporaire)"
+
+Chaque processus charge le script une seule fois (initialiseur du pool) puis enchaîne
+les variantes ; un `manifest.json` récapitule paramètres, durées, fichiers et erreurs.
+`--instances` place les pétales/plots symétriques en `App::Link` (`kiosque_instances`) ;
+`--developper-liens` les remplace par des solides juste avant l'export STEP.
+Les formats `stl` et `glb` (glTF binaire) sont maillés dans le worker de la variante
+(`kiosque_export`, déviation réglable par `--deviation`) et écrits au fil de l'eau.
+`--dimensionner` calcule seulement vent/ancrage (`kiosque_ancrage`, sans CAD ni script)
+et écrit `dimensionnement.csv` ; `--metre` écrit le métré analytique (`kiosque_metre`)
+dans `metre.csv` ; `--fiabilite` la probabilité de défaillance de l'ancrage et le lest
+requis (Monte-Carlo, `kiosque_fiabilite`) dans `fiabilite.csv`. Chaque variante est enregistrée dans l'historique des générations
+(`kiosque_historique`), sauf avec `--sans-historique`. `--journal variantes.jsonl`
+écrit un évènement JSON par variante (statut, durée, mémoire, fichiers) via `kiosque_journal`.
+Ni FreeCADGui ni PySide ne sont importés.
+"""
+
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+from kiosque_documents import memoire_residente
+from kiosque_generation import (FS_DEFAUT, PARAMETRES, VENT_DEFAUT, charger_module, construire_kiosque,
+                                hash_fichier)
+from kiosque_journal import JOURNAL
+from kiosque_profil import PROFILEUR
+
+# Valeurs par défaut des méta-paramètres (identiques à l'interface)
+DEFAUTS = {
+    'material': 'Acier galvanisé (permanent)',
+    'wind_speed': VENT_DEFAUT,
+    'safety_factor': FS_DEFAUT,
+}
+
+FORMATS = ('fcstd', 'step')
+FORMATS_DISPONIBLES = FORMATS + ('brep', 'stl', 'glb')
+
+
+# ============================================================================
+# LECTURE DES VARIANTES
+# ============================================================================
+
+def _nombre(texte):
+    """Convertit une chaîne en int/float si possible, sinon la retourne telle quelle."""
+    texte = texte.strip()
+    for conv in (int, float):
+        try:
+            return conv(texte)
+        except ValueError:
+            pass
+    return texte
+
+
+def _valeurs(spec):
+    """'2000:2400:200' -> [2000, 2200, 2400] ; '3000,3500' -> [3000, 3500]."""
+    if spec.count(':') == 2:
+        debut, fin, pas = (_nombre(v) for v in spec.split(':'))
+        if not all(isinstance(v, (int, float)) for v in (debut, fin, pas)) or pas <= 0:
+            raise ValueError(f"Plage invalide: {spec}")
+        n = int((fin - debut) / pas + 1e-9) + 1
+        return [debut + k * pas for k in range(max(n, 0))]
+    return [_nombre(v) for v in spec.split(',')]
+
+
+def variantes_grille(specs):
+    """Produit cartésien des specs 'cle=valeurs'."""
+    axes = {}
+    for spec in specs:
+        cle, _, valeurs = spec.partition('=')
+        cle = cle.strip()
+        if cle not in PARAMETRES:
+            raise ValueError(f"Paramètre inconnu: {cle} (attendu: {', '.join(PARAMETRES)})")
+        axes[cle] = _valeurs(valeurs)
+    cles = list(axes)
+    return [dict(zip(cles, combinaison)) for combinaison in itertools.product(*axes.values())]
+
+
+def variantes_csv(chemin):
+    """Une variante par ligne ; les colonnes hors `PARAMETRES` sont ignorées."""
+    variantes = []
+    with open(chemin, newline='', encoding='utf-8') as f:
+        for ligne in csv.DictReader(f):
+            variantes.append({cle: _nombre(valeur) for cle, valeur in ligne.items()
+                              if cle in PARAMETRES and valeur not in (None, '')})
+    return variantes
+
+
+def completer(variante):
+    """Ajoute les valeurs par défaut manquantes (dimensions None = valeur du script)."""
+    parametres = {cle: None for cle in PARAMETRES}
+    parametres.update(DEFAUTS)
+    parametres.update(variante)
+    return parametres
+
+
+# ============================================================================
+# POOL DE PROCESSUS
+# ============================================================================
+
+def interpreteur_python():
+    """Interpréteur Python à utiliser pour les workers.
+
+    Dans FreeCAD (GUI ou FreeCADCmd) `sys.executable` n'est pas un interpréteur
+    Python : on utilise alors le `python` livré dans le même dossier `bin`.
+    """
+    if os.path.basename(sys.executable).lower().startswith('python'):
+        return sys.executable
+    dossier = os.path.dirname(sys.executable)
+    for nom in ('python.exe', 'python3', 'python'):
+        candidat = os.path.join(dossier, nom)
+        if os.path.exists(candidat):
+            return candidat
+    return sys.executable
+
+
+def contexte_processus():
+    """Contexte multiprocessing 'spawn' pointant sur un vrai interpréteur Python."""
+    import multiprocessing
+
+    ctx = multiprocessing.get_context('spawn')
+    ctx.set_executable(interpreteur_python())
+    return ctx
+
+
+def chemins_freecad(supplementaires=()):
+    """Dossiers à ajouter à `sys.path` des workers pour pouvoir `import FreeCAD`."""
+    chemins = [os.path.abspath(c) for c in supplementaires]
+    try:
+        import FreeCAD
+        chemins.append(os.path.dirname(os.path.abspath(FreeCAD.__file__)))
+    except ImportError:
+        pass
+    return chemins
+
+
+_MODULE = None
+_CACHE = None
+_HISTORIQUE = None
+_HASH_SCRIPT = None
+
+
+def _initialiser_worker(chemin_script, chemins, dossier_cache=None, chemin_historique=None):
+    """Initialiseur du pool : importe FreeCAD et charge le script UNE fois par processus."""
+    global _MODULE, _CACHE, _HISTORIQUE, _HASH_SCRIPT
+    for chemin in chemins:
+        if chemin not in sys.path:
+            sys.path.append(chemin)
+    import FreeCAD  # noqa: F401  (échoue tôt si FreeCAD est introuvable)
+    _MODULE = charger_module(chemin_script)
+    if dossier_cache:
+        from kiosque_cache import CacheGeometrie
+        _CACHE = CacheGeometrie(dossier_cache)
+    if chemin_historique:
+        from kiosque_historique import HistoriqueGenerations
+        _HISTORIQUE = HistoriqueGenerations(chemin_historique)
+        _HASH_SCRIPT = hash_fichier(chemin_script)
+
+
+def _racines(doc):
+    """Objets racines à exporter, maîtres des instances (référencés par des liens seulement) compris."""
+    from kiosque_instances import TYPE_LIEN
+
+    return [o for o in doc.Objects
+            if (o.TypeId == TYPE_LIEN or hasattr(o, 'Shape') and not o.Shape.isNull())
+            and all(p.TypeId == TYPE_LIEN for p in o.InList)]
+
+
+def _exporter(doc, base, formats, developper_liens=False, deviation=None):
+    """Exporte `doc` ; les `App::Link` ne sont développés en solides que pour le STEP, sur demande."""
+    fichiers = {}
+    if 'stl' in formats or 'glb' in formats:
+        # Avant un éventuel développement des liens : `getShape` les résout déjà
+        from kiosque_export import DEVIATION_DEFAUT_MM, FORMATS_MAILLAGE, exporter_document
+        fichiers.update(exporter_document(doc, base, [f for f in formats if f in FORMATS_MAILLAGE],
+                                          deviation or DEVIATION_DEFAUT_MM))
+    if 'fcstd' in formats:
+        chemin = base + '.FCStd'
+        doc.saveAs(chemin)
+        fichiers['fcstd'] = chemin
+    if 'step' in formats:
+        import Import
+        from kiosque_instances import developper_liens as developper
+        if developper_liens:
+            developper(doc)
+        chemin = base + '.step'
+        Import.export(_racines(doc), chemin)
+        fichiers['step'] = chemin
+    if 'brep' in formats:
+        import Part
+        # Un seul composé ; `getShape` résout les liens (placements compris)
+        chemin = base + '.brep'
+        Part.makeCompound([Part.getShape(o) for o in _racines(doc)]).exportBrep(chemin)
+        fichiers['brep'] = chemin
+    return fichiers
+
+
+def generer_variante(index, variante, dossier, formats, instances=False, developper_liens=False,
+                     origine='batch', deviation=None):
+    """Construit une variante dans le worker courant et retourne son entrée de manifeste."""
+    import FreeCAD as App
+
+    parametres = completer(variante)
+    entree = {'index': index, 'parametres': parametres, 'fichiers': {}, 'statut': 'ok'}
+    config, geometrie = {}, None
+    debut = time.perf_counter()
+    docs_avant = set(App.listDocuments())
+    try:
+        doc = construire_kiosque(_MODULE, parametres, cache=_CACHE, instances=instances,
+                                 config_effective=config)
+        if doc is None:
+            raise RuntimeError("Aucun document produit")
+        if _HISTORIQUE is not None:
+            from kiosque_historique import resume_geometrie
+            geometrie = resume_geometrie(doc)  # avant un éventuel développement des liens
+        base = os.path.join(dossier, f"variante_{index:04d}")
+        entree['fichiers'] = _exporter(doc, base, formats, developper_liens, deviation)
+        entree['objets'] = len(doc.Objects)
+    except Exception as e:
+        entree['statut'] = 'erreur'
+        entree['erreur'] = f"{type(e).__name__}: {e}"
+    finally:
+        # Fermer tous les documents créés par cette variante (mémoire bornée)
+        for nom in set(App.listDocuments()) - docs_avant:
+            try:
+                App.closeDocument(nom)
+            except Exception:
+                pass
+    entree['duree_s'] = round(time.perf_counter() - debut, 3)
+    rss = memoire_residente()
+    if rss is not None:
+        entree['memoire_mo'] = round(rss / 1048576, 1)  # après fermeture des documents
+    if _HISTORIQUE is not None:
+        try:
+            _HISTORIQUE.enregistrer(
+                parametres, config=config or None, hash_script=_HASH_SCRIPT,
+                cible='generer_kiosque_complet_avec_plots', duree_s=entree['duree_s'],
+                phases=PROFILEUR.resume(depuis=debut), geometrie=geometrie,
+                fichier=entree['fichiers'].get('fcstd'), statut=entree['statut'],
+                erreur=entree.get('erreur'), origine=origine)
+        except Exception as e:
+            JOURNAL.avertissement(f"⚠️  Historique non enregistré: {e}")
+    return entree
+
+
+def executer_batch(chemin_script, variantes, dossier, formats=FORMATS, processus=None,
+                   chemins_supplementaires=(), dossier_cache=None, instances=False,
+                   developper_liens=False, historique=None, deviation=None):
+    """Répartit `variantes` sur un pool de processus et écrit `manifest.json`.
+
+    `dossier_cache` active le cache de géométrie partagé entre les workers ;
+    `instances` l'instanciation App::Link des symétries, `developper_liens` leur
+    développement en solides avant l'export STEP ; `historique` (fichier SQLite)
+    l'enregistrement de chaque variante dans l'historique des générations ;
+    `deviation` (mm) la finesse des maillages STL/glTF.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    os.makedirs(dossier, exist_ok=True)
+    chemin_script = os.path.abspath(chemin_script)
+    processus = processus or os.cpu_count() or 1
+    debut = time.perf_counter()
+
+    entrees = []
+    with ProcessPoolExecutor(max_workers=processus, mp_context=contexte_processus(),
+                             initializer=_initialiser_worker,
+                             initargs=(chemin_script, chemins_freecad(chemins_supplementaires),
+                                       dossier_cache, historique)) as pool:
+        futures = {pool.submit(generer_variante, i, v, os.path.abspath(dossier), tuple(formats),
+                               instances, developper_liens, 'batch', deviation): (i, v)
+                   for i, v in enumerate(variantes, start=1)}
+        for future in as_completed(futures):
+            try:
+                entree = future.result()
+            except Exception as e:
+                # Worker mort (plantage FreeCAD : pool cassé) : la variante échoue, le batch continue
+                index, variante = futures[future]
+                entree = {'index': index, 'parametres': completer(variante), 'fichiers': {},
+                          'statut': 'erreur', 'erreur': f"{type(e).__name__}: {e}", 'duree_s': 0.0}
+            entrees.append(entree)
+            _afficher_entree(entree, len(entrees), len(variantes))
+
+    return _ecrire_manifeste(dossier, chemin_script, formats, processus, instances, debut, entrees)
+
+
+def _afficher_entree(entree, rang, total):
+    symbole = "✅" if entree['statut'] == 'ok' else "❌"
+    JOURNAL.ecrire('info' if entree['statut'] == 'ok' else 'avertissement',
+                   f"{symbole} [{rang}/{total}] variante {entree['index']:04d} "
+                   f"({entree['duree_s']:.1f} s) {entree.get('erreur', '')}",
+                   evenement='variante', rang=rang, total=total,
+                   **{cle: entree.get(cle) for cle in ('index', 'statut', 'duree_s', 'memoire_mo',
+                                                       'erreur', 'parametres', 'fichiers')})
+
+
+def _afficher_resume(manifeste):
+    """Bilan du batch : toujours en console (après le surplus limité), et dans le journal."""
+    message = (f"📋 {manifeste['reussies']} réussie(s), {manifeste['echouees']} échec(s) "
+               f"en {manifeste['duree_totale_s']:.1f} s")
+    JOURNAL.info(message, console=False, evenement='bilan', reussies=manifeste['reussies'],
+                 echouees=manifeste['echouees'], duree_totale_s=manifeste['duree_totale_s'])
+    JOURNAL.vider()
+    print(message)
+
+
+def _ecrire_manifeste(dossier, chemin_script, formats, processus, instances, debut, entrees):
+    entrees.sort(key=lambda e: e['index'])
+    manifeste = {
+        'script': chemin_script,
+        'script_sha256': hash_fichier(chemin_script),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'processus': processus,
+        'formats': list(formats),
+        'instances': instances,
+        'duree_totale_s': round(time.perf_counter() - debut, 3),
+        'reussies': sum(1 for e in entrees if e['statut'] == 'ok'),
+        'echouees': sum(1 for e in entrees if e['statut'] != 'ok'),
+        'variantes': entrees,
+    }
+    with open(os.path.join(dossier, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifeste, f, indent=2, ensure_ascii=False)
+    return manifeste
+
+
+def executer_via_service(variantes, dossier, formats=FORMATS, chemin_script=None, instances=False,
+                         developper_liens=False, deviation=None):
+    """Comme `executer_batch`, mais avec les workers préchauffés de `kiosque_service`.
+
+    Une connexion par worker du service ; `chemin_script` None : celui du service.
+    Cache et historique sont ceux du démarrage du service. Lève
+    `kiosque_service.ServiceIndisponible` si aucun service ne répond.
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    from kiosque_service import ClientService
+
+    os.makedirs(dossier, exist_ok=True)
+    dossier = os.path.abspath(dossier)
+    debut = time.perf_counter()
+    with ClientService() as client:
+        etat = client.etat()
+    chemin_script = os.path.abspath(chemin_script) if chemin_script else etat['script']
+    processus = max(1, len(etat['workers']))
+    clients, local = [], threading.local()  # une connexion par thread
+
+    def generer(index, variante):
+        if getattr(local, 'client', None) is None:
+            local.client = ClientService()
+            clients.append(local.client)
+        entree = local.client.generer(variante, formats, dossier, index, chemin_script,
+                                      instances=instances, developper_liens=developper_liens,
+                                      deviation=deviation)
+        entree.pop('latence_s', None)
+        return entree
+
+    entrees = []
+    try:
+        with ThreadPoolExecutor(max_workers=processus) as threads:
+            futures = [threads.submit(generer, i, v) for i, v in enumerate(variantes, start=1)]
+            for future in as_completed(futures):
+                entrees.append(future.result())
+                _afficher_entree(entrees[-1], len(entrees), len(variantes))
+    finally:
+        for client in clients:
+            client.fermer()
+    return _ecrire_manifeste(dossier, chemin_script, formats, processus, instances, debut, entrees)
+
+
+# ============================================================================
+# DIMENSIONNEMENT SANS CAO
+# ============================================================================
+
+COLONNES_DIMENSIONNEMENT = ('pression', 'effort_horizontal', 'moment', 'soulevement', 'fs',
+                            'traction_plot', 'masse_plot', 'cote_plot')
+
+
+def _colonnes_parametres(variantes):
+    """Variantes complétées -> {clé de PARAMETRES: liste de valeurs} (géométrie par défaut si absente)."""
+    from kiosque_ancrage import GEOMETRIE_DEFAUT
+
+    completes = [completer(v) for v in variantes]
+    return {cle: [p[cle] if p[cle] is not None else GEOMETRIE_DEFAUT.get(cle) for p in completes]
+            for cle in PARAMETRES}
+
+
+def ecrire_csv_vectorise(chemin, colonne, resultats, colonnes_resultats):
+    """CSV d'une ligne par variante : index, `PARAMETRES` (`colonne`) puis `colonnes_resultats`."""
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    with open(chemin, 'w', newline='', encoding='utf-8') as f:
+        ecrivain = csv.writer(f)
+        ecrivain.writerow(['index'] + PARAMETRES + list(colonnes_resultats))
+        for i in range(len(colonne[PARAMETRES[0]])):
+            ecrivain.writerow([i + 1] + [colonne[cle][i] for cle in PARAMETRES]
+                              + [round(float(resultats[cle][i]), 4) for cle in colonnes_resultats])
+    return chemin
+
+
+def dimensionner_variantes(variantes, dossier):
+    """Dimensionne toutes les variantes en un seul appel vectorisé ; écrit `dimensionnement.csv`."""
+    from kiosque_ancrage import dimensionner
+
+    debut = time.perf_counter()
+    colonne = _colonnes_parametres(variantes)
+    resultats = dimensionner(colonne['wind_speed'], colonne['rayon_petale'], colonne['rayon_rosaire'],
+                             colonne['hauteur_petale'], colonne['hauteur_dome'],
+                             colonne['material'], colonne['safety_factor'])
+    chemin = ecrire_csv_vectorise(os.path.join(dossier, 'dimensionnement.csv'), colonne,
+                                   resultats, COLONNES_DIMENSIONNEMENT)
+    return chemin, time.perf_counter() - debut
+
+
+def metrer_variantes(variantes, dossier):
+    """Métré analytique (`kiosque_metre`) de toutes les variantes ; écrit `metre.csv`."""
+    from kiosque_metre import COLONNES_METRE, estimer
+
+    debut = time.perf_counter()
+    colonne = _colonnes_parametres(variantes)
+    resultats = estimer(colonne['rayon_petale'], colonne['rayon_rosaire'],
+                        colonne['hauteur_petale'], colonne['hauteur_dome'],
+                        colonne['material'], colonne['wind_speed'], colonne['safety_factor'])
+    chemin = ecrire_csv_vectorise(os.path.join(dossier, 'metre.csv'), colonne,
+                                   resultats, COLONNES_METRE)
+    return chemin, time.perf_counter() - debut
+
+
+def fiabiliser_variantes(variantes, dossier, echantillons=None, cible=None):
+    """Monte-Carlo de l'ancrage (`kiosque_fiabilite`) de chaque variante ; écrit `fiabilite.csv`."""
+    from kiosque_fiabilite import CIBLE_DEFAUT, COLONNES_FIABILITE, ECHANTILLONS_DEFAUT, analyser_parametres
+
+    debut = time.perf_counter()
+    colonne = _colonnes_parametres(variantes)
+    resultats = {cle: [] for cle in COLONNES_FIABILITE}
+    for i in range(len(variantes)):
+        r = analyser_parametres({cle: colonne[cle][i] for cle in PARAMETRES},
+                                echantillons=echantillons or ECHANTILLONS_DEFAUT, cible=cible or CIBLE_DEFAUT)
+        for cle in COLONNES_FIABILITE:
+            resultats[cle].append(r[cle])
+    # 4 décimales ne suffisent pas aux probabilités : écrites en notation scientifique
+    resultats = {cle: [float(f"{v:.3g}") for v in valeurs] if cle.startswith('pf') else valeurs
+                 for cle, valeurs in resultats.items()}
+    chemin = ecrire_csv_vectorise(os.path.join(dossier, 'fiabilite.csv'), colonne,
+                                   resultats, COLONNES_FIABILITE)
+    return chemin, time.perf_counter() - debut
+
+
+# ============================================================================
+# LIGNE DE COMMANDE
+# ============================================================================
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Génération batch de variantes du kiosque trèfle")
+    parser.add_argument('script', nargs='?', help="Chemin de kiosque_trefle_4petales_dome22.py")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--grille', nargs='+', metavar='CLE=VALEURS',
+                        help="Axes du balayage : 'debut:fin:pas' ou 'v1,v2,...'")
+    source.add_argument('--csv', help="Fichier CSV, une variante par ligne")
+    parser.add_argument('--sortie', default='variantes', help="Dossier de sortie (défaut: variantes)")
+    parser.add_argument('--formats', default=','.join(FORMATS),
+                        help="Formats exportés parmi fcstd,step,brep,stl,glb (défaut: fcstd,step)")
+    parser.add_argument('--deviation', type=float, default=None, metavar='MM',
+                        help="Déviation de maillage des formats stl/glb en mm (défaut: 1.0)")
+    parser.add_argument('-j', '--processus', type=int, default=None,
+                        help="Nombre de processus (défaut: nombre de cœurs)")
+    parser.add_argument('--freecad-lib', action='append', default=[],
+                        help="Dossier contenant FreeCAD.pyd/.so (répétable)")
+    parser.add_argument('--cache', nargs='?', const='', default=None, metavar='DOSSIER',
+                        help="Réutiliser le cache de géométrie (dossier optionnel)")
+    parser.add_argument('--instances', action='store_true',
+                        help="Pétales/plots symétriques en App::Link (FCStd plus léger)")
+    parser.add_argument('--developper-liens', action='store_true',
+                        help="Avec --instances : liens développés en solides pour l'export STEP")
+    parser.add_argument('--service', action='store_true',
+                        help="Soumettre les variantes au service de génération (workers préchauffés)")
+    parser.add_argument('--sans-historique', action='store_true',
+                        help="Ne pas enregistrer les variantes dans l'historique des générations")
+    parser.add_argument('--journal', metavar='FICHIER.jsonl',
+                        help="Journal structuré (une ligne JSON par évènement) à compléter")
+    parser.add_argument('--dimensionner', action='store_true',
+                        help="Dimensionnement vent/ancrage seul (sans CAO ni script)")
+    parser.add_argument('--metre', action='store_true',
+                        help="Métré analytique seul : tubes, dôme, béton, masses (sans CAO ni script)")
+    parser.add_argument('--fiabilite', action='store_true',
+                        help="Fiabilité de l'ancrage seule : Monte-Carlo vent/béton/matériau (sans CAO ni script)")
+    parser.add_argument('--echantillons', type=int, default=None, metavar='N',
+                        help="Avec --fiabilite : tirages par variante (défaut: 1 000 000)")
+    parser.add_argument('--cible', type=float, default=None, metavar='PF',
+                        help="Avec --fiabilite : probabilité annuelle de défaillance visée (défaut: 1e-4)")
+    args = parser.parse_args(argv)
+    analyses = args.dimensionner or args.metre or args.fiabilite
+    if args.script is None and not (analyses or args.service):
+        parser.error("Le chemin du script est requis (sauf avec --dimensionner, --metre, --fiabilite "
+                     "ou --service)")
+    if args.service:
+        # Réglages des workers, fixés au démarrage du service (kiosque_service.py demarrer)
+        options_service = [option for option, donnee in (('--cache', args.cache is not None),
+                                                          ('--sans-historique', args.sans_historique),
+                                                          ('--freecad-lib', args.freecad_lib)) if donnee]
+        if options_service:
+            parser.error(f"{', '.join(options_service)} : à passer au démarrage du service, "
+                         f"pas avec --service")
+
+    formats = [f.strip().lower() for f in args.formats.split(',') if f.strip()]
+    inconnus = set(formats) - set(FORMATS_DISPONIBLES)
+    if inconnus:
+        parser.error(f"Format(s) inconnu(s): {', '.join(sorted(inconnus))}")
+
+    try:
+        variantes = variantes_csv(args.csv) if args.csv else variantes_grille(args.grille)
+    except ValueError as e:
+        parser.error(str(e))
+    if not variantes:
+        parser.error("Aucune variante à générer")
+
+    if args.dimensionner:
+        chemin, duree = dimensionner_variantes(variantes, args.sortie)
+        print(f"🌬️ {len(variantes)} variante(s) dimensionnée(s) en {duree * 1000:.0f} ms -> {chemin}")
+    if args.metre:
+        chemin, duree = metrer_variantes(variantes, args.sortie)
+        print(f"📐 {len(variantes)} variante(s) métrée(s) en {duree * 1000:.0f} ms -> {chemin}")
+    if args.fiabilite:
+        chemin, duree = fiabiliser_variantes(variantes, args.sortie, args.echantillons, args.cible)
+        print(f"🎲 {len(variantes)} variante(s) analysée(s) (Monte-Carlo) en {duree:.1f} s -> {chemin}")
+    if analyses:
+        return 0
+    if args.journal:
+        JOURNAL.ouvrir_fichier(args.journal)
+
+    if args.service:
+        from kiosque_service import ServiceIndisponible
+
+        print(f"🔥 {len(variantes)} variante(s) -> service de génération -> {args.sortie}")
+        try:
+            manifeste = executer_via_service(variantes, args.sortie, formats, args.script, args.instances,
+                                             args.developper_liens, args.deviation)
+        except ServiceIndisponible as e:
+            print(f"❌ {e}")
+            return 1
+        _afficher_resume(manifeste)
+        return 0 if manifeste['echouees'] == 0 else 1
+
+    dossier_cache = None
+    if args.cache is not None:
+        from kiosque_cache import DOSSIER_CACHE
+        dossier_cache = args.cache or DOSSIER_CACHE
+
+    historique = None
+    if not args.sans_historique:
+        from kiosque_historique import CHEMIN_HISTORIQUE
+        historique = CHEMIN_HISTORIQUE
+
+    print(f"🏭 {len(variantes)} variante(s) -> {args.sortie}")
+    manifeste = executer_batch(args.script, variantes, args.sortie, formats,
+                               args.processus, args.freecad_lib, dossier_cache,
+                               args.instances, args.developper_liens, historique, args.deviation)
+    _afficher_resume(manifeste)
+    return 0 if manifeste['echouees'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
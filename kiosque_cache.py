@@ -0,0 +1,140 @@
+"""
+💾 CACHE DE GÉOMÉTRIE DU KIOSQUE TRÈFLE
+Cache adressé par contenu : clé = SHA-256(empreinte du script + `config` complet).
+
+Chaque entrée est un fichier FCStd (formes BREP incluses) ; une configuration déjà
+construite est restaurée par `mergeProject` au lieu d'être remodélisée. La taille
+totale est bornée, les entrées les moins récemment utilisées sont évincées (LRU,
+date de modification rafraîchie à chaque lecture).
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from kiosque_generation import REPERTOIRE_DONNEES
+from kiosque_journal import JOURNAL
+from kiosque_profil import PROFILEUR
+
+DOSSIER_CACHE = os.path.join(REPERTOIRE_DONNEES, 'cache_geometrie')
+TAILLE_MAX_DEFAUT = 500 * 1024 * 1024  # 500 Mo
+EXTENSION = '.FCStd'
+
+
+def cle_cache(hash_script, config):
+    """Clé déterministe pour (script, config) ; l'ordre des clés de config est ignoré."""
+    charge = json.dumps({'script': hash_script, 'config': config},
+                        sort_keys=True, default=repr, ensure_ascii=False)
+    return hashlib.sha256(charge.encode('utf-8')).hexdigest()
+
+
+class CacheGeometrie:
+    """Cache disque LRU de documents générés, borné à `taille_max` octets."""
+
+    def __init__(self, dossier=DOSSIER_CACHE, taille_max=TAILLE_MAX_DEFAUT):
+        self.dossier = dossier
+        self.taille_max = taille_max
+        os.makedirs(self.dossier, exist_ok=True)
+
+    def chemin(self, cle):
+        return os.path.join(self.dossier, cle + EXTENSION)
+
+    def contient(self, cle):
+        return os.path.exists(self.chemin(cle))
+
+    def restaurer(self, cle, doc):
+        """Fusionne l'entrée `cle` dans `doc`. Retourne False si absente (miss)."""
+        chemin = self.chemin(cle)
+        if not os.path.exists(chemin):
+            return False
+        doc.mergeProject(chemin)
+        try:
+            os.utime(chemin, None)  # rafraîchit la position LRU
+        except OSError:
+            pass
+        return True
+
+    def enregistrer(self, cle, doc):
+        """Sauve une copie de `doc` sous `cle` (écriture atomique) puis applique la borne."""
+        chemin = self.chemin(cle)
+        temporaire = f"{chemin}.{os.getpid()}.tmp{EXTENSION}"
+        doc.saveCopy(temporaire)
+        os.replace(temporaire, chemin)
+        self.evincer()
+        return chemin
+
+    def entrees(self):
+        """Liste (mtime, taille, chemin) des entrées, de la plus ancienne à la plus récente."""
+        resultat = []
+        for nom in os.listdir(self.dossier):
+            if not nom.endswith(EXTENSION) or '.tmp' in nom:
+                continue
+            chemin = os.path.join(self.dossier, nom)
+            try:
+                st = os.stat(chemin)
+            except FileNotFoundError:
+                continue  # évincée entre-temps par un autre processus
+            resultat.append((st.st_mtime, st.st_size, chemin))
+        resultat.sort()
+        return resultat
+
+    def taille(self):
+        return sum(taille for _, taille, _ in self.entrees())
+
+    def evincer(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de `taille_max`."""
+        entrees = self.entrees()
+        total = sum(taille for _, taille, _ in entrees)
+        supprimees = 0
+        for _, taille, chemin in entrees:
+            if total <= self.taille_max:
+                break
+            try:
+                os.remove(chemin)
+                supprimees += 1
+            except FileNotFoundError:
+                pass
+            total -= taille
+        return supprimees
+
+    def vider(self):
+        for _, _, chemin in self.entrees():
+            try:
+                os.remove(chemin)
+            except FileNotFoundError:
+                pass
+
+
+def construire_avec_cache(cache, hash_script, config, construire, rappel=None):
+    """Restaure `config` depuis le cache ou appelle `construire()` puis l'enregistre.
+
+    Retourne (doc, hit).
+    """
+    import FreeCAD as App
+
+    cle = cle_cache(hash_script, config)
+    debut = time.perf_counter()
+    if cache.contient(cle):
+        doc = App.newDocument("Kiosque_Trefle")
+        with PROFILEUR.span('restauration cache', 'cache'):
+            restaure = cache.restaurer(cle, doc)
+            if restaure:
+                doc.recompute()
+        if restaure:
+            if rappel is not None:
+                rappel(f"💾 Cache HIT ({cle[:12]}) : restauré en "
+                       f"{(time.perf_counter() - debut) * 1000:.0f} ms")
+            return doc, True
+        App.closeDocument(doc.Name)
+
+    if rappel is not None:
+        rappel(f"💾 Cache MISS ({cle[:12]}) : génération complète")
+    doc = construire()
+    if doc is not None:
+        try:
+            with PROFILEUR.span('enregistrement cache', 'cache'):
+                cache.enregistrer(cle, doc)
+        except Exception as e:
+            JOURNAL.avertissement(f"⚠️  Écriture cache impossible: {e}")
+    return doc, False
@@ -0,0 +1,212 @@
+"""
+⚖️ COMPARAISON DE VARIANTES DANS UN SEUL DOCUMENT
+Construit N jeux de paramètres côte à côte dans un document `Comparaison_Kiosque`
+au lieu d'un document `Kiosque_*` par variante.
+
+Les sous-assemblages sont ceux de la régénération incrémentale (`graphe_dependances` :
+méthodes appelées par `generer_kiosque_complet_avec_plots`). Chacun est identifié par
+sa signature : arguments et valeurs des clés de `config` qu'il lit (plus les clés lues
+par l'orchestrateur). Une signature déjà construite pour une variante précédente n'est
+pas remodélisée : ses objets sont réutilisés tels quels (mêmes plots, mêmes pétales).
+
+La géométrie modélisée reste à l'origine, masquée ; chaque variante est un groupe
+`Variante_k` d'`App::Link` vers ses objets racines, décalé le long de X d'une emprise
+majorée. `metriques(parametres)` donne les indicateurs du tableau comparatif
+(`kiosque_metre`, `kiosque_ancrage`, sans CAO).
+"""
+
+import time
+
+from kiosque_generation import (
+    METHODES_GLOBALES,
+    PARAMETRES,
+    appliquer_parametres,
+    construction_groupee,
+    instrumenter_etapes,
+    rediriger_new_document,
+    verifier_annulation,
+)
+from kiosque_incremental import cles_globales, graphe_dependances
+from kiosque_instances import TYPE_LIEN
+from kiosque_profil import PROFILEUR
+
+NOM_DOCUMENT = "Comparaison_Kiosque"
+TYPE_GROUPE = 'App::DocumentObjectGroup'
+MARGE_ESPACEMENT = 1.3  # espacement = plus grande emprise × marge
+ESPACEMENT_MIN_MM = 3000
+
+# Indicateur -> (libellé, échelle, format) du tableau comparatif
+COLONNES_COMPARAISON = {
+    'emprise': ("Emprise (m)", 1e-3, "{:.2f}"),
+    'surface_dome': ("Dôme (m²)", 1, "{:.1f}"),
+    'longueur_tubes': ("Tubes (m)", 1, "{:.0f}"),
+    'masse_structure': ("Structure (kg)", 1, "{:.0f}"),
+    'volume_beton': ("Béton (m³)", 1, "{:.2f}"),
+    'masse_plot': ("Lest/plot (kg)", 1, "{:.0f}"),
+    'objets': ("Objets modélisés", 1, "{:.0f}"),
+    'partages': ("Sous-assemblages partagés", 1, "{:.0f}"),
+}
+
+
+def emprise(config):
+    """Diamètre hors tout du trèfle (mm) : 2 × (rayon du rosaire + rayon des pétales)."""
+    return 2.0 * (float(config.get('rayon_rosaire') or 0) + float(config.get('rayon_petale') or 0))
+
+
+def metriques(parametres):
+    """Indicateurs analytiques d'une variante (floats, clés de `COLONNES_COMPARAISON`)."""
+    from kiosque_ancrage import dimensionner_parametres
+    from kiosque_metre import estimer_parametres
+
+    metre = estimer_parametres(parametres)
+    ancrage = dimensionner_parametres(parametres)
+    valeurs = {cle: float(metre[cle]) for cle in ('surface_dome', 'longueur_tubes', 'masse_structure',
+                                                   'volume_beton')}
+    valeurs['masse_plot'] = float(ancrage['masse_plot'])
+    return valeurs
+
+
+def cles_differentes(variantes):
+    """Clés de `PARAMETRES` dont la valeur n'est pas la même pour toutes les variantes."""
+    return [cle for cle in PARAMETRES if len({repr(v.get(cle)) for v in variantes}) > 1]
+
+
+class ComparaisonVariantes:
+    """Construit des variantes côte à côte en partageant leurs sous-assemblages identiques.
+
+    `construire(variantes, rappel, annulation)` retourne un dict : 'doc', 'variantes'
+    (une entrée par jeu de paramètres : métriques, objets modélisés, sous-assemblages
+    partagés, durée), 'construits', 'partages' et 'duree_s'. Une construction se fait
+    toujours dans un document neuf.
+    """
+
+    def __init__(self, module, index, instances=False):
+        self.module = module
+        self.instances = instances
+        self.graphe = graphe_dependances(index) or {}
+        self.cles_globales = cles_globales(index)
+        self._partages = {}  # signature -> {'objets': [...], 'resultat': ...}
+
+    def _signature(self, instance, nom, args, kwargs):
+        cles = sorted(self.graphe[nom] | self.cles_globales)
+        signature = (nom, args, tuple(sorted(kwargs.items())),
+                     tuple((cle, repr(instance.config.get(cle))) for cle in cles))
+        hash(signature)
+        return signature
+
+    def _partager(self, instance, doc, entree):
+        """Enveloppe les sous-assemblages de `instance` : signature connue -> objets réutilisés."""
+        profondeur = [0]
+
+        def envelopper(nom, methode):
+            def enveloppe(*args, **kwargs):
+                if profondeur[0]:
+                    return methode(*args, **kwargs)
+                try:
+                    signature = self._signature(instance, nom, args, kwargs)
+                except TypeError:
+                    signature = None  # arguments non hachables : toujours construit
+                partage = self._partages.get(signature)
+                if partage is not None and all(doc.getObject(n) is not None for n in partage['objets']):
+                    entree['reutilises'].extend(partage['objets'])
+                    entree['sous_assemblages_partages'].append(nom)
+                    return partage['resultat']
+                avant = {o.Name for o in doc.Objects}
+                profondeur[0] += 1
+                try:
+                    resultat = methode(*args, **kwargs)
+                finally:
+                    profondeur[0] -= 1
+                if signature is not None:
+                    self._partages[signature] = {
+                        'objets': [o.Name for o in doc.Objects if o.Name not in avant], 'resultat': resultat}
+                return resultat
+            enveloppe.__name__ = nom
+            enveloppe.__wrapped__ = methode
+            return enveloppe
+
+        for nom in self.graphe:
+            methode = getattr(instance, nom, None)
+            if callable(methode):
+                setattr(instance, nom, envelopper(nom, methode))
+
+    def construire(self, variantes, rappel=None, annulation=None):
+        import FreeCAD as App
+
+        debut = time.perf_counter()
+        self._partages = {}
+        instances = []
+        for parametres in variantes:
+            with PROFILEUR.span('KiosqueTrefleFonctionnel()', 'script'):
+                instance = getattr(self.module, 'KiosqueTrefleFonctionnel')()
+            appliquer_parametres(instance.config, parametres)
+            instances.append(instance)
+        espacement = max([ESPACEMENT_MIN_MM] + [emprise(i.config) * MARGE_ESPACEMENT for i in instances])
+        differentes = cles_differentes(variantes)
+
+        entrees = []
+        with construction_groupee(rappel) as groupe:
+            doc = App.newDocument(NOM_DOCUMENT)
+            groupe.suivre(doc)
+            # Le script crée son document dans l'orchestrateur : toutes les variantes vont dans `doc`
+            with rediriger_new_document(self.module, lambda *args, **kwargs: doc):
+                for k, (parametres, instance) in enumerate(zip(variantes, instances), start=1):
+                    verifier_annulation(annulation)
+                    App.setActiveDocument(doc.Name)
+                    entree = {'index': k, 'parametres': dict(parametres), 'reutilises': [],
+                              'sous_assemblages_partages': []}
+                    if self.instances:
+                        from kiosque_instances import instancier_symetries
+                        instancier_symetries(instance, rappel)
+                    instrumenter_etapes(instance, rappel, annulation)
+                    self._partager(instance, doc, entree)
+                    if rappel is not None:
+                        rappel(f"⚖️ Variante {k}/{len(variantes)}")
+                    debut_variante = time.perf_counter()
+                    avant = {o.Name for o in doc.Objects}
+                    with PROFILEUR.span(f'variante {k}', 'comparaison'):
+                        getattr(instance, METHODES_GLOBALES[0])()
+                    nouveaux = [o for o in doc.Objects if o.Name not in avant]
+                    entree['duree_s'] = round(time.perf_counter() - debut_variante, 4)
+                    entree['objets'] = len(nouveaux)
+                    entree['emprise'] = emprise(instance.config)
+                    self._placer_variante(App, doc, entree, nouveaux, (k - 1) * espacement, differentes)
+                    entrees.append(entree)
+            for objet in doc.Objects:
+                if objet.TypeId not in (TYPE_LIEN, TYPE_GROUPE) and getattr(objet, 'ViewObject', None):
+                    objet.ViewObject.Visibility = False
+            verifier_annulation(annulation)
+            groupe.recompute(doc)
+
+        for entree, instance in zip(entrees, instances):
+            # Valeurs effectives (celles du script pour les dimensions laissées à None)
+            entree.update(metriques({cle: instance.config.get(cle) for cle in PARAMETRES}))
+            entree['partages'] = len(entree['sous_assemblages_partages'])
+            del entree['reutilises']
+        construits = len(self._partages)
+        partages = sum(e['partages'] for e in entrees)
+        if rappel is not None:
+            rappel(f"⚖️ {len(entrees)} variante(s) : {construits} sous-assemblage(s) modélisé(s), "
+                   f"{partages} partagé(s)")
+        return {'doc': doc, 'variantes': entrees, 'construits': construits, 'partages': partages,
+                'espacement_mm': espacement, 'duree_s': round(time.perf_counter() - debut, 4)}
+
+    @staticmethod
+    def _placer_variante(App, doc, entree, nouveaux, decalage, differentes):
+        """Groupe `Variante_k` : un `App::Link` décalé par objet racine de la variante."""
+        membres = nouveaux + [doc.getObject(n) for n in entree['reutilises']]
+        noms = {o.Name for o in membres}
+        racines = [o for o in membres if not any(p.Name in noms for p in getattr(o, 'InList', ()))]
+        translation = App.Placement(App.Vector(decalage, 0, 0), App.Rotation())
+        liens = []
+        for racine in racines:
+            lien = doc.addObject(TYPE_LIEN, f"V{entree['index']}_{racine.Name}")
+            lien.LinkedObject = racine
+            lien.Label = f"{racine.Label} (V{entree['index']})"
+            placement = getattr(racine, 'Placement', None)
+            lien.Placement = translation.multiply(placement) if placement is not None else translation
+            liens.append(lien)
+        groupe = doc.addObject(TYPE_GROUPE, f"Variante_{entree['index']}")
+        groupe.Label = f"Variante {entree['index']}" + "".join(
+            f" {cle}={entree['parametres'].get(cle)}" for cle in differentes)
+        groupe.Group = liens
@@ -0,0 +1,164 @@
+"""
+🗂️ CYCLE DE VIE DES DOCUMENTS DU KIOSQUE TRÈFLE
+`GestionnaireDocuments` suit les documents FreeCAD créés par l'interface :
+
+  - les essais (« Générer automatiquement », boutons standard/plots) se font dans
+    un document brouillon unique, vidé puis réutilisé d'un essai à l'autre ; un
+    essai qui échoue ferme tous les documents qu'il a ouverts ;
+  - les documents générés conservés sont bornés (`max_documents`) : au-delà, les
+    moins récemment utilisés sont fermés (LRU) ;
+  - `rapport()` donne la mémoire résidente du processus après chaque construction.
+
+La fermeture des documents (`evincer`) se fait dans le thread Qt.
+"""
+
+import collections
+import contextlib
+import os
+import sys
+import threading
+
+from kiosque_journal import JOURNAL
+
+NOM_BROUILLON = "Essai_Kiosque"
+MAX_DOCUMENTS_DEFAUT = 4
+
+
+def memoire_residente():
+    """Mémoire résidente du processus en octets, ou None si indisponible.
+
+    `psutil` s'il est installé, sinon `/proc` (Linux), `GetProcessMemoryInfo`
+    (Windows) ou, à défaut, le pic de `resource.getrusage` (macOS).
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class CompteursMemoire(ctypes.Structure):  # PROCESS_MEMORY_COUNTERS
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (nom, ctypes.c_size_t) for nom in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                    'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage',
+                    'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        compteurs = CompteursMemoire()
+        compteurs.cb = ctypes.sizeof(compteurs)
+        processus = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(processus, ctypes.byref(compteurs), compteurs.cb):
+            return compteurs.WorkingSetSize
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # octets sous macOS
+
+
+class GestionnaireDocuments:
+    """Documents créés par l'interface : brouillon d'essai réutilisé et générés bornés (LRU)."""
+
+    def __init__(self, max_documents=MAX_DOCUMENTS_DEFAUT):
+        self.max_documents = max_documents
+        self.generes = collections.OrderedDict()  # nom -> None, du moins au plus récent
+        self.brouillon = None
+        self._verrou = threading.Lock()
+
+    @staticmethod
+    def _ouverts():
+        import FreeCAD as App
+        return set(App.listDocuments())
+
+    @staticmethod
+    def _fermer(nom):
+        import FreeCAD as App
+        try:
+            if nom in App.listDocuments():
+                App.closeDocument(nom)
+        except Exception as e:
+            JOURNAL.avertissement(f"⚠️  Impossible de fermer {nom}: {e}")
+
+    @staticmethod
+    def _vider(doc):
+        # Ordre inverse de création : les objets dérivés partent avant leurs sources
+        for nom in reversed([o.Name for o in doc.Objects]):
+            if doc.getObject(nom) is not None:
+                doc.removeObject(nom)
+
+    def brouillon_vide(self):
+        """Document brouillon actif et vide (créé au premier essai, vidé ensuite)."""
+        import FreeCAD as App
+
+        with self._verrou:
+            if self.brouillon is not None and self.brouillon in self._ouverts():
+                doc = App.getDocument(self.brouillon)
+                self._vider(doc)
+                App.setActiveDocument(doc.Name)
+            else:
+                doc = App.newDocument(NOM_BROUILLON)
+                self.brouillon = doc.Name
+            return doc
+
+    @contextlib.contextmanager
+    def essai(self, libelle=None):
+        """Exécute un essai dans le brouillon ; en cas d'échec, ferme ce qu'il a ouvert.
+
+        Le brouillon lui-même est seulement vidé. `libelle` devient son `Label`.
+        """
+        doc = self.brouillon_vide()
+        if libelle:
+            doc.Label = libelle
+        avant = self._ouverts()
+        try:
+            yield doc
+        except BaseException:
+            for nom in self._ouverts() - avant:
+                self._fermer(nom)
+            if doc.Name in self._ouverts():
+                self._vider(doc)
+            raise
+
+    def conserver(self, nom):
+        """Marque `nom` comme document généré (le plus récent) ; un brouillon conservé est libéré."""
+        if not nom:
+            return
+        with self._verrou:
+            if nom == self.brouillon:
+                self.brouillon = None  # le prochain essai ouvrira un nouveau brouillon
+            self.generes.pop(nom, None)
+            self.generes[nom] = None
+
+    def evincer(self, proteges=()):
+        """Ferme les générés les moins récents au-delà de `max_documents` (thread Qt).
+
+        Les documents fermés par l'utilisateur sont oubliés. Retourne les noms fermés.
+        """
+        ouverts = self._ouverts()
+        with self._verrou:
+            for nom in [n for n in self.generes if n not in ouverts]:
+                del self.generes[nom]
+            candidats = [n for n in self.generes if n not in proteges]
+            fermes = candidats[:max(0, len(self.generes) - self.max_documents)]
+            for nom in fermes:
+                del self.generes[nom]
+        for nom in fermes:
+            self._fermer(nom)
+        return fermes
+
+    def rapport(self):
+        """Ligne de log : mémoire résidente et documents générés ouverts."""
+        rss = memoire_residente()
+        memoire = f"{rss / 1048576:.0f} Mo" if rss is not None else "indisponible"
+        return (f"🧠 Mémoire résidente : {memoire} — {len(self.generes)}/{self.max_documents} "
+                f"document(s) généré(s) ouvert(s)")
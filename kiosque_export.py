@@ -0,0 +1,337 @@
+"""
+📦 EXPORT EN FLUX : STEP, STL ET glTF BINAIRE
+Exporte un kiosque généré pour le fabricant (STEP) et la visionneuse web (STL, glTF
+binaire `.glb`) sans bloquer l'interface :
+
+- les pièces (pétales, montants, dôme, plots) sont triangulées en parallèle dans un
+  pool de processus (`creer_pool`), à la déviation demandée (mm) ;
+- chaque maillage est écrit sur disque dès qu'il revient (`as_completed`) puis
+  oublié : seul le maillage en cours d'écriture est en mémoire ;
+- le STL binaire est écrit au fil de l'eau (nombre de triangles corrigé à la
+  fermeture) ; le tampon binaire du glTF va dans un fichier temporaire, recopié
+  par blocs derrière l'en-tête JSON à la fermeture.
+
+Le glTF est en mètres, Y vers le haut (nœud racine : échelle 0.001, rotation -90°
+autour de X) ; indices sur 16 bits quand la pièce le permet. En batch, les
+variantes sont déjà réparties sur les workers : `exporter_document` triangule
+en série dans le worker, sans pool imbriqué.
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+
+from kiosque_journal import JOURNAL
+
+FORMATS_EXPORT = ('step', 'stl', 'glb')
+FORMATS_MAILLAGE = ('stl', 'glb')
+DEVIATION_DEFAUT_MM = 1.0
+TAILLE_BLOC = 1 << 20
+
+# glTF 2.0
+_FLOAT, _UNSIGNED_SHORT, _UNSIGNED_INT = 5126, 5123, 5125
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+_ROTATION_Z_VERS_Y = [-0.7071068, 0.0, 0.0, 0.7071068]
+
+
+class _ExportAnnule(Exception):
+    pass
+
+
+# ============================================================================
+# FORMES ET TRIANGULATION
+# ============================================================================
+
+def formes_brep(doc):
+    """[(nom, libellé, BREP)] des objets racines de `doc` (liens résolus par `Part.getShape`)."""
+    import Part
+
+    from kiosque_batch import _racines
+
+    return [(o.Name, o.Label, Part.getShape(o).exportBrepToString()) for o in _racines(doc)]
+
+
+def ajouter_formes(doc, formes):
+    """Un `Part::Feature` par forme [(nom, libellé, BREP)] de `formes_brep`, ajouté à `doc`."""
+    import Part
+
+    objets = []
+    for nom, libelle, brep in formes:
+        forme = Part.Shape()
+        forme.importBrepFromString(brep)
+        objet = doc.addObject('Part::Feature', nom)
+        objet.Shape = forme
+        objet.Label = libelle
+        objets.append(objet)
+    return objets
+
+
+def _mailler_forme(forme, deviation):
+    """(sommets float32 (n, 3), faces uint32 (m, 3)) de `forme` triangulée à `deviation` mm."""
+    import numpy as np
+
+    points, triangles = forme.tessellate(deviation)
+    sommets = np.array([(p.x, p.y, p.z) for p in points], dtype='<f4').reshape(-1, 3)
+    faces = np.array(triangles, dtype='<u4').reshape(-1, 3)
+    return sommets, faces
+
+
+def _initialiser_worker(chemins):
+    for chemin in chemins:
+        if chemin not in sys.path:
+            sys.path.append(chemin)
+    import Part  # noqa: F401  (échoue tôt si FreeCAD est introuvable)
+
+
+def _trianguler(libelle, brep, deviation):
+    """Worker : BREP -> (libellé, sommets, faces) en octets (transfert compact entre processus)."""
+    import Part
+
+    forme = Part.Shape()
+    forme.importBrepFromString(brep)
+    sommets, faces = _mailler_forme(forme, deviation)
+    return libelle, sommets.tobytes(), faces.tobytes()
+
+
+def _ecrire_step(chemin, breps):
+    """Worker : un composé des formes, exporté en STEP."""
+    import Part
+
+    formes = []
+    for brep in breps:
+        forme = Part.Shape()
+        forme.importBrepFromString(brep)
+        formes.append(forme)
+    Part.makeCompound(formes).exportStep(chemin)
+    return chemin
+
+
+def creer_pool(processus=None, chemins_supplementaires=()):
+    """Pool de processus FreeCAD headless pour la triangulation (à garder entre deux exports)."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from kiosque_batch import chemins_freecad, contexte_processus
+
+    return ProcessPoolExecutor(max_workers=processus or os.cpu_count() or 1,
+                               mp_context=contexte_processus(), initializer=_initialiser_worker,
+                               initargs=(chemins_freecad(chemins_supplementaires),))
+
+
+# ============================================================================
+# ÉCRIVAINS EN FLUX
+# ============================================================================
+
+class EcrivainSTL:
+    """STL binaire écrit pièce par pièce ; le nombre de triangles est corrigé à la fermeture."""
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.triangles = 0
+        self._fichier = open(chemin, 'wb')
+        self._fichier.write(b'kiosque trefle'.ljust(80, b' '))
+        self._fichier.write(struct.pack('<I', 0))
+
+    def ajouter(self, libelle, sommets, faces):
+        import numpy as np
+
+        if not len(faces):
+            return
+        triangles = sommets[faces]
+        normales = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        normes = np.linalg.norm(normales, axis=1, keepdims=True)
+        normes[normes == 0] = 1
+        enregistrements = np.zeros(len(faces), dtype=[('normale', '<f4', (3,)),
+                                                      ('sommets', '<f4', (3, 3)),
+                                                      ('attribut', '<u2')])
+        enregistrements['normale'] = normales / normes
+        enregistrements['sommets'] = triangles
+        self._fichier.write(enregistrements.tobytes())
+        self.triangles += len(faces)
+
+    def fermer(self):
+        self._fichier.seek(80)
+        self._fichier.write(struct.pack('<I', self.triangles))
+        self._fichier.close()
+
+
+class EcrivainGLB:
+    """glTF binaire : un maillage et un nœud nommés par pièce, tampon binaire sur disque."""
+
+    def __init__(self, chemin):
+        import tempfile
+
+        self.chemin = chemin
+        self.triangles = 0
+        self._gltf = {'asset': {'version': '2.0', 'generator': 'kiosque_export'},
+                      'scene': 0, 'scenes': [{'nodes': [0]}],
+                      'nodes': [{'name': 'kiosque', 'children': [], 'scale': [0.001] * 3,
+                                 'rotation': _ROTATION_Z_VERS_Y}],
+                      'meshes': [], 'accessors': [], 'bufferViews': []}
+        self._binaire = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(chemin)),
+                                                    prefix='.glb-', delete=False)
+        self._taille = 0
+
+    def _vue(self, donnees, cible):
+        """Ajoute `donnees` au tampon (aligné sur 4 octets) ; retourne l'indice de la bufferView."""
+        self._binaire.write(donnees)
+        self._gltf['bufferViews'].append({'buffer': 0, 'byteOffset': self._taille,
+                                          'byteLength': len(donnees), 'target': cible})
+        self._taille += len(donnees)
+        bourrage = -self._taille % 4
+        if bourrage:
+            self._binaire.write(b'\0' * bourrage)
+            self._taille += bourrage
+        return len(self._gltf['bufferViews']) - 1
+
+    def ajouter(self, libelle, sommets, faces):
+        if not len(faces):
+            return
+        accesseurs = self._gltf['accessors']
+        accesseurs.append({'bufferView': self._vue(sommets.tobytes(), _ARRAY_BUFFER),
+                           'componentType': _FLOAT, 'count': len(sommets), 'type': 'VEC3',
+                           'min': sommets.min(axis=0).tolist(), 'max': sommets.max(axis=0).tolist()})
+        indices = faces.astype('<u2') if len(sommets) < 0xFFFF else faces
+        accesseurs.append({'bufferView': self._vue(indices.tobytes(), _ELEMENT_ARRAY_BUFFER),
+                           'componentType': _UNSIGNED_SHORT if indices.dtype.itemsize == 2 else _UNSIGNED_INT,
+                           'count': indices.size, 'type': 'SCALAR'})
+        self._gltf['meshes'].append({'name': libelle, 'primitives': [
+            {'attributes': {'POSITION': len(accesseurs) - 2}, 'indices': len(accesseurs) - 1, 'mode': 4}]})
+        self._gltf['nodes'].append({'name': libelle, 'mesh': len(self._gltf['meshes']) - 1})
+        self._gltf['nodes'][0]['children'].append(len(self._gltf['nodes']) - 1)
+        self.triangles += len(faces)
+
+    def fermer(self):
+        import shutil
+
+        self._binaire.close()
+        try:
+            if self._taille:
+                self._gltf['buffers'] = [{'byteLength': self._taille}]
+            entete_json = json.dumps({cle: valeur for cle, valeur in self._gltf.items() if valeur != []},
+                                     separators=(',', ':')).encode('utf-8')
+            entete_json += b' ' * (-len(entete_json) % 4)
+            total = 12 + 8 + len(entete_json) + (8 + self._taille if self._taille else 0)
+            with open(self.chemin, 'wb') as sortie:
+                sortie.write(struct.pack('<4sII', b'glTF', 2, total))
+                sortie.write(struct.pack('<I4s', len(entete_json), b'JSON'))
+                sortie.write(entete_json)
+                if self._taille:
+                    sortie.write(struct.pack('<I4s', self._taille, b'BIN\0'))
+                    with open(self._binaire.name, 'rb') as binaire:
+                        shutil.copyfileobj(binaire, sortie, TAILLE_BLOC)
+        finally:
+            os.unlink(self._binaire.name)
+
+
+_ECRIVAINS = {'stl': EcrivainSTL, 'glb': EcrivainGLB}
+
+
+def _ecrire_maillages(base, formats, maillages, rappel=None, total=None):
+    """Consomme `maillages` [(libellé, sommets, faces)] au fil de l'eau ; retourne {format: chemin}."""
+    ecrivains = {f: _ECRIVAINS[f](f"{base}.{f}") for f in FORMATS_MAILLAGE if f in formats}
+    if not ecrivains:
+        return {}
+    termine = False
+    try:
+        for rang, (libelle, sommets, faces) in enumerate(maillages, start=1):
+            for ecrivain in ecrivains.values():
+                ecrivain.ajouter(libelle, sommets, faces)
+            if rappel:
+                rappel(f"📦 {libelle} maillé ({len(faces)} triangles) [{rang}/{total or '?'}]")
+        termine = True
+    finally:
+        for ecrivain in ecrivains.values():
+            ecrivain.fermer()
+            if not termine:
+                os.remove(ecrivain.chemin)
+    return {f: ecrivain.chemin for f, ecrivain in ecrivains.items()}
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+
+def exporter_document(doc, base, formats=FORMATS_MAILLAGE, deviation=DEVIATION_DEFAUT_MM):
+    """Export en série depuis un document ouvert (worker batch) ; retourne {format: chemin}."""
+    import Part
+
+    from kiosque_batch import _racines
+
+    racines = _racines(doc)
+    fichiers = {}
+    if 'step' in formats:
+        fichiers['step'] = base + '.step'
+        Part.makeCompound([Part.getShape(o) for o in racines]).exportStep(fichiers['step'])
+    fichiers.update(_ecrire_maillages(
+        base, formats, ((o.Label, *_mailler_forme(Part.getShape(o), deviation)) for o in racines)))
+    return fichiers
+
+
+def exporter(formes, base, formats=FORMATS_EXPORT, deviation=DEVIATION_DEFAUT_MM, pool=None,
+             rappel=None, annulation=None):
+    """Exporte `formes` [(nom, libellé, BREP)] (voir `formes_brep`) ; retourne {format: chemin}.
+
+    Avec `pool` (`creer_pool`), STEP et triangulations tournent en parallèle et les
+    maillages sont écrits dans l'ordre où ils reviennent ; sans pool, tout est fait
+    dans le thread appelant. `annulation` (threading.Event) : les fichiers partiels
+    sont supprimés et None est retourné ; ils le sont aussi, triangulations en
+    attente annulées, si un worker échoue (l'exception est propagée).
+    """
+    import numpy as np
+
+    debut = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(base)), exist_ok=True)
+    fichiers = {}
+
+    def au_fil(resultats):
+        """Maillages décodés un par un ; interrompt l'écriture à l'annulation."""
+        for libelle, sommets, faces in resultats:
+            if annulation is not None and annulation.is_set():
+                raise _ExportAnnule()
+            yield (libelle, np.frombuffer(sommets, dtype='<f4').reshape(-1, 3),
+                   np.frombuffer(faces, dtype='<u4').reshape(-1, 3))
+
+    breps = [brep for _, _, brep in formes]
+    en_attente, future_step = set(), None
+    try:
+        if pool is None:
+            if 'step' in formats:
+                fichiers['step'] = _ecrire_step(base + '.step', breps)
+            resultats = (_trianguler(libelle, brep, deviation) for _, libelle, brep in formes)
+        else:
+            from concurrent.futures import as_completed
+
+            if 'step' in formats:
+                future_step = pool.submit(_ecrire_step, base + '.step', breps)
+            if any(f in formats for f in FORMATS_MAILLAGE):
+                en_attente = {pool.submit(_trianguler, libelle, brep, deviation) for _, libelle, brep in formes}
+
+            def recuperer():
+                # Une Future terminée garde son maillage : oubliée dès qu'il est remis à l'écriture
+                for future in as_completed(en_attente):
+                    en_attente.discard(future)
+                    yield future.result()
+
+            resultats = recuperer()
+        fichiers.update(_ecrire_maillages(base, formats, au_fil(resultats), rappel, len(formes)))
+        if future_step is not None:
+            fichiers['step'] = future_step.result()
+    except BaseException as e:
+        # Annulation ou worker en échec : plus de triangulation en cours, aucun fichier partiel
+        for future in en_attente:
+            future.cancel()
+        if future_step is not None and not future_step.cancel():
+            future_step.exception()  # STEP en cours : attendre avant de supprimer le fichier
+        for chemin in {base + '.step', *fichiers.values()}:
+            if os.path.exists(chemin):
+                os.remove(chemin)
+        if not isinstance(e, _ExportAnnule):
+            raise
+        JOURNAL.info("⏹️ Export annulé", evenement='export', statut='annule')
+        return None
+    JOURNAL.info(f"📦 Export {', '.join(sorted(fichiers))} en {time.perf_counter() - debut:.2f} s -> {base}",
+                 evenement='export', fichiers=fichiers, deviation=deviation, pieces=len(formes),
+                 duree_s=round(time.perf_counter() - debut, 3))
+    return fichiers
@@ -0,0 +1,183 @@
+"""
+🎲 FIABILITÉ DE L'ANCRAGE (MONTE-CARLO)
+Probabilité annuelle de défaillance des plots du kiosque trèfle, sous la dispersion
+du vent et des matériaux (NumPy, sans FreeCAD), autour du dimensionnement
+déterministe de `kiosque_ancrage` :
+
+  - rafale maximale annuelle : loi de Gumbel dont le quantile 98 % (période de retour
+    50 ans) est la vitesse de calcul saisie, coefficient de variation `cov_vent` ;
+    les efforts de `dimensionner` varient comme v² ;
+  - béton des plots : masse volumique normale (moyenne `RHO_BETON`, `cov_beton`),
+    le volume étant celui du lest dimensionné ;
+  - liaison plot / structure : résistance lognormale dont le fractile 5 % est la
+    traction de calcul (FS compris), dispersion selon le matériau (`COV_RESISTANCE`).
+
+Modes de défaillance : soulèvement d'un plot (traction nette > poids du plot),
+renversement d'ensemble (moment + soulèvement autour du bord > poids stabilisant),
+rupture de la liaison. Les échantillons sont tirés par blocs de `taille_bloc` :
+la mémoire reste bornée quel que soit le nombre de tirages. Le lest requis pour une
+probabilité cible est le quantile correspondant du « lest critique » de chaque tirage,
+suivi par blocs (seules les plus grandes valeurs sont gardées) ; il couvre soulèvement
+et renversement, la rupture de la liaison ne dépendant pas du lest.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from kiosque_ancrage import (
+    GEOMETRIE_DEFAUT,
+    GRAVITE,
+    MATERIAU_DEFAUT,
+    NB_PLOTS_DEFAUT,
+    RHO_BETON,
+    dimensionner,
+    proprietes_materiau,
+)
+from kiosque_generation import FS_DEFAUT, meta_parametre, verifier_annulation
+
+ECHANTILLONS_DEFAUT = 1_000_000
+TAILLE_BLOC_DEFAUT = 250_000
+CIBLE_DEFAUT = 1e-4  # probabilité annuelle de défaillance visée (indice β ≈ 3,7)
+COV_VENT = 0.15  # rafale maximale annuelle
+COV_BETON = 0.04
+QUANTILE_VENT = 0.98  # la vitesse de calcul a une période de retour de 50 ans
+
+# Matériau -> coefficient de variation de la résistance de la liaison plot / structure
+COV_RESISTANCE = {
+    'acier': 0.07,
+    'bambou': 0.25,
+}
+
+_FRACTILE_5 = 1.645
+_EULER = 0.5772156649
+
+COLONNES_FIABILITE = ('pf', 'beta', 'pf_soulevement', 'pf_renversement', 'pf_rupture',
+                      'masse_plot', 'masse_requise', 'cote_plot', 'cote_requise')
+
+
+def cov_resistance(material):
+    """Dispersion de la résistance de la liaison d'après le début du libellé du matériau."""
+    nom = str(material or '').strip().lower()
+    for cle, cov in COV_RESISTANCE.items():
+        if nom.startswith(cle):
+            return cov
+    return COV_RESISTANCE[MATERIAU_DEFAUT]
+
+
+def parametres_gumbel(vitesse, cov=COV_VENT, quantile=QUANTILE_VENT):
+    """(mode, échelle) de la loi de Gumbel de coefficient `cov` dont `vitesse` est le quantile."""
+    y = -math.log(-math.log(quantile))
+    rapport = math.sqrt(6.0) / math.pi * cov  # échelle / moyenne
+    moyenne = vitesse / (1.0 + (y - _EULER) * rapport)
+    echelle = rapport * moyenne
+    return moyenne - _EULER * echelle, echelle
+
+
+def indice_fiabilite(pf):
+    """Indice β = -Φ⁻¹(pf) (inf si aucune défaillance observée)."""
+    from statistics import NormalDist
+
+    if pf <= 0.0:
+        return math.inf
+    if pf >= 1.0:
+        return -math.inf
+    return -NormalDist().inv_cdf(pf)
+
+
+def analyser(wind_speed, rayon_petale=None, rayon_rosaire=None, hauteur_petale=None, hauteur_dome=None,
+             material=MATERIAU_DEFAUT, safety_factor=FS_DEFAUT, nb_plots=NB_PLOTS_DEFAUT,
+             echantillons=ECHANTILLONS_DEFAUT, cible=CIBLE_DEFAUT, cov_vent=COV_VENT, cov_beton=COV_BETON,
+             taille_bloc=TAILLE_BLOC_DEFAUT, graine=None, masse_plot=None, annulation=None):
+    """Monte-Carlo de l'ancrage d'une géométrie (entrées scalaires, comme `dimensionner`).
+
+    `masse_plot` (kg) : lest évalué, par défaut celui de `dimensionner`. Retourne un dict :
+    pf (toute défaillance), pf_soulevement, pf_renversement, pf_rupture, beta,
+    intervalle_pf (IC 95 %), masse_plot/cote_plot évalués, masse_requise/cote_requise
+    (lest pour `cible`), echantillons, duree_s. Un vent nul ne charge pas l'ancrage (pf = 0).
+    `annulation` (threading.Event) est vérifié avant chaque bloc (`GenerationAnnulee`).
+    """
+    debut = time.perf_counter()
+    vitesse = float(wind_speed)
+    if vitesse < 0:
+        raise ValueError(f"Vitesse de vent négative: {wind_speed}")
+    geometrie = {cle: GEOMETRIE_DEFAUT[cle] if valeur is None else valeur
+                 for cle, valeur in (('rayon_petale', rayon_petale), ('rayon_rosaire', rayon_rosaire),
+                                     ('hauteur_petale', hauteur_petale), ('hauteur_dome', hauteur_dome))}
+    calcul = {cle: float(valeur) for cle, valeur in dimensionner(
+        wind_speed, geometrie['rayon_petale'], geometrie['rayon_rosaire'], geometrie['hauteur_petale'],
+        geometrie['hauteur_dome'], material, safety_factor, nb_plots).items()}
+    if masse_plot is None:
+        masse_plot = calcul['masse_plot']
+    r_ext = (geometrie['rayon_rosaire'] + geometrie['rayon_petale']) / 1000.0
+    poids_structure = proprietes_materiau(material)[0] * math.pi * r_ext ** 2 * GRAVITE
+
+    # Effets du vent de calcul, non pondérés : traction brute par plot, moment de renversement
+    traction_calcul = 2.0 * calcul['moment'] / (nb_plots * r_ext) + calcul['soulevement'] / nb_plots
+    renversement_calcul = calcul['moment'] + calcul['soulevement'] * r_ext
+    sigma_r = math.sqrt(math.log(1.0 + cov_resistance(material) ** 2))
+    mediane_r = calcul['fs'] * traction_calcul * math.exp(_FRACTILE_5 * sigma_r)
+    mode, echelle = parametres_gumbel(vitesse, cov_vent)
+
+    rng = np.random.default_rng(graine)
+    rang = int(cible * echantillons) + 1  # lest requis : `rang`-ième plus grand lest critique
+    plus_grands = np.empty(0)
+    defaillances = dict.fromkeys(('pf', 'pf_soulevement', 'pf_renversement', 'pf_rupture'), 0)
+    restants = int(echantillons)
+    while restants > 0:
+        verifier_annulation(annulation)
+        n = min(taille_bloc, restants)
+        restants -= n
+        if vitesse > 0:
+            rapport_q = (np.maximum(rng.gumbel(mode, echelle, n), 0.0) / vitesse) ** 2
+        else:
+            rapport_q = np.zeros(n)
+        densite = rng.normal(1.0, cov_beton, n)  # masse volumique / RHO_BETON
+        resistance = mediane_r * np.exp(sigma_r * rng.standard_normal(n))
+
+        traction = traction_calcul * rapport_q
+        # Lest (kg de béton nominal) au-delà duquel le plot tient, pour chaque mode
+        critique = np.maximum((traction - poids_structure / nb_plots) / GRAVITE,
+                              (renversement_calcul * rapport_q / r_ext - poids_structure)
+                              / (nb_plots * GRAVITE)) / densite
+        soulevement = (traction - poids_structure / nb_plots) > masse_plot * densite * GRAVITE
+        renversement = renversement_calcul * rapport_q > (poids_structure + nb_plots * masse_plot * densite
+                                                          * GRAVITE) * r_ext
+        rupture = traction > resistance
+        defaillances['pf_soulevement'] += int(np.count_nonzero(soulevement))
+        defaillances['pf_renversement'] += int(np.count_nonzero(renversement))
+        defaillances['pf_rupture'] += int(np.count_nonzero(rupture))
+        defaillances['pf'] += int(np.count_nonzero(soulevement | renversement | rupture))
+
+        candidats = np.concatenate((plus_grands, critique))
+        if len(candidats) > rang:
+            candidats = np.partition(candidats, len(candidats) - rang)[len(candidats) - rang:]
+        plus_grands = candidats
+
+    resultat = {cle: nombre / echantillons for cle, nombre in defaillances.items()}
+    pf = resultat['pf']
+    masse_requise = max(float(plus_grands.min()), 0.0) if len(plus_grands) else 0.0
+    resultat.update(
+        beta=indice_fiabilite(pf),
+        intervalle_pf=1.96 * math.sqrt(pf * (1.0 - pf) / echantillons),
+        masse_plot=masse_plot, cote_plot=(masse_plot / RHO_BETON) ** (1.0 / 3.0),
+        masse_requise=masse_requise, cote_requise=(masse_requise / RHO_BETON) ** (1.0 / 3.0),
+        cible=cible, echantillons=int(echantillons),
+        # Moins d'une dizaine de défaillances attendues à la cible : quantile peu fiable
+        estimation_fiable=cible * echantillons >= 10,
+        duree_s=time.perf_counter() - debut,
+    )
+    return resultat
+
+
+def analyser_parametres(parametres, nb_plots=NB_PLOTS_DEFAUT, **options):
+    """`analyser` appliqué à un dict de `PARAMETRES` (interface, batch) ; `options` : voir `analyser`."""
+    return analyser(
+        meta_parametre(parametres, 'wind_speed'),
+        parametres.get('rayon_petale'), parametres.get('rayon_rosaire'),
+        parametres.get('hauteur_petale'), parametres.get('hauteur_dome'),
+        parametres.get('material') or MATERIAU_DEFAUT,
+        meta_parametre(parametres, 'safety_factor'),
+        nb_plots, **options,
+    )
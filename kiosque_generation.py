@@ -0,0 +1,400 @@
+"""
+⚙️ NOYAU DE GÉNÉRATION DU KIOSQUE TRÈFLE
+Outils sans interface graphique partagés par `interface_ultrasimple` et les
+outils batch : chargement du script, correspondance paramètres -> `config`,
+suivi des étapes de construction et annulation coopérative.
+
+Ce module ne doit importer ni FreeCADGui ni PySide (FreeCAD est importé à la demande).
+"""
+
+import contextlib
+import hashlib
+import importlib.util
+import os
+import threading
+import time
+
+from kiosque_journal import JOURNAL
+from kiosque_profil import PROFILEUR
+
+NOM_MODULE = "kiosque_module"
+
+# Dossier des données persistantes (cache, index...) partagé par les outils
+REPERTOIRE_DONNEES = os.path.join(os.path.expanduser("~"), ".kiosque_trefle")
+
+# Paramètres clés de `KiosqueTrefleFonctionnel.config` pilotés par l'interface/le batch
+PARAMETRES_GEOMETRIE = ['rayon_petale', 'rayon_rosaire', 'hauteur_petale', 'hauteur_dome']
+PARAMETRES_META = ['material', 'wind_speed', 'safety_factor']
+PARAMETRES = PARAMETRES_GEOMETRIE + PARAMETRES_META
+
+# Méta-paramètres par défaut (réglages initiaux de l'interface, batch, calculs de vent)
+VENT_DEFAUT = 100  # km/h
+FS_DEFAUT = 1.3
+
+# Nom du contrôle de l'interface -> clé de config
+CORRESPONDANCE_CONTROLES = {
+    'rayon': 'rayon_petale',
+    'espace': 'rayon_rosaire',
+    'haut': 'hauteur_petale',
+    'hauteur_dome': 'hauteur_dome',
+    'material': 'material',
+    'wind_speed': 'wind_speed',
+    'safety_factor': 'safety_factor',
+}
+
+
+def meta_parametre(parametres, cle):
+    """`parametres[cle]`, ou sa valeur par défaut s'il est absent ou None (0 est une valeur)."""
+    valeur = parametres.get(cle)
+    if valeur is not None:
+        return valeur
+    return {'wind_speed': VENT_DEFAUT, 'safety_factor': FS_DEFAUT}.get(cle)
+
+
+class GenerationAnnulee(Exception):
+    """Levée quand l'utilisateur a demandé l'arrêt de la génération en cours."""
+
+
+# Mots-clés des méthodes de `KiosqueTrefleFonctionnel` -> libellé d'étape affiché
+ETAPES = [
+    ('petale', "🌸 Pétales"),
+    ('plot', "🧱 Plots"),
+    ('dome', "⛱️ Dôme"),
+]
+
+# Méthodes « chef d'orchestre » : on les laisse passer sans les annoncer comme étape
+METHODES_GLOBALES = ('generer_kiosque_complet_avec_plots',)
+
+
+def etape_de(nom_methode):
+    """Retourne le libellé d'étape correspondant à un nom de méthode, ou None."""
+    nom = nom_methode.lower()
+    if nom in METHODES_GLOBALES:
+        return None
+    for mot, libelle in ETAPES:
+        if mot in nom:
+            return libelle
+    return None
+
+
+def verifier_annulation(annulation):
+    """Lève `GenerationAnnulee` si l'évènement d'annulation est positionné."""
+    if annulation is not None and annulation.is_set():
+        raise GenerationAnnulee("Génération annulée par l'utilisateur")
+
+
+def instrumenter_etapes(instance, rappel=None, annulation=None):
+    """Enveloppe les méthodes de construction de `instance` pour suivre les étapes.
+
+    Chaque méthode dont le nom correspond à une étape (pétales, plots, dôme) est
+    remplacée, sur l'instance uniquement, par une enveloppe qui :
+      - vérifie l'annulation avant d'entrer (annulation coopérative) ;
+      - appelle `rappel(message)` au début et à la fin de l'étape la plus externe.
+
+    Les appels internes `self.methode()` du script passent par l'instance et sont
+    donc eux aussi suivis. Retourne la liste des méthodes instrumentées.
+    """
+    profondeur = threading.local()
+
+    def envelopper(nom, methode, libelle):
+        def enveloppe(*args, **kwargs):
+            verifier_annulation(annulation)
+            niveau = getattr(profondeur, 'valeur', 0)
+            profondeur.valeur = niveau + 1
+            debut = time.perf_counter()
+            try:
+                if niveau == 0 and rappel is not None:
+                    rappel(f"{libelle} : {nom}…")
+                with PROFILEUR.span(nom, 'etape'):
+                    resultat = methode(*args, **kwargs)
+            finally:
+                profondeur.valeur = niveau
+            if niveau == 0 and rappel is not None:
+                rappel(f"{libelle} : terminé en {time.perf_counter() - debut:.2f} s")
+            return resultat
+        enveloppe.__name__ = nom
+        enveloppe.__wrapped__ = methode
+        return enveloppe
+
+    instrumentees = []
+    for nom in dir(type(instance)):
+        if nom.startswith('_'):
+            continue
+        libelle = etape_de(nom)
+        if libelle is None:
+            continue
+        methode = getattr(instance, nom, None)
+        if not callable(methode):
+            continue
+        setattr(instance, nom, envelopper(nom, methode, libelle))
+        instrumentees.append(nom)
+    return instrumentees
+
+
+# ============================================================================
+# CONSTRUCTION GROUPÉE (sans recompute intermédiaire ni annulation)
+# ============================================================================
+
+_GROUPES = threading.local()
+
+
+class _FreeCADRedirige:
+    """Mandataire du module FreeCAD dont seul `newDocument` est remplacé."""
+
+    def __init__(self, app, new_document):
+        self._app = app
+        self.newDocument = new_document
+
+    def __getattr__(self, nom):
+        return getattr(self._app, nom)
+
+
+@contextlib.contextmanager
+def rediriger_new_document(module, new_document):
+    """Bloc où `App.newDocument`, appelé par le script `module` seulement, devient `new_document`.
+
+    Le module FreeCAD n'est pas modifié : les noms globaux du script qui le désignent
+    (`App`...) pointent le temps du bloc vers un mandataire (blocs imbriquables). Les
+    autres threads qui exécutent le même module voient aussi la redirection.
+    """
+    import FreeCAD
+
+    anciens = {nom: valeur for nom, valeur in vars(module).items()
+               if valeur is FreeCAD or isinstance(valeur, _FreeCADRedirige)}
+    for nom in anciens:
+        setattr(module, nom, _FreeCADRedirige(FreeCAD, new_document))
+    try:
+        yield
+    finally:
+        for nom, valeur in anciens.items():
+            setattr(module, nom, valeur)
+
+
+class ConstructionGroupee:
+    """Construction en masse : pas de recompute intermédiaire ni de transactions d'annulation.
+
+    Pendant le bloc, le document actif, ceux passés à `suivre` et ceux que le script
+    `module` crée par `App.newDocument` (`rediriger_new_document`) ont `RecomputesFrozen`
+    activé et `UndoMode` à 0. À la sortie, l'état d'origine est restauré (même sur
+    exception) puis, si le bloc a réussi, chaque document modifié est recalculé une
+    seule fois (sauf s'il l'a déjà été via `recompute(doc)`).
+    Le rafraîchissement de la vue 3D relève du thread Qt (voir l'interface).
+    """
+
+    def __init__(self, rappel=None, module=None):
+        self.rappel = rappel
+        self.module = module
+        self.modules = []  # scripts dont les nouveaux documents sont suivis
+        self.documents = {}  # nom -> (doc, état d'origine, nombre d'objets à l'entrée)
+        self.recalcules = set()
+        self.objets_crees = 0
+        self._app = None
+        self._redirections = contextlib.ExitStack()
+
+    def suivre(self, doc):
+        """Suspend recomputes et annulation de `doc` jusqu'à la fin du bloc."""
+        if doc is None or doc.Name in self.documents:
+            return
+        etat = {attr: getattr(doc, attr) for attr in ('RecomputesFrozen', 'UndoMode')
+                if hasattr(doc, attr)}
+        self.documents[doc.Name] = (doc, etat, len(doc.Objects))
+        if 'RecomputesFrozen' in etat:
+            doc.RecomputesFrozen = True
+        if 'UndoMode' in etat:
+            doc.UndoMode = 0
+
+    def new_document(self, *args, **kwargs):
+        """`App.newDocument` suivi par le bloc (redirection des scripts)."""
+        doc = self._app.newDocument(*args, **kwargs)
+        self.suivre(doc)
+        return doc
+
+    @contextlib.contextmanager
+    def rediriger(self, module):
+        """Sous-bloc où les documents créés par le script `module` sont suivis."""
+        self.modules.append(module)
+        try:
+            with rediriger_new_document(module, self.new_document):
+                yield self
+        finally:
+            self.modules.remove(module)
+
+    def __enter__(self):
+        import FreeCAD as App
+
+        self._app = App
+        if self.module is not None:
+            self._redirections.enter_context(self.rediriger(self.module))
+        self.suivre(App.ActiveDocument)
+        _GROUPES.actif = self
+        return self
+
+    def recompute(self, doc):
+        """Recompute unique de `doc` à l'intérieur du bloc (ex. avant une sauvegarde)."""
+        if doc is None:
+            return
+        etat = self.documents.get(doc.Name, (None, {}, 0))[1]
+        if 'RecomputesFrozen' in etat:
+            doc.RecomputesFrozen = False
+        try:
+            with PROFILEUR.span('recompute', 'freecad'):
+                doc.recompute()
+        finally:
+            if 'RecomputesFrozen' in etat:
+                doc.RecomputesFrozen = True
+        self.recalcules.add(doc.Name)
+
+    def __exit__(self, type_exc, exc, tb):
+        self._redirections.close()
+        _GROUPES.actif = None
+        ouverts = set(self._app.listDocuments())
+        for nom, (doc, etat, avant) in self.documents.items():
+            if nom not in ouverts:
+                continue
+            modifie = len(doc.Objects) != avant or avant == 0 or any(
+                'Touched' in getattr(o, 'State', ()) for o in doc.Objects)
+            self.objets_crees += len(doc.Objects) - avant
+            # Recompute avant la restauration : `recompute` regèle le document en sortant
+            if type_exc is None and modifie and nom not in self.recalcules:
+                self.recompute(doc)
+            for attr, valeur in etat.items():
+                try:
+                    setattr(doc, attr, valeur)
+                except Exception as e:
+                    JOURNAL.avertissement(f"⚠️  Restauration de {nom}.{attr} impossible: {e}")
+        if type_exc is None and self.rappel is not None:
+            self.rappel(f"📦 Construction groupée : {self.objets_crees} objet(s) créé(s), "
+                        f"{len(self.recalcules)} recompute")
+        return False
+
+
+def construction_groupee(rappel=None, module=None):
+    """Contexte `ConstructionGroupee` suivant les documents du script `module`.
+
+    Imbriqué dans un bloc actif du même thread, il le réutilise (en y ajoutant `module`).
+    """
+    actif = getattr(_GROUPES, 'actif', None)
+    if actif is None:
+        return ConstructionGroupee(rappel, module)
+    if module is None or module in actif.modules:
+        return contextlib.nullcontext(actif)
+    return actif.rediriger(module)
+
+
+# Étapes omises en aperçu (détails coûteux sans intérêt pour la silhouette)
+ETAPES_OMISES_APERCU = ("🧱 Plots",)
+
+# Clé posée dans `config` en aperçu : le script peut s'en servir pour simplifier ses profils
+CLE_APERCU = 'apercu'
+
+
+def simplifier_pour_apercu(instance):
+    """Prépare `instance` pour un aperçu rapide (niveau de détail réduit).
+
+    Les méthodes des étapes de `ETAPES_OMISES_APERCU` deviennent des appels vides et
+    `config[CLE_APERCU]` vaut True. Retourne la liste des méthodes omises.
+    """
+    def omise(nom):
+        def vide(*args, **kwargs):
+            return None
+        vide.__name__ = nom
+        return vide
+
+    omises = []
+    for nom in dir(type(instance)):
+        if nom.startswith('_') or etape_de(nom) not in ETAPES_OMISES_APERCU:
+            continue
+        if callable(getattr(instance, nom, None)):
+            setattr(instance, nom, omise(nom))
+            omises.append(nom)
+    instance.config[CLE_APERCU] = True
+    return omises
+
+
+# ============================================================================
+# CHARGEMENT DU SCRIPT ET APPLICATION DES PARAMÈTRES
+# ============================================================================
+
+def hash_fichier(chemin):
+    """Empreinte SHA-256 (hex) du contenu d'un fichier."""
+    h = hashlib.sha256()
+    with open(chemin, 'rb') as f:
+        for bloc in iter(lambda: f.read(1 << 16), b''):
+            h.update(bloc)
+    return h.hexdigest()
+
+
+def charger_module(chemin_script, nom=NOM_MODULE):
+    """Exécute le script kiosque dans son propre espace de noms et retourne le module.
+
+    L'empreinte du fichier est mémorisée dans `module.__kiosque_sha256__` (clé de cache).
+    """
+    spec = importlib.util.spec_from_file_location(nom, chemin_script)
+    module = importlib.util.module_from_spec(spec)
+    module.__kiosque_sha256__ = hash_fichier(chemin_script)
+    with PROFILEUR.span('import du script', 'chargement', script=os.path.basename(chemin_script)):
+        spec.loader.exec_module(module)
+    return module
+
+
+def appliquer_parametres(config, parametres):
+    """Applique `parametres` (clés de `PARAMETRES`) sur le dict `config`.
+
+    Les dimensions à None sont ignorées (on garde la valeur du script) ; les
+    méta-paramètres (matériau, vent, FS) sont toujours stockés.
+    """
+    for cle in PARAMETRES_GEOMETRIE:
+        if parametres.get(cle) is not None:
+            config[cle] = parametres[cle]
+    for cle in PARAMETRES_META:
+        config[cle] = parametres.get(cle)
+    return config
+
+
+def construire_kiosque(module, parametres, rappel=None, annulation=None, cache=None,
+                       instances=False, config_effective=None):
+    """Construit le kiosque complet avec `KiosqueTrefleFonctionnel` et retourne le document.
+
+    Utilisé aussi bien par le worker de l'interface que par le batch (sans GUI).
+    Si `cache` (`kiosque_cache.CacheGeometrie`) est fourni, une configuration déjà
+    construite avec le même script est restaurée au lieu d'être remodélisée.
+    `instances=True` place les pétales/plots symétriques en `App::Link` (`kiosque_instances`).
+    Le dict `config_effective`, s'il est fourni, reçoit le `config` complet de l'instance.
+    """
+    import FreeCAD as App
+
+    Kclass = getattr(module, 'KiosqueTrefleFonctionnel')
+    with PROFILEUR.span('KiosqueTrefleFonctionnel()', 'script'):
+        instance = Kclass()
+    try:
+        appliquer_parametres(instance.config, parametres)
+    except Exception as e:
+        JOURNAL.avertissement(f"⚠️  Impossible d'appliquer certains paramètres: {e}")
+
+    if instances:
+        from kiosque_instances import instancier_symetries
+        instancier_symetries(instance, rappel)
+    instrumenter_etapes(instance, rappel, annulation)
+    if config_effective is not None:
+        config_effective.update(instance.config)
+
+    with construction_groupee(rappel, module) as groupe:
+
+        def construire():
+            doc = instance.generer_kiosque_complet_avec_plots()
+            verifier_annulation(annulation)
+            if not hasattr(doc, 'recompute'):
+                doc = App.ActiveDocument
+            if doc is not None:
+                if rappel is not None:
+                    rappel("🔄 Recompute du document...")
+                groupe.recompute(doc)
+            return doc
+
+        if cache is None:
+            return construire()
+
+        from kiosque_cache import construire_avec_cache
+        doc, _ = construire_avec_cache(cache, getattr(module, '__kiosque_sha256__', ''),
+                                       instance.config, construire, rappel)
+        return doc
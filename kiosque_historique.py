@@ -0,0 +1,273 @@
+"""
+🕘 HISTORIQUE DES GÉNÉRATIONS (SQLite)
+Chaque génération (interface ou batch) est enregistrée dans une base SQLite locale :
+empreinte du script, `config` complet, cible appelée, durée et durées par phase
+(`PROFILEUR`), fichier produit et résumé de la géométrie.
+
+Les paramètres clés sont des colonnes indexées : recharger une configuration,
+trouver la variante déjà construite la plus proche (`plus_proche`) ou tracer la
+durée de construction en fonction d'un paramètre (`series`) restent instantanés
+sur des milliers d'exécutions. La base est en mode WAL : les workers du batch
+peuvent y écrire en parallèle.
+
+    python kiosque_historique.py                         # dernières générations
+    python kiosque_historique.py --proche rayon_petale=2300 hauteur_dome=3400
+    python kiosque_historique.py --csv historique.csv    # export (tableur, graphiques)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+from kiosque_generation import PARAMETRES, PARAMETRES_GEOMETRIE, REPERTOIRE_DONNEES
+
+CHEMIN_HISTORIQUE = os.path.join(REPERTOIRE_DONNEES, 'historique.sqlite')
+VERSION_SCHEMA = 1
+
+COLONNES_PARAMETRES = {
+    'rayon_petale': 'REAL', 'rayon_rosaire': 'REAL', 'hauteur_petale': 'REAL',
+    'hauteur_dome': 'REAL', 'material': 'TEXT', 'wind_speed': 'REAL', 'safety_factor': 'REAL',
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS generations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    origine TEXT NOT NULL,
+    script_sha256 TEXT,
+    cible TEXT,
+    statut TEXT NOT NULL,
+    erreur TEXT,
+    duree_s REAL,
+    {', '.join(f'{nom} {type_sql}' for nom, type_sql in COLONNES_PARAMETRES.items())},
+    config TEXT,
+    phases TEXT,
+    fichier TEXT,
+    nb_objets INTEGER,
+    nb_solides INTEGER,
+    volume_m3 REAL,
+    boite TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_generations_geometrie
+    ON generations (rayon_petale, rayon_rosaire, hauteur_petale, hauteur_dome);
+CREATE INDEX IF NOT EXISTS idx_generations_script ON generations (script_sha256, statut);
+CREATE INDEX IF NOT EXISTS idx_generations_materiau ON generations (material, wind_speed);
+CREATE INDEX IF NOT EXISTS idx_generations_date ON generations (date);
+PRAGMA user_version = {VERSION_SCHEMA};
+"""
+
+# Échelle (mm) de chaque dimension dans la distance de `plus_proche`
+ECHELLES_DISTANCE = {'rayon_petale': 100.0, 'rayon_rosaire': 100.0,
+                     'hauteur_petale': 100.0, 'hauteur_dome': 100.0}
+# Demi-largeur (en échelles) de la boîte de pré-filtrage de `plus_proche`, élargie par 4
+DEMI_LARGEUR_INITIALE = 2.0
+DEMI_LARGEUR_MAX = 512.0
+
+
+def resume_geometrie(doc):
+    """Nombre d'objets, de solides, volume (m³) et boîte englobante (mm) des objets racines."""
+    resume = {'nb_objets': len(doc.Objects), 'nb_solides': 0, 'volume_m3': 0.0, 'boite': None}
+    boite = None
+    for obj in doc.Objects:
+        forme = getattr(obj, 'Shape', None)
+        if forme is None or getattr(obj, 'InList', None) or forme.isNull():
+            continue
+        try:
+            resume['nb_solides'] += len(forme.Solids)
+            resume['volume_m3'] += forme.Volume * 1e-9
+            b = forme.BoundBox
+            coins = [b.XMin, b.YMin, b.ZMin, b.XMax, b.YMax, b.ZMax]
+        except Exception:
+            continue
+        boite = coins if boite is None else [min(boite[i], coins[i]) for i in range(3)] + \
+            [max(boite[i], coins[i]) for i in range(3, 6)]
+    resume['boite'] = [round(v, 1) for v in boite] if boite is not None else None
+    return resume
+
+
+class HistoriqueGenerations:
+    """Base SQLite des générations ; utilisable depuis plusieurs threads (verrou interne)."""
+
+    def __init__(self, chemin=CHEMIN_HISTORIQUE):
+        import sqlite3
+
+        self.chemin = chemin
+        os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(chemin, timeout=30, check_same_thread=False)
+        self._connexion.row_factory = sqlite3.Row
+        with self._verrou, self._connexion:
+            self._connexion.execute("PRAGMA journal_mode=WAL")
+            self._connexion.executescript(SCHEMA)
+
+    def fermer(self):
+        with self._verrou:
+            self._connexion.close()
+
+    def _executer(self, requete, valeurs=()):
+        with self._verrou, self._connexion:
+            return self._connexion.execute(requete, valeurs).fetchall()
+
+    def enregistrer(self, parametres, config=None, hash_script=None, cible=None, duree_s=None,
+                    phases=None, fichier=None, geometrie=None, statut='ok', erreur=None,
+                    origine='interface'):
+        """Ajoute une génération et retourne son identifiant.
+
+        `phases` : résumé `PROFILEUR.resume()` (durées totales par span) ;
+        `geometrie` : dict de `resume_geometrie`.
+        """
+        geometrie = geometrie or {}
+        ligne = {
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'origine': origine,
+            'script_sha256': hash_script,
+            'cible': cible,
+            'statut': statut,
+            'erreur': None if erreur is None else str(erreur)[:1000],
+            'duree_s': None if duree_s is None else round(duree_s, 4),
+            'config': json.dumps(config if config is not None else parametres,
+                                 default=repr, ensure_ascii=False, sort_keys=True),
+            'phases': json.dumps({p['nom']: round(p['total'], 4) for p in phases or ()},
+                                 ensure_ascii=False),
+            'fichier': fichier,
+            'nb_objets': geometrie.get('nb_objets'),
+            'nb_solides': geometrie.get('nb_solides'),
+            'volume_m3': geometrie.get('volume_m3'),
+            'boite': json.dumps(geometrie['boite']) if geometrie.get('boite') else None,
+        }
+        for cle in COLONNES_PARAMETRES:  # valeurs absentes des paramètres : celles de `config`
+            valeur = parametres.get(cle)
+            ligne[cle] = (config or {}).get(cle) if valeur is None else valeur
+        colonnes = ', '.join(ligne)
+        with self._verrou, self._connexion:
+            curseur = self._connexion.execute(
+                f"INSERT INTO generations ({colonnes}) VALUES ({', '.join('?' * len(ligne))})",
+                list(ligne.values()))
+            return curseur.lastrowid
+
+    @staticmethod
+    def _dict(ligne):
+        entree = dict(ligne)
+        for cle in ('config', 'phases', 'boite'):
+            if entree.get(cle):
+                entree[cle] = json.loads(entree[cle])
+        entree['parametres'] = {cle: entree[cle] for cle in PARAMETRES}
+        return entree
+
+    def charger(self, identifiant):
+        """Génération `identifiant` (dict, `parametres` prêts à réappliquer) ou None."""
+        lignes = self._executer("SELECT * FROM generations WHERE id = ?", (identifiant,))
+        return self._dict(lignes[0]) if lignes else None
+
+    def dernieres(self, limite=50, hash_script=None):
+        """Générations les plus récentes d'abord (éventuellement d'un seul script)."""
+        if hash_script is None:
+            lignes = self._executer("SELECT * FROM generations ORDER BY id DESC LIMIT ?", (limite,))
+        else:
+            lignes = self._executer("SELECT * FROM generations WHERE script_sha256 = ? "
+                                    "ORDER BY id DESC LIMIT ?", (hash_script, limite))
+        return [self._dict(ligne) for ligne in lignes]
+
+    def plus_proche(self, parametres, hash_script=None, meme_materiau=True, limite=1):
+        """Générations réussies les plus proches de `parametres` (distance sur la géométrie).
+
+        Chaque écart est divisé par `ECHELLES_DISTANCE` ; les dimensions à None
+        sont ignorées. Chaque entrée reçoit sa `distance`. La recherche se limite
+        à une boîte autour de `parametres` sur les colonnes indexées, élargie
+        jusqu'à contenir les `limite` plus proches (au-delà de
+        `DEMI_LARGEUR_MAX`, toute la table est parcourue).
+        """
+        termes, valeurs, conditions = [], [], ["statut = 'ok'"]
+        dimensions = [cle for cle in PARAMETRES_GEOMETRIE if parametres.get(cle) is not None]
+        for cle in dimensions:
+            termes.append(f"(({cle} - ?) / ?) * (({cle} - ?) / ?)")
+            valeurs += [parametres[cle], ECHELLES_DISTANCE[cle]] * 2
+            conditions.append(f"{cle} IS NOT NULL")
+        distance = ' + '.join(termes) or '0'
+        filtres = []
+        if hash_script is not None:
+            conditions.append("script_sha256 = ?")
+            filtres.append(hash_script)
+        if meme_materiau and parametres.get('material'):
+            conditions.append("material = ?")
+            filtres.append(parametres['material'])
+        requete = f"SELECT *, ({distance}) AS distance FROM generations WHERE {' AND '.join(conditions)}"
+
+        demi = DEMI_LARGEUR_INITIALE
+        while dimensions and demi <= DEMI_LARGEUR_MAX:
+            boite, bornes = [], []
+            for cle in dimensions:
+                boite.append(f"{cle} BETWEEN ? AND ?")
+                bornes += [parametres[cle] - demi * ECHELLES_DISTANCE[cle],
+                           parametres[cle] + demi * ECHELLES_DISTANCE[cle]]
+            lignes = self._executer(f"{requete} AND {' AND '.join(boite)} ORDER BY distance, id DESC LIMIT ?",
+                                    valeurs + filtres + bornes + [limite])
+            # Exact si le plus éloigné retenu est dans la sphère inscrite à la boîte
+            if lignes and len(lignes) >= limite and lignes[-1]['distance'] <= demi * demi:
+                return [self._dict(ligne) for ligne in lignes]
+            demi *= 4
+        lignes = self._executer(f"{requete} ORDER BY distance, id DESC LIMIT ?", valeurs + filtres + [limite])
+        return [self._dict(ligne) for ligne in lignes]
+
+    def series(self, parametre, hash_script=None):
+        """[(valeur du paramètre, durée en s)] des générations réussies, pour un graphique."""
+        if parametre not in COLONNES_PARAMETRES:
+            raise ValueError(f"Paramètre inconnu: {parametre}")
+        requete = (f"SELECT {parametre}, duree_s FROM generations WHERE statut = 'ok' "
+                   f"AND {parametre} IS NOT NULL AND duree_s IS NOT NULL")
+        valeurs = ()
+        if hash_script is not None:
+            requete += " AND script_sha256 = ?"
+            valeurs = (hash_script,)
+        return [tuple(ligne) for ligne in self._executer(requete + f" ORDER BY {parametre}", valeurs)]
+
+    def exporter_csv(self, chemin):
+        import csv
+
+        lignes = self._executer("SELECT * FROM generations ORDER BY id")
+        with open(chemin, 'w', newline='', encoding='utf-8') as f:
+            ecrivain = csv.writer(f)
+            if lignes:
+                ecrivain.writerow(lignes[0].keys())
+            ecrivain.writerows(tuple(ligne) for ligne in lignes)
+        return len(lignes)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Historique des générations du kiosque trèfle")
+    parser.add_argument('--base', default=CHEMIN_HISTORIQUE, help="Fichier SQLite")
+    parser.add_argument('-n', '--limite', type=int, default=20)
+    parser.add_argument('--proche', nargs='+', metavar='CLE=VALEUR',
+                        help="Variantes déjà construites les plus proches de ces paramètres")
+    parser.add_argument('--csv', help="Exporter tout l'historique en CSV")
+    args = parser.parse_args(argv)
+
+    historique = HistoriqueGenerations(args.base)
+    if args.csv:
+        print(f"📤 {historique.exporter_csv(args.csv)} génération(s) -> {args.csv}")
+        return 0
+    if args.proche:
+        from kiosque_batch import _nombre
+        cible = {}
+        for spec in args.proche:
+            cle, _, valeur = spec.partition('=')
+            if cle not in COLONNES_PARAMETRES:
+                parser.error(f"Paramètre inconnu: {cle}")
+            cible[cle] = _nombre(valeur)
+        entrees = historique.plus_proche(cible, limite=args.limite)
+    else:
+        entrees = historique.dernieres(args.limite)
+    for e in entrees:
+        geometrie = ' '.join(f"{cle}={e[cle]:g}" for cle in PARAMETRES_GEOMETRIE if e[cle] is not None)
+        distance = f" d={e['distance']:.2f}" if 'distance' in e else ''
+        print(f"#{e['id']:<5} {e['date']} {e['statut']:<6} {e['duree_s'] or 0:7.2f} s "
+              f"{e['cible'] or '-'} {geometrie} {e['material'] or ''}{distance} {e['fichier'] or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+♻️ RÉGÉNÉRATION INCRÉMENTALE DU KIOSQUE TRÈFLE
+Graphe de dépendances clé de `config` -> sous-assemblage, déduit de l'index statique
+(`kiosque_index`) : les sous-assemblages sont les méthodes appelées directement par
+`generer_kiosque_complet_avec_plots` (pétales, plots, dôme...).
+
+Lors de la première construction, les objets créés par chaque sous-assemblage sont
+mémorisés. Quand des paramètres changent, seuls les sous-assemblages qui lisent une
+clé modifiée (ou dont les objets dépendent d'objets reconstruits) sont supprimés du
+document existant puis reconstruits ; le reste de la géométrie est conservé. L'instance
+étant réutilisée, un sous-assemblage qui lit un attribut de `self` affecté par un
+sous-assemblage reconstruit, ou qui lit les objets du document, est reconstruit aussi
+(`kiosque_index.lectures_etat` / `ecritures_etat`).
+
+Avec un cache de géométrie (`kiosque_cache`), les constructions complètes passent par
+`construire_avec_cache`. Un document restauré ne dit pas quel sous-assemblage a créé
+quels objets : la mise à jour suivante repart d'une construction complète (cache
+compris), les mises à jour incrémentales reprennent après une construction réelle.
+"""
+
+import copy
+
+from kiosque_generation import (
+    METHODES_GLOBALES,
+    appliquer_parametres,
+    construction_groupee,
+    instrumenter_etapes,
+    simplifier_pour_apercu,
+    verifier_annulation,
+)
+from kiosque_index import cles_config, ecritures_etat, lectures_etat
+from kiosque_profil import PROFILEUR
+
+ORCHESTRATEUR = METHODES_GLOBALES[0]
+
+_ABSENT = object()
+
+
+def graphe_dependances(index, orchestrateur=ORCHESTRATEUR):
+    """Sous-assemblage -> clés de `config` lues (transitivement) par celui-ci.
+
+    Seules les méthodes appelables sans argument peuvent être reconstruites seules ;
+    les autres restent rattachées à l'orchestrateur (voir `cles_globales`).
+    Retourne None si l'index ne permet pas de découper la construction.
+    """
+    methodes = (index.get('classe') or {}).get('methodes', {})
+    if orchestrateur not in methodes:
+        return None
+    return {nom: cles_config(index, nom)
+            for nom in methodes[orchestrateur]['appels']
+            if nom in methodes and nom != orchestrateur and methodes[nom]['requis'] == 0}
+
+
+def cles_globales(index, orchestrateur=ORCHESTRATEUR):
+    """Clés dont la modification impose une construction complète.
+
+    Celles lues directement par l'orchestrateur et par les sous-assemblages qui
+    exigent des arguments (non reconstructibles isolément).
+    """
+    methodes = (index.get('classe') or {}).get('methodes', {})
+    if orchestrateur not in methodes:
+        return set()
+    cles = set(methodes[orchestrateur]['config'])
+    for nom in methodes[orchestrateur]['appels']:
+        if nom in methodes and nom != orchestrateur and methodes[nom]['requis'] > 0:
+            cles |= cles_config(index, nom)
+    return cles
+
+
+def cles_modifiees(ancienne, nouvelle):
+    """Clés dont la valeur diffère entre deux `config` (ajout/suppression compris)."""
+    return {cle for cle in set(ancienne) | set(nouvelle)
+            if ancienne.get(cle, _ABSENT) != nouvelle.get(cle, _ABSENT)}
+
+
+class SessionIncrementale:
+    """Garde l'instance et le document de la dernière construction pour les réutiliser.
+
+    `construire(parametres, rappel, annulation)` fait une construction complète la
+    première fois (ou si le document a été fermé), puis ne reconstruit ensuite que les
+    sous-assemblages invalidés. Une erreur ou une annulation en cours de route
+    invalide la session : l'appel suivant repart d'une construction complète.
+
+    `apercu=True` construit au niveau de détail réduit (`simplifier_pour_apercu`),
+    `instances=True` place les pétales/plots symétriques en `App::Link`, `cache`
+    (`kiosque_cache.CacheGeometrie`) sert les constructions complètes (voir le module).
+    """
+
+    def __init__(self, module, index, apercu=False, instances=False, cache=None):
+        self.module = module
+        self.apercu = apercu
+        self.instances = instances
+        self.cache = cache
+        self.graphe = graphe_dependances(index)
+        self.cles_globales = cles_globales(index)
+        # Sous-assemblage -> état lu / attributs de `self` affectés (hors `config`)
+        self.lectures = {nom: lectures_etat(index, nom) for nom in self.graphe or ()}
+        self.ecritures = {nom: ecritures_etat(index, nom) for nom in self.graphe or ()}
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        self.instance = None
+        self.doc = None
+        self.objets = {}  # sous-assemblage -> noms des objets créés, dans l'ordre
+        self.ordre = []  # ordre d'appel des sous-assemblages lors de la construction
+        self.config_construite = None
+
+    def _document_valide(self):
+        import FreeCAD as App
+        return self.doc is not None and self.doc.Name in App.listDocuments()
+
+    def _enregistrer_objets(self, instance):
+        """Enveloppe les sous-assemblages pour noter les objets créés par chacun."""
+        import FreeCAD as App
+
+        profondeur = [0]
+
+        def envelopper(nom, methode):
+            def enveloppe(*args, **kwargs):
+                if profondeur[0]:
+                    return methode(*args, **kwargs)  # appel imbriqué : compté par l'appelant
+                doc = App.ActiveDocument
+                avant = {o.Name for o in doc.Objects} if doc is not None else set()
+                profondeur[0] += 1
+                try:
+                    resultat = methode(*args, **kwargs)
+                finally:
+                    profondeur[0] -= 1
+                doc = App.ActiveDocument
+                if doc is not None:
+                    nouveaux = [o.Name for o in doc.Objects if o.Name not in avant]
+                    self.objets.setdefault(nom, []).extend(nouveaux)
+                if nom not in self.ordre:
+                    self.ordre.append(nom)
+                return resultat
+            enveloppe.__name__ = nom
+            enveloppe.__wrapped__ = methode
+            return enveloppe
+
+        for nom in self.graphe or ():
+            methode = getattr(instance, nom, None)
+            if callable(methode):
+                setattr(instance, nom, envelopper(nom, methode))
+
+    def _invalides(self, modifiees):
+        """Sous-assemblages à reconstruire, fermeture par état de `self` et par document comprise."""
+        invalides = {nom for nom, cles in self.graphe.items() if cles & modifiees}
+        proprietaire = {objet: nom for nom, objets in self.objets.items() for objet in objets}
+        pile = list(invalides)
+        while pile:
+            nom = pile.pop()
+            # Lecteurs d'un attribut que `nom` affecte, ou des objets du document qu'il recrée
+            for autre in self.graphe:
+                lectures = self.lectures[autre]
+                if autre not in invalides and (lectures & self.ecritures[nom]
+                                               or any(e.startswith('document.') for e in lectures)):
+                    invalides.add(autre)
+                    pile.append(autre)
+            for objet in self.objets.get(nom, []):
+                obj = self.doc.getObject(objet)
+                if obj is None:
+                    continue
+                for dependant in obj.InListRecursive:
+                    autre = proprietaire.get(dependant.Name)
+                    if autre is not None and autre not in invalides:
+                        invalides.add(autre)
+                        pile.append(autre)
+        return invalides
+
+    def _supprimer(self, nom):
+        # Ordre inverse de création : les objets dérivés partent avant leurs sources
+        for objet in reversed(self.objets.pop(nom, [])):
+            if self.doc.getObject(objet) is not None:
+                self.doc.removeObject(objet)
+
+    def construire(self, parametres, rappel=None, annulation=None):
+        """Construit ou met à jour le kiosque (construction groupée) et retourne le document."""
+        import FreeCAD as App
+
+        try:
+            complet = self.instance is None or not self.graphe or not self._document_valide()
+            if not complet:
+                App.setActiveDocument(self.doc.Name)  # suivi par la construction groupée
+            with construction_groupee(rappel, self.module) as groupe:
+                if complet:
+                    return self._construire_complet(parametres, rappel, annulation, groupe)
+                return self._mettre_a_jour(parametres, rappel, annulation, groupe)
+        except BaseException:
+            self.reinitialiser()
+            raise
+
+    def _construire_complet(self, parametres, rappel, annulation, groupe):
+        import FreeCAD as App
+
+        self.reinitialiser()
+        with PROFILEUR.span('KiosqueTrefleFonctionnel()', 'script'):
+            instance = getattr(self.module, 'KiosqueTrefleFonctionnel')()
+        if self.apercu:
+            simplifier_pour_apercu(instance)
+        if self.instances:
+            from kiosque_instances import instancier_symetries
+            instancier_symetries(instance, rappel)
+        appliquer_parametres(instance.config, parametres)
+        instrumenter_etapes(instance, rappel, annulation)
+        self._enregistrer_objets(instance)
+
+        if rappel is not None:
+            rappel("♻️ Construction complète (référence incrémentale)")
+
+        def construire():
+            doc = instance.generer_kiosque_complet_avec_plots()
+            verifier_annulation(annulation)
+            if not hasattr(doc, 'recompute'):
+                doc = App.ActiveDocument
+            if doc is not None:
+                if rappel is not None:
+                    rappel("🔄 Recompute du document...")
+                groupe.recompute(doc)
+            return doc
+
+        hit = False
+        if self.cache is None:
+            doc = construire()
+        else:
+            from kiosque_cache import construire_avec_cache
+            doc, hit = construire_avec_cache(self.cache, getattr(self.module, '__kiosque_sha256__', ''),
+                                             instance.config, construire, rappel)
+
+        # Document restauré : objets sans sous-assemblage connu, pas de référence incrémentale
+        self.instance = None if hit else instance
+        self.doc = doc
+        self.config_construite = copy.deepcopy(instance.config)
+        return doc
+
+    def _mettre_a_jour(self, parametres, rappel, annulation, groupe):
+        appliquer_parametres(self.instance.config, parametres)
+        modifiees = cles_modifiees(self.config_construite, self.instance.config)
+        globales = modifiees & self.cles_globales
+        if globales:
+            if rappel is not None:
+                rappel(f"♻️ Clé(s) globale(s) modifiée(s) ({', '.join(sorted(globales))})")
+            return self._construire_complet(parametres, rappel, annulation, groupe)
+
+        invalides = self._invalides(modifiees)
+        if rappel is not None:
+            if invalides:
+                rappel(f"♻️ Modifié: {', '.join(sorted(modifiees))} -> reconstruction de "
+                       f"{', '.join(n for n in self.ordre if n in invalides)}")
+            else:
+                rappel("♻️ Aucun sous-assemblage impacté : géométrie conservée")
+
+        for nom in [n for n in self.ordre if n in invalides]:
+            verifier_annulation(annulation)
+            with PROFILEUR.span(f'suppression {nom}', 'freecad'):
+                self._supprimer(nom)
+            getattr(self.instance, nom)()
+
+        verifier_annulation(annulation)
+        if rappel is not None:
+            rappel("🔄 Recompute du document...")
+        groupe.recompute(self.doc)
+        self.config_construite = copy.deepcopy(self.instance.config)
+        return self.doc
@@ -0,0 +1,245 @@
+"""
+📇 INDEX STATIQUE DU SCRIPT KIOSQUE
+Introspection par AST (sans exécuter le script ni importer FreeCAD) :
+fonctions du module, méthodes de `KiosqueTrefleFonctionnel`, leurs signatures,
+les méthodes qu'elles appellent via `self.`, les clés de `config` qu'elles lisent
+et l'état qu'elles lisent ou modifient en dehors de `config` (attributs de `self`,
+objets du document).
+
+L'index est persisté en JSON par empreinte SHA-256 du fichier : une réouverture
+du même script est instantanée. Le vrai module n'est exécuté qu'à la première
+génération (voir `FonctionDifferee`).
+"""
+
+import ast
+import hashlib
+import json
+import os
+
+from kiosque_generation import REPERTOIRE_DONNEES
+from kiosque_journal import JOURNAL
+from kiosque_profil import PROFILEUR
+
+DOSSIER_INDEX = os.path.join(REPERTOIRE_DONNEES, 'index')
+NOM_CLASSE = 'KiosqueTrefleFonctionnel'
+VERSION_INDEX = 2
+
+# Noms locaux considérés comme alias de `self.config`
+ALIAS_CONFIG = ('config', 'cfg', 'conf')
+
+# Lectures du document FreeCAD (objets créés ailleurs) ; `addObject` n'en fait pas partie
+LECTURES_DOCUMENT = ('Objects', 'getObject', 'getObjectsByLabel', 'findObjects')
+
+
+def _signature(noeud, methode=False):
+    """Paramètres positionnels/mot-clés et nombre de paramètres obligatoires."""
+    args = noeud.args
+    positionnels = [a.arg for a in args.posonlyargs + args.args]
+    if methode and positionnels:
+        positionnels = positionnels[1:]  # self
+    requis = len(positionnels) - len(args.defaults)
+    requis += sum(1 for d in args.kw_defaults if d is None)
+    params = positionnels + [a.arg for a in args.kwonlyargs]
+    if args.vararg:
+        params.append('*' + args.vararg.arg)
+    if args.kwarg:
+        params.append('**' + args.kwarg.arg)
+    return {'params': params, 'requis': max(requis, 0), 'ligne': noeud.lineno}
+
+
+def _est_config(noeud, alias):
+    """Vrai si `noeud` désigne `self.config` ou un alias local de celui-ci."""
+    if isinstance(noeud, ast.Attribute) and noeud.attr == 'config':
+        return True
+    return isinstance(noeud, ast.Name) and noeud.id in alias
+
+
+def _constante(noeud):
+    if isinstance(noeud, ast.Constant) and isinstance(noeud.value, str):
+        return noeud.value
+    return None
+
+
+class _Analyseur(ast.NodeVisitor):
+    """Collecte clés de config lues, appels `self.methode()` et autres lectures d'état."""
+
+    def __init__(self):
+        self.cles = set()
+        self.appels = set()
+        self.etat = set()  # 'self.<attribut>' lus, 'document.<lecture>'
+        self.ecritures = set()  # 'self.<attribut>' affectés
+        self.alias = set(ALIAS_CONFIG)
+
+    def visit_Assign(self, noeud):
+        # c = self.config  -> `c` devient un alias
+        if _est_config(noeud.value, self.alias):
+            for cible in noeud.targets:
+                if isinstance(cible, ast.Name):
+                    self.alias.add(cible.id)
+        self.generic_visit(noeud)
+
+    def visit_Subscript(self, noeud):
+        if _est_config(noeud.value, self.alias) and isinstance(noeud.ctx, ast.Load):
+            cle = _constante(noeud.slice)
+            if cle is not None:
+                self.cles.add(cle)
+        self.generic_visit(noeud)
+
+    def visit_Attribute(self, noeud):
+        if isinstance(noeud.value, ast.Name) and noeud.value.id == 'self' and noeud.attr != 'config':
+            (self.etat if isinstance(noeud.ctx, ast.Load) else self.ecritures).add(f"self.{noeud.attr}")
+        elif noeud.attr in LECTURES_DOCUMENT and isinstance(noeud.ctx, ast.Load):
+            self.etat.add(f"document.{noeud.attr}")
+        self.generic_visit(noeud)
+
+    def visit_Call(self, noeud):
+        f = noeud.func
+        if isinstance(f, ast.Attribute):
+            if f.attr in ('get', 'setdefault') and _est_config(f.value, self.alias) and noeud.args:
+                cle = _constante(noeud.args[0])
+                if cle is not None:
+                    self.cles.add(cle)
+            if isinstance(f.value, ast.Name) and f.value.id == 'self':
+                self.appels.add(f.attr)
+        self.generic_visit(noeud)
+
+
+def _analyser(noeud):
+    """Entrée d'index : `config` (clés lues), `appels` (méthodes), `etat` et `ecritures` (hors `config`)."""
+    analyseur = _Analyseur()
+    for instruction in noeud.body:
+        analyseur.visit(instruction)
+    # Ni `self.methode` appelée ni un attribut que la fonction affecte elle-même
+    etat = analyseur.etat - analyseur.ecritures - {f"self.{nom}" for nom in analyseur.appels}
+    return {'config': sorted(analyseur.cles), 'appels': sorted(analyseur.appels), 'etat': sorted(etat),
+            'ecritures': sorted(analyseur.ecritures)}
+
+
+def _config_defaut(classe):
+    """Clés littérales de `self.config = {...}` dans `__init__`."""
+    for noeud in classe.body:
+        if isinstance(noeud, ast.FunctionDef) and noeud.name == '__init__':
+            for sous in ast.walk(noeud):
+                if (isinstance(sous, ast.Assign) and isinstance(sous.value, ast.Dict)
+                        and any(_est_config(c, ()) for c in sous.targets)):
+                    return [c for c in (_constante(k) for k in sous.value.keys) if c is not None]
+    return []
+
+
+def indexer_source(source):
+    """Construit l'index d'un source Python (lève SyntaxError si invalide)."""
+    arbre = ast.parse(source)
+    index = {'version': VERSION_INDEX, 'fonctions': {}, 'classe': None}
+    for noeud in arbre.body:
+        if isinstance(noeud, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            entree = _signature(noeud)
+            entree.update(_analyser(noeud))
+            index['fonctions'][noeud.name] = entree
+        elif isinstance(noeud, ast.ClassDef) and noeud.name == NOM_CLASSE:
+            methodes = {}
+            for sous in noeud.body:
+                if isinstance(sous, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    entree = _signature(sous, methode=True)
+                    entree.update(_analyser(sous))
+                    methodes[sous.name] = entree
+            index['classe'] = {
+                'nom': NOM_CLASSE,
+                'ligne': noeud.lineno,
+                'methodes': methodes,
+                'config_defaut': _config_defaut(noeud),
+            }
+    return index
+
+
+def charger_index(chemin_script, dossier=DOSSIER_INDEX):
+    """Index du script, depuis le cache disque si le contenu n'a pas changé.
+
+    Retourne (index, hash_script). L'index est mis en cache sous `<hash>.json`.
+    """
+    with open(chemin_script, 'rb') as f:
+        contenu = f.read()
+    hash_script = hashlib.sha256(contenu).hexdigest()
+    chemin_index = os.path.join(dossier, hash_script + '.json')
+    try:
+        with open(chemin_index, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == VERSION_INDEX:
+            return index, hash_script
+    except (OSError, ValueError):
+        pass
+
+    index = indexer_source(contenu.decode('utf-8', errors='ignore'))
+    try:
+        os.makedirs(dossier, exist_ok=True)
+        temporaire = f"{chemin_index}.{os.getpid()}.tmp"
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(temporaire, chemin_index)
+    except OSError as e:
+        JOURNAL.avertissement(f"⚠️  Index non persisté: {e}")
+    return index, hash_script
+
+
+def methodes_dependantes(index, methode):
+    """Fermeture transitive des méthodes appelées par `methode` via `self.`."""
+    methodes = (index.get('classe') or {}).get('methodes', {})
+    vues, pile = set(), [methode]
+    while pile:
+        nom = pile.pop()
+        if nom in vues or nom not in methodes:
+            continue
+        vues.add(nom)
+        pile.extend(methodes[nom]['appels'])
+    return vues
+
+
+def cles_config(index, methode):
+    """Clés de `config` lues par `methode` et tout ce qu'elle appelle."""
+    methodes = (index.get('classe') or {}).get('methodes', {})
+    cles = set()
+    for nom in methodes_dependantes(index, methode):
+        cles.update(methodes[nom]['config'])
+    return cles
+
+
+def lectures_etat(index, methode):
+    """État lu hors de `config` par `methode` et tout ce qu'elle appelle (voir `_Analyseur`).
+
+    Les références à d'autres méthodes de la classe (`self.methode` passée en argument)
+    n'en font pas partie.
+    """
+    return _etat_transitif(index, methode, 'etat')
+
+
+def ecritures_etat(index, methode):
+    """Attributs de `self` (hors `config`) affectés par `methode` et tout ce qu'elle appelle."""
+    return _etat_transitif(index, methode, 'ecritures')
+
+
+def _etat_transitif(index, methode, cle):
+    methodes = (index.get('classe') or {}).get('methodes', {})
+    etat = set()
+    for nom in methodes_dependantes(index, methode):
+        etat.update(methodes[nom].get(cle, ()))
+    return etat - {f"self.{nom}" for nom in methodes}
+
+
+class FonctionDifferee:
+    """Callable qui n'exécute le module réel qu'au premier appel.
+
+    `charger()` doit retourner le module (ou None si le chargement a échoué).
+    """
+
+    def __init__(self, charger, nom):
+        self._charger = charger
+        self.__name__ = nom
+
+    def __call__(self, *args, **kwargs):
+        module = self._charger()
+        if module is None:
+            raise RuntimeError("Le module du script n'a pas pu être chargé")
+        with PROFILEUR.span(self.__name__, 'script'):
+            return getattr(module, self.__name__)(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<FonctionDifferee {self.__name__}>"
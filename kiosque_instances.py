@@ -0,0 +1,141 @@
+"""
+🔗 INSTANCIATION DES SYMÉTRIES (App::Link)
+Les quatre pétales du trèfle (et les plots) sont identiques à une rotation près
+autour de l'axe vertical : seul le premier appel de `creer_petale(angle)` (resp.
+`creer_plot(angle)`...) modélise la géométrie, les appels suivants avec les mêmes
+autres arguments et la même `config` placent des `App::Link` tournés vers les
+objets racines de ce maître.
+
+  - `instancier_symetries(instance)` : active le mode sur une instance du script ;
+  - `developper_liens(doc)` : remplace les liens par des solides (à l'export seulement).
+
+Les méthodes concernées sont celles des étapes pétales/plots dont le premier
+paramètre contient « angle » (degrés, rotation autour de Z passant par l'origine).
+Une méthode qui retourne autre chose que None ou l'un de ses objets racines (une
+forme, une liste...) n'est pas instanciable : le lien ne peut pas tenir lieu de
+cette valeur, elle est alors toujours appelée normalement.
+"""
+
+from kiosque_journal import JOURNAL
+from kiosque_profil import PROFILEUR
+
+# Étapes dont les méthodes sont instanciables (libellés de `kiosque_generation.ETAPES`)
+ETAPES_SYMETRIQUES = ("🌸 Pétales", "🧱 Plots")
+
+# Clé posée dans `config` : distingue les entrées de cache instanciées des autres
+CLE_INSTANCES = 'instances'
+
+TYPE_LIEN = 'App::Link'
+
+
+def methodes_symetriques(instance):
+    """Noms des méthodes de `instance` instanciables par rotation (voir le module)."""
+    import inspect
+
+    from kiosque_generation import etape_de
+
+    noms = []
+    for nom in dir(type(instance)):
+        if nom.startswith('_') or etape_de(nom) not in ETAPES_SYMETRIQUES:
+            continue
+        methode = getattr(type(instance), nom, None)
+        if not callable(methode):
+            continue
+        try:
+            params = list(inspect.signature(methode).parameters)[1:]
+        except (TypeError, ValueError):
+            continue
+        if params and 'angle' in params[0].lower():
+            noms.append(nom)
+    return noms
+
+
+def _placer_lien(App, doc, maitre, delta, suffixe):
+    """Crée un `App::Link` vers `maitre`, tourné de `delta` degrés autour de Z."""
+    lien = doc.addObject(TYPE_LIEN, f"{maitre.Name}_{suffixe}")
+    lien.LinkedObject = maitre
+    lien.Label = f"{maitre.Label} ({suffixe})"
+    rotation = App.Placement(App.Vector(0, 0, 0), App.Rotation(App.Vector(0, 0, 1), delta))
+    placement = getattr(maitre, 'Placement', None)
+    lien.Placement = rotation.multiply(placement) if placement is not None else rotation
+    return lien
+
+
+def instancier_symetries(instance, rappel=None):
+    """Remplace, sur `instance`, les méthodes symétriques par leur version instanciée.
+
+    `config[CLE_INSTANCES]` vaut True. Retourne la liste des méthodes enveloppées.
+    """
+    import FreeCAD as App
+
+    maitres = {}  # (méthode, document, autres arguments, config) -> maître
+    non_instanciables = set()
+
+    def envelopper(nom, methode):
+        def enveloppe(angle, *args, **kwargs):
+            doc = App.ActiveDocument
+            if doc is None or nom in non_instanciables or not isinstance(angle, (int, float)):
+                return methode(angle, *args, **kwargs)
+            try:
+                cle = (nom, doc.Name, args, tuple(sorted(kwargs.items())),
+                       tuple(sorted((k, repr(v)) for k, v in instance.config.items())))
+                hash(cle)
+            except TypeError:
+                return methode(angle, *args, **kwargs)  # arguments non hachables : pas d'instance
+
+            maitre = maitres.get(cle)
+            if maitre is None or any(doc.getObject(n) is None for n in maitre['racines']):
+                avant = {o.Name for o in doc.Objects}
+                resultat = methode(angle, *args, **kwargs)
+                nouveaux = [o for o in doc.Objects if o.Name not in avant]
+                noms = {o.Name for o in nouveaux}
+                racines = [o.Name for o in nouveaux
+                           if not any(p.Name in noms for p in getattr(o, 'InList', ()))]
+                if resultat is not None and getattr(resultat, 'Name', None) not in racines:
+                    non_instanciables.add(nom)
+                    JOURNAL.info(f"🔗 {nom} retourne {type(resultat).__name__} : appelée sans App::Link",
+                                 evenement='instances', methode=nom)
+                else:
+                    maitres[cle] = {'angle': angle, 'racines': racines, 'resultat': resultat}
+                return resultat
+
+            suffixe = f"lien_{angle:g}".replace('.', '_').replace('-', 'm')
+            with PROFILEUR.span(f'{nom} (lien)', 'instances'):
+                liens = {n: _placer_lien(App, doc, doc.getObject(n), angle - maitre['angle'], suffixe)
+                         for n in maitre['racines']}
+            # Le script reçoit le lien correspondant à l'objet renvoyé par le maître (ou None)
+            if maitre['resultat'] is None:
+                return None
+            return liens[maitre['resultat'].Name]
+        enveloppe.__name__ = nom
+        enveloppe.__wrapped__ = methode
+        return enveloppe
+
+    enveloppees = []
+    for nom in methodes_symetriques(instance):
+        setattr(instance, nom, envelopper(nom, getattr(instance, nom)))
+        enveloppees.append(nom)
+    instance.config[CLE_INSTANCES] = True
+    if rappel is not None and enveloppees:
+        rappel(f"🔗 Instanciation App::Link : {', '.join(enveloppees)}")
+    return enveloppees
+
+
+def developper_liens(doc):
+    """Remplace chaque `App::Link` de `doc` par un `Part::Feature` de même forme et position.
+
+    À n'utiliser qu'avant un export qui ne sait pas lire les liens : le document
+    perd le gain de taille de l'instanciation. Retourne le nombre de liens développés.
+    """
+    import Part
+
+    liens = [o for o in doc.Objects if o.TypeId == TYPE_LIEN]
+    with PROFILEUR.span('développement des liens', 'instances', liens=len(liens)):
+        for lien in liens:
+            solide = doc.addObject('Part::Feature', f"{lien.Name}_solide")
+            solide.Shape = Part.getShape(lien)
+            solide.Label = lien.Label
+            doc.removeObject(lien.Name)
+        if liens:
+            doc.recompute()
+    return len(liens)
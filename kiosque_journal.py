@@ -0,0 +1,172 @@
+"""
+📜 JOURNAL STRUCTURÉ DU KIOSQUE
+Remplace les `print` et les ajouts ligne à ligne dans la zone de logs par un
+journal unique, `JOURNAL`, partagé par l'interface, le noyau de génération et le batch :
+
+  - niveaux `debug` < `info` < `avertissement` < `erreur` ;
+  - tampon circulaire borné (`EVENEMENTS_MAX`) : l'interface en extrait les
+    nouveaux évènements sur minuterie (`depuis(curseur)`) et les affiche d'un bloc ;
+  - console limitée en débit (`CONSOLE_MAX_PAR_S` lignes par seconde, le surplus est
+    compté puis signalé en une ligne) ; les erreurs passent toujours ;
+  - fichier JSON-lines optionnel (`ouvrir_fichier`), écrit par blocs : un batch de
+    milliers de variantes ne paie pas une écriture disque par évènement.
+
+Chaque évènement est un dict : `seq`, `t` (epoch), `niveau`, `message`, `thread`,
+plus les champs structurés passés en mots-clés (`index=..., duree_s=...`). `json`
+et `traceback` ne sont importés qu'à l'usage (démarrage rapide).
+"""
+
+import collections
+import os
+import sys
+import threading
+import time
+
+NIVEAUX = {'debug': 10, 'info': 20, 'avertissement': 30, 'erreur': 40}
+EVENEMENTS_MAX = 5000
+CONSOLE_MAX_PAR_S = 20
+TAMPON_FICHIER = 200  # évènements accumulés avant écriture dans le fichier
+
+
+class Journal:
+    """Journal thread-safe : tampon circulaire, console limitée, fichier JSON-lines par blocs."""
+
+    def __init__(self, evenements_max=EVENEMENTS_MAX, niveau_console='info',
+                 console_max_par_s=CONSOLE_MAX_PAR_S):
+        self.evenements = collections.deque(maxlen=evenements_max)
+        self.niveau_console = niveau_console
+        self.console_max_par_s = console_max_par_s
+        self._verrou = threading.Lock()
+        self._seq = 0
+        self._fenetre = 0.0  # début (monotonic) de la seconde de console courante
+        self._affiches = 0
+        self._supprimes = 0
+        self._fichier = None
+        self._a_ecrire = []
+
+    # ------------------------------------------------------------------
+    # Émission
+    # ------------------------------------------------------------------
+    def ecrire(self, niveau, message, console=True, trace=False, **champs):
+        """Enregistre un évènement ; `console=False` le réserve au tampon et au fichier.
+
+        `trace=True` joint la pile de l'exception en cours (champ `trace`), affichée
+        en console seulement au niveau `debug`.
+        """
+        evenement = {'t': time.time(), 'niveau': niveau, 'message': str(message),
+                     'thread': threading.current_thread().name}
+        if trace and sys.exc_info()[0] is not None:
+            import traceback
+            evenement['trace'] = traceback.format_exc()
+        evenement.update(champs)
+        with self._verrou:
+            self._seq += 1
+            evenement['seq'] = self._seq
+            self.evenements.append(evenement)
+            if self._fichier is not None:
+                self._a_ecrire.append(evenement)
+                if len(self._a_ecrire) >= TAMPON_FICHIER or niveau == 'erreur':
+                    self._vider_fichier()
+            lignes = self._lignes_console(evenement) if console else ()
+        for ligne in lignes:
+            print(ligne)
+        return evenement
+
+    def debug(self, message, **champs):
+        return self.ecrire('debug', message, **champs)
+
+    def info(self, message, **champs):
+        return self.ecrire('info', message, **champs)
+
+    def avertissement(self, message, **champs):
+        return self.ecrire('avertissement', message, **champs)
+
+    def erreur(self, message, **champs):
+        return self.ecrire('erreur', message, **champs)
+
+    def exception(self, message, **champs):
+        """Erreur avec la pile de l'exception en cours (à appeler dans un `except`)."""
+        return self.ecrire('erreur', message, trace=True, **champs)
+
+    def _lignes_console(self, evenement):
+        """Lignes à imprimer pour `evenement` (sous le verrou) selon le niveau et le débit."""
+        niveau = NIVEAUX[evenement['niveau']]
+        if niveau < NIVEAUX[self.niveau_console]:
+            return ()
+        lignes = []
+        maintenant = time.monotonic()
+        if maintenant - self._fenetre >= 1.0:
+            if self._supprimes:
+                lignes.append(f"🔇 {self._supprimes} message(s) non affiché(s) (voir le journal)")
+            self._fenetre, self._affiches, self._supprimes = maintenant, 0, 0
+        if self._affiches >= self.console_max_par_s and niveau < NIVEAUX['erreur']:
+            self._supprimes += 1
+            return lignes
+        self._affiches += 1
+        lignes.append(evenement['message'])
+        if 'trace' in evenement and NIVEAUX[self.niveau_console] <= NIVEAUX['debug']:
+            lignes.append(evenement['trace'].rstrip())
+        return lignes
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+    def depuis(self, seq=0):
+        """Évènements du tampon postérieurs à `seq` (ordre chronologique ; `seq` du dernier = curseur)."""
+        with self._verrou:
+            nouveaux = []
+            for evenement in reversed(self.evenements):
+                if evenement['seq'] <= seq:
+                    break
+                nouveaux.append(evenement)
+        nouveaux.reverse()
+        return nouveaux
+
+    @property
+    def dernier_seq(self):
+        return self._seq
+
+    # ------------------------------------------------------------------
+    # Fichier JSON-lines
+    # ------------------------------------------------------------------
+    def ouvrir_fichier(self, chemin):
+        """Ajoute les évènements suivants à `chemin` (une ligne JSON par évènement)."""
+        dossier = os.path.dirname(os.path.abspath(chemin))
+        os.makedirs(dossier, exist_ok=True)
+        import atexit
+
+        with self._verrou:
+            if self._fichier is None:
+                atexit.register(self.fermer_fichier)  # évènements en attente écrits à la sortie
+            self._fermer_fichier()
+            self._fichier = open(chemin, 'a', encoding='utf-8', buffering=1 << 16)
+        return chemin
+
+    def vider(self):
+        """Écrit les évènements en attente dans le fichier."""
+        with self._verrou:
+            self._vider_fichier()
+
+    def fermer_fichier(self):
+        with self._verrou:
+            self._fermer_fichier()
+
+    def _vider_fichier(self):
+        import json
+
+        if self._fichier is None:
+            return
+        if self._a_ecrire:
+            self._fichier.write(''.join(json.dumps(e, ensure_ascii=False, default=str) + '\n'
+                                        for e in self._a_ecrire))
+            self._a_ecrire = []
+        self._fichier.flush()
+
+    def _fermer_fichier(self):
+        if self._fichier is not None:
+            self._vider_fichier()
+            self._fichier.close()
+            self._fichier = None
+
+
+JOURNAL = Journal(niveau_console=os.environ.get('KIOSQUE_JOURNAL_NIVEAU', 'info'))
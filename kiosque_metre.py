@@ -0,0 +1,113 @@
+"""
+📐 MÉTRÉ ANALYTIQUE DU KIOSQUE TRÈFLE
+Quantités pour un devis sans modèle CAO (NumPy, sans FreeCAD) : longueurs de tubes
+des pétales et des montants, nervures et surface du dôme, béton des plots, masses.
+Comme `kiosque_ancrage.dimensionner`, toutes les entrées sont diffusées : un seul
+appel chiffre des milliers de variantes.
+
+Modèle géométrique (cohérent avec le script à 4 pétales, à vérifier sur plan) :
+  - pétale : lobe circulaire de rayon `rayon_petale` centré à `rayon_rosaire` de
+    l'axe, ouvert sur `ANGLE_LOBE` ; deux lisses (basse et haute) par pétale ;
+  - montants verticaux de `hauteur_petale` espacés d'au plus `ESPACEMENT_MONTANTS`
+    le long du lobe ;
+  - dôme : paraboloïde de révolution de rayon `rayon_rosaire + rayon_petale` et de
+    hauteur `hauteur_dome`, porté par `NERVURES_PAR_PETALE` nervures par pétale ;
+  - plots : `nb_plots` cubes de béton dimensionnés au vent par `kiosque_ancrage`.
+Dimensions en mm (comme `config`), résultats en m, m², m³ et kg.
+"""
+
+import numpy as np
+
+from kiosque_ancrage import (GEOMETRIE_DEFAUT, MATERIAU_DEFAUT, NB_PLOTS_DEFAUT, RHO_BETON, diffuser_materiau,
+                             dimensionner)
+from kiosque_generation import FS_DEFAUT, VENT_DEFAUT, meta_parametre
+
+ANGLE_LOBE = 1.5 * np.pi  # rad, partie du cercle du pétale hors raccord avec ses voisins
+LISSES_PAR_PETALE = 2
+ESPACEMENT_MONTANTS = 0.8  # m
+NERVURES_PAR_PETALE = 2
+NB_PETALES = 4
+
+# Matériau -> (masse linéique des tubes en kg/m, masse surfacique de la couverture en kg/m²)
+MASSES = {
+    'acier': (3.56, 4.0),  # tube 48,3 × 3,2 ; bac acier
+    'bambou': (1.6, 1.2),  # chaume Ø 80 ; toile tendue
+}
+
+COLONNES_METRE = ('longueur_lisses', 'nb_montants', 'longueur_montants', 'longueur_nervures',
+                  'longueur_tubes', 'surface_dome', 'volume_beton', 'masse_beton',
+                  'masse_tubes', 'masse_couverture', 'masse_structure')
+
+
+def longueur_parabole(rayon, hauteur):
+    """Longueur d'une demi-parabole de portée `rayon` et de flèche `hauteur` (mêmes unités)."""
+    k = 2.0 * hauteur / rayon ** 2
+    kr = k * rayon
+    return 0.5 * rayon * np.sqrt(1.0 + kr ** 2) + np.arcsinh(kr) / (2.0 * k)
+
+
+def surface_paraboloide(rayon, hauteur):
+    """Surface latérale d'un paraboloïde de révolution (rayon de base, hauteur)."""
+    return np.pi * rayon / (6.0 * hauteur ** 2) * ((rayon ** 2 + 4.0 * hauteur ** 2) ** 1.5 - rayon ** 3)
+
+
+def estimer(rayon_petale=None, rayon_rosaire=None, hauteur_petale=None, hauteur_dome=None,
+            material=MATERIAU_DEFAUT, wind_speed=VENT_DEFAUT, safety_factor=FS_DEFAUT,
+            nb_petales=NB_PETALES, nb_plots=NB_PLOTS_DEFAUT):
+    """Métré de toutes les combinaisons diffusées des entrées.
+
+    Les dimensions à None prennent `GEOMETRIE_DEFAUT`. Retourne un dict de tableaux
+    de même forme, clés `COLONNES_METRE` (+ `nb_plots`).
+    """
+    geometrie = {cle: GEOMETRIE_DEFAUT[cle] if valeur is None else valeur
+                 for cle, valeur in (('rayon_petale', rayon_petale), ('rayon_rosaire', rayon_rosaire),
+                                     ('hauteur_petale', hauteur_petale), ('hauteur_dome', hauteur_dome))}
+    ancrage = dimensionner(wind_speed, geometrie['rayon_petale'], geometrie['rayon_rosaire'],
+                           geometrie['hauteur_petale'], geometrie['hauteur_dome'],
+                           material, safety_factor, nb_plots)
+    forme = np.broadcast_shapes(ancrage['volume_plot'].shape, np.shape(nb_petales))
+    r_p, r_r, h_p, h_d, n_p, n_plots = (
+        np.broadcast_to(np.asarray(valeur, dtype=float) / echelle, forme)
+        for valeur, echelle in ((geometrie['rayon_petale'], 1000.0), (geometrie['rayon_rosaire'], 1000.0),
+                                (geometrie['hauteur_petale'], 1000.0), (geometrie['hauteur_dome'], 1000.0),
+                                (nb_petales, 1.0), (nb_plots, 1.0)))
+    lineique, surfacique = diffuser_materiau(material, forme, MASSES)
+
+    arc = ANGLE_LOBE * r_p
+    lisses = n_p * LISSES_PAR_PETALE * arc
+    montants = n_p * (np.ceil(arc / ESPACEMENT_MONTANTS) + 1.0)
+    longueur_montants = montants * h_p
+    r_dome = r_r + r_p
+    nervures = n_p * NERVURES_PAR_PETALE * longueur_parabole(r_dome, h_d)
+    surface = surface_paraboloide(r_dome, h_d)
+    tubes = lisses + longueur_montants + nervures
+    volume = np.broadcast_to(ancrage['volume_plot'], forme) * n_plots
+
+    masse_tubes = tubes * lineique
+    masse_couverture = surface * surfacique
+    return {
+        'longueur_lisses': lisses,
+        'nb_montants': montants,
+        'longueur_montants': longueur_montants,
+        'longueur_nervures': nervures,
+        'longueur_tubes': tubes,
+        'surface_dome': surface,
+        'nb_plots': n_plots,
+        'volume_beton': volume,
+        'masse_beton': volume * RHO_BETON,
+        'masse_tubes': masse_tubes,
+        'masse_couverture': masse_couverture,
+        'masse_structure': masse_tubes + masse_couverture,
+    }
+
+
+def estimer_parametres(parametres, nb_petales=NB_PETALES, nb_plots=NB_PLOTS_DEFAUT):
+    """`estimer` appliqué à un dict de `PARAMETRES` (interface, batch)."""
+    return estimer(
+        parametres.get('rayon_petale'), parametres.get('rayon_rosaire'),
+        parametres.get('hauteur_petale'), parametres.get('hauteur_dome'),
+        parametres.get('material') or MATERIAU_DEFAUT,
+        meta_parametre(parametres, 'wind_speed'),
+        meta_parametre(parametres, 'safety_factor'),
+        nb_petales, nb_plots,
+    )
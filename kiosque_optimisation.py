@@ -0,0 +1,268 @@
+"""
+🎯 OPTIMISATION DE LA GÉOMÉTRIE SOUS CONTRAINTES
+Cherche les combinaisons `rayon_petale`, `rayon_rosaire`, `hauteur_petale`,
+`hauteur_dome` qui respectent des contraintes de site (vent, matériau, FS, emprise
+maximale, hauteur libre minimale, lest maximal par plot) et retourne leur front de
+Pareto (masse de structure, béton, surface abritée), sans CAO.
+
+  1. grille grossière sur `BORNES_DEFAUT` ; les contraintes géométriques (emprise,
+     hauteur libre) élaguent les axes et le plan des rayons avant tout calcul ;
+  2. les survivants sont évalués en un appel vectorisé (`kiosque_ancrage`, puis
+     `kiosque_metre` sur ceux dont le lest est admissible) : quelques millisecondes
+     pour des milliers de candidats, un pool de processus coûterait plus cher que le
+     calcul ; le parallélisme multi-processus est réservé à la CAO du front ;
+  3. chaque passe de raffinement divise le pas par deux autour du front courant
+     seulement : les régions infaisables ou dominées ne sont jamais raffinées.
+
+Seul le front final mérite une génération CAO :
+
+    python kiosque_optimisation.py --vent 130 --emprise-max 7000 --hauteur-libre-min 2100 \
+        --construire kiosque_trefle_4petales_dome22.py --max-variantes 8 -j 4
+"""
+
+import itertools
+import sys
+import time
+
+import numpy as np
+
+from kiosque_ancrage import MATERIAU_DEFAUT, NB_PLOTS_DEFAUT, dimensionner
+from kiosque_generation import FS_DEFAUT, VENT_DEFAUT
+from kiosque_metre import estimer
+
+# Dimensions optimisées et bornes de recherche (mm), dans l'ordre des colonnes des candidats
+BORNES_DEFAUT = {
+    'rayon_petale': (1500, 3000),
+    'rayon_rosaire': (500, 1500),
+    'hauteur_petale': (1800, 3000),
+    'hauteur_dome': (2500, 4500),
+}
+PAS_DEFAUT = 200  # mm, grille initiale
+PAS_MIN = 10  # mm, les passes de raffinement s'arrêtent là
+RAFFINEMENTS_DEFAUT = 3
+
+# Indicateur -> sens (1 : à minimiser, -1 : à maximiser)
+OBJECTIFS_DEFAUT = {'masse_structure': 1, 'volume_beton': 1, 'surface_abritee': -1}
+
+COLONNES_OPTIMISATION = ('emprise', 'surface_abritee', 'masse_plot', 'cote_plot', 'volume_beton',
+                         'longueur_tubes', 'surface_dome', 'masse_structure')
+
+_BASE_CLE = 1 << 14  # encodage entier d'un candidat (dimensions < 16 384 mm)
+
+
+def front_pareto(couts):
+    """Indices (croissants) des lignes non dominées de `couts` (N × k, à minimiser).
+
+    Les doublons exacts ne sont gardés qu'une fois.
+    """
+    couts = np.asarray(couts, dtype=float)
+    ordre = np.lexsort(couts.T[::-1])
+    tries = couts[ordre]
+    restants = np.arange(len(tries))
+    front = []
+    while restants.size:
+        # Le plus petit restant (ordre lexicographique) n'est dominé par aucun autre
+        tete = restants[0]
+        front.append(tete)
+        restants = restants[~np.all(tries[restants] >= tries[tete], axis=1)]
+    return np.sort(ordre[front])
+
+
+def _cles(points):
+    cles = np.zeros(len(points), dtype=np.int64)
+    for j in range(points.shape[1]):
+        cles = cles * _BASE_CLE + points[:, j]
+    return cles
+
+
+def _grille(bornes, pas, emprise_max, hauteur_libre_min):
+    """Candidats initiaux (N × 4, mm entiers), déjà élagués par les contraintes géométriques."""
+    axes = [np.arange(bas, haut + 1, pas, dtype=np.int64) for bas, haut in bornes.values()]
+    r_p, r_r, h_p, h_d = axes
+    if hauteur_libre_min is not None:
+        h_p = h_p[h_p >= hauteur_libre_min]
+    plan = np.stack(np.meshgrid(r_p, r_r, indexing='ij'), axis=-1).reshape(-1, 2)
+    if emprise_max is not None:
+        plan = plan[2 * plan.sum(axis=1) <= emprise_max]
+    if not len(plan) or not len(h_p) or not len(h_d):
+        return np.empty((0, 4), dtype=np.int64)
+    hauteurs = np.stack(np.meshgrid(h_p, h_d, indexing='ij'), axis=-1).reshape(-1, 2)
+    return np.hstack([np.repeat(plan, len(hauteurs), axis=0), np.tile(hauteurs, (len(plan), 1))])
+
+
+def _voisins(points, pas, bornes):
+    """Voisins à ±`pas` sur chaque dimension (3⁴ par point), ramenés dans les bornes."""
+    decalages = np.array(list(itertools.product((-pas, 0, pas), repeat=points.shape[1])), dtype=np.int64)
+    voisins = (points[:, None, :] + decalages[None, :, :]).reshape(-1, points.shape[1])
+    bas = np.array([b for b, _ in bornes.values()], dtype=np.int64)
+    haut = np.array([h for _, h in bornes.values()], dtype=np.int64)
+    return np.unique(np.clip(voisins, bas, haut), axis=0)
+
+
+def evaluer(points, wind_speed=VENT_DEFAUT, material=MATERIAU_DEFAUT, safety_factor=FS_DEFAUT,
+            nb_plots=NB_PLOTS_DEFAUT, emprise_max=None, hauteur_libre_min=None, lest_max=None):
+    """Évalue les candidats `points` (N × 4 : colonnes de `BORNES_DEFAUT`, mm).
+
+    Retourne (masque des faisables, indicateurs des faisables) ; les indicateurs
+    (clés `COLONNES_OPTIMISATION`) ne sont calculés que pour les candidats qui
+    passent les contraintes précédentes.
+    """
+    r_p, r_r, h_p, h_d = (points[:, j].astype(float) for j in range(4))
+    faisable = np.ones(len(points), dtype=bool)
+    if emprise_max is not None:
+        faisable &= 2.0 * (r_p + r_r) <= emprise_max
+    if hauteur_libre_min is not None:
+        faisable &= h_p >= hauteur_libre_min
+
+    idx = np.flatnonzero(faisable)
+    ancrage = dimensionner(wind_speed, r_p[idx], r_r[idx], h_p[idx], h_d[idx],
+                           material, safety_factor, nb_plots)
+    if lest_max is not None:
+        admis = ancrage['masse_plot'] <= lest_max
+        faisable[idx[~admis]] = False
+        idx = idx[admis]
+        ancrage = {cle: valeurs[admis] for cle, valeurs in ancrage.items()}
+
+    metre = estimer(r_p[idx], r_r[idx], h_p[idx], h_d[idx], material, wind_speed,
+                    safety_factor, nb_plots=nb_plots)
+    r_ext = (r_p[idx] + r_r[idx]) / 1000.0
+    indicateurs = {
+        'emprise': 2.0 * (r_p[idx] + r_r[idx]),
+        'surface_abritee': np.pi * r_ext ** 2,
+        'masse_plot': ancrage['masse_plot'],
+        'cote_plot': ancrage['cote_plot'],
+    }
+    for cle in ('volume_beton', 'longueur_tubes', 'surface_dome', 'masse_structure'):
+        indicateurs[cle] = metre[cle]
+    return faisable, indicateurs
+
+
+def optimiser(wind_speed=VENT_DEFAUT, material=MATERIAU_DEFAUT, safety_factor=FS_DEFAUT, emprise_max=None,
+              hauteur_libre_min=None, lest_max=None, bornes=None, pas=PAS_DEFAUT,
+              raffinements=RAFFINEMENTS_DEFAUT, objectifs=None, nb_plots=NB_PLOTS_DEFAUT, rappel=None):
+    """Front de Pareto des géométries admissibles (voir le module).
+
+    `emprise_max` : diamètre extérieur maximal (mm) ; `hauteur_libre_min` : hauteur
+    des pétales minimale (mm) ; `lest_max` : lest béton maximal par plot (kg).
+    Retourne un dict : `front` (liste triée par surface abritée de dicts
+    `parametres` + indicateurs), `evalues`, `elagues`, `faisables`, `duree_s`.
+    """
+    debut = time.perf_counter()
+    bornes = dict(BORNES_DEFAUT, **(bornes or {}))
+    objectifs = objectifs or OBJECTIFS_DEFAUT
+    contraintes = dict(wind_speed=wind_speed, material=material, safety_factor=safety_factor,
+                       nb_plots=nb_plots, emprise_max=emprise_max,
+                       hauteur_libre_min=hauteur_libre_min, lest_max=lest_max)
+    signes = np.array(list(objectifs.values()), dtype=float)
+
+    candidats = _grille(bornes, pas, emprise_max, hauteur_libre_min)
+    total_grille = int(np.prod([len(range(b, h + 1, pas)) for b, h in bornes.values()]))
+    elagues = total_grille - len(candidats)
+    evalues = np.empty(0, dtype=np.int64)  # clés de tous les candidats déjà évalués
+    points = np.empty((0, 4), dtype=np.int64)  # candidats faisables
+    indicateurs = {cle: np.empty(0) for cle in COLONNES_OPTIMISATION}
+    front = np.empty(0, dtype=np.int64)
+
+    for passe in range(raffinements + 1):
+        if passe:
+            pas = max(PAS_MIN, pas // 2)
+            candidats = _voisins(points[front], pas, bornes)
+            candidats = candidats[~np.isin(_cles(candidats), evalues)]
+        evalues = np.concatenate([evalues, _cles(candidats)])
+        faisable, nouveaux = evaluer(candidats, **contraintes)
+        elagues += int((~faisable).sum())
+        points = np.vstack([points, candidats[faisable]])
+        indicateurs = {cle: np.concatenate([indicateurs[cle], nouveaux[cle]]) for cle in indicateurs}
+        if not len(points):
+            break
+        couts = np.column_stack([indicateurs[cle] for cle in objectifs]) * signes
+        front = front_pareto(couts)
+        if rappel is not None:
+            rappel(f"🎯 Passe {passe + 1} (pas {pas} mm) : {len(candidats)} candidat(s), "
+                   f"{len(points)} faisable(s), front de {len(front)}")
+        if pas == PAS_MIN:
+            break
+
+    resultats = []
+    for i in front:
+        parametres = dict(zip(bornes, (int(v) for v in points[i])))
+        parametres.update(material=material, wind_speed=wind_speed, safety_factor=safety_factor)
+        entree = {'parametres': parametres}
+        entree.update({cle: float(indicateurs[cle][i]) for cle in COLONNES_OPTIMISATION})
+        resultats.append(entree)
+    resultats.sort(key=lambda e: (e['surface_abritee'], e['masse_structure']))
+    return {
+        'front': resultats,
+        'evalues': len(evalues),
+        'elagues': elagues,
+        'faisables': len(points),
+        'duree_s': time.perf_counter() - debut,
+    }
+
+
+def representants(front, nombre):
+    """Au plus `nombre` entrées de `front` régulièrement réparties (extrémités comprises)."""
+    if nombre is None or len(front) <= nombre:
+        return list(front)
+    indices = np.unique(np.linspace(0, len(front) - 1, max(nombre, 1)).round().astype(int))
+    return [front[i] for i in indices]
+
+
+def ecrire_front(resultat, chemin):
+    """Écrit le front dans un CSV (colonnes `PARAMETRES` + `COLONNES_OPTIMISATION`)."""
+    from kiosque_batch import ecrire_csv_vectorise
+    from kiosque_generation import PARAMETRES
+
+    front = resultat['front']
+    colonne = {cle: [e['parametres'].get(cle) for e in front] for cle in PARAMETRES}
+    valeurs = {cle: [e[cle] for e in front] for cle in COLONNES_OPTIMISATION}
+    return ecrire_csv_vectorise(chemin, colonne, valeurs, COLONNES_OPTIMISATION)
+
+
+def main(argv=None):
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Optimisation sous contraintes du kiosque trèfle")
+    parser.add_argument('--vent', type=float, default=VENT_DEFAUT, help="Vitesse de vent (km/h)")
+    parser.add_argument('--materiau', default='Acier galvanisé (permanent)')
+    parser.add_argument('--fs', type=float, default=FS_DEFAUT, help="Facteur de sécurité")
+    parser.add_argument('--emprise-max', type=float, help="Diamètre extérieur maximal (mm)")
+    parser.add_argument('--hauteur-libre-min', type=float, help="Hauteur des pétales minimale (mm)")
+    parser.add_argument('--lest-max', type=float, help="Lest béton maximal par plot (kg)")
+    parser.add_argument('--pas', type=int, default=PAS_DEFAUT, help="Pas de la grille initiale (mm)")
+    parser.add_argument('--raffinements', type=int, default=RAFFINEMENTS_DEFAUT)
+    parser.add_argument('--sortie', default='pareto', help="Dossier de sortie (défaut: pareto)")
+    parser.add_argument('--construire', metavar='SCRIPT',
+                        help="Générer en CAO les variantes du front (via kiosque_batch)")
+    parser.add_argument('--max-variantes', type=int, default=None,
+                        help="Ne générer que N variantes régulièrement réparties sur le front")
+    parser.add_argument('--formats', default='fcstd')
+    parser.add_argument('-j', '--processus', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    resultat = optimiser(args.vent, args.materiau, args.fs, args.emprise_max,
+                         args.hauteur_libre_min, args.lest_max, pas=args.pas,
+                         raffinements=args.raffinements, rappel=print)
+    print(f"🎯 {resultat['evalues']} candidat(s) évalué(s), {resultat['elagues']} élagué(s), "
+          f"front de {len(resultat['front'])} en {resultat['duree_s'] * 1000:.0f} ms")
+    if not resultat['front']:
+        print("❌ Aucune géométrie ne respecte les contraintes")
+        return 1
+    print(f"📄 {ecrire_front(resultat, os.path.join(args.sortie, 'pareto.csv'))}")
+
+    if args.construire:
+        from kiosque_batch import executer_batch
+
+        formats = [f.strip().lower() for f in args.formats.split(',') if f.strip()]
+        front = representants(resultat['front'], args.max_variantes)
+        print(f"🏭 Génération CAO de {len(front)} variante(s) du front")
+        manifeste = executer_batch(args.construire, [e['parametres'] for e in front],
+                                   args.sortie, formats, args.processus)
+        print(f"📋 {manifeste['reussies']} réussie(s), {manifeste['echouees']} échec(s)")
+        return 0 if manifeste['echouees'] == 0 else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
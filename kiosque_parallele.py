@@ -0,0 +1,269 @@
+"""
+⚡ CONSTRUCTION PARALLÈLE DES SOUS-ASSEMBLAGES
+`generer_kiosque_complet_avec_plots` enchaîne pétales, plots et dôme dans un seul
+thread alors qu'ils sont indépendants jusqu'à leur placement. Ici, chaque
+sous-assemblage de la régénération incrémentale (`graphe_dependances` : méthodes
+sans argument appelées par l'orchestrateur) est construit dans un pool de
+processus FreeCAD headless, qui ont chargé le script une fois pour toutes.
+
+Les sous-assemblages sont soumis au pool dès le début de la construction ;
+l'orchestrateur tourne ensuite normalement dans le processus principal et, à
+chaque appel d'un sous-assemblage, attend le worker correspondant et ajoute ses
+formes BREP (`Part::Feature`, placement inclus) au document qu'il a créé. La
+construction dure ainsi à peu près le temps du sous-assemblage le plus lent, plus
+la fusion.
+
+Seuls les sous-assemblages qui ne lisent que `self.config` sont soumis au pool :
+un worker part d'une instance neuve et d'un document vide, il ne voit ni les
+attributs posés par d'autres méthodes ni les objets des autres sous-assemblages,
+et les attributs qu'il pose ne reviennent pas dans le processus principal.
+L'index statique (`kiosque_index.lectures_etat`, `ecritures_etat`) écarte d'emblée
+ceux qui lisent ou affectent un attribut de `self`, ou lisent le document
+(`Objects`, `getObject`...) : ils sont construits sur place, dans le processus
+principal. Au-delà de ce que l'AST
+permet de voir (état global du module, fichiers...), rien n'est détecté : un tel
+sous-assemblage doit être écarté par le script lui-même (argument par défaut...).
+
+Un sous-assemblage soumis est aussi construit sur place si son worker échoue,
+s'il retourne une valeur (objets FreeCAD non transférables) ou si l'orchestrateur
+a modifié une clé de `config` qu'il lit avant de l'appeler. Les deux premiers cas
+sont mémorisés : ce sous-assemblage n'est plus soumis au pool. Comme en bac à
+sable, le document ne contient que des solides (ni arbre paramétrique, ni liens).
+"""
+
+import copy
+import os
+import sys
+import threading
+import time
+
+from kiosque_generation import (
+    METHODES_GLOBALES,
+    GenerationAnnulee,
+    appliquer_parametres,
+    charger_module,
+    construction_groupee,
+    instrumenter_etapes,
+    verifier_annulation,
+)
+from kiosque_incremental import graphe_dependances
+from kiosque_index import ecritures_etat, lectures_etat
+from kiosque_journal import JOURNAL
+from kiosque_profil import PROFILEUR
+
+INTERVALLE_ATTENTE_S = 0.1  # vérification de l'annulation pendant l'attente d'un worker
+
+_MODULE = None
+
+
+# ============================================================================
+# CÔTÉ WORKER
+# ============================================================================
+
+def _initialiser_worker(chemin_script, chemins):
+    """Initialiseur du pool : importe FreeCAD et charge le script UNE fois par processus."""
+    global _MODULE
+    for chemin in chemins:
+        if chemin not in sys.path:
+            sys.path.append(chemin)
+    import FreeCAD  # noqa: F401  (échoue tôt si FreeCAD est introuvable)
+    _MODULE = charger_module(chemin_script)
+
+
+def _pret():
+    return os.getpid()
+
+
+def _construire_partie(nom, parametres):
+    """Worker : sous-assemblage `nom` seul dans un document temporaire -> formes BREP."""
+    import FreeCAD as App
+
+    from kiosque_export import formes_brep
+
+    debut = time.perf_counter()
+    instance = getattr(_MODULE, 'KiosqueTrefleFonctionnel')()
+    appliquer_parametres(instance.config, parametres)
+    doc = None
+    try:
+        with construction_groupee(module=_MODULE) as groupe:
+            doc = App.newDocument(f"Partie_{nom}")
+            groupe.suivre(doc)
+            resultat = getattr(instance, nom)()
+            groupe.recompute(doc)
+        return {'formes': formes_brep(doc), 'objets': len(doc.Objects), 'resultat': resultat is not None,
+                'duree_s': round(time.perf_counter() - debut, 4)}
+    finally:
+        if doc is not None and doc.Name in App.listDocuments():
+            App.closeDocument(doc.Name)
+
+
+# ============================================================================
+# CÔTÉ PROCESSUS PRINCIPAL
+# ============================================================================
+
+def _attendre(future, annulation):
+    """Résultat de `future`, l'annulation étant vérifiée toutes les `INTERVALLE_ATTENTE_S`."""
+    from concurrent.futures import wait
+
+    while not future.done():
+        verifier_annulation(annulation)
+        wait([future], timeout=INTERVALLE_ATTENTE_S)
+    return future.result()
+
+
+class ConstructionParallele:
+    """Pool de workers FreeCAD (script chargé) construisant les sous-assemblages en parallèle.
+
+    `construire(module, parametres, rappel, annulation)` retourne le document ;
+    `bilan` décrit la dernière construction : 'paralleles' (sous-assemblage ->
+    durée dans le worker), 'sur_place' et 'duree_s'. Le pool est démarré au premier
+    usage (ou par `prechauffer`) puis gardé jusqu'à `arreter`.
+    """
+
+    def __init__(self, chemin_script, index, processus=None, chemins_supplementaires=()):
+        self.chemin_script = os.path.abspath(chemin_script)
+        self.graphe = graphe_dependances(index) or {}
+        self.processus = processus or max(1, min(len(self.graphe), os.cpu_count() or 1))
+        self.chemins_supplementaires = tuple(chemins_supplementaires)
+        # Sous-assemblages à ne pas (ou plus) soumettre au pool ; d'emblée ceux qui touchent
+        # autre chose que `config` (attributs de `self`, objets du document)
+        self.sur_place = set()
+        for nom in sorted(self.graphe):
+            etat = lectures_etat(index, nom) | ecritures_etat(index, nom)
+            if etat:
+                self.sur_place.add(nom)
+                JOURNAL.info(f"⚡ {nom} construit sur place ({', '.join(sorted(etat))})",
+                             evenement='parallele', methode=nom)
+        self.bilan = None
+        self._pool = None
+        self._verrou = threading.Lock()
+
+    def actif(self):
+        return self._pool is not None
+
+    def _demarrer_si_besoin(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        from kiosque_batch import chemins_freecad, contexte_processus
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processus, mp_context=contexte_processus(),
+                initializer=_initialiser_worker,
+                initargs=(self.chemin_script, chemins_freecad(self.chemins_supplementaires)))
+        return self._pool
+
+    def prechauffer(self):
+        """Démarre tous les workers (FreeCAD + script chargés) ; retourne leurs PID."""
+        with self._verrou:
+            pool = self._demarrer_si_besoin()
+        return {future.result() for future in [pool.submit(_pret) for _ in range(self.processus)]}
+
+    def arreter(self):
+        with self._verrou:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _oublier_pool(self, pool):
+        """Pool cassé (worker mort) : remplacé à la construction suivante."""
+        with self._verrou:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _substituer(self, instance, pool, futures, soumis, rappel, annulation):
+        """Remplace les sous-assemblages soumis par l'ajout des formes construites par le worker."""
+        import FreeCAD as App
+        from concurrent.futures.process import BrokenProcessPool
+
+        def envelopper(nom, methode):
+            def enveloppe(*args, **kwargs):
+                future = futures.pop(nom, None)
+                if future is None or args or kwargs or any(
+                        instance.config.get(cle) != soumis.get(cle) for cle in self.graphe[nom]):
+                    if future is not None:
+                        future.cancel()
+                    self.bilan['sur_place'].append(nom)
+                    return methode(*args, **kwargs)
+                try:
+                    with PROFILEUR.span(f'attente {nom}', 'parallele'):
+                        partie = _attendre(future, annulation)
+                except GenerationAnnulee:
+                    raise
+                except Exception as e:
+                    if isinstance(e, BrokenProcessPool):
+                        self._oublier_pool(pool)
+                    else:
+                        self.sur_place.add(nom)
+                    JOURNAL.avertissement(f"⚠️  {nom} construit sur place (worker : {type(e).__name__}: {e})")
+                    self.bilan['sur_place'].append(nom)
+                    return methode(*args, **kwargs)
+                if partie['resultat']:
+                    # Valeur de retour utilisée par l'orchestrateur : non transférable entre processus
+                    self.sur_place.add(nom)
+                    self.bilan['sur_place'].append(nom)
+                    return methode(*args, **kwargs)
+                with PROFILEUR.span(f'fusion {nom}', 'parallele'):
+                    from kiosque_export import ajouter_formes
+                    ajouter_formes(App.ActiveDocument, partie['formes'])
+                self.bilan['paralleles'][nom] = partie['duree_s']
+                if rappel is not None:
+                    rappel(f"⚡ {nom} : {len(partie['formes'])} forme(s) du worker ({partie['duree_s']:.2f} s)")
+                return None
+            enveloppe.__name__ = nom
+            enveloppe.__wrapped__ = methode
+            return enveloppe
+
+        for nom in self.graphe:
+            methode = getattr(instance, nom, None)
+            if callable(methode):
+                setattr(instance, nom, envelopper(nom, methode))
+
+    def construire(self, module, parametres, rappel=None, annulation=None, config_effective=None):
+        """Construit le kiosque de `module` avec les sous-assemblages en parallèle ; retourne le document.
+
+        `module` est le script chargé dans ce processus (celui de `chemin_script`) : l'orchestrateur
+        et les sous-assemblages construits sur place y tournent.
+        """
+        import FreeCAD as App
+
+        debut = time.perf_counter()
+        with PROFILEUR.span('KiosqueTrefleFonctionnel()', 'script'):
+            instance = getattr(module, 'KiosqueTrefleFonctionnel')()
+        appliquer_parametres(instance.config, parametres)
+        soumis = copy.deepcopy(instance.config)
+        if config_effective is not None:
+            config_effective.update(instance.config)
+
+        self.bilan = {'paralleles': {}, 'sur_place': []}
+        with self._verrou:
+            pool = self._demarrer_si_besoin()
+        parallelisables = [nom for nom in self.graphe if nom not in self.sur_place]
+        futures = {nom: pool.submit(_construire_partie, nom, dict(parametres)) for nom in parallelisables}
+        if rappel is not None:
+            rappel(f"⚡ {len(futures)} sous-assemblage(s) soumis à {self.processus} worker(s)")
+        self._substituer(instance, pool, futures, soumis, rappel, annulation)
+        instrumenter_etapes(instance, rappel, annulation)
+
+        try:
+            with construction_groupee(rappel, module) as groupe:
+                doc = getattr(instance, METHODES_GLOBALES[0])()
+                verifier_annulation(annulation)
+                if not hasattr(doc, 'recompute'):
+                    doc = App.ActiveDocument
+                if doc is not None:
+                    if rappel is not None:
+                        rappel("🔄 Recompute du document...")
+                    groupe.recompute(doc)
+        finally:
+            for future in futures.values():  # sous-assemblages que l'orchestrateur n'a pas appelés
+                future.cancel()
+
+        self.bilan['duree_s'] = round(time.perf_counter() - debut, 4)
+        if rappel is not None:
+            lent = max(self.bilan['paralleles'].values(), default=0.0)
+            rappel(f"⚡ {len(self.bilan['paralleles'])} sous-assemblage(s) en parallèle "
+                   f"(le plus lent {lent:.2f} s), {len(self.bilan['sur_place'])} sur place, "
+                   f"total {self.bilan['duree_s']:.2f} s")
+        return doc
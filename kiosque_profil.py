@@ -0,0 +1,170 @@
+"""
+⏱️ PROFILAGE DES PHASES DE GÉNÉRATION
+Spans imbriqués (chargement du script, instanciation, étapes de construction,
+recompute, ajustement de la vue...) enregistrés par `PROFILEUR`, partagé par
+l'interface et le noyau de génération.
+
+  - `PROFILEUR.span(nom, categorie)` : gestionnaire de contexte (coût négligeable) ;
+  - `resume()` : agrégats par span (nombre, total, max, pic mémoire) ;
+  - `exporter_chrome(chemin)` : trace JSON lisible par chrome://tracing et Perfetto ;
+  - `cprofile(chemin)` : capture cProfile (`.prof`) du thread courant.
+
+Le pic mémoire n'est mesuré que si `tracemalloc` est actif (`suivre_memoire(True)`) :
+c'est le pic depuis l'entrée dans le span le plus externe du thread. `tracemalloc`,
+`json` et `cProfile` ne sont importés qu'à l'usage (démarrage rapide).
+"""
+
+import collections
+import contextlib
+import os
+import sys
+import threading
+import time
+
+EVENEMENTS_MAX = 20000
+
+
+class Profileur:
+    """Collecte thread-safe de spans (début, durée, thread, pic mémoire)."""
+
+    def __init__(self, evenements_max=EVENEMENTS_MAX):
+        self.evenements = collections.deque(maxlen=evenements_max)
+        self._verrou = threading.Lock()
+        self._local = threading.local()
+        self._origine = time.perf_counter()
+
+    def reinitialiser(self):
+        with self._verrou:
+            self.evenements.clear()
+            self._origine = time.perf_counter()
+
+    def suivre_memoire(self, actif):
+        """Active/désactive `tracemalloc` (ralentit nettement l'exécution Python)."""
+        import tracemalloc
+
+        if actif and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not actif and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def span(self, nom, categorie='kiosque', **args):
+        profondeur = getattr(self._local, 'profondeur', 0)
+        tracemalloc = sys.modules.get('tracemalloc')  # jamais importé ici : actif seulement si suivi
+        memoire = tracemalloc is not None and tracemalloc.is_tracing()
+        if memoire and profondeur == 0:
+            tracemalloc.reset_peak()
+        self._local.profondeur = profondeur + 1
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            fin = time.perf_counter()
+            self._local.profondeur = profondeur
+            evenement = {
+                'nom': nom,
+                'categorie': categorie,
+                'debut': debut,
+                'duree': fin - debut,
+                'thread': threading.get_ident(),
+                'profondeur': profondeur,
+                'args': args,
+            }
+            if memoire and tracemalloc.is_tracing():
+                evenement['pic_memoire'] = tracemalloc.get_traced_memory()[1]
+            with self._verrou:
+                self.evenements.append(evenement)
+
+    def mesurer(self, nom=None, categorie='kiosque'):
+        """Décorateur : exécute la fonction dans un span (nom par défaut : nom qualifié)."""
+        def decorer(fonction):
+            libelle = nom or fonction.__qualname__
+
+            def enveloppe(*args, **kwargs):
+                with self.span(libelle, categorie):
+                    return fonction(*args, **kwargs)
+            enveloppe.__name__ = fonction.__name__
+            enveloppe.__qualname__ = fonction.__qualname__
+            enveloppe.__doc__ = fonction.__doc__
+            enveloppe.__wrapped__ = fonction
+            return enveloppe
+        return decorer
+
+    def resume(self, depuis=None):
+        """Liste triée par temps total décroissant de dicts nom/categorie/n/total/max/pic_memoire.
+
+        `depuis` (instant `time.perf_counter()`) limite aux spans commencés après lui.
+        """
+        with self._verrou:
+            evenements = list(self.evenements)
+        agregats = {}
+        for e in evenements:
+            if depuis is not None and e['debut'] < depuis:
+                continue
+            a = agregats.setdefault(e['nom'], {'nom': e['nom'], 'categorie': e['categorie'],
+                                               'n': 0, 'total': 0.0, 'max': 0.0, 'pic_memoire': None})
+            a['n'] += 1
+            a['total'] += e['duree']
+            a['max'] = max(a['max'], e['duree'])
+            if e.get('pic_memoire') is not None:
+                a['pic_memoire'] = max(a['pic_memoire'] or 0, e['pic_memoire'])
+        return sorted(agregats.values(), key=lambda a: a['total'], reverse=True)
+
+    def trace_chrome(self):
+        """Évènements au format Trace Event (« complete events », µs)."""
+        with self._verrou:
+            evenements = list(self.evenements)
+            origine = self._origine
+        pid = os.getpid()
+        trace = []
+        for e in evenements:
+            args = dict(e['args'])
+            if e.get('pic_memoire') is not None:
+                args['pic_memoire_octets'] = e['pic_memoire']
+            trace.append({
+                'name': e['nom'],
+                'cat': e['categorie'],
+                'ph': 'X',
+                'ts': round((e['debut'] - origine) * 1e6, 1),
+                'dur': round(e['duree'] * 1e6, 1),
+                'pid': pid,
+                'tid': e['thread'],
+                'args': {cle: valeur if isinstance(valeur, (int, float, bool)) else str(valeur)
+                         for cle, valeur in args.items()},
+            })
+        trace.sort(key=lambda t: t['ts'])
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+    def exporter_chrome(self, chemin):
+        import json
+
+        with open(chemin, 'w', encoding='utf-8') as f:
+            json.dump(self.trace_chrome(), f, ensure_ascii=False)
+        return chemin
+
+    @contextlib.contextmanager
+    def cprofile(self, chemin):
+        """Capture cProfile du thread courant, écrite dans `chemin` (format pstats)."""
+        import cProfile
+
+        profil = cProfile.Profile()
+        profil.enable()
+        try:
+            yield profil
+        finally:
+            profil.disable()
+            os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+            profil.dump_stats(chemin)
+
+
+def formater_resume(resume):
+    """Texte à colonnes fixes du résumé (panneau de l'interface, console)."""
+    lignes = [f"{'Phase':<44} {'n':>4} {'total (ms)':>11} {'max (ms)':>10} {'pic mém.':>9}"]
+    for a in resume:
+        memoire = f"{a['pic_memoire'] / 1048576:.1f} Mo" if a['pic_memoire'] is not None else '-'
+        lignes.append(f"{a['nom'][:44]:<44} {a['n']:>4} {a['total'] * 1000:>11.1f} "
+                      f"{a['max'] * 1000:>10.1f} {memoire:>9}")
+    return "\n".join(lignes)
+
+
+PROFILEUR = Profileur()
@@ -0,0 +1,395 @@
+"""
+🔥 SERVICE DE GÉNÉRATION (workers préchauffés)
+Un processus de longue durée garde un pool de workers FreeCAD headless dont le
+script du kiosque est déjà chargé (initialiseur de `kiosque_batch`) : une variante
+soumise ne paie plus ni le démarrage de FreeCAD ni l'exécution du script, seulement
+la modélisation.
+
+    python kiosque_service.py demarrer kiosque_trefle_4petales_dome22.py -j 2
+    python kiosque_service.py etat
+    python kiosque_service.py arreter
+
+Les clients (`ClientService` : dialogue, `kiosque_batch --service`) se connectent
+par `multiprocessing.connection` sur 127.0.0.1 ; adresse et clé d'authentification
+sont publiées dans `~/.kiosque_trefle/service.json`. Un job renvoie son entrée de
+manifeste (chemins des fichiers produits) et, avec `brep=True`, le contenu BREP de
+la géométrie. Si le script change sur disque, le pool est relancé au job suivant ;
+un job qui désigne un autre script est servi par un pool propre à ce script.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+from kiosque_generation import REPERTOIRE_DONNEES, hash_fichier
+from kiosque_journal import JOURNAL
+
+FICHIER_SERVICE = os.path.join(REPERTOIRE_DONNEES, 'service.json')
+DOSSIER_SORTIES = os.path.join(REPERTOIRE_DONNEES, 'service')
+VERSION_PROTOCOLE = 1
+
+
+class ServiceIndisponible(Exception):
+    """Levée quand aucun service de génération ne répond (ou qu'il refuse la requête)."""
+
+
+def _prechauffer():
+    """Tâche vide : force le démarrage (et l'initialiseur) d'un worker ; retourne son pid."""
+    time.sleep(0.05)  # tâches simultanées : le pool lance un worker par tâche en attente
+    return os.getpid()
+
+
+def _signature(chemin):
+    etat = os.stat(chemin)
+    return etat.st_mtime_ns, etat.st_size
+
+
+class ServiceGeneration:
+    """Pool de workers préchauffés servant des jobs de génération sur une socket locale."""
+
+    def __init__(self, chemin_script, processus=None, chemins_supplementaires=(), dossier=DOSSIER_SORTIES,
+                 dossier_cache=None, instances=False, historique=None, fichier_service=FICHIER_SERVICE):
+        self.chemin_script = os.path.abspath(chemin_script)
+        self.processus = processus or max(1, (os.cpu_count() or 2) // 2)
+        self.chemins_supplementaires = tuple(chemins_supplementaires)
+        self.dossier = os.path.abspath(dossier)
+        self.dossier_cache = dossier_cache
+        self.instances = instances
+        self.historique = historique
+        self.fichier_service = fichier_service
+        self._pools = {}  # chemin absolu du script -> executeur, pids (une fois préchauffé), sha256, signature
+        self._verrou = threading.Lock()
+        self._compteur = 0
+        self._jobs = {'soumis': 0, 'reussis': 0, 'echoues': 0}
+        self._arret = threading.Event()
+        self._listener = None
+        self._authkey = None
+        self.debut = time.time()
+
+    # ------------------------------------------------------------------ pool
+
+    def demarrer_pool(self, chemin_script=None):
+        """(Re)lance le pool de `chemin_script` (défaut : celui du service) et attend que
+        chaque worker ait chargé FreeCAD et le script. Retourne la durée (s)."""
+        chemin = os.path.abspath(chemin_script or self.chemin_script)
+        debut = time.perf_counter()
+        with self._verrou:
+            entree, prechauffages = self._lancer_pool(chemin)
+        self._attendre_prechauffage(chemin, entree, prechauffages, debut)
+        return time.perf_counter() - debut
+
+    def _lancer_pool(self, chemin):
+        """Crée le pool de `chemin` et lui soumet le préchauffage, sans l'attendre (verrou tenu).
+
+        Retourne (entrée du pool, futures de préchauffage) ; l'ancien pool de ce script est
+        fermé, ses jobs en cours s'y terminent.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        from kiosque_batch import _initialiser_worker, chemins_freecad, contexte_processus
+
+        signature = _signature(chemin)
+        sha256 = hash_fichier(chemin)
+        executeur = ProcessPoolExecutor(
+            max_workers=self.processus, mp_context=contexte_processus(),
+            initializer=_initialiser_worker,
+            initargs=(chemin, chemins_freecad(self.chemins_supplementaires),
+                      self.dossier_cache, self.historique))
+        ancien = self._pools.get(chemin)
+        if ancien is not None:
+            ancien['executeur'].shutdown(wait=False)
+        entree = {'executeur': executeur, 'pids': [], 'sha256': sha256, 'signature': signature}
+        self._pools[chemin] = entree
+        return entree, [executeur.submit(_prechauffer) for _ in range(self.processus)]
+
+    def _attendre_prechauffage(self, chemin, entree, prechauffages, debut):
+        """Attend, hors verrou, que les workers d'un pool lancé par `_lancer_pool` soient prêts."""
+        pids = sorted({f.result() for f in prechauffages})
+        with self._verrou:
+            entree['pids'] = pids
+        JOURNAL.info(f"🔥 {len(pids)} worker(s) préchauffé(s) en {time.perf_counter() - debut:.1f} s "
+                     f"({os.path.basename(chemin)})")
+
+    def _pool_a_jour(self, chemin):
+        """Pool du script `chemin`, relancé s'il a changé sur disque (verrou tenu).
+
+        Retourne (entrée, futures de préchauffage à attendre hors verrou, ou None).
+        """
+        pool = self._pools.get(chemin)
+        if pool is None or _signature(chemin) != pool['signature']:
+            return self._lancer_pool(chemin)
+        return pool, None
+
+    def soumettre(self, variante, formats=('fcstd',), dossier=None, index=None, chemin_script=None,
+                  instances=None, developper_liens=False, deviation=None):
+        """Soumet une variante ; retourne un `Future` de son entrée de manifeste.
+
+        `chemin_script` (défaut : celui du service) a son propre pool : un client qui
+        en fournit un autre ne change pas le script des autres clients. Le démarrage
+        d'un pool (FreeCAD + script) est attendu hors du verrou du service : les clients
+        des pools déjà chauds ne l'attendent pas. `instances` None : réglage du service ;
+        `developper_liens`, `deviation` : voir `kiosque_batch`.
+        """
+        from kiosque_batch import generer_variante
+
+        instances = self.instances if instances is None else instances
+        chemin = os.path.abspath(chemin_script or self.chemin_script)
+        dossier = os.path.abspath(dossier or self.dossier)
+        os.makedirs(dossier, exist_ok=True)
+        debut = time.perf_counter()
+        with self._verrou:
+            self._compteur += 1
+            self._jobs['soumis'] += 1
+            index = index or self._compteur
+            # Soumis sous le verrou : aucun autre job ne peut relancer (et fermer) ce pool entre-temps
+            entree, prechauffages = self._pool_a_jour(chemin)
+            future = entree['executeur'].submit(generer_variante, index, variante, dossier,
+                                                tuple(formats), instances, developper_liens,
+                                                'service', deviation)
+        if prechauffages is not None:
+            self._attendre_prechauffage(chemin, entree, prechauffages, debut)
+        return future
+
+    def generer(self, variante, formats=('fcstd',), dossier=None, index=None, chemin_script=None,
+                brep=False, instances=None, developper_liens=False, deviation=None):
+        """Job synchrone : entrée de manifeste (+ `brep` : contenu du fichier BREP si demandé)."""
+        debut = time.perf_counter()
+        if brep and 'brep' not in formats:
+            formats = tuple(formats) + ('brep',)
+        try:
+            entree = self.soumettre(variante, formats, dossier, index, chemin_script,
+                                    instances, developper_liens, deviation).result()
+        except Exception:
+            # Script illisible, pool cassé... : le job compte comme échoué
+            with self._verrou:
+                self._jobs['echoues'] += 1
+            raise
+        with self._verrou:
+            self._jobs['reussis' if entree['statut'] == 'ok' else 'echoues'] += 1
+        if brep and 'brep' in entree['fichiers']:
+            with open(entree['fichiers']['brep'], 'rb') as f:
+                entree['brep'] = f.read()
+        entree['latence_s'] = round(time.perf_counter() - debut, 4)
+        return entree
+
+    def etat(self):
+        with self._verrou:
+            pool = self._pools.get(self.chemin_script, {})
+            return {
+                'version': VERSION_PROTOCOLE,
+                'pid': os.getpid(),
+                'script': self.chemin_script,
+                'script_sha256': pool.get('sha256'),
+                'workers': list(pool.get('pids', ())),
+                'scripts': sorted(self._pools),
+                'jobs': dict(self._jobs),
+                'depuis_s': round(time.time() - self.debut, 1),
+            }
+
+    # ---------------------------------------------------------------- socket
+
+    def _traiter(self, connexion):
+        """Boucle d'une connexion cliente : un message (dict) -> une réponse (dict)."""
+        with connexion:
+            while not self._arret.is_set():
+                try:
+                    message = connexion.recv()
+                except (EOFError, OSError):
+                    return
+                action = message.get('action')
+                try:
+                    if action == 'generer':
+                        reponse = self.generer(message['variante'], message.get('formats') or ('fcstd',),
+                                               message.get('dossier'), message.get('index'),
+                                               message.get('script'), message.get('brep', False),
+                                               message.get('instances'), message.get('developper_liens', False),
+                                               message.get('deviation'))
+                    elif action == 'etat':
+                        reponse = self.etat()
+                    elif action == 'arreter':
+                        reponse = {'statut': 'arret'}
+                        self._arret.set()
+                    else:
+                        reponse = {'erreur': f"Action inconnue: {action}"}
+                except Exception as e:
+                    reponse = {'erreur': f"{type(e).__name__}: {e}"}
+                try:
+                    connexion.send(reponse)
+                except OSError:
+                    return
+                if self._arret.is_set():
+                    self.arreter()
+
+    def _publier(self, adresse):
+        os.makedirs(os.path.dirname(os.path.abspath(self.fichier_service)), exist_ok=True)
+        temporaire = f"{self.fichier_service}.{os.getpid()}.tmp"
+        descripteur = os.open(temporaire, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descripteur, 'w', encoding='utf-8') as f:
+            json.dump({'version': VERSION_PROTOCOLE, 'adresse': list(adresse), 'pid': os.getpid(),
+                       'cle': self._authkey.hex(), 'script': self.chemin_script}, f)
+        os.replace(temporaire, self.fichier_service)
+
+    def servir(self, adresse=('127.0.0.1', 0), pret=None):
+        """Préchauffe le pool puis sert les clients jusqu'à `arreter` (bloquant).
+
+        `pret` (threading.Event) est positionné une fois le service joignable.
+        """
+        import secrets
+        from multiprocessing.connection import Listener
+
+        self._authkey = secrets.token_bytes(16)
+        if self.chemin_script not in self._pools:
+            self.demarrer_pool()
+        listener = self._listener = Listener(adresse, authkey=self._authkey)
+        self._publier(listener.address)
+        JOURNAL.info(f"🔌 Service de génération à l'écoute sur {listener.address[0]}:{listener.address[1]}")
+        if pret is not None:
+            pret.set()
+        try:
+            while not self._arret.is_set():
+                try:
+                    connexion = listener.accept()
+                except Exception as e:  # authentification refusée, connexion interrompue
+                    if not self._arret.is_set():
+                        JOURNAL.avertissement(f"⚠️  Connexion refusée: {e}")
+                    continue
+                if self._arret.is_set():  # connexion de réveil d'`arreter`
+                    connexion.close()
+                    break
+                threading.Thread(target=self._traiter, args=(connexion,), daemon=True).start()
+        finally:
+            self.arreter()
+
+    def arreter(self):
+        """Arrête l'écoute et le pool (depuis n'importe quel thread ; sans effet la 2e fois)."""
+        from multiprocessing.connection import Client
+
+        self._arret.set()
+        with self._verrou:
+            listener, self._listener = self._listener, None
+            pools, self._pools = list(self._pools.values()), {}
+        if listener is not None:
+            # `accept()` ne se réveille qu'à la connexion suivante : on s'en fait une
+            try:
+                Client(listener.address, authkey=self._authkey).close()
+            except Exception:
+                pass
+            listener.close()
+            try:
+                with open(self.fichier_service, encoding='utf-8') as f:
+                    if json.load(f).get('pid') == os.getpid():
+                        os.remove(self.fichier_service)
+            except (OSError, ValueError):
+                pass
+        for pool in pools:
+            pool['executeur'].shutdown(wait=True)
+        if pools:
+            JOURNAL.info("🛑 Service de génération arrêté")
+
+
+class ClientService:
+    """Connexion à un `ServiceGeneration` publié dans `fichier_service`."""
+
+    def __init__(self, fichier_service=FICHIER_SERVICE):
+        from multiprocessing.connection import Client
+
+        try:
+            with open(fichier_service, encoding='utf-8') as f:
+                infos = json.load(f)
+        except (OSError, ValueError):
+            raise ServiceIndisponible("Aucun service de génération démarré "
+                                      "(python kiosque_service.py demarrer <script>)")
+        if infos.get('version') != VERSION_PROTOCOLE:
+            raise ServiceIndisponible(f"Version de protocole incompatible: {infos.get('version')}")
+        try:
+            self._connexion = Client(tuple(infos['adresse']), authkey=bytes.fromhex(infos['cle']))
+        except (OSError, EOFError) as e:
+            raise ServiceIndisponible(f"Service de génération injoignable: {e}")
+        self.script = infos.get('script')
+        self._verrou = threading.Lock()
+
+    def _requete(self, message):
+        with self._verrou:
+            try:
+                self._connexion.send(message)
+                reponse = self._connexion.recv()
+            except (OSError, EOFError) as e:
+                raise ServiceIndisponible(f"Connexion au service perdue: {e}")
+        if 'erreur' in reponse and 'statut' not in reponse:
+            raise ServiceIndisponible(reponse['erreur'])
+        return reponse
+
+    def generer(self, variante, formats=('fcstd',), dossier=None, index=None, script=None, brep=False,
+                instances=None, developper_liens=False, deviation=None):
+        """Génère `variante` dans un worker préchauffé ; retourne son entrée de manifeste."""
+        return self._requete({'action': 'generer', 'variante': variante, 'formats': list(formats),
+                              'dossier': dossier, 'index': index, 'script': script, 'brep': brep,
+                              'instances': instances, 'developper_liens': developper_liens,
+                              'deviation': deviation})
+
+    def etat(self):
+        return self._requete({'action': 'etat'})
+
+    def arreter(self):
+        return self._requete({'action': 'arreter'})
+
+    def fermer(self):
+        self._connexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Service de génération du kiosque trèfle (workers préchauffés)")
+    sous = parser.add_subparsers(dest='commande', required=True)
+    demarrer = sous.add_parser('demarrer', help="Lancer le service (bloquant)")
+    demarrer.add_argument('script', help="Chemin de kiosque_trefle_4petales_dome22.py")
+    demarrer.add_argument('-j', '--processus', type=int, default=None, help="Workers préchauffés")
+    demarrer.add_argument('--port', type=int, default=0, help="Port local (défaut: libre)")
+    demarrer.add_argument('--sortie', default=DOSSIER_SORTIES, help="Dossier des fichiers produits")
+    demarrer.add_argument('--freecad-lib', action='append', default=[],
+                          help="Dossier contenant FreeCAD.pyd/.so (répétable)")
+    demarrer.add_argument('--cache', nargs='?', const='', default=None, metavar='DOSSIER')
+    demarrer.add_argument('--instances', action='store_true')
+    demarrer.add_argument('--sans-historique', action='store_true')
+    sous.add_parser('etat', help="État du service en cours")
+    sous.add_parser('arreter', help="Arrêter le service en cours")
+    args = parser.parse_args(argv)
+
+    if args.commande == 'demarrer':
+        dossier_cache = None
+        if args.cache is not None:
+            from kiosque_cache import DOSSIER_CACHE
+            dossier_cache = args.cache or DOSSIER_CACHE
+        historique = None
+        if not args.sans_historique:
+            from kiosque_historique import CHEMIN_HISTORIQUE
+            historique = CHEMIN_HISTORIQUE
+        service = ServiceGeneration(args.script, args.processus, args.freecad_lib, args.sortie,
+                                    dossier_cache, args.instances, historique)
+        try:
+            service.servir(('127.0.0.1', args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    try:
+        with ClientService() as client:
+            reponse = client.etat() if args.commande == 'etat' else client.arreter()
+    except ServiceIndisponible as e:
+        print(f"❌ {e}")
+        return 1
+    print(json.dumps(reponse, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
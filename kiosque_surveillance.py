@@ -0,0 +1,50 @@
+"""
+🔄 SURVEILLANCE DU SCRIPT (rechargement à chaud)
+Détecte les enregistrements du script kiosque : `verifier()` compare d'abord
+`os.stat` (taille, date de modification en ns : quelques µs, appelable sur minuterie)
+puis, seulement si le fichier a été touché, son empreinte SHA-256. Un enregistrement
+sans changement de contenu (sauvegarde à l'identique, `touch`) n'est pas un changement.
+
+Sondage plutôt que notifications du système : les éditeurs qui enregistrent par
+renommage atomique (fichier remplacé) restent suivis sans réinscription.
+"""
+
+import os
+
+from kiosque_generation import hash_fichier
+
+INTERVALLE_SURVEILLANCE_MS = 500
+
+
+class SurveillanceFichier:
+    """Suit le contenu d'un fichier ; `verifier()` retourne la nouvelle empreinte ou None."""
+
+    def __init__(self, chemin, empreinte=None):
+        self.chemin = chemin
+        self._signature = self._stat()
+        self.empreinte = empreinte if empreinte is not None else self._hash()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.chemin)
+        except OSError:
+            return None  # fichier absent (enregistrement en cours) : rien à signaler
+        return st.st_size, st.st_mtime_ns
+
+    def _hash(self):
+        try:
+            return hash_fichier(self.chemin)
+        except OSError:
+            return None
+
+    def verifier(self):
+        """Nouvelle empreinte si le contenu a changé depuis le dernier appel, sinon None."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+        empreinte = self._hash()
+        if empreinte is None or empreinte == self.empreinte:
+            return None
+        self.empreinte = empreinte
+        return empreinte
@@ -0,0 +1,24 @@
+"""
+Réglages communs des tests : chemins du dépôt, des substituts FreeCAD/Part/PySide de
+`bench/substituts` et du script synthétique du benchmark ; fixture `substituts`.
+"""
+
+import os
+import sys
+
+import pytest
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUBSTITUTS = os.path.join(RACINE, 'bench', 'substituts')
+SCRIPT = os.path.join(RACINE, 'bench', 'kiosque_synthetique.py')
+
+if RACINE not in sys.path:
+    sys.path.insert(0, RACINE)
+
+
+@pytest.fixture
+def substituts(monkeypatch):
+    """Substituts importables (avant les modules `kiosque_*`), script synthétique sans coût de calcul."""
+    monkeypatch.setenv('KIOSQUE_BENCH_COUT', '0')
+    monkeypatch.syspath_prepend(SUBSTITUTS)
+    monkeypatch.syspath_prepend(RACINE)
@@ -0,0 +1,42 @@
+"""
+Aiguillage des fonctions de génération (`kiosque_aiguillage`) : ordre d'essai d'après
+les succès et durées mémorisés, échecs écartés, persistance par empreinte du script.
+"""
+
+
+def test_ordre_et_persistance(tmp_path):
+    from kiosque_aiguillage import IndexAiguillage
+
+    candidats = ['creer_kiosque_fonctionnel', 'creer_kiosque_avec_plots', 'main', 'demo']
+    aiguillage = IndexAiguillage('abc', str(tmp_path))
+    assert aiguillage.ordonner(candidats) == (candidats, [])
+
+    aiguillage.succes('creer_kiosque_avec_plots', 2.0)
+    aiguillage.succes('demo', 0.5)
+    aiguillage.succes('demo', 0.8)
+    aiguillage.echec('main', ValueError("pas de document"))
+    ordre = (['demo', 'creer_kiosque_avec_plots', 'creer_kiosque_fonctionnel'], ['main'])
+    assert aiguillage.ordonner(candidats) == ordre
+
+    # Relu pour la même empreinte uniquement
+    assert IndexAiguillage('abc', str(tmp_path)).ordonner(candidats) == ordre
+    assert IndexAiguillage('abd', str(tmp_path)).ordonner(candidats) == (candidats, [])
+    assert IndexAiguillage('abc', str(tmp_path)).cibles['main']['erreur'] == "pas de document"
+
+
+def test_tout_en_echec_reessaye(tmp_path):
+    from kiosque_aiguillage import IndexAiguillage
+
+    aiguillage = IndexAiguillage('abc', str(tmp_path))
+    aiguillage.echec('main', "erreur")
+    assert aiguillage.ordonner(['main']) == (['main'], [])
+    aiguillage.succes('main', 1.0)  # un succès ultérieur l'emporte
+    assert aiguillage.connue_bonne('main') and not aiguillage.connue_en_echec('main')
+
+
+def test_appelables_sans_argument():
+    from kiosque_aiguillage import appelables_sans_argument
+    from kiosque_index import indexer_source
+
+    index = indexer_source("def a():\n    pass\n\n\ndef b(x, y=1):\n    pass\n\n\ndef c(*args):\n    pass\n")
+    assert appelables_sans_argument(index, ['b', 'a', 'inconnue', 'c']) == (['a', 'inconnue', 'c'], ['b'])
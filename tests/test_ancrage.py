@@ -0,0 +1,53 @@
+"""
+Dimensionnement vent/ancrage (`kiosque_ancrage`) : valeurs recalculées à la main pour
+la géométrie par défaut, diffusion des entrées (matériaux compris), vent nul et
+valeurs par défaut des méta-paramètres.
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from kiosque_ancrage import dimensionner, dimensionner_parametres, proprietes_materiau  # noqa: E402
+
+
+def test_calcul_a_la_main():
+    # 100 km/h, pétales 2,2 m sur rosaire 1 m, dôme 3,5 m, acier, FS 1,3, 8 plots
+    q = 0.5 * 1.225 * (100 / 3.6) ** 2
+    r_ext, emprise = 3.2, math.pi * 3.2 ** 2
+    f_petales = q * 1.2 * 0.35 * 2 * r_ext * 2.2
+    f_dome = q * 0.6 * 2 / 3 * 2 * r_ext * 3.5
+    moment = f_petales * 1.1 + f_dome * (2.2 + 0.4 * 3.5)
+    traction = 1.3 * (2 * moment / (8 * r_ext) + q * 0.8 * emprise / 8) - 25.0 * emprise * 9.81 / 8
+
+    r = dimensionner(100)
+    assert q == pytest.approx(472.608, rel=1e-5) and r['pression'] == pytest.approx(q)
+    assert r['effort_horizontal'] == pytest.approx(f_petales + f_dome)
+    assert r['moment'] == pytest.approx(moment)
+    assert r['traction_plot'] == pytest.approx(traction)
+    # Traction > cisaillement / frottement : le soulèvement dimensionne le lest
+    assert r['masse_plot'] == pytest.approx(traction / 9.81)
+    assert traction / 9.81 == pytest.approx(290.6, abs=0.1)
+    assert r['cote_plot'] == pytest.approx((traction / 9.81 / 2400) ** (1 / 3))
+
+
+def test_diffusion_et_materiaux():
+    r = dimensionner(np.array([[60], [120]]), rayon_petale=np.array([2000, 2200, 2400]),
+                     material=np.array(['Acier galvanisé (permanent)', 'Bambou (temporaire)', 'inconnu']))
+    assert r['masse_plot'].shape == (2, 3)
+    assert (r['masse_plot'][1] > r['masse_plot'][0]).all()
+    assert r['fs'][0].tolist() == [1.3, 1.5, 1.3]  # FS minimal du bambou, acier par défaut
+    assert proprietes_materiau('Bambou (temporaire)') == (12.0, 1.5)
+    seul = dimensionner(120, rayon_petale=2200, material='Bambou (temporaire)')
+    assert seul['masse_plot'] == pytest.approx(r['masse_plot'][1, 1])
+
+
+def test_vent_nul_et_defauts():
+    nul = dimensionner(0)
+    assert nul['pression'] == 0 and nul['masse_plot'] == 0 and nul['traction_plot'] < 0
+    # 0 est une valeur, None prend la valeur par défaut (100 km/h, FS 1,3)
+    assert dimensionner_parametres({'wind_speed': 0})['masse_plot'] == 0
+    defaut = dimensionner_parametres({'wind_speed': None, 'safety_factor': None})
+    assert defaut['masse_plot'] == pytest.approx(dimensionner(100, safety_factor=1.3)['masse_plot'])
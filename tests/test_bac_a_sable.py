@@ -0,0 +1,78 @@
+"""
+Bac à sable d'exécution (`kiosque_bac_a_sable`) avec les substituts FreeCAD/Part de
+`bench/substituts` : job normal, script bloqué tué au délai, script qui plante.
+Le script fautif se bloque ou plante pour des rayons de pétale conventionnels.
+"""
+
+import os
+
+import pytest
+
+from conftest import SCRIPT, SUBSTITUTS
+
+SCRIPT_FAUTIF = '''
+import os
+import time
+
+from kiosque_synthetique import KiosqueTrefleFonctionnel as _Base
+
+
+BLOQUE, PLANTE = 1, 2
+
+
+class KiosqueTrefleFonctionnel(_Base):
+    def generer_kiosque_complet_avec_plots(self):
+        if self.config['rayon_petale'] == BLOQUE:
+            time.sleep(60)
+        if self.config['rayon_petale'] == PLANTE:
+            os.abort()
+        return super().generer_kiosque_complet_avec_plots()
+'''
+
+
+@pytest.fixture
+def bac_a_sable(tmp_path, substituts):
+    from kiosque_bac_a_sable import BacASable
+
+    script = tmp_path / 'kiosque_fautif.py'
+    script.write_text(SCRIPT_FAUTIF, encoding='utf-8')
+    bac = BacASable(str(script), chemins_supplementaires=[SUBSTITUTS, os.path.dirname(SCRIPT)], delai_s=2)
+    yield bac
+    bac.arreter()
+
+
+def test_job_normal(bac_a_sable):
+    from kiosque_bac_a_sable import reconstruire_document
+
+    messages = []
+    resultat = bac_a_sable.generer({'rayon_petale': 2300}, messages.append)
+    pid = bac_a_sable.infos['pid']
+    suivant = bac_a_sable.generer({'rayon_petale': 2400})
+    assert resultat['statut'] == 'ok'
+    assert resultat['formes'] and resultat['formes'][0][2].startswith('DBRep_DrawableShape')
+    assert any('Pétales' in m for m in messages)
+    assert suivant['config']['rayon_petale'] == 2400
+    assert bac_a_sable.infos['pid'] == pid  # même serveur, script chargé une fois
+    doc = reconstruire_document(resultat)
+    assert len(doc.Objects) == len(resultat['formes'])
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="isolation par fork (POSIX)")
+def test_script_bloque_tue_au_delai(bac_a_sable):
+    from kiosque_bac_a_sable import ErreurBacASable
+
+    with pytest.raises(ErreurBacASable, match="Délai dépassé"):
+        bac_a_sable.generer({'rayon_petale': 1})
+    pid = bac_a_sable.infos['pid']
+    # Seul l'enfant a été tué : le même serveur traite le job suivant
+    assert bac_a_sable.generer({})['statut'] == 'ok'
+    assert bac_a_sable.infos['pid'] == pid
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="isolation par fork (POSIX)")
+def test_script_qui_plante(bac_a_sable):
+    from kiosque_bac_a_sable import ErreurBacASable
+
+    with pytest.raises(ErreurBacASable, match="SIGABRT"):
+        bac_a_sable.generer({'rayon_petale': 2})
+    assert bac_a_sable.generer({})['statut'] == 'ok'
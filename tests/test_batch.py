@@ -0,0 +1,74 @@
+"""
+Génération batch (`kiosque_batch`) : lecture des variantes (grille, CSV), valeurs par
+défaut, puis un balayage réel sur un pool de processus avec les substituts FreeCAD.
+"""
+
+import json
+import os
+
+import pytest
+
+from conftest import SCRIPT, SUBSTITUTS
+
+
+def test_grille():
+    from kiosque_batch import variantes_grille
+
+    variantes = variantes_grille(['rayon_petale=2000:2400:200', 'material=Bambou (temporaire),Bois'])
+    assert len(variantes) == 6
+    assert variantes[0] == {'rayon_petale': 2000, 'material': 'Bambou (temporaire)'}
+    assert [v['rayon_petale'] for v in variantes[::2]] == [2000, 2200, 2400]
+    assert variantes_grille(['wind_speed=0.5:1.0:0.25']) == \
+        [{'wind_speed': 0.5}, {'wind_speed': 0.75}, {'wind_speed': 1.0}]
+    with pytest.raises(ValueError):
+        variantes_grille(['rayon=2000'])
+    with pytest.raises(ValueError):
+        variantes_grille(['rayon_petale=2000:2400:0'])
+
+
+def test_csv_et_defauts(tmp_path):
+    from kiosque_batch import DEFAUTS, completer, variantes_csv
+
+    chemin = tmp_path / 'variantes.csv'
+    chemin.write_text("rayon_petale,hauteur_dome,commentaire\n2200,,essai\n2300,3200,\n", encoding='utf-8')
+    variantes = variantes_csv(str(chemin))
+    assert variantes == [{'rayon_petale': 2200}, {'rayon_petale': 2300, 'hauteur_dome': 3200}]
+    parametres = completer(variantes[0])
+    assert parametres['hauteur_dome'] is None and parametres['rayon_petale'] == 2200
+    assert all(parametres[cle] == valeur for cle, valeur in DEFAUTS.items())
+
+
+def test_balayage_pool(substituts, tmp_path):
+    from kiosque_batch import executer_batch
+
+    dossier = tmp_path / 'variantes'
+    manifeste = executer_batch(SCRIPT, [{'rayon_petale': 2000}, {'rayon_petale': 2400}], str(dossier),
+                               formats=('fcstd',), processus=2, chemins_supplementaires=[SUBSTITUTS])
+    assert manifeste['echouees'] == 0
+    entrees = manifeste['variantes']  # triées par index
+    assert [e['parametres']['rayon_petale'] for e in entrees] == [2000, 2400]
+    assert all(os.path.exists(e['fichiers']['fcstd']) for e in entrees)
+    with open(dossier / 'manifest.json', encoding='utf-8') as f:
+        assert json.load(f)['echouees'] == 0
+
+
+def test_worker_mort_manifeste_ecrit(substituts, tmp_path):
+    from kiosque_batch import executer_batch
+
+    script = tmp_path / 'kiosque_plantage.py'
+    with open(SCRIPT, encoding='utf-8') as f:
+        source = f.read()
+    # Plantage du processus (comme un segfault de FreeCAD) pour les dômes hauts seulement
+    script.write_text(source.replace("    def creer_dome(self):\n",
+                                     "    def creer_dome(self):\n"
+                                     "        if self.config['hauteur_dome'] > 4000:\n"
+                                     "            os._exit(1)\n"), encoding='utf-8')
+    dossier = tmp_path / 'variantes'
+    manifeste = executer_batch(str(script), [{'hauteur_dome': 3000}, {'hauteur_dome': 5000}],
+                               str(dossier), formats=('fcstd',), processus=1,
+                               chemins_supplementaires=[SUBSTITUTS])
+    assert [e['statut'] for e in manifeste['variantes']] == ['ok', 'erreur']
+    assert 'BrokenProcessPool' in manifeste['variantes'][1]['erreur']
+    assert manifeste['variantes'][1]['parametres']['hauteur_dome'] == 5000
+    with open(dossier / 'manifest.json', encoding='utf-8') as f:
+        assert json.load(f)['reussies'] == 1
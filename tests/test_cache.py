@@ -0,0 +1,68 @@
+"""
+Cache de géométrie (`kiosque_cache`) avec les substituts FreeCAD : clé indépendante de
+l'ordre de `config`, miss puis hit, éviction LRU au-delà de la taille maximale.
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture
+def cache(substituts, tmp_path):
+    from kiosque_cache import CacheGeometrie
+
+    return CacheGeometrie(dossier=str(tmp_path / 'cache'))
+
+
+def _construire(nom):
+    import FreeCAD as App
+
+    def construire():
+        construire.appels += 1
+        doc = App.newDocument("Kiosque_Trefle")
+        doc.addObject('Part::Feature', nom)
+        return doc
+    construire.appels = 0
+    return construire
+
+
+def test_cle_deterministe():
+    from kiosque_cache import cle_cache
+
+    a = cle_cache('abc', {'rayon_petale': 2200, 'hauteur_dome': 3500})
+    assert a == cle_cache('abc', {'hauteur_dome': 3500, 'rayon_petale': 2200})
+    assert a != cle_cache('abd', {'rayon_petale': 2200, 'hauteur_dome': 3500})
+    assert a != cle_cache('abc', {'rayon_petale': 2201, 'hauteur_dome': 3500})
+
+
+def test_miss_puis_hit(cache):
+    from kiosque_cache import construire_avec_cache
+
+    construire, messages = _construire('Dome'), []
+    doc, hit = construire_avec_cache(cache, 'abc', {'rayon_petale': 2200}, construire, messages.append)
+    assert not hit and construire.appels == 1 and len(cache.entrees()) == 1
+
+    doc, hit = construire_avec_cache(cache, 'abc', {'rayon_petale': 2200}, construire, messages.append)
+    assert hit and construire.appels == 1
+    assert [o.Name for o in doc.Objects] == ['Dome']
+    assert messages[0].startswith("💾 Cache MISS") and messages[1].startswith("💾 Cache HIT")
+
+
+def test_eviction_lru(cache):
+    import FreeCAD as App
+
+    from kiosque_cache import cle_cache, construire_avec_cache
+
+    for rayon in (2000, 2100, 2200):
+        construire_avec_cache(cache, 'abc', {'rayon_petale': rayon}, _construire(f"Petale_{rayon}"))
+    # Dates espacées dans l'ordre de création ; la plus ancienne est relue, elle devient la plus récente
+    for i, rayon in enumerate((2000, 2100, 2200)):
+        os.utime(cache.chemin(cle_cache('abc', {'rayon_petale': rayon})), (1000 + i, 1000 + i))
+    assert cache.restaurer(cle_cache('abc', {'rayon_petale': 2000}), App.newDocument("Relu"))
+
+    cache.taille_max = cache.taille() - 1  # une entrée de trop
+    assert cache.evincer() == 1
+    assert not cache.contient(cle_cache('abc', {'rayon_petale': 2100}))
+    assert cache.contient(cle_cache('abc', {'rayon_petale': 2000}))
+    assert cache.contient(cle_cache('abc', {'rayon_petale': 2200}))
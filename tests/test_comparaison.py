@@ -0,0 +1,69 @@
+"""
+Comparaison de variantes (`kiosque_comparaison`) avec les substituts FreeCAD de
+`bench/substituts` : un seul document, sous-assemblages identiques modélisés une fois,
+variantes décalées le long de X, indicateurs du tableau comparatif.
+"""
+
+import pytest
+
+from conftest import SCRIPT
+
+BASE = {'rayon_petale': 2200, 'rayon_rosaire': 1000, 'hauteur_petale': 2200, 'hauteur_dome': 3500,
+        'material': 'Bambou (temporaire)', 'wind_speed': 100, 'safety_factor': 1.3}
+
+
+@pytest.fixture
+def comparaison(substituts):
+    from kiosque_comparaison import ComparaisonVariantes
+    from kiosque_generation import charger_module
+    from kiosque_index import indexer_source
+
+    with open(SCRIPT, encoding='utf-8') as f:
+        index = indexer_source(f.read())
+    return ComparaisonVariantes(charger_module(SCRIPT), index)
+
+
+def test_sous_assemblages_partages(comparaison):
+    import FreeCAD as App
+
+    documents = set(App.listDocuments())
+    variantes = [dict(BASE, hauteur_dome=3000), dict(BASE, hauteur_dome=4000),
+                 dict(BASE, hauteur_dome=4000, rayon_petale=2400)]
+    resultat = comparaison.construire(variantes)
+    doc = resultat['doc']
+    assert set(App.listDocuments()) - documents == {doc.Name}
+
+    v1, v2, v3 = resultat['variantes']
+    assert v2['sous_assemblages_partages'] == ['assembler_4_petales', 'creer_plots_fondation']
+    assert v3['sous_assemblages_partages'] == ['creer_plots_fondation', 'creer_dome']
+    assert v2['objets'] < v1['objets'] and v3['objets'] < v1['objets']
+    assert resultat['construits'] == 5 and resultat['partages'] == 4
+
+    groupes = [doc.getObject(f"Variante_{k}") for k in (1, 2, 3)]
+    assert all(len(g.Group) == v1['objets'] for g in groupes)  # chaque variante est complète
+    decalages = [g.Group[0].Placement.Base.x for g in groupes]
+    assert decalages == [0, resultat['espacement_mm'], 2 * resultat['espacement_mm']]
+    assert "rayon_petale=2400" in groupes[2].Label and "hauteur_dome=4000" in groupes[2].Label
+
+
+def test_indicateurs(comparaison):
+    from kiosque_comparaison import COLONNES_COMPARAISON
+
+    resultat = comparaison.construire([dict(BASE, rayon_petale=2000), dict(BASE, rayon_petale=2600)])
+    petite, grande = resultat['variantes']
+    assert set(COLONNES_COMPARAISON) <= set(petite)
+    assert petite['emprise'] == 6000 and grande['emprise'] == 7200
+    assert petite['masse_structure'] < grande['masse_structure']
+    assert resultat['espacement_mm'] == pytest.approx(7200 * 1.3)
+
+
+def test_new_document_global_intact(comparaison):
+    import FreeCAD as App
+
+    original, globaux = App.newDocument, []
+    # Pendant la construction (rappels de progression), FreeCAD.newDocument n'est pas remplacé
+    resultat = comparaison.construire([dict(BASE, rayon_petale=2000), dict(BASE, rayon_petale=2600)],
+                                      rappel=lambda message: globaux.append(App.newDocument is original))
+    assert globaux and all(globaux)
+    assert comparaison.module.App is App
+    assert resultat['doc'].recomputes == 1 and not resultat['doc'].RecomputesFrozen
@@ -0,0 +1,72 @@
+"""
+Démarrage sans effet de bord : `interface_ultrasimple` et les modules calculatoires
+s'importent sans FreeCAD, FreeCADGui ni PySide, sans rien afficher, dans un budget
+de temps mesuré (chaque mesure dans un interpréteur neuf, meilleur de plusieurs essais).
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets (secondes) : larges par rapport aux mesures (~3 ms / ~25 ms) pour rester stables en CI
+BUDGET_INTERFACE_S = 0.05
+BUDGET_CALCUL_S = 0.15
+ESSAIS = 5
+
+MODULES_GUI = ('FreeCAD', 'FreeCADGui', 'PySide', 'interface_dialogue')
+MODULES_CALCUL = ('kiosque_generation', 'kiosque_index', 'kiosque_cache',
+                  'kiosque_incremental', 'kiosque_instances', 'kiosque_documents', 'kiosque_aiguillage',
+                  'kiosque_historique', 'kiosque_service', 'kiosque_bac_a_sable', 'kiosque_journal',
+                  'kiosque_surveillance', 'kiosque_export', 'kiosque_comparaison', 'kiosque_profil',
+                  'kiosque_parallele', 'kiosque_batch')
+
+
+def _executer(code):
+    env = dict(os.environ, PYTHONPATH=RACINE)
+    sortie = subprocess.run([sys.executable, '-c', code], cwd=RACINE, env=env,
+                            capture_output=True, text=True, check=True)
+    return sortie.stdout
+
+
+def _mesurer_import(modules):
+    """Meilleur temps d'import de `modules` + modules lourds chargés au passage."""
+    code = (
+        "import json, sys, time\n"
+        "debut = time.perf_counter()\n"
+        + "".join(f"import {m}\n" for m in modules) +
+        "duree = time.perf_counter() - debut\n"
+        f"charges = [m for m in {MODULES_GUI + ('numpy', 'multiprocessing')!r} if m in sys.modules]\n"
+        "print(json.dumps({'duree': duree, 'charges': charges}))\n"
+    )
+    mesures = [json.loads(_executer(code).splitlines()[-1]) for _ in range(ESSAIS)]
+    return min(m['duree'] for m in mesures), mesures[0]['charges']
+
+
+def test_import_interface_silencieux():
+    assert _executer("import interface_ultrasimple") == ""
+
+
+def test_import_interface_sans_gui_et_dans_le_budget():
+    duree, charges = _mesurer_import(['interface_ultrasimple'])
+    assert charges == []
+    assert duree < BUDGET_INTERFACE_S, f"import en {duree * 1000:.1f} ms"
+
+
+def test_import_modules_calcul_sans_gui_et_dans_le_budget():
+    duree, charges = _mesurer_import(MODULES_CALCUL)
+    assert charges == []
+    assert duree < BUDGET_CALCUL_S, f"import en {duree * 1000:.1f} ms"
+
+
+def test_exports_differes():
+    code = (
+        "import sys, interface_ultrasimple as iu, kiosque_generation as g\n"
+        "assert iu.charger_module is g.charger_module\n"
+        "assert iu.CORRESPONDANCE_CONTROLES is g.CORRESPONDANCE_CONTROLES\n"
+        "assert 'InterfaceUltraSimple' in dir(iu)\n"
+        "print('PySide' in sys.modules)\n"
+    )
+    assert _executer(code).strip() == "False"
@@ -0,0 +1,56 @@
+"""
+Cycle de vie des documents (`kiosque_documents`) avec les substituts FreeCAD : brouillon
+vidé et réutilisé, essai en échec sans document orphelin, générés bornés en LRU.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def gestionnaire(substituts):
+    import FreeCAD as App
+
+    from kiosque_documents import GestionnaireDocuments
+
+    avant = set(App.listDocuments())
+    yield GestionnaireDocuments(max_documents=2)
+    for nom in set(App.listDocuments()) - avant:
+        App.closeDocument(nom)
+
+
+def test_brouillon_reutilise(gestionnaire):
+    import FreeCAD as App
+
+    with gestionnaire.essai("Essai 1") as doc:
+        doc.addObject('Part::Feature', 'Petale')
+    with gestionnaire.essai("Essai 2") as suivant:
+        assert suivant is doc and doc.Objects == [] and doc.Label == "Essai 2"
+
+    with pytest.raises(RuntimeError):
+        with gestionnaire.essai() as doc:
+            doc.addObject('Part::Feature', 'Petale')
+            orphelin = App.newDocument("Kiosque_Trefle")
+            raise RuntimeError("script cassé")
+    assert orphelin.Name not in App.listDocuments()
+    assert doc.Name in App.listDocuments() and doc.Objects == []
+
+
+def test_generes_lru(gestionnaire):
+    import FreeCAD as App
+
+    noms = [App.newDocument(f"Kiosque_{i}").Name for i in range(4)]
+    for nom in noms[:3]:
+        gestionnaire.conserver(nom)
+    gestionnaire.conserver(noms[0])  # réutilisé : le plus récent
+    App.closeDocument(noms[1])  # fermé par l'utilisateur : oublié
+    gestionnaire.conserver(noms[3])
+    assert gestionnaire.evincer(proteges=(noms[3],)) == [noms[2]]
+    assert list(gestionnaire.generes) == [noms[0], noms[3]]
+    assert noms[2] not in App.listDocuments()
+    assert "2/2 document(s)" in gestionnaire.rapport()
+
+
+def test_brouillon_conserve_libere(gestionnaire):
+    doc = gestionnaire.brouillon_vide()
+    gestionnaire.conserver(doc.Name)
+    assert gestionnaire.brouillon_vide() is not doc
@@ -0,0 +1,132 @@
+"""
+Export en flux (`kiosque_export`) avec le substitut `Part` de `bench/substituts`
+(un tétraèdre par pièce) : STL binaire et glTF binaire valides, en série comme avec
+le pool de triangulation, fichiers partiels supprimés à l'annulation ou à l'échec d'un worker.
+"""
+
+import gc
+import json
+import os
+import struct
+import threading
+import weakref
+from concurrent.futures import Future
+
+import pytest
+
+from conftest import SUBSTITUTS
+
+PIECES = 5
+
+
+@pytest.fixture
+def formes(substituts):
+    import Part
+
+    return [(f"Petale{i}", f"Pétale {i}", Part.Forme([f"Petale{i}"]).exportBrepToString())
+            for i in range(PIECES)]
+
+
+def _verifier(fichiers):
+    assert sorted(fichiers) == ['glb', 'step', 'stl']
+    with open(fichiers['stl'], 'rb') as f:
+        donnees = f.read()
+    (triangles,) = struct.unpack_from('<I', donnees, 80)
+    assert triangles == 4 * PIECES and len(donnees) == 84 + 50 * triangles
+
+    with open(fichiers['glb'], 'rb') as f:
+        donnees = f.read()
+    magie, version, total = struct.unpack_from('<4sII', donnees)
+    assert (magie, version, total) == (b'glTF', 2, len(donnees))
+    taille_json, type_json = struct.unpack_from('<I4s', donnees, 12)
+    gltf = json.loads(donnees[20:20 + taille_json])
+    taille_bin, type_bin = struct.unpack_from('<I4s', donnees, 20 + taille_json)
+    assert (type_json, type_bin) == (b'JSON', b'BIN\0')
+    assert taille_bin == gltf['buffers'][0]['byteLength'] == len(donnees) - 28 - taille_json
+    assert sorted(n['name'] for n in gltf['nodes'][1:]) == [f"Pétale {i}" for i in range(PIECES)]
+    assert {a['componentType'] for a in gltf['accessors'][1::2]} == {5123}  # indices 16 bits
+    assert not [f for f in os.listdir(os.path.dirname(fichiers['glb'])) if f.startswith('.glb-')]
+
+
+def test_export_en_serie(formes, tmp_path):
+    from kiosque_export import exporter
+
+    messages = []
+    fichiers = exporter(formes, str(tmp_path / 'kiosque'), rappel=messages.append)
+    _verifier(fichiers)
+    assert len(messages) == PIECES
+
+
+def test_export_avec_pool(formes, tmp_path):
+    from kiosque_export import creer_pool, exporter
+
+    with creer_pool(2, [SUBSTITUTS]) as pool:
+        _verifier(exporter(formes, str(tmp_path / 'a' / 'kiosque'), deviation=0.5, pool=pool))
+        _verifier(exporter(formes, str(tmp_path / 'b' / 'kiosque'), pool=pool))  # pool réutilisé
+
+
+def test_export_annule(formes, tmp_path):
+    from kiosque_export import exporter
+
+    annulation = threading.Event()
+    annulation.set()
+    assert exporter(formes, str(tmp_path / 'kiosque'), annulation=annulation) is None
+    assert os.listdir(tmp_path) == []
+
+
+class _PoolSynchrone:
+    """Exécute chaque tâche à la soumission ; garde une référence faible de ses Futures."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fonction, *args):
+        future = Future()
+        future.set_result(fonction(*args))
+        self.futures.append(weakref.ref(future))
+        return future
+
+
+def test_maillages_liberes_apres_ecriture(formes, tmp_path):
+    from kiosque_export import exporter
+
+    pool = _PoolSynchrone()
+    vivantes = []
+
+    def rappel(message):
+        gc.collect()
+        vivantes.append(sum(ref() is not None for ref in pool.futures[1:]))  # [0] : le STEP
+
+    _verifier(exporter(formes, str(tmp_path / 'kiosque'), pool=pool, rappel=rappel))
+    # Après la k-ième pièce écrite, seules les pièces pas encore écrites (et la courante) restent
+    assert vivantes == [PIECES - k + 1 for k in range(1, PIECES + 1)]
+
+
+class _PoolDefaillant(_PoolSynchrone):
+    """La triangulation de `echec` lève ; celles des pièces suivantes restent en attente."""
+
+    def __init__(self, echec):
+        super().__init__()
+        self.echec, self.en_attente = echec, []
+
+    def submit(self, fonction, *args):
+        from kiosque_export import _trianguler
+
+        if fonction is _trianguler and args[0] >= self.echec:
+            future = Future()
+            if args[0] == self.echec:
+                future.set_exception(RuntimeError("worker perdu"))
+            else:
+                self.en_attente.append(future)
+            return future
+        return super().submit(fonction, *args)
+
+
+def test_export_worker_en_echec(formes, tmp_path):
+    from kiosque_export import exporter
+
+    pool = _PoolDefaillant("Pétale 2")
+    with pytest.raises(RuntimeError, match="worker perdu"):
+        exporter(formes, str(tmp_path / 'kiosque'), pool=pool)
+    assert os.listdir(tmp_path) == []  # STEP écrit par le pool supprimé
+    assert pool.en_attente and all(f.cancelled() for f in pool.en_attente)
@@ -0,0 +1,77 @@
+"""
+Fiabilité de l'ancrage (`kiosque_fiabilite`) : loi de Gumbel calée sur la vitesse de
+calcul, résultats indépendants du découpage en blocs, lest requis cohérent avec la
+probabilité visée, export `fiabilite.csv` du batch.
+"""
+
+import csv
+import math
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from kiosque_fiabilite import COLONNES_FIABILITE, analyser, parametres_gumbel  # noqa: E402
+
+GEOMETRIE = dict(rayon_petale=2200, rayon_rosaire=1000, hauteur_petale=2200, hauteur_dome=3500)
+
+
+def test_gumbel_quantile():
+    mode, echelle = parametres_gumbel(130, cov=0.15, quantile=0.98)
+    assert math.exp(-math.exp(-(130 - mode) / echelle)) == pytest.approx(0.98)
+    moyenne = mode + 0.5772156649 * echelle
+    assert echelle * math.pi / math.sqrt(6) / moyenne == pytest.approx(0.15)
+
+
+def test_blocs_sans_effet():
+    a = analyser(100, **GEOMETRIE, echantillons=200_000, graine=3, taille_bloc=200_000)
+    b = analyser(100, **GEOMETRIE, echantillons=200_000, graine=3, taille_bloc=200_000)
+    c = analyser(100, **GEOMETRIE, echantillons=200_000, graine=3, taille_bloc=30_000)
+    assert a['pf'] == b['pf'] and a['masse_requise'] == b['masse_requise']
+    # Tirages différents selon le découpage : même estimation aux fluctuations près
+    assert c['pf'] == pytest.approx(a['pf'], abs=3 * a['intervalle_pf'] + 1e-4)
+
+
+def test_lest_requis():
+    options = dict(echantillons=400_000, graine=1, cible=1e-3)
+    base = analyser(100, **GEOMETRIE, material='Acier galvanisé (permanent)', **options)
+    assert base['pf'] >= max(base['pf_soulevement'], base['pf_renversement'], base['pf_rupture'])
+    assert 0 < base['beta'] < 5 and base['estimation_fiable']
+
+    lourd = analyser(100, **GEOMETRIE, material='Acier galvanisé (permanent)',
+                     masse_plot=base['masse_requise'], **options)
+    assert lourd['pf_soulevement'] < base['pf_soulevement']
+    assert max(lourd['pf_soulevement'], lourd['pf_renversement']) <= 1e-3
+    assert lourd['cote_requise'] == pytest.approx(base['cote_requise'])
+
+
+def test_vent_nul():
+    resultat = analyser(0, **GEOMETRIE, echantillons=10_000, graine=2)
+    assert resultat['pf'] == 0.0 and resultat['beta'] == math.inf
+    assert resultat['masse_requise'] == 0.0
+    with pytest.raises(ValueError):
+        analyser(-10, **GEOMETRIE, echantillons=10_000)
+
+
+def test_annulation_entre_blocs():
+    import threading
+
+    from kiosque_generation import GenerationAnnulee
+
+    annulation = threading.Event()
+    annulation.set()
+    with pytest.raises(GenerationAnnulee):
+        analyser(100, **GEOMETRIE, echantillons=50_000, taille_bloc=10_000, annulation=annulation)
+
+
+def test_batch_csv(tmp_path, capsys):
+    from kiosque_batch import main
+
+    code = main(['--fiabilite', '--grille', 'wind_speed=100,130', '--echantillons', '50000',
+                 '--sortie', str(tmp_path)])
+    assert code == 0 and '🎲 2 variante(s)' in capsys.readouterr().out
+    with open(tmp_path / 'fiabilite.csv', encoding='utf-8') as f:
+        lignes = list(csv.DictReader(f))
+    assert [ligne['wind_speed'] for ligne in lignes] == ['100', '130']
+    assert set(COLONNES_FIABILITE) <= set(lignes[0])
+    assert float(lignes[1]['masse_requise']) > float(lignes[0]['masse_requise'])
@@ -0,0 +1,84 @@
+"""
+Construction groupée (`kiosque_generation.ConstructionGroupee`) avec les substituts FreeCAD :
+recomputes et annulation suspendus pendant le bloc, un seul recompute à la sortie ; seuls
+les documents créés par le script sont suivis, `FreeCAD.newDocument` reste intact.
+"""
+
+import threading
+
+import pytest
+
+SCRIPT = '''
+import FreeCAD as App
+
+
+class KiosqueTrefleFonctionnel:
+
+    def __init__(self):
+        self.config = {}
+        self.etats = []
+
+    def generer_kiosque_complet_avec_plots(self):
+        doc = App.newDocument("Kiosque_Trefle")
+        doc.addObject('Part::Feature', 'Petale')
+        self.etats.append((doc.RecomputesFrozen, doc.UndoMode))
+        return doc
+'''
+
+
+@pytest.fixture
+def document(substituts):
+    import FreeCAD as App
+
+    doc = App.newDocument("Kiosque_Groupe")
+    yield doc
+    App.closeDocument(doc.Name)
+
+
+def test_etat_restaure_apres_recompute(document):
+    from kiosque_generation import construction_groupee
+
+    with construction_groupee():
+        document.addObject('Part::Feature', 'Petale')
+        assert (document.RecomputesFrozen, document.UndoMode) == (True, 0)
+        document.recompute()  # gelé : sans effet
+    assert (document.RecomputesFrozen, document.UndoMode, document.recomputes) == (False, 1, 1)
+
+
+@pytest.fixture
+def module(substituts, tmp_path):
+    from kiosque_generation import charger_module
+
+    chemin = tmp_path / 'kiosque_groupe.py'
+    chemin.write_text(SCRIPT, encoding='utf-8')
+    return charger_module(str(chemin))
+
+
+def test_documents_du_script_suivis(module):
+    import FreeCAD as App
+
+    from kiosque_generation import construction_groupee
+
+    original = App.newDocument
+    instance = module.KiosqueTrefleFonctionnel()
+    with construction_groupee(module=module) as groupe:
+        assert App.newDocument is original
+        doc = instance.generer_kiosque_complet_avec_plots()
+        externe = App.newDocument("Hors_Script")  # autre code : non suivi
+    assert instance.etats == [(True, 0)]
+    assert doc.Name in groupe.documents and externe.Name not in groupe.documents
+    assert (doc.RecomputesFrozen, doc.UndoMode, doc.recomputes) == (False, 1, 1)
+    assert module.App is App
+
+
+def test_autre_thread_non_redirige(module):
+    import FreeCAD as App
+
+    from kiosque_generation import construction_groupee
+
+    crees = []
+    with construction_groupee(module=module) as groupe:
+        thread = threading.Thread(target=lambda: crees.append(App.newDocument("Autre_Thread")))
+        thread.start()
+        thread.join()
+    assert crees[0].Name not in groupe.documents and not crees[0].RecomputesFrozen
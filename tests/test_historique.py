@@ -0,0 +1,81 @@
+"""
+Historique des générations (`kiosque_historique`) : enregistrement et rechargement,
+variante la plus proche, séries durée/paramètre et export CSV.
+"""
+
+import csv
+
+import pytest
+
+
+@pytest.fixture
+def historique(tmp_path):
+    from kiosque_historique import HistoriqueGenerations
+
+    historique = HistoriqueGenerations(str(tmp_path / 'historique.sqlite'))
+    yield historique
+    historique.fermer()
+
+
+def test_enregistrer_et_charger(historique):
+    identifiant = historique.enregistrer(
+        {'rayon_petale': 2300, 'hauteur_dome': None, 'material': 'Bambou (temporaire)'},
+        config={'rayon_petale': 2300, 'hauteur_dome': 3500}, hash_script='abc',
+        duree_s=1.23456, phases=[{'nom': 'recompute', 'total': 0.5}],
+        geometrie={'nb_objets': 12, 'boite': [0, 0, 0, 1, 1, 1]})
+    entree = historique.charger(identifiant)
+    # Dimension absente des paramètres : valeur effective du script
+    assert entree['parametres']['hauteur_dome'] == 3500 and entree['parametres']['rayon_petale'] == 2300
+    assert entree['config'] == {'hauteur_dome': 3500, 'rayon_petale': 2300}
+    assert entree['phases'] == {'recompute': 0.5} and entree['duree_s'] == 1.2346
+    assert entree['nb_objets'] == 12 and entree['boite'] == [0, 0, 0, 1, 1, 1]
+    assert historique.charger(identifiant + 1) is None
+
+
+def test_plus_proche_et_series(historique):
+    for rayon, duree, statut in ((2000, 1.0, 'ok'), (2400, 2.0, 'ok'), (2300, 9.0, 'erreur')):
+        historique.enregistrer({'rayon_petale': rayon, 'hauteur_dome': 3500, 'material': 'Acier'},
+                               hash_script='abc', duree_s=duree, statut=statut)
+    historique.enregistrer({'rayon_petale': 2300, 'hauteur_dome': 3500, 'material': 'Bambou'},
+                           hash_script='abc', duree_s=1.5)
+
+    proches = historique.plus_proche({'rayon_petale': 2290, 'material': 'Acier'}, limite=2)
+    assert [p['rayon_petale'] for p in proches] == [2400, 2000]  # l'échec à 2300 est ignoré
+    assert proches[0]['distance'] == pytest.approx(1.1 ** 2)
+    tous = historique.plus_proche({'rayon_petale': 2290, 'material': 'Acier'}, meme_materiau=False)
+    assert tous[0]['material'] == 'Bambou'
+    assert historique.plus_proche({'rayon_petale': 2290}, hash_script='abd') == []
+
+    assert historique.series('rayon_petale') == [(2000.0, 1.0), (2300.0, 1.5), (2400.0, 2.0)]
+    with pytest.raises(ValueError):
+        historique.series('rayon')
+
+
+def test_plus_proche_pre_filtre_exact(historique):
+    from kiosque_historique import ECHELLES_DISTANCE
+
+    enregistrees = [{'rayon_petale': 1800 + 50 * i, 'hauteur_dome': 3000 + 70 * j, 'material': 'Acier'}
+                    for i in range(12) for j in range(8)]
+    for parametres in enregistrees:
+        historique.enregistrer(parametres, hash_script='abc')
+
+    def exhaustif(cible, limite):
+        distances = sorted(sum(((p[c] - cible[c]) / ECHELLES_DISTANCE[c]) ** 2 for c in cible)
+                           for p in enregistrees)
+        return distances[:limite]
+
+    # Cible dans le nuage, au bord, et loin de tout : la boîte est élargie au besoin
+    for cible, limite in (({'rayon_petale': 2010, 'hauteur_dome': 3300}, 5),
+                          ({'rayon_petale': 1700, 'hauteur_dome': 3500}, 30),
+                          ({'rayon_petale': 90000, 'hauteur_dome': 3100}, 3)):
+        proches = historique.plus_proche(dict(cible, material='Acier'), limite=limite)
+        assert [p['distance'] for p in proches] == pytest.approx(exhaustif(cible, limite))
+
+
+def test_export_csv(historique, tmp_path):
+    historique.enregistrer({'rayon_petale': 2200}, statut='erreur', erreur=RuntimeError("x" * 2000))
+    chemin = tmp_path / 'historique.csv'
+    assert historique.exporter_csv(str(chemin)) == 1
+    with open(chemin, newline='', encoding='utf-8') as f:
+        lignes = list(csv.DictReader(f))
+    assert lignes[0]['statut'] == 'erreur' and len(lignes[0]['erreur']) == 1000
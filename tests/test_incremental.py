@@ -0,0 +1,154 @@
+"""
+Régénération incrémentale (`kiosque_incremental`) sur le script synthétique : graphe
+clé -> sous-assemblage, puis seuls les sous-assemblages invalidés (par une clé lue ou
+par une dépendance de document) sont reconstruits, le reste est conservé tel quel.
+"""
+
+import pytest
+
+from conftest import SCRIPT
+
+
+@pytest.fixture
+def session(substituts, monkeypatch):
+    monkeypatch.setenv('KIOSQUE_BENCH_OBJETS', '4')
+    from kiosque_generation import charger_module
+    from kiosque_incremental import SessionIncrementale
+    from kiosque_index import charger_index
+
+    return SessionIncrementale(charger_module(SCRIPT), charger_index(SCRIPT)[0])
+
+
+def test_graphe_dependances(session):
+    from kiosque_incremental import cles_modifiees
+
+    assert session.graphe == {
+        'assembler_4_petales': {'nb_petales', 'rayon_petale', 'hauteur_petale'},
+        'creer_plots_fondation': {'nb_petales', 'nb_plots_par_petale', 'rayon_rosaire'},
+        'creer_dome': {'hauteur_dome'},
+    }
+    assert session.cles_globales == set()
+    assert cles_modifiees({'a': 1, 'b': 2}, {'a': 1, 'b': 3, 'c': None}) == {'b', 'c'}
+
+
+def test_seul_le_dome_reconstruit(session):
+    messages = []
+    doc = session.construire({'hauteur_dome': 3500})
+    petales = {o.Name: o for o in doc.Objects if o.Name.startswith('Petale_')}
+
+    doc = session.construire({'hauteur_dome': 4000}, messages.append)
+    noms = {o.Name for o in doc.Objects}
+    assert not any(n.startswith('Dome_3500') for n in noms) and 'Dome_4000_0' in noms
+    assert all(doc.getObject(n) is o for n, o in petales.items())  # objets conservés
+    assert "reconstruction de creer_dome" in messages[0]
+
+    messages.clear()
+    session.construire({'hauteur_dome': 4000}, messages.append)
+    assert "♻️ Aucun sous-assemblage impacté : géométrie conservée" in messages
+
+
+def test_dependance_de_document(session):
+    doc = session.construire({})
+    plot, petale = doc.getObject('Plot_0_1000_0'), doc.getObject('Petale_45_2200_2200_0')
+    # Un plot dérivé du dôme : reconstruit avec lui
+    doc.getObject('Dome_3500_0').InListRecursive.append(plot)
+
+    doc = session.construire({'hauteur_dome': 3000})
+    assert doc.getObject('Plot_0_1000_0') not in (None, plot)
+    assert doc.getObject('Petale_45_2200_2200_0') is petale
+
+
+def test_apercu_sans_plots(substituts, monkeypatch):
+    monkeypatch.setenv('KIOSQUE_BENCH_OBJETS', '4')
+    from kiosque_generation import CLE_APERCU, charger_module
+    from kiosque_incremental import SessionIncrementale
+    from kiosque_index import charger_index
+
+    apercu = SessionIncrementale(charger_module(SCRIPT), charger_index(SCRIPT)[0], apercu=True)
+    doc = apercu.construire({'rayon_petale': 2000})
+    assert apercu.instance.config[CLE_APERCU] is True
+    assert not any(o.Name.startswith('Plot_') for o in doc.Objects)
+    doc = apercu.construire({'rayon_petale': 2100})  # incrémental, toujours sans plots
+    noms = {o.Name for o in doc.Objects}
+    assert 'Petale_45_2100_2200_0' in noms and not any(n.startswith(('Plot_', 'Petale_45_2000')) for n in noms)
+
+
+def test_constructions_completes_via_cache(substituts, monkeypatch, tmp_path):
+    monkeypatch.setenv('KIOSQUE_BENCH_OBJETS', '4')
+    from kiosque_cache import CacheGeometrie
+    from kiosque_generation import charger_module
+    from kiosque_incremental import SessionIncrementale
+    from kiosque_index import charger_index
+
+    module, index = charger_module(SCRIPT), charger_index(SCRIPT)[0]
+    cache = CacheGeometrie(dossier=str(tmp_path / 'cache'))
+    messages = []
+    SessionIncrementale(module, index, cache=cache).construire({'hauteur_dome': 3500}, messages.append)
+    assert any(m.startswith("💾 Cache MISS") for m in messages)
+
+    session, messages = SessionIncrementale(module, index, cache=cache), []
+    doc = session.construire({'hauteur_dome': 3500}, messages.append)
+    assert any(m.startswith("💾 Cache HIT") for m in messages) and doc.getObject('Dome_3500_0') is not None
+
+    # Restauré : pas de référence incrémentale, la mise à jour suivante est complète (MISS)
+    messages.clear()
+    session.construire({'hauteur_dome': 4000}, messages.append)
+    assert "♻️ Construction complète (référence incrémentale)" in messages
+    messages.clear()
+    doc = session.construire({'hauteur_dome': 4500}, messages.append)
+    assert any("reconstruction de creer_dome" in m for m in messages)
+    assert doc.getObject('Dome_4500_0') is not None and doc.getObject('Dome_4000_0') is None
+
+
+# Les plots suivent `self.rayon_ext` posé par les pétales, le dôme compte les pétales du document
+SCRIPT_ETAT = '''
+import FreeCAD as App
+
+
+class KiosqueTrefleFonctionnel:
+
+    def __init__(self):
+        self.config = {'rayon_petale': 2200, 'hauteur_dome': 3500}
+        self.rayon_ext = None
+
+    def assembler_4_petales(self):
+        self.rayon_ext = self.config['rayon_petale'] + 1000
+        App.ActiveDocument.addObject('Part::Feature', f"Petale_{self.config['rayon_petale']}")
+
+    def creer_plots_fondation(self):
+        App.ActiveDocument.addObject('Part::Feature', f"Plot_{self.rayon_ext}")
+
+    def creer_dome(self):
+        n = len([o for o in App.ActiveDocument.Objects if o.Name.startswith('Petale_')])
+        App.ActiveDocument.addObject('Part::Feature', f"Dome_{self.config['hauteur_dome']}_{n}")
+
+    def creer_banc(self):
+        App.ActiveDocument.addObject('Part::Feature', 'Banc')
+
+    def generer_kiosque_complet_avec_plots(self):
+        doc = App.newDocument("Kiosque_Trefle")
+        self.assembler_4_petales()
+        self.creer_plots_fondation()
+        self.creer_dome()
+        self.creer_banc()
+        return doc
+'''
+
+
+def test_dependance_par_etat(substituts, tmp_path):
+    from kiosque_generation import charger_module
+    from kiosque_incremental import SessionIncrementale
+    from kiosque_index import charger_index
+
+    chemin = tmp_path / 'kiosque_etat.py'
+    chemin.write_text(SCRIPT_ETAT, encoding='utf-8')
+    session = SessionIncrementale(charger_module(str(chemin)), charger_index(str(chemin), str(tmp_path))[0])
+    doc = session.construire({})
+    banc = doc.getObject('Banc')
+
+    messages = []
+    doc = session.construire({'rayon_petale': 2400}, messages.append)
+    assert sorted(o.Name for o in doc.Objects) == ['Banc', 'Dome_3500_1', 'Petale_2400', 'Plot_3400']
+    assert doc.getObject('Banc') is banc
+    assert any(m.endswith("reconstruction de assembler_4_petales, creer_plots_fondation, creer_dome")
+               for m in messages)
@@ -0,0 +1,68 @@
+"""
+Index statique du script (`kiosque_index`) : signatures, clés de `config` et appels
+relevés par AST, cache disque invalidé par l'empreinte SHA-256 et par `VERSION_INDEX`.
+"""
+
+import json
+import os
+
+SOURCE = '''
+import FreeCAD as App
+
+
+def utilitaire(a, b=2, *args, c, **kwargs):
+    return a
+
+
+class KiosqueTrefleFonctionnel:
+
+    def __init__(self):
+        self.config = {'rayon_petale': 2200, 'hauteur_dome': 3500}
+
+    def creer_petale(self, angle, epaisseur=10):
+        cfg = self.config
+        return cfg['rayon_petale'] + self.config.get('hauteur_petale', 0)
+
+    def creer_dome(self):
+        return self.config['hauteur_dome'] + self.creer_petale(0)
+'''
+
+
+def test_indexer_source():
+    from kiosque_index import cles_config, indexer_source, methodes_dependantes
+
+    index = indexer_source(SOURCE)
+    assert index['fonctions']['utilitaire']['params'] == ['a', 'b', 'c', '*args', '**kwargs']
+    assert index['fonctions']['utilitaire']['requis'] == 2
+    classe = index['classe']
+    assert classe['config_defaut'] == ['rayon_petale', 'hauteur_dome']
+    petale = classe['methodes']['creer_petale']
+    assert petale['params'] == ['angle', 'epaisseur'] and petale['requis'] == 1
+    assert petale['config'] == ['hauteur_petale', 'rayon_petale']
+    assert methodes_dependantes(index, 'creer_dome') == {'creer_dome', 'creer_petale'}
+    assert cles_config(index, 'creer_dome') == {'hauteur_dome', 'hauteur_petale', 'rayon_petale'}
+
+
+def test_cache_par_empreinte(tmp_path):
+    from kiosque_index import VERSION_INDEX, charger_index
+
+    script, dossier = tmp_path / 'kiosque.py', tmp_path / 'index'
+    script.write_text(SOURCE, encoding='utf-8')
+    index, empreinte = charger_index(str(script), str(dossier))
+    chemin_index = dossier / f"{empreinte}.json"
+    assert index['version'] == VERSION_INDEX and chemin_index.exists()
+
+    # Même contenu : relu depuis le disque, sans réanalyse
+    marque = dict(index, marque=True)
+    chemin_index.write_text(json.dumps(marque), encoding='utf-8')
+    assert charger_index(str(script), str(dossier))[0]['marque']
+
+    # Version d'index périmée : réanalysé et réécrit
+    chemin_index.write_text(json.dumps(dict(marque, version=VERSION_INDEX - 1)), encoding='utf-8')
+    assert 'marque' not in charger_index(str(script), str(dossier))[0]
+
+    # Contenu modifié : nouvelle empreinte, nouvelle entrée
+    script.write_text(SOURCE + "\n# modifié\n", encoding='utf-8')
+    index, autre = charger_index(str(script), str(dossier))
+    assert autre != empreinte and 'marque' not in index
+    assert sorted(os.listdir(dossier)) == sorted([f"{empreinte}.json", f"{autre}.json"])
@@ -0,0 +1,75 @@
+"""
+Instanciation des symétries (`kiosque_instances`) avec les substituts FreeCAD/Part :
+liens tournés vers le maître, valeur renvoyée au script, méthodes non instanciables.
+"""
+
+import pytest
+
+SCRIPT = '''
+import FreeCAD as App
+import Part
+
+
+class KiosqueTrefleFonctionnel:
+
+    def __init__(self):
+        self.config = {'rayon_petale': 2200}
+        self.appels = []
+
+    def creer_petale(self, angle):
+        self.appels.append(('petale', angle))
+        return App.ActiveDocument.addObject('Part::Feature', f"Petale_{self.config['rayon_petale']}")
+
+    def creer_plot(self, angle):
+        self.appels.append(('plot', angle))
+        return Part.Forme([f"Plot_{angle}"])
+
+    def creer_dome(self):
+        return None
+'''
+
+
+@pytest.fixture
+def kiosque(substituts, tmp_path):
+    import FreeCAD as App
+
+    from kiosque_generation import charger_module
+
+    chemin = tmp_path / 'kiosque_symetrique.py'
+    chemin.write_text(SCRIPT, encoding='utf-8')
+    instance = charger_module(str(chemin)).KiosqueTrefleFonctionnel()
+    doc = App.newDocument("Kiosque_Instances")
+    yield instance, doc
+    App.closeDocument(doc.Name)
+
+
+def test_liens_vers_le_maitre(kiosque):
+    from kiosque_instances import CLE_INSTANCES, TYPE_LIEN, instancier_symetries
+
+    instance, doc = kiosque
+    assert instancier_symetries(instance) == ['creer_petale', 'creer_plot']
+    assert instance.config[CLE_INSTANCES] is True
+
+    maitre = instance.creer_petale(45)
+    liens = [instance.creer_petale(a) for a in (135, 225, 315)]
+    assert instance.appels == [('petale', 45)]  # géométrie modélisée une fois
+    assert [lien.TypeId for lien in liens] == [TYPE_LIEN] * 3
+    assert all(lien.LinkedObject is maitre for lien in liens)
+    assert liens[0].Name == f"{maitre.Name}_lien_135"
+
+    instance.config['rayon_petale'] = 2400  # autre config : nouveau maître
+    assert instance.creer_petale(45).TypeId == 'Part::Feature'
+    assert instance.appels[-1] == ('petale', 45)
+
+
+def test_valeur_non_document_appelee_normalement(kiosque):
+    import Part
+
+    from kiosque_instances import instancier_symetries
+
+    instance, doc = kiosque
+    instancier_symetries(instance)
+    formes = [instance.creer_plot(a) for a in (0, 90, 180)]
+    assert all(isinstance(forme, Part.Forme) for forme in formes)  # jamais None
+    assert instance.appels == [('plot', 0), ('plot', 90), ('plot', 180)]
+    assert not [o for o in doc.Objects if o.TypeId == 'App::Link']
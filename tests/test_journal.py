@@ -0,0 +1,54 @@
+"""
+Journal structuré (`kiosque_journal`) : tampon borné lu par curseur, console limitée
+en débit, fichier JSON-lines écrit par blocs.
+"""
+
+import json
+
+
+def test_tampon_borne_et_curseur():
+    from kiosque_journal import Journal
+
+    journal = Journal(evenements_max=10, niveau_console='erreur')
+    for i in range(25):
+        journal.info(f"message {i}", index=i)
+    assert len(journal.evenements) == 10
+    nouveaux = journal.depuis(0)
+    assert [e['index'] for e in nouveaux] == list(range(15, 25))
+    journal.debug("détail")
+    suivants = journal.depuis(nouveaux[-1]['seq'])
+    assert [(e['niveau'], e['message']) for e in suivants] == [('debug', "détail")]
+
+
+def test_console_limitee(capsys):
+    from kiosque_journal import Journal
+
+    journal = Journal(niveau_console='info', console_max_par_s=5)
+    for i in range(50):
+        journal.info(f"variante {i}")
+    journal.debug("invisible en console")
+    journal.erreur("❌ toujours affichée")
+    lignes = capsys.readouterr().out.splitlines()
+    assert lignes == [f"variante {i}" for i in range(5)] + ["❌ toujours affichée"]
+    assert len(journal.depuis(0)) == 52
+
+
+def test_fichier_json_lines(tmp_path):
+    from kiosque_journal import TAMPON_FICHIER, Journal
+
+    chemin = tmp_path / 'journal' / 'batch.jsonl'
+    journal = Journal(niveau_console='erreur')
+    journal.ouvrir_fichier(str(chemin))
+    for i in range(TAMPON_FICHIER + 5):
+        journal.info("variante", index=i, duree_s=0.5)
+    # Écrit par blocs de TAMPON_FICHIER évènements ; le reste au `vider()`
+    assert len(chemin.read_text(encoding='utf-8').splitlines()) == TAMPON_FICHIER
+    try:
+        raise ValueError("script cassé")
+    except ValueError:
+        journal.exception("❌ échec")
+    journal.fermer_fichier()
+    evenements = [json.loads(ligne) for ligne in chemin.read_text(encoding='utf-8').splitlines()]
+    assert len(evenements) == TAMPON_FICHIER + 6
+    assert evenements[3]['index'] == 3 and evenements[3]['duree_s'] == 0.5
+    assert "ValueError: script cassé" in evenements[-1]['trace']
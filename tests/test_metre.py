@@ -0,0 +1,49 @@
+"""
+Métré analytique (`kiosque_metre`) : quantités recalculées à la main pour la géométrie
+par défaut, formules de la parabole contrôlées par intégration numérique, diffusion
+et cohérence du béton avec `kiosque_ancrage`.
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from kiosque_ancrage import dimensionner  # noqa: E402
+from kiosque_metre import estimer, estimer_parametres, longueur_parabole, surface_paraboloide  # noqa: E402
+
+
+def _trapezes(y, x):
+    return float(np.sum((y[1:] + y[:-1]) * np.diff(x)) / 2.0)
+
+
+def test_parabole_par_integration():
+    # z = h·(x/r)² sur [0, r] : longueur d'arc et surface de révolution
+    r, h = 3.2, 3.5
+    x = np.linspace(0.0, r, 200_001)
+    pente = 2.0 * h * x / r ** 2
+    assert longueur_parabole(r, h) == pytest.approx(_trapezes(np.sqrt(1 + pente ** 2), x), rel=1e-9)
+    assert surface_paraboloide(r, h) == pytest.approx(
+        _trapezes(2 * math.pi * x * np.sqrt(1 + pente ** 2), x), rel=1e-9)
+
+
+def test_calcul_a_la_main():
+    m = estimer(material='Acier galvanisé (permanent)')
+    arc = 1.5 * math.pi * 2.2  # 10,37 m de lobe par pétale
+    assert m['longueur_lisses'] == pytest.approx(4 * 2 * arc)
+    assert m['nb_montants'] == 4 * (math.ceil(arc / 0.8) + 1) == 56
+    assert m['longueur_montants'] == pytest.approx(56 * 2.2)
+    assert m['longueur_nervures'] == pytest.approx(4 * 2 * longueur_parabole(3.2, 3.5))
+    assert m['masse_tubes'] == pytest.approx(3.56 * float(m['longueur_tubes']))
+    assert m['masse_couverture'] == pytest.approx(4.0 * surface_paraboloide(3.2, 3.5))
+    assert m['volume_beton'] == pytest.approx(8 * float(dimensionner(100)['volume_plot']))
+
+
+def test_diffusion_et_defauts():
+    m = estimer(rayon_petale=np.array([2000, 2400]), material=np.array(['Acier', 'Bambou (temporaire)']))
+    assert m['masse_tubes'].shape == (2,)
+    seul = estimer(rayon_petale=2400, material='Bambou (temporaire)')
+    assert m['masse_structure'][1] == pytest.approx(seul['masse_structure'])
+    assert estimer_parametres({'wind_speed': 0})['volume_beton'] == 0
+    assert estimer_parametres({})['volume_beton'] == pytest.approx(estimer()['volume_beton'])
@@ -0,0 +1,62 @@
+"""
+Optimisation sous contraintes (`kiosque_optimisation`) : front de Pareto comparé à une
+recherche exhaustive, contraintes respectées par tout le front, raffinement utile.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from kiosque_optimisation import (BORNES_DEFAUT, OBJECTIFS_DEFAUT, evaluer, front_pareto,  # noqa: E402
+                                  optimiser, representants)
+
+CONTRAINTES = dict(wind_speed=130, emprise_max=7000, hauteur_libre_min=2100, lest_max=600)
+
+
+def _domine(a, b):
+    return bool(np.all(a <= b) and np.any(a < b))
+
+
+def _front_exhaustif(couts):
+    return [i for i in range(len(couts))
+            if not any(_domine(couts[j], couts[i]) for j in range(len(couts)))
+            and not any((couts[j] == couts[i]).all() for j in range(i))]
+
+
+def test_front_pareto():
+    couts = [[1, 5], [2, 2], [5, 1], [3, 3], [2, 2], [1, 6]]
+    assert front_pareto(couts).tolist() == [0, 1, 2]  # [3, 3] dominé ; doublon et [1, 6] écartés
+    aleatoires = np.random.default_rng(4).integers(0, 20, size=(300, 3)).astype(float)
+    assert front_pareto(aleatoires).tolist() == _front_exhaustif(aleatoires)
+
+
+def test_grille_sans_raffinement_exhaustive():
+    bornes = {cle: (bas, bas + 400) for cle, (bas, _) in BORNES_DEFAUT.items()}
+    resultat = optimiser(**CONTRAINTES, bornes=bornes, raffinements=0)
+
+    axes = [np.arange(bas, haut + 1, 200) for bas, haut in bornes.values()]
+    points = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, 4)
+    faisable, indicateurs = evaluer(points, **CONTRAINTES)
+    couts = np.column_stack([indicateurs[cle] * signe for cle, signe in OBJECTIFS_DEFAUT.items()])
+    attendus = {tuple(int(v) for v in points[faisable][i]) for i in _front_exhaustif(couts)}
+    assert {tuple(e['parametres'][cle] for cle in bornes) for e in resultat['front']} == attendus
+    assert resultat['faisables'] == int(faisable.sum())
+    # Hauteurs de pétales sous 2100 écartées avant évaluation
+    assert resultat['evalues'] == int((points[:, 2] >= 2100).sum()) < len(points)
+
+
+def test_contraintes_et_raffinement():
+    grossier = optimiser(**CONTRAINTES, raffinements=0)
+    resultat = optimiser(**CONTRAINTES)
+    assert resultat['evalues'] > grossier['evalues'] and len(resultat['front']) >= len(grossier['front'])
+    for entree in resultat['front']:
+        p = entree['parametres']
+        assert entree['emprise'] <= 7000 and p['hauteur_petale'] >= 2100 and entree['masse_plot'] <= 600
+        assert all(BORNES_DEFAUT[cle][0] <= p[cle] <= BORNES_DEFAUT[cle][1] for cle in BORNES_DEFAUT)
+    couts = np.array([[e['masse_structure'], e['volume_beton'], -e['surface_abritee']]
+                      for e in resultat['front']])
+    assert len(_front_exhaustif(couts)) == len(couts)  # aucun point du front n'en domine un autre
+    surfaces = [e['surface_abritee'] for e in resultat['front']]
+    assert surfaces == sorted(surfaces)
+    assert [e['emprise'] for e in representants(resultat['front'], 2)] == \
+        [resultat['front'][0]['emprise'], resultat['front'][-1]['emprise']]
@@ -0,0 +1,145 @@
+"""
+Construction parallèle des sous-assemblages (`kiosque_parallele`) : workers de vrais
+processus avec les substituts FreeCAD de `bench/substituts`. Même document qu'une
+construction séquentielle, et repli sur place des sous-assemblages non transférables.
+"""
+
+import pytest
+
+from conftest import SCRIPT, SUBSTITUTS
+
+# Dôme qui lit les pétales du document, plots qui retournent leurs objets
+SCRIPT_DEPENDANT = '''
+import FreeCAD as App
+
+
+class KiosqueTrefleFonctionnel:
+
+    def __init__(self):
+        self.config = {'rayon_petale': 2200, 'hauteur_dome': 3500, 'nb_petales': 4}
+
+    def assembler_4_petales(self):
+        for k in range(self.config['nb_petales']):
+            App.ActiveDocument.addObject('Part::Feature', f"Petale_{k}_{self.config['rayon_petale']}")
+
+    def creer_plots_fondation(self):
+        return [App.ActiveDocument.addObject('Part::Feature', f"Plot_{k}") for k in range(8)]
+
+    def creer_dome(self):
+        petales = [o for o in App.ActiveDocument.Objects if o.Name.startswith('Petale_')]
+        if not petales:
+            raise RuntimeError("pétales absents")
+        App.ActiveDocument.addObject('Part::Feature', f"Dome_{self.config['hauteur_dome']}")
+
+    def generer_kiosque_complet_avec_plots(self):
+        doc = App.newDocument("Kiosque_Trefle")
+        self.assembler_4_petales()
+        plots = self.creer_plots_fondation()
+        assert len(plots) == 8
+        self.creer_dome()
+        return doc
+'''
+
+
+# Dépendances silencieuses : le dôme compte les pétales du document, les plots suivent
+# `self.angles` posé par les pétales ; aucun ne lève d'exception dans un worker vide.
+# Seul le socle ne lit que `config`.
+SCRIPT_DEPENDANT_SILENCIEUX = '''
+import FreeCAD as App
+
+
+class KiosqueTrefleFonctionnel:
+
+    def __init__(self):
+        self.config = {'nb_petales': 4}
+        self.angles = []
+
+    def assembler_4_petales(self):
+        self.angles = [k * 360 / self.config['nb_petales'] for k in range(self.config['nb_petales'])]
+        for angle in self.angles:
+            App.ActiveDocument.addObject('Part::Feature', f"Petale_{angle:.0f}")
+
+    def creer_plots_fondation(self):
+        for angle in self.angles:
+            App.ActiveDocument.addObject('Part::Feature', f"Plot_{angle:.0f}")
+
+    def creer_dome(self):
+        petales = [o for o in App.ActiveDocument.Objects if o.Name.startswith('Petale_')]
+        App.ActiveDocument.addObject('Part::Feature', f"Dome_{len(petales)}")
+
+    def creer_socle(self):
+        App.ActiveDocument.addObject('Part::Feature', f"Socle_{self.config['nb_petales']}")
+
+    def generer_kiosque_complet_avec_plots(self):
+        doc = App.newDocument("Kiosque_Trefle")
+        self.assembler_4_petales()
+        self.creer_plots_fondation()
+        self.creer_dome()
+        self.creer_socle()
+        return doc
+'''
+
+
+@pytest.fixture
+def parallele(substituts):
+    from kiosque_generation import charger_module
+    from kiosque_index import indexer_source
+    from kiosque_parallele import ConstructionParallele
+
+    constructions = []
+
+    def creer(chemin):
+        with open(chemin, encoding='utf-8') as f:
+            construction = ConstructionParallele(chemin, indexer_source(f.read()), processus=3,
+                                                 chemins_supplementaires=[SUBSTITUTS])
+        constructions.append(construction)
+        return construction, charger_module(chemin)
+
+    yield creer
+    for construction in constructions:
+        construction.arreter()
+
+
+def test_meme_document_que_sequentiel(parallele):
+    from kiosque_generation import construire_kiosque
+
+    construction, module = parallele(SCRIPT)
+    parametres = {'rayon_petale': 2400, 'hauteur_dome': 3000, 'material': 'Bambou (temporaire)'}
+    sequentiel = sorted(o.Name for o in construire_kiosque(module, parametres).Objects)
+    config = {}
+    doc = construction.construire(module, parametres, config_effective=config)
+    assert sorted(o.Name for o in doc.Objects) == sequentiel
+    assert 'Dome_3000_0' in doc.getObject('Dome_3000_0').Shape.exportBrepToString()
+    assert sorted(construction.bilan['paralleles']) == sorted(construction.graphe)
+    assert construction.bilan['sur_place'] == [] and config['rayon_petale'] == 2400
+
+
+def test_repli_sur_place(parallele, tmp_path):
+    chemin = tmp_path / 'kiosque_dependant.py'
+    chemin.write_text(SCRIPT_DEPENDANT, encoding='utf-8')
+    construction, module = parallele(str(chemin))
+
+    doc = construction.construire(module, {'hauteur_dome': 4000})
+    assert sorted(o.Name for o in doc.Objects if not o.Name.startswith('Petale_')) == \
+        ['Dome_4000'] + [f"Plot_{k}" for k in range(8)]
+    assert list(construction.bilan['paralleles']) == ['assembler_4_petales']
+    assert construction.sur_place == {'creer_plots_fondation', 'creer_dome'}
+
+    # Mémorisé : seuls les pétales sont encore soumis au pool
+    doc = construction.construire(module, {'rayon_petale': 2000})
+    assert len(doc.Objects) == 4 + 8 + 1 and doc.getObject('Petale_3_2000') is not None
+    assert sorted(construction.bilan['sur_place']) == ['creer_dome', 'creer_plots_fondation']
+
+
+def test_lecture_hors_config_construite_sur_place(parallele, tmp_path):
+    chemin = tmp_path / 'kiosque_dependant_silencieux.py'
+    chemin.write_text(SCRIPT_DEPENDANT_SILENCIEUX, encoding='utf-8')
+    construction, module = parallele(str(chemin))
+    # D'après l'index : les pétales posent `self.angles`, les plots le lisent, le dôme lit le document
+    assert construction.sur_place == {'assembler_4_petales', 'creer_plots_fondation', 'creer_dome'}
+
+    doc = construction.construire(module, {})
+    angles = ['0', '180', '270', '90']
+    assert sorted(o.Name for o in doc.Objects) == \
+        ['Dome_4'] + [f"Petale_{a}" for a in angles] + [f"Plot_{a}" for a in angles] + ['Socle_4']
+    assert list(construction.bilan['paralleles']) == ['creer_socle']
@@ -0,0 +1,59 @@
+"""
+Profilage des phases (`kiosque_profil`) : spans imbriqués et agrégés, décorateur,
+export Chrome Trace Event, pic mémoire seulement quand `tracemalloc` est actif.
+"""
+
+import json
+
+
+def test_spans_et_resume():
+    from kiosque_profil import Profileur, formater_resume
+
+    profileur = Profileur()
+
+    @profileur.mesurer(categorie='script')
+    def etape():
+        """Étape mesurée."""
+        with profileur.span('recompute', 'freecad', objets=3):
+            pass
+
+    for _ in range(3):
+        with profileur.span('construction'):
+            etape()
+    assert etape.__doc__ == "Étape mesurée." and etape.__wrapped__ is not None
+    resume = {a['nom']: a for a in profileur.resume()}
+    assert {nom: a['n'] for nom, a in resume.items()} == \
+        {'construction': 3, 'test_spans_et_resume.<locals>.etape': 3, 'recompute': 3}
+    assert resume['construction']['total'] >= resume['recompute']['total']
+    assert resume['recompute']['pic_memoire'] is None
+    assert [e['profondeur'] for e in list(profileur.evenements)[:3]] == [2, 1, 0]
+    assert formater_resume(profileur.resume()).splitlines()[0].startswith('Phase')
+
+
+def test_trace_chrome(tmp_path):
+    from kiosque_profil import Profileur
+
+    profileur = Profileur(evenements_max=2)
+    for nom in ('a', 'b', 'c'):
+        with profileur.span(nom, objet=object()):
+            pass
+    chemin = profileur.exporter_chrome(str(tmp_path / 'trace.json'))
+    with open(chemin, encoding='utf-8') as f:
+        trace = json.load(f)['traceEvents']
+    assert [t['name'] for t in trace] == ['b', 'c']  # borné
+    assert all(t['ph'] == 'X' and t['dur'] >= 0 for t in trace)
+    assert trace[0]['args']['objet'].startswith('<object')
+
+
+def test_pic_memoire():
+    from kiosque_profil import Profileur
+
+    profileur = Profileur()
+    profileur.suivre_memoire(True)
+    try:
+        with profileur.span('allocation'):
+            tampon = bytearray(4 * 1048576)
+            del tampon
+    finally:
+        profileur.suivre_memoire(False)
+    assert profileur.resume()[0]['pic_memoire'] >= 4 * 1048576
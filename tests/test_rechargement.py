@@ -0,0 +1,91 @@
+"""
+Rechargement à chaud du script : `SurveillanceFichier` (contenu réellement modifié
+seulement) et le dialogue avec les substituts de `bench/substituts`, exécuté dans un
+interpréteur neuf (HOME isolé : index, cache et historique dans un dossier temporaire).
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from conftest import RACINE, SCRIPT, SUBSTITUTS
+
+SCENARIO = '''
+import json, os, sys, threading, time
+from interface_ultrasimple import InterfaceUltraSimple
+
+script = sys.argv[1]
+interface = InterfaceUltraSimple(script)
+interface.controles['hauteur_dome'].setValue(3200)
+interface.generer_avec_parametres()
+avant = {'hash': interface.hash_script, 'module': id(interface.module_loaded)}
+
+os.utime(script, ns=(1, 1))  # touché sans changement de contenu
+interface._surveiller_script()
+touche = {'hash': interface.hash_script, 'module': id(interface._module)}
+
+# Bac à sable et workers occupés : leur arrêt ne doit pas bloquer le thread Qt
+libere, arretes = threading.Event(), []
+
+class ServeurOccupe:
+    def arreter(self):
+        libere.wait(10)
+        arretes.append(self)
+
+interface._bac_a_sable, interface._parallele = ServeurOccupe(), ServeurOccupe()
+with open(script, 'a', encoding='utf-8') as f:
+    f.write("\\n\\ndef creer_kiosque_rapide():\\n    return creer_kiosque_avec_plots()\\n")
+debut = time.perf_counter()
+interface._surveiller_script()
+rechargement_s = time.perf_counter() - debut
+libere.set()
+for thread in threading.enumerate():
+    if thread.name in ('kiosque-prechargement', 'kiosque-arret'):
+        thread.join(10)
+print(json.dumps({
+    'avant': avant, 'touche': touche,
+    'hash': interface.hash_script,
+    'aiguillage': interface.aiguillage.hash_script,
+    'module_precharge': interface._module is not None and id(interface._module) != avant['module'],
+    'session': interface._session_incrementale is None,
+    'fonctions': sorted(interface.functions_map),
+    'dome': interface.controles['hauteur_dome'].value(),
+    'rechargement_s': rechargement_s, 'arretes': len(arretes),
+}))
+'''
+
+
+def test_surveillance_contenu_seulement(tmp_path):
+    from kiosque_surveillance import SurveillanceFichier
+
+    fichier = tmp_path / 'kiosque.py'
+    fichier.write_text("A = 1\n", encoding='utf-8')
+    surveillance = SurveillanceFichier(str(fichier))
+    assert surveillance.verifier() is None
+    os.utime(fichier, ns=(1, 1))
+    assert surveillance.verifier() is None  # même contenu
+    fichier.write_text("A = 2\n", encoding='utf-8')
+    empreinte = surveillance.verifier()
+    assert empreinte is not None and empreinte == surveillance.empreinte
+    assert surveillance.verifier() is None
+
+
+def test_dialogue_recharge_a_chaud(tmp_path):
+    script = tmp_path / 'kiosque_synthetique.py'
+    shutil.copy(SCRIPT, script)
+    env = dict(os.environ, HOME=str(tmp_path), USERPROFILE=str(tmp_path), KIOSQUE_BENCH_COUT='0',
+               PYTHONPATH=os.pathsep.join([SUBSTITUTS, RACINE]))
+    sortie = subprocess.run([sys.executable, '-c', SCENARIO, str(script)], cwd=str(tmp_path), env=env,
+                            capture_output=True, text=True, check=True)
+    r = json.loads(sortie.stdout.splitlines()[-1])
+    # Enregistrement à l'identique : rien n'est rechargé
+    assert r['touche'] == {'hash': r['avant']['hash'], 'module': r['avant']['module']}
+    # Nouveau contenu : réindexé, état de l'ancien script oublié, module préchargé, réglages gardés
+    assert r['hash'] != r['avant']['hash'] and r['aiguillage'] == r['hash']
+    assert r['module_precharge'] and r['session']
+    assert 'creer_kiosque_rapide' in r['fonctions']
+    assert r['dome'] == 3200
+    # Anciens serveurs arrêtés en arrière-plan, après le rechargement
+    assert r['rechargement_s'] < 5 and r['arretes'] == 2
@@ -0,0 +1,136 @@
+"""
+Service de génération (`kiosque_service`) avec des workers substituts : FreeCAD et
+Part de `bench/substituts`, script synthétique du benchmark. Le service tourne
+dans un thread du test ; ses workers sont de vrais processus préchauffés.
+"""
+
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from conftest import SCRIPT, SUBSTITUTS
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, substituts):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    from kiosque_service import ServiceGeneration
+
+    script = tmp_path / 'kiosque_synthetique.py'
+    shutil.copy(SCRIPT, script)
+    service = ServiceGeneration(str(script), processus=1, chemins_supplementaires=[SUBSTITUTS],
+                                dossier=str(tmp_path / 'sorties'),
+                                fichier_service=str(tmp_path / 'service.json'))
+    pret = threading.Event()
+    thread = threading.Thread(target=service.servir, kwargs={'pret': pret}, daemon=True)
+    thread.start()
+    assert pret.wait(60), "service non démarré"
+    yield service, script, str(tmp_path / 'service.json')
+    service.arreter()
+    thread.join(10)
+
+
+def test_job_via_le_client(service):
+    from kiosque_service import ClientService
+
+    serveur, _, fichier = service
+    with ClientService(fichier) as client:
+        workers = client.etat()['workers']
+        entree = client.generer({'rayon_petale': 2300}, ('fcstd',), brep=True)
+        entree_suivante = client.generer({'rayon_petale': 2400}, ('fcstd',))
+        assert entree['statut'] == 'ok', entree.get('erreur')
+        assert os.path.exists(entree['fichiers']['fcstd'])
+        assert entree['brep'].startswith(b'DBRep_DrawableShape')
+        assert entree_suivante['statut'] == 'ok'
+        # Les jobs passent par les workers préchauffés, sans relancer le pool
+        assert client.etat()['workers'] == workers
+        assert client.etat()['jobs'] == {'soumis': 2, 'reussis': 2, 'echoues': 0}
+
+
+def test_script_modifie_relance_le_pool(service):
+    from kiosque_service import ClientService
+
+    serveur, script, fichier = service
+    with ClientService(fichier) as client:
+        avant = client.etat()
+        with open(script, 'a', encoding='utf-8') as f:
+            f.write("\n# modifié\n")
+        entree = client.generer({}, ('fcstd',))
+        apres = client.etat()
+    assert entree['statut'] == 'ok', entree.get('erreur')
+    assert apres['script_sha256'] != avant['script_sha256']
+    assert apres['workers'] != avant['workers']
+
+
+def test_autre_script_sans_remplacer_celui_du_service(service, tmp_path):
+    from kiosque_service import ClientService, ServiceIndisponible
+
+    serveur, script, fichier = service
+    autre = tmp_path / 'autre_kiosque.py'
+    shutil.copy(SCRIPT, autre)
+    with ClientService(fichier) as client:
+        avant = client.etat()
+        entree = client.generer({}, ('fcstd',), script=str(autre))
+        apres = client.etat()
+        assert entree['statut'] == 'ok', entree.get('erreur')
+        # Le script du service et ses workers restent ceux des autres clients
+        assert apres['script'] == avant['script'] == str(script)
+        assert apres['workers'] == avant['workers']
+        assert apres['scripts'] == sorted([str(script), str(autre)])
+
+        with pytest.raises(ServiceIndisponible):
+            client.generer({}, ('fcstd',), script=str(tmp_path / 'absent.py'))
+        assert client.etat()['jobs'] == {'soumis': 2, 'reussis': 1, 'echoues': 1}
+
+
+def test_demarrage_d_un_pool_sans_bloquer_les_autres(service, tmp_path):
+    from kiosque_service import ClientService
+
+    serveur, _, fichier = service
+    lent = tmp_path / 'kiosque_lent.py'
+    lent.write_text("import time\ntime.sleep(5)\n" + open(SCRIPT, encoding='utf-8').read(), encoding='utf-8')
+    resultats = {}
+
+    def generer_lent():
+        with ClientService(fichier) as client:
+            resultats['lent'] = client.generer({}, ('fcstd',), script=str(lent))
+
+    thread = threading.Thread(target=generer_lent)
+    debut = time.perf_counter()
+    thread.start()
+    with ClientService(fichier) as client:
+        while str(lent) not in client.etat()['scripts']:
+            time.sleep(0.01)
+        # Pool du service déjà chaud : servi pendant le préchauffage de l'autre script
+        entree = client.generer({'rayon_petale': 2300}, ('fcstd',))
+        assert entree['statut'] == 'ok', entree.get('erreur')
+        assert time.perf_counter() - debut < 4 and thread.is_alive()
+    thread.join(60)
+    assert resultats['lent']['statut'] == 'ok', resultats['lent'].get('erreur')
+
+
+def test_options_de_job_transmises(service):
+    from kiosque_service import ClientService
+
+    serveur, _, fichier = service
+    with ClientService(fichier) as client:
+        entree = client.generer({}, ('fcstd',), instances=True, developper_liens=True, deviation=0.5)
+    assert entree['statut'] == 'ok', entree.get('erreur')
+
+
+def test_batch_refuse_les_reglages_du_service(capsys):
+    from kiosque_batch import main
+
+    with pytest.raises(SystemExit):
+        main(['--service', '--grille', 'rayon_petale=2200', '--cache'])
+    assert '--cache : à passer au démarrage du service' in capsys.readouterr().err
+
+
+def test_client_sans_service(tmp_path):
+    from kiosque_service import ClientService, ServiceIndisponible
+
+    with pytest.raises(ServiceIndisponible):
+        ClientService(str(tmp_path / 'absent.json'))